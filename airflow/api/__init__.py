@@ -28,7 +28,18 @@ log = logging.getLogger(__name__)
 class ApiAuth:  # pylint: disable=too-few-public-methods
     """Class to keep module of Authentication API  """
     def __init__(self):
-        self.api_auth = None
+        self._api_auth = None
+
+    @property
+    def api_auth(self):
+        """Module of the authentication backend, loaded on first use"""
+        if self._api_auth is None:
+            load_auth()
+        return self._api_auth
+
+    @api_auth.setter
+    def api_auth(self, value):
+        self._api_auth = value
 
 
 API_AUTH = ApiAuth()
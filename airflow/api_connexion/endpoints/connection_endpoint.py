@@ -21,6 +21,7 @@ from marshmallow import ValidationError
 from sqlalchemy import func
 
 from airflow.api_connexion.exceptions import AlreadyExists, BadRequest, NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.connection_schema import (
     ConnectionCollection, connection_collection_item_schema, connection_collection_schema, connection_schema,
@@ -56,15 +57,18 @@ def get_connection(connection_id, session):
     'limit': check_limit
 })
 @provide_session
-def get_connections(session, limit, offset=0):
+def get_connections(session, limit, offset=0, cursor=None):
     """
     Get all connection entries
     """
     total_entries = session.query(func.count(Connection.id)).scalar()
     query = session.query(Connection)
-    connections = query.order_by(Connection.id).offset(offset).limit(limit).all()
-    return connection_collection_schema.dump(ConnectionCollection(connections=connections,
-                                                                  total_entries=total_entries))
+    connections, next_cursor = paginate(query, [Connection.id], limit, offset, cursor)
+    return add_next_cursor(
+        connection_collection_schema.dump(ConnectionCollection(connections=connections,
+                                                               total_entries=total_entries)),
+        next_cursor,
+    )
 
 
 @provide_session
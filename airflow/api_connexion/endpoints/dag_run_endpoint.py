@@ -15,12 +15,15 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from flask import request
+from marshmallow import ValidationError
 from sqlalchemy import func
 
-from airflow.api_connexion.exceptions import NotFound
+from airflow.api_connexion.exceptions import BadRequest, NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate, stream_collection
 from airflow.api_connexion.parameters import check_limit, format_datetime, format_parameters
 from airflow.api_connexion.schemas.dag_run_schema import (
-    DAGRunCollection, dagrun_collection_schema, dagrun_schema,
+    DAGRunCollection, dagrun_collection_schema, dagrun_schema, dagruns_batch_form_schema,
 )
 from airflow.models import DagRun
 from airflow.utils.session import provide_session
@@ -45,6 +48,32 @@ def get_dag_run(dag_id, dag_run_id, session):
     return dagrun_schema.dump(dag_run)
 
 
+def _apply_date_filters(query, start_date_gte=None, start_date_lte=None,
+                        execution_date_gte=None, execution_date_lte=None,
+                        end_date_gte=None, end_date_lte=None):
+    # filter start date
+    if start_date_gte:
+        query = query.filter(DagRun.start_date >= start_date_gte)
+
+    if start_date_lte:
+        query = query.filter(DagRun.start_date <= start_date_lte)
+
+    # filter execution date
+    if execution_date_gte:
+        query = query.filter(DagRun.execution_date >= execution_date_gte)
+
+    if execution_date_lte:
+        query = query.filter(DagRun.execution_date <= execution_date_lte)
+
+    # filter end date
+    if end_date_gte:
+        query = query.filter(DagRun.end_date >= end_date_gte)
+
+    if end_date_lte:
+        query = query.filter(DagRun.end_date <= end_date_lte)
+    return query
+
+
 @format_parameters({
     'start_date_gte': format_datetime,
     'start_date_lte': format_datetime,
@@ -57,7 +86,7 @@ def get_dag_run(dag_id, dag_run_id, session):
 @provide_session
 def get_dag_runs(session, dag_id, start_date_gte=None, start_date_lte=None,
                  execution_date_gte=None, execution_date_lte=None,
-                 end_date_gte=None, end_date_lte=None, offset=None, limit=None):
+                 end_date_gte=None, end_date_lte=None, offset=None, limit=None, cursor=None):
     """
     Get all DAG Runs.
     """
@@ -68,40 +97,54 @@ def get_dag_runs(session, dag_id, start_date_gte=None, start_date_lte=None,
     if dag_id != '~':
         query = query.filter(DagRun.dag_id == dag_id)
 
-    # filter start date
-    if start_date_gte:
-        query = query.filter(DagRun.start_date >= start_date_gte)
-
-    if start_date_lte:
-        query = query.filter(DagRun.start_date <= start_date_lte)
-
-    # filter execution date
-    if execution_date_gte:
-        query = query.filter(DagRun.execution_date >= execution_date_gte)
-
-    if execution_date_lte:
-        query = query.filter(DagRun.execution_date <= execution_date_lte)
-
-    # filter end date
-    if end_date_gte:
-        query = query.filter(DagRun.end_date >= end_date_gte)
+    query = _apply_date_filters(query, start_date_gte, start_date_lte, execution_date_gte,
+                                execution_date_lte, end_date_gte, end_date_lte)
 
-    if end_date_lte:
-        query = query.filter(DagRun.end_date <= end_date_lte)
-
-    # apply offset and limit
-    dag_run = query.order_by(DagRun.id).offset(offset).limit(limit).all()
+    # apply the cursor or offset, and the limit
+    dag_run, next_cursor = paginate(query, [DagRun.id], limit, offset, cursor)
     total_entries = session.query(func.count(DagRun.id)).scalar()
 
-    return dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run,
-                                                          total_entries=total_entries))
+    return add_next_cursor(
+        dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run, total_entries=total_entries)),
+        next_cursor,
+    )
 
 
-def get_dag_runs_batch():
+@provide_session
+def get_dag_runs_batch(session):
     """
-    Get list of DAG Runs
+    Get list of DAG Runs, streamed so that all of them can be read at once.
     """
-    raise NotImplementedError("Not implemented yet.")
+    try:
+        data = dagruns_batch_form_schema.load(request.get_json() or {})
+    except ValidationError as err:
+        raise BadRequest(detail=str(err.messages))
+
+    def build_query(query_session):
+        query = query_session.query(DagRun)
+        if data.get('dag_ids'):
+            query = query.filter(DagRun.dag_id.in_(data['dag_ids']))
+        return _apply_date_filters(
+            query,
+            start_date_gte=data.get('start_date_gte'),
+            start_date_lte=data.get('start_date_lte'),
+            execution_date_gte=data.get('execution_date_gte'),
+            execution_date_lte=data.get('execution_date_lte'),
+            end_date_gte=data.get('end_date_gte'),
+            end_date_lte=data.get('end_date_lte'),
+        )
+
+    total_entries = build_query(session).order_by(None).count()
+    return stream_collection(
+        'dag_runs',
+        build_query,
+        [DagRun.id],
+        dagrun_schema.dump,
+        total_entries,
+        limit=data.get('page_limit'),
+        offset=data.get('page_offset'),
+        cursor=data.get('page_cursor'),
+    )
 
 
 def post_dag_run():
@@ -19,6 +19,7 @@
 from sqlalchemy import func
 
 from airflow.api_connexion.exceptions import NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.event_log_schema import (
     EventLogCollection, event_log_collection_schema, event_log_schema,
@@ -42,12 +43,15 @@ def get_event_log(event_log_id, session):
     'limit': check_limit
 })
 @provide_session
-def get_event_logs(session, limit, offset=None):
+def get_event_logs(session, limit, offset=None, cursor=None):
     """
     Get all log entries from event log
     """
 
     total_entries = session.query(func.count(Log.id)).scalar()
-    event_logs = session.query(Log).order_by(Log.id).offset(offset).limit(limit).all()
-    return event_log_collection_schema.dump(EventLogCollection(event_logs=event_logs,
-                                                               total_entries=total_entries))
+    event_logs, next_cursor = paginate(session.query(Log), [Log.id], limit, offset, cursor)
+    return add_next_cursor(
+        event_log_collection_schema.dump(EventLogCollection(event_logs=event_logs,
+                                                            total_entries=total_entries)),
+        next_cursor,
+    )
@@ -18,6 +18,7 @@
 from sqlalchemy import func
 
 from airflow.api_connexion.exceptions import NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.error_schema import (
     ImportErrorCollection, import_error_collection_schema, import_error_schema,
@@ -42,13 +43,16 @@ def get_import_error(import_error_id, session):
     'limit': check_limit
 })
 @provide_session
-def get_import_errors(session, limit, offset=None):
+def get_import_errors(session, limit, offset=None, cursor=None):
     """
     Get all import errors
     """
 
     total_entries = session.query(func.count(ImportError.id)).scalar()
-    import_errors = session.query(ImportError).order_by(ImportError.id).offset(offset).limit(limit).all()
-    return import_error_collection_schema.dump(
-        ImportErrorCollection(import_errors=import_errors, total_entries=total_entries)
+    import_errors, next_cursor = paginate(session.query(ImportError), [ImportError.id], limit, offset, cursor)
+    return add_next_cursor(
+        import_error_collection_schema.dump(
+            ImportErrorCollection(import_errors=import_errors, total_entries=total_entries)
+        ),
+        next_cursor,
     )
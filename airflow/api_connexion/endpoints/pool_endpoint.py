@@ -20,6 +20,7 @@ from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 
 from airflow.api_connexion.exceptions import AlreadyExists, BadRequest, NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.pool_schema import PoolCollection, pool_collection_schema, pool_schema
 from airflow.models.pool import Pool
@@ -54,15 +55,16 @@ def get_pool(pool_name, session):
     'limit': check_limit
 })
 @provide_session
-def get_pools(session, limit, offset=None):
+def get_pools(session, limit, offset=None, cursor=None):
     """
     Get all pools
     """
 
     total_entries = session.query(func.count(Pool.id)).scalar()
-    pools = session.query(Pool).order_by(Pool.id).offset(offset).limit(limit).all()
-    return pool_collection_schema.dump(
-        PoolCollection(pools=pools, total_entries=total_entries)
+    pools, next_cursor = paginate(session.query(Pool), [Pool.id], limit, offset, cursor)
+    return add_next_cursor(
+        pool_collection_schema.dump(PoolCollection(pools=pools, total_entries=total_entries)),
+        next_cursor,
     )
 
 
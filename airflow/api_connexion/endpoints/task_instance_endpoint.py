@@ -15,6 +15,21 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from flask import request
+from marshmallow import ValidationError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+from airflow.api_connexion.exceptions import BadRequest
+from airflow.api_connexion.pagination import add_next_cursor, paginate, stream_collection
+from airflow.api_connexion.parameters import check_limit, format_datetime, format_parameters
+from airflow.api_connexion.schemas.task_instance_schema import (
+    TASK_INSTANCE_FIELDS, TaskInstanceCollection, TaskInstanceSchema, task_instance_batch_form_schema,
+    task_instance_collection_schema,
+)
+from airflow.models import DagRun as DR, TaskInstance as TI
+from airflow.utils.session import provide_session
+
 # TODO(mik-laj): We have to implement it.
 #     Do you want to help? Please look at: https://github.com/apache/airflow/issues/8132
 
@@ -26,18 +41,146 @@ def get_task_instance():
     raise NotImplementedError("Not implemented yet.")
 
 
-def get_task_instances():
+# Unique sort key of the task instances, led by the columns of the ti_dag_date index
+TASK_INSTANCE_SORT_KEY = [TI.dag_id, TI.execution_date, TI.task_id]
+
+
+def _apply_task_instance_filters(
+    query,
+    execution_date_gte=None,
+    execution_date_lte=None,
+    start_date_gte=None,
+    start_date_lte=None,
+    end_date_gte=None,
+    end_date_lte=None,
+    duration_gte=None,
+    duration_lte=None,
+    state=None,
+    pool=None,
+    queue=None,
+):
+    for column, lower, upper in (
+        (TI.execution_date, execution_date_gte, execution_date_lte),
+        (TI.start_date, start_date_gte, start_date_lte),
+        (TI.end_date, end_date_gte, end_date_lte),
+        (TI.duration, duration_gte, duration_lte),
+    ):
+        if lower is not None:
+            query = query.filter(column >= lower)
+        if upper is not None:
+            query = query.filter(column <= upper)
+
+    if state:
+        states = [value for value in state if value != 'none']
+        condition = TI.state.in_(states)
+        if len(states) != len(state):
+            # Task instances without state are requested with "none"
+            condition = or_(condition, TI.state.is_(None))
+        query = query.filter(condition)
+    if pool:
+        query = query.filter(TI.pool.in_(pool))
+    if queue:
+        query = query.filter(TI.queue.in_(queue))
+    return query
+
+
+@format_parameters({
+    'execution_date_gte': format_datetime,
+    'execution_date_lte': format_datetime,
+    'start_date_gte': format_datetime,
+    'start_date_lte': format_datetime,
+    'end_date_gte': format_datetime,
+    'end_date_lte': format_datetime,
+    'limit': check_limit,
+})
+@provide_session
+def get_task_instances(
+    session,
+    dag_id,
+    dag_run_id,
+    limit=None,
+    offset=None,
+    cursor=None,
+    **filters,
+):
     """
     Get list of task instances of DAG.
     """
-    raise NotImplementedError("Not implemented yet.")
+    query = session.query(TI)
+    #  This endpoint allows specifying ~ as the dag_id and dag_run_id to retrieve task
+    #  instances of all DAGs and DAG Runs.
+    if dag_id != '~':
+        query = query.filter(TI.dag_id == dag_id)
+    if dag_run_id != '~':
+        query = query.join(DR, and_(DR.dag_id == TI.dag_id, DR.execution_date == TI.execution_date))
+        query = query.filter(DR.run_id == dag_run_id)
+    query = _apply_task_instance_filters(query, **filters)
 
+    total_entries = query.order_by(None).count()
+    task_instances, next_cursor = paginate(query, TASK_INSTANCE_SORT_KEY, limit, offset, cursor)
+    return add_next_cursor(
+        task_instance_collection_schema.dump(
+            TaskInstanceCollection(task_instances=task_instances, total_entries=total_entries)
+        ),
+        next_cursor,
+    )
 
-def get_task_instances_batch():
+
+@provide_session
+def get_task_instances_batch(session):
     """
-    Get list of task instances.
+    Get list of task instances, streamed so that all of them can be read at once.
     """
-    raise NotImplementedError("Not implemented yet.")
+    try:
+        data = task_instance_batch_form_schema.load(request.get_json() or {})
+    except ValidationError as err:
+        raise BadRequest(detail=str(err.messages))
+
+    limit = data.pop('page_limit')
+    offset = data.pop('page_offset')
+    cursor = data.pop('page_cursor')
+    dag_ids = data.pop('dag_ids')
+    dag_run_ids = data.pop('dag_run_ids')
+    selected_fields = data.pop('selected_fields') or list(TASK_INSTANCE_FIELDS)
+    compact = data.pop('compact')
+
+    # Only load the selected columns, and the ones of the sort key
+    attributes = {TASK_INSTANCE_FIELDS[field] for field in selected_fields}
+    load_attributes = attributes | {column.key for column in TASK_INSTANCE_SORT_KEY}
+
+    def build_query(query_session):
+        query = query_session.query(TI).options(load_only(*sorted(load_attributes)))
+        if dag_ids:
+            query = query.filter(TI.dag_id.in_(dag_ids))
+        if dag_run_ids:
+            query = query.join(DR, and_(DR.dag_id == TI.dag_id, DR.execution_date == TI.execution_date))
+            query = query.filter(DR.run_id.in_(dag_run_ids))
+        return _apply_task_instance_filters(query, **data)
+
+    schema = TaskInstanceSchema(only=attributes)
+    if compact:
+        # Every task instance is a list of the values of the selected fields, in order
+        def dump(ti):
+            dumped = schema.dump(ti)
+            return [dumped[field] for field in selected_fields]
+
+        extra = {'fields': selected_fields}
+    else:
+        dump = schema.dump
+        extra = None
+
+    total_entries = build_query(session).count()
+    return stream_collection(
+        'task_instances',
+        build_query,
+        TASK_INSTANCE_SORT_KEY,
+        dump,
+        total_entries,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        extra=extra,
+    )
 
 
 def post_clear_task_instances():
@@ -21,6 +21,7 @@ from marshmallow import ValidationError
 from sqlalchemy import func
 
 from airflow.api_connexion.exceptions import BadRequest, NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.variable_schema import variable_collection_schema, variable_schema
 from airflow.models import Variable
@@ -51,21 +52,21 @@ def get_variable(variable_key: str) -> Response:
     'limit': check_limit
 })
 @provide_session
-def get_variables(session, limit: Optional[int], offset: Optional[int] = None) -> Response:
+def get_variables(
+    session, limit: Optional[int], offset: Optional[int] = None, cursor: Optional[str] = None
+) -> Response:
     """
     Get all variable values
     """
     total_entries = session.query(func.count(Variable.id)).scalar()
-    query = session.query(Variable).order_by(Variable.id)
-    if offset:
-        query = query.offset(offset)
-    if limit:
-        query = query.limit(limit)
-    variables = query.all()
-    return variable_collection_schema.dump({
-        "variables": variables,
-        "total_entries": total_entries,
-    })
+    variables, next_cursor = paginate(session.query(Variable), [Variable.id], limit or None, offset, cursor)
+    return add_next_cursor(
+        variable_collection_schema.dump({
+            "variables": variables,
+            "total_entries": total_entries,
+        }),
+        next_cursor,
+    )
 
 
 def patch_variable(variable_key: str, update_mask: Optional[List[str]] = None) -> Response:
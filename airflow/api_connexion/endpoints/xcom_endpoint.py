@@ -20,6 +20,7 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm.session import Session
 
 from airflow.api_connexion.exceptions import NotFound
+from airflow.api_connexion.pagination import add_next_cursor, paginate
 from airflow.api_connexion.parameters import check_limit, format_parameters
 from airflow.api_connexion.schemas.xcom_schema import (
     XComCollection, XComCollectionItemSchema, XComCollectionSchema, xcom_collection_item_schema,
@@ -39,7 +40,8 @@ def get_xcom_entries(
     task_id: str,
     session: Session,
     limit: Optional[int],
-    offset: Optional[int] = None
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> XComCollectionSchema:
     """
     Get all XCom values
@@ -55,12 +57,14 @@ def get_xcom_entries(
         query = query.filter(XCom.task_id == task_id)
     if dag_run_id != '~':
         query = query.filter(DR.run_id == dag_run_id)
-    query = query.order_by(
-        XCom.execution_date, XCom.task_id, XCom.dag_id, XCom.key
-    )
     total_entries = session.query(func.count(XCom.key)).scalar()
-    query = query.offset(offset).limit(limit)
-    return xcom_collection_schema.dump(XComCollection(xcom_entries=query.all(), total_entries=total_entries))
+    xcom_entries, next_cursor = paginate(
+        query, [XCom.execution_date, XCom.task_id, XCom.dag_id, XCom.key], limit, offset, cursor
+    )
+    return add_next_cursor(
+        xcom_collection_schema.dump(XComCollection(xcom_entries=xcom_entries, total_entries=total_entries)),
+        next_cursor,
+    )
 
 
 @provide_session
@@ -0,0 +1,201 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Keyset pagination of the collections of the REST API.
+
+Instead of skipping ``offset`` rows, a page starts right after the sort key of
+the last item of the previous page, passed back by the client as an opaque
+``cursor``. Reading any page costs the same as reading the first one, as long
+as the sort key is indexed.
+"""
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Response, stream_with_context
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
+
+from airflow.api_connexion.exceptions import BadRequest
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+
+# Number of rows fetched per query when streaming a collection
+STREAM_CHUNK_SIZE = 1000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encodes the sort key of the last item of a page into an opaque cursor"""
+    data = json.dumps([value.isoformat() if isinstance(value, datetime.datetime) else value
+                       for value in values])
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decodes a cursor into the sort key it holds, raising BadRequest when the
+    cursor was not issued for these columns.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise BadRequest("Invalid cursor", detail=f"The cursor {cursor!r} could not be decoded")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise BadRequest("Invalid cursor", detail=f"The cursor {cursor!r} does not match this collection")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and _is_datetime_column(column):
+            try:
+                value = timezone.parse(value)
+            except (TypeError, ValueError):
+                raise BadRequest("Invalid cursor", detail=f"The cursor {cursor!r} could not be decoded")
+        decoded.append(value)
+    return decoded
+
+
+def _is_datetime_column(column) -> bool:
+    try:
+        return issubclass(column.type.python_type, datetime.datetime)
+    except NotImplementedError:
+        return False
+
+
+def _get_sort_key(item, columns: Sequence[Any]) -> List[Any]:
+    return [getattr(item, column.key) for column in columns]
+
+
+def after_sort_key(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    Returns the condition selecting the rows sorting after the given sort key,
+    written without row values so that every database supports it.
+    """
+    return or_(*[
+        and_(*[previous == value for previous, value in zip(columns[:index], values[:index])],
+             column > values[index])
+        for index, column in enumerate(columns)
+    ])
+
+
+def paginate(
+    query: Query,
+    columns: Sequence[Any],
+    limit: Optional[int],
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns a page of a query sorted by the given unique sort key, and the
+    cursor of the next page, None on the last page.
+
+    :param query: query of the collection
+    :param columns: columns of a unique sort key of the collection
+    :param limit: maximum number of items of the page
+    :param offset: number of items to skip, only used without cursor
+    :param cursor: cursor returned with the previous page
+    """
+    query = query.order_by(*columns)
+    if cursor:
+        query = query.filter(after_sort_key(columns, decode_cursor(cursor, columns)))
+    elif offset:
+        query = query.offset(offset)
+    if limit is None:
+        return query.all(), None
+
+    # One more item tells whether there is a next page
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(_get_sort_key(items[-1], columns))
+
+
+def add_next_cursor(collection: Dict[str, Any], next_cursor: Optional[str]) -> Dict[str, Any]:
+    """Adds the cursor of the next page to a dumped collection, when there is one"""
+    if next_cursor is not None:
+        collection['next_cursor'] = next_cursor
+    return collection
+
+
+def stream_collection(
+    collection_name: str,
+    build_query: Callable[[Session], Query],
+    columns: Sequence[Any],
+    dump: Callable[[Any], Any],
+    total_entries: int,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Streams a collection as a JSON object, fetching it in chunks of
+    ``STREAM_CHUNK_SIZE`` rows with keyset pagination, so that the memory used
+    does not depend on the size of the collection.
+
+    :param collection_name: key of the list of items in the JSON object
+    :param build_query: callable building the query of the collection in a session
+    :param columns: columns of a unique sort key of the collection
+    :param dump: callable serializing an item
+    :param total_entries: number of items of the whole collection
+    :param limit: maximum number of items to return, all of them if None
+    :param offset: number of items to skip, only used without cursor
+    :param cursor: cursor returned with the previous page
+    :param extra: other keys of the JSON object
+    """
+    sort_key = decode_cursor(cursor, columns) if cursor else None
+
+    def generate() -> Iterator[str]:
+        yield '{{{}: ['.format(json.dumps(collection_name))
+        last_key = sort_key
+        remaining = limit
+        next_cursor = None
+        separator = ''
+        with create_session() as session:
+            while remaining is None or remaining > 0:
+                chunk_size = STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining)
+                query = build_query(session).order_by(*columns)
+                if last_key is not None:
+                    query = query.filter(after_sort_key(columns, last_key))
+                elif offset:
+                    query = query.offset(offset)
+                items = query.limit(chunk_size + 1).all()
+                has_more = len(items) > chunk_size
+                items = items[:chunk_size]
+                for item in items:
+                    yield separator + json.dumps(dump(item))
+                    separator = ','
+                if not has_more:
+                    break
+                last_key = _get_sort_key(items[-1], columns)
+                # Do not keep the rows already streamed in the identity map
+                session.expunge_all()
+                if remaining is not None:
+                    remaining -= len(items)
+                    if remaining == 0:
+                        next_cursor = encode_cursor(last_key)
+        yield '], "total_entries": {}'.format(total_entries)
+        if next_cursor is not None:
+            yield ', "next_cursor": {}'.format(json.dumps(next_cursor))
+        for key, value in (extra or {}).items():
+            yield ', {}: {}'.format(json.dumps(key), json.dumps(value))
+        yield '}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
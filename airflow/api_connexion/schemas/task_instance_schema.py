@@ -0,0 +1,106 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import List, NamedTuple
+
+from marshmallow import Schema, ValidationError, fields, validate, validates
+from marshmallow_sqlalchemy import SQLAlchemySchema, auto_field
+
+from airflow.models import TaskInstance
+
+
+class TaskInstanceSchema(SQLAlchemySchema):
+    """ Task instance schema """
+
+    class Meta:
+        """ Meta """
+        model = TaskInstance
+
+    task_id = auto_field()
+    dag_id = auto_field()
+    execution_date = auto_field()
+    start_date = auto_field()
+    end_date = auto_field()
+    duration = auto_field()
+    state = auto_field()
+    _try_number = auto_field(data_key="try_number")
+    max_tries = auto_field()
+    hostname = auto_field()
+    unixname = auto_field()
+    pool = auto_field()
+    pool_slots = auto_field()
+    queue = auto_field()
+    priority_weight = auto_field()
+    operator = auto_field()
+    queued_dttm = auto_field(data_key="queued_when")
+    pid = auto_field()
+    executor_config = fields.String()
+
+
+class TaskInstanceCollection(NamedTuple):
+    """ List of task instances with metadata """
+    task_instances: List[TaskInstance]
+    total_entries: int
+
+
+class TaskInstanceCollectionSchema(Schema):
+    """ Task instance collection schema """
+
+    task_instances = fields.List(fields.Nested(TaskInstanceSchema))
+    total_entries = fields.Int()
+
+
+# Names of the fields in the dumped task instances, mapped to the attributes holding them
+TASK_INSTANCE_FIELDS = {
+    field.data_key or name: name for name, field in TaskInstanceSchema().fields.items()
+}
+
+
+class TaskInstanceBatchFormSchema(Schema):
+    """ Schema to validate and deserialize the Form(request payload) submitted to TaskInstance Batch"""
+
+    page_offset = fields.Int(missing=0, validate=validate.Range(min=0))
+    page_limit = fields.Int(missing=None, validate=validate.Range(min=1))
+    page_cursor = fields.Str(missing=None)
+    dag_ids = fields.List(fields.Str(), missing=None)
+    dag_run_ids = fields.List(fields.Str(), missing=None)
+    execution_date_gte = fields.DateTime(missing=None)
+    execution_date_lte = fields.DateTime(missing=None)
+    start_date_gte = fields.DateTime(missing=None)
+    start_date_lte = fields.DateTime(missing=None)
+    end_date_gte = fields.DateTime(missing=None)
+    end_date_lte = fields.DateTime(missing=None)
+    duration_gte = fields.Float(missing=None)
+    duration_lte = fields.Float(missing=None)
+    state = fields.List(fields.Str(), missing=None)
+    pool = fields.List(fields.Str(), missing=None)
+    queue = fields.List(fields.Str(), missing=None)
+    selected_fields = fields.List(fields.Str(), missing=None, data_key='fields')
+    compact = fields.Bool(missing=False)
+
+    @validates('selected_fields')
+    def validate_selected_fields(self, value):
+        """ Validates that only fields of the task instances are selected """
+        unknown = sorted(set(value) - set(TASK_INSTANCE_FIELDS))
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+
+
+task_instance_schema = TaskInstanceSchema()
+task_instance_collection_schema = TaskInstanceCollectionSchema()
+task_instance_batch_form_schema = TaskInstanceBatchFormSchema()
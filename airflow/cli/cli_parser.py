@@ -30,7 +30,6 @@ from tabulate import tabulate_formats
 from airflow import settings
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
-from airflow.executors.executor_loader import ExecutorLoader
 from airflow.utils.cli import ColorMode
 from airflow.utils.helpers import partition
 from airflow.utils.module_loading import import_string
@@ -61,6 +60,9 @@ class DefaultHelpParser(argparse.ArgumentParser):
 
     def _check_value(self, action, value):
         """Override _check_value and check conditionally added command"""
+        # The executors import the models, which only the invoked command may need
+        from airflow.executors.executor_loader import ExecutorLoader
+
         executor = conf.get('core', 'EXECUTOR')
         if value == 'celery' and executor != ExecutorLoader.CELERY_EXECUTOR:
             message = f'celery subcommand works only with CeleryExecutor, your current executor: {executor}'
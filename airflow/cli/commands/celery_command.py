@@ -31,6 +31,7 @@ from lockfile.pidlockfile import read_pid_from_pidfile, remove_existing_pidfile
 from airflow import settings
 from airflow.configuration import conf
 from airflow.executors.celery_executor import app as celery_app
+from airflow.jobs.heartbeat_agent import start_heartbeat_agent
 from airflow.utils import cli as cli_utils
 from airflow.utils.cli import setup_locations, setup_logging
 from airflow.utils.serve_logs import serve_logs
@@ -152,6 +153,7 @@ def worker(args):
         )
         with ctx:
             sub_proc = _serve_logs(skip_serve_logs)
+            heartbeat_agent = start_heartbeat_agent()
             worker_instance.run(**options)
 
         stdout.close()
@@ -159,10 +161,13 @@ def worker(args):
     else:
         # Run Celery worker in the same process
         sub_proc = _serve_logs(skip_serve_logs)
+        heartbeat_agent = start_heartbeat_agent()
         worker_instance.run(**options)
 
     if sub_proc:
         sub_proc.terminate()
+    if heartbeat_agent:
+        heartbeat_agent.terminate()
 
 
 @cli_utils.action_logging
@@ -29,7 +29,4 @@ def sync_perm(args):
     appbuilder.sm.sync_roles()
     print('Updating permission on all DAG views')
     dags = DagBag().dags.values()
-    for dag in dags:
-        appbuilder.sm.sync_perm_for_dag(
-            dag.dag_id,
-            dag.access_control)
+    appbuilder.sm.sync_perms_for_dags({dag.dag_id: dag.access_control for dag in dags})
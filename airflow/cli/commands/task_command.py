@@ -21,9 +21,11 @@ import json
 import logging
 import os
 import textwrap
+import time
 from contextlib import redirect_stderr, redirect_stdout
-from typing import List
+from typing import List, Optional
 
+import psutil
 from tabulate import tabulate
 
 from airflow import settings
@@ -33,6 +35,7 @@ from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.local_task_job import LocalTaskJob
 from airflow.models import DagPickle, TaskInstance
 from airflow.models.dag import DAG
+from airflow.stats import Stats
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import SCHEDULER_QUEUED_DEPS
 from airflow.utils import cli as cli_utils
@@ -140,6 +143,49 @@ def _run_raw_task(args, ti):
     )
 
 
+def _get_serialized_dag(args) -> Optional[DAG]:
+    """
+    Returns the serialized DAG of the task to run, or None when the DAG file has to be
+    parsed instead: when the DAG is not serialized, or was serialized before the last
+    change of its file, or lacks the task or some of its dependencies.
+
+    Only the process supervising the task with ``--local`` uses it, the raw task
+    process it starts always parses the DAG file, as it needs the real operator.
+    """
+    from airflow.models.serialized_dag import SerializedDagModel
+
+    serialized_dag = SerializedDagModel.get(args.dag_id)
+    # A sub-DAG is serialized with its parent DAG
+    if serialized_dag is None or serialized_dag.dag_id != args.dag_id:
+        return None
+    try:
+        if os.path.getmtime(serialized_dag.fileloc) > serialized_dag.last_updated.timestamp():
+            return None
+    except OSError:
+        return None
+
+    dag = serialized_dag.dag
+    task = dag.task_dict.get(args.task_id)
+    if task is None or task.unloaded_deps:
+        return None
+    print(f'Loaded DAG {args.dag_id} from the serialized DAGs')
+    return dag
+
+
+def _raw_task_is_forked() -> bool:
+    """
+    Whether the raw task process is forked from the supervising process, and so runs
+    the DAG the supervising process loaded rather than parsing the DAG file again
+    """
+    from airflow.task.task_runner.standard_task_runner import CAN_FORK
+
+    return (
+        CAN_FORK
+        and conf.get('core', 'task_runner') == 'StandardTaskRunner'
+        and not conf.get('core', 'default_impersonation', fallback=None)
+    )
+
+
 @cli_utils.action_logging
 def task_run(args, dag=None):
     """Runs a single task instance"""
@@ -159,15 +205,29 @@ def task_run(args, dag=None):
     # behind multiple open sleeping connections while heartbeating, which could
     # easily exceed the database connection limit when
     # processing hundreds of simultaneous tasks.
-    settings.configure_orm(disable_connection_pool=True)
+    settings.configure_orm(disable_connection_pool=True, limit_host_connections=True)
 
     if dag and args.pickle:
         raise AirflowException("You cannot use the --pickle option when using DAG.cli() method.")
     elif args.pickle:
         print(f'Loading pickle id: {args.pickle}')
-        dag = get_dag_by_pickle(args.pickle)
+        with Stats.timer('task_run.dag_load.pickle'):
+            dag = get_dag_by_pickle(args.pickle)
     elif not dag:
-        dag = get_dag(args.subdir, args.dag_id)
+        # A forked raw task process runs the DAG parsed here, so the serialized DAG
+        # would not save the parse of the DAG file then
+        if (
+            args.local
+            and conf.getboolean('core', 'task_supervisor_use_serialized_dag', fallback=False)
+            and not _raw_task_is_forked()
+        ):
+            # Only time the serialized DAGs actually used
+            timer = Stats.timer('task_run.dag_load.serialized').start()
+            dag = _get_serialized_dag(args)
+            timer.stop(send=dag is not None)
+        if dag is None:
+            with Stats.timer('task_run.dag_load.file'):
+                dag = get_dag(args.subdir, args.dag_id)
     else:
         # Use DAG from parameter
         pass
@@ -180,6 +240,13 @@ def task_run(args, dag=None):
 
     print(f"Running {ti} on host {hostname}")
 
+    # Time from the start of the process, the fork of a raw task process or the start of
+    # the interpreter, until the task is ready to run
+    mode = 'local' if args.local else 'raw' if args.raw else 'executor'
+    Stats.timing(
+        f'task_run.startup_duration.{mode}', (time.time() - psutil.Process().create_time()) * 1000
+    )
+
     if args.interactive:
         _run_task_by_selected_method(args, dag, ti)
     else:
@@ -354,6 +421,7 @@ def task_test(args, dag=None):
     if args.env_vars:
         env_vars.update(args.env_vars)
         os.environ.update(env_vars)
+        conf.invalidate_snapshot()
 
     dag = dag or get_dag(args.subdir, args.dag_id)
 
@@ -35,6 +35,7 @@ from lockfile.pidlockfile import read_pid_from_pidfile
 from airflow import settings
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException, AirflowWebServerTimeout
+from airflow.stats import Stats, serve_metrics
 from airflow.utils import cli as cli_utils
 from airflow.utils.cli import setup_locations, setup_logging
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -77,7 +78,13 @@ class GunicornMonitor(LoggingMixin):
         bringing up new ones and killing old ones.
     :param reload_on_plugin_change: If set to True, Airflow will track files in plugins_follder directory.
         When it detects changes, then reload the gunicorn.
+    :param emit_worker_memory_metrics: Whether to report the memory used by the workers, and how much
+        of it is shared with the master. Only useful when the app is preloaded by the master.
     """
+
+    # Number of seconds between two reports of the memory used by the workers
+    WORKER_METRICS_INTERVAL = 30
+
     def __init__(
         self,
         gunicorn_master_pid: int,
@@ -85,7 +92,8 @@ class GunicornMonitor(LoggingMixin):
         master_timeout: int,
         worker_refresh_interval: int,
         worker_refresh_batch_size: int,
-        reload_on_plugin_change: bool
+        reload_on_plugin_change: bool,
+        emit_worker_memory_metrics: bool = False,
     ):
         super().__init__()
         self.gunicorn_master_proc = psutil.Process(gunicorn_master_pid)
@@ -94,12 +102,14 @@ class GunicornMonitor(LoggingMixin):
         self.worker_refresh_interval = worker_refresh_interval
         self.worker_refresh_batch_size = worker_refresh_batch_size
         self.reload_on_plugin_change = reload_on_plugin_change
+        self.emit_worker_memory_metrics = emit_worker_memory_metrics
 
         self._num_workers_running = 0
         self._num_ready_workers_running = 0
         self._last_refresh_time = time.time() if worker_refresh_interval > 0 else None
         self._last_plugin_state = self._generate_plugin_state() if reload_on_plugin_change else None
         self._restart_on_next_plugin_check = False
+        self._last_worker_metrics_time = 0.0
 
     def _generate_plugin_state(self) -> Dict[str, float]:
         """
@@ -214,6 +224,7 @@ class GunicornMonitor(LoggingMixin):
                 if not self.gunicorn_master_proc.is_running():
                     sys.exit(1)
                 self._check_workers()
+                self._emit_worker_metrics()
                 # Throttle loop
                 sleep(1)
 
@@ -226,6 +237,31 @@ class GunicornMonitor(LoggingMixin):
             finally:
                 sys.exit(1)
 
+    def _emit_worker_metrics(self) -> None:
+        """
+        Reports the total and the highest resident and unique memory of the workers.
+        The unique memory is the part that is not shared with the other processes,
+        which tells how much of the preloaded master is still shared copy-on-write.
+        """
+        if not self.emit_worker_memory_metrics:
+            return
+        if time.time() - self._last_worker_metrics_time < self.WORKER_METRICS_INTERVAL:
+            return
+        self._last_worker_metrics_time = time.time()
+
+        rss, uss = [], []
+        for worker in self.gunicorn_master_proc.children():
+            try:
+                memory = worker.memory_full_info()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            rss.append(memory.rss)
+            uss.append(memory.uss)
+        Stats.gauge('webserver.workers_rss', sum(rss))
+        Stats.gauge('webserver.workers_uss', sum(uss))
+        Stats.gauge('webserver.workers_max_rss', max(rss, default=0))
+        Stats.gauge('webserver.workers_max_uss', max(uss, default=0))
+
     def _check_workers(self) -> None:
         num_workers_running = self._get_num_workers_running()
         num_ready_workers_running = self._get_num_ready_workers_running()
@@ -309,6 +345,20 @@ class GunicornMonitor(LoggingMixin):
                 self._reload_gunicorn()
 
 
+def serve_webserver_metrics():
+    """
+    Serves the metrics of the webserver on ``[webserver] prometheus_port``, from
+    the process monitoring the gunicorn workers, when it is set and the metrics
+    are recorded for Prometheus.
+
+    :return: the server, or None
+    """
+    port = conf.get('webserver', 'prometheus_port', fallback='')
+    if not port:
+        return None
+    return serve_metrics(int(port))
+
+
 @cli_utils.action_logging
 def webserver(args):
     """Starts Airflow Webserver"""
@@ -321,6 +371,10 @@ def webserver(args):
                       conf.get('webserver', 'web_server_worker_timeout'))
     ssl_cert = args.ssl_cert or conf.get('webserver', 'web_server_ssl_cert')
     ssl_key = args.ssl_key or conf.get('webserver', 'web_server_ssl_key')
+    preload_app = conf.getboolean('webserver', 'preload_app', fallback=False)
+    if preload_app and not settings.STORE_SERIALIZED_DAGS:
+        raise AirflowException(
+            'The webserver can only be preloaded when [core] store_serialized_dags is enabled')
     if not ssl_cert and ssl_key:
         raise AirflowException(
             'An SSL certificate must also be provided for use with ' + ssl_key)
@@ -385,6 +439,10 @@ def webserver(args):
         if ssl_cert:
             run_args += ['--certfile', ssl_cert, '--keyfile', ssl_key]
 
+        if preload_app:
+            # Load the app and the DAGs once in the master, which the workers share copy-on-write
+            run_args += ['--preload']
+
         run_args += ["airflow.www.app:cached_app()"]
 
         gunicorn_master_proc = None
@@ -400,16 +458,27 @@ def webserver(args):
             signal.signal(signal.SIGINT, kill_proc)
             signal.signal(signal.SIGTERM, kill_proc)
 
+            # Served from this process only, as the registry of a worker only holds its own metrics
+            serve_webserver_metrics()
+
+            # The workers of a preloaded webserver refresh their DAGs in place. Restarted workers
+            # would be forked from the same master, so they are not restarted periodically.
+            if preload_app:
+                worker_refresh_interval = 0
+            else:
+                worker_refresh_interval = conf.getint('webserver', 'worker_refresh_interval', fallback=30)
+
             # These run forever until SIG{INT, TERM, KILL, ...} signal is sent
             GunicornMonitor(
                 gunicorn_master_pid=gunicorn_master_pid,
                 num_workers_expected=num_workers,
                 master_timeout=conf.getint('webserver', 'web_server_master_timeout'),
-                worker_refresh_interval=conf.getint('webserver', 'worker_refresh_interval', fallback=30),
+                worker_refresh_interval=worker_refresh_interval,
                 worker_refresh_batch_size=conf.getint('webserver', 'worker_refresh_batch_size', fallback=1),
                 reload_on_plugin_change=conf.getboolean(
                     'webserver', 'reload_on_plugin_change', fallback=False
                 ),
+                emit_worker_memory_metrics=preload_app,
             ).start()
 
         if args.daemon:
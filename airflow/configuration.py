@@ -30,7 +30,7 @@ from base64 import b64encode
 from collections import OrderedDict
 # Ignored Mypy on configparser because it thinks the configparser module has no _UNSET attribute
 from configparser import _UNSET, ConfigParser, NoOptionError, NoSectionError  # type: ignore
-from typing import Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import yaml
 from cryptography.fernet import Fernet
@@ -40,6 +40,9 @@ from airflow.utils.module_loading import import_string
 
 log = logging.getLogger(__name__)
 
+# Marks the options missing from the snapshot of the configuration
+_MISSING = object()
+
 # show Airflow's deprecation warnings
 if not sys.warnoptions:
     warnings.filterwarnings(
@@ -181,6 +184,11 @@ class AirflowConfigParser(ConfigParser):
         return optionstr
 
     def __init__(self, default_config=None, *args, **kwargs):
+        # Resolved values of the options, keyed by section and key, when in snapshot mode
+        self._snapshot: Optional[Dict[Tuple[str, str], Any]] = None
+        # Converted values of the options, keyed by section, key and converter
+        self._converted_snapshot: Dict[Tuple[str, str, Callable], Any] = {}
+
         super().__init__(*args, **kwargs)
 
         self.airflow_defaults = ConfigParser(*args, **kwargs)
@@ -189,6 +197,37 @@ class AirflowConfigParser(ConfigParser):
 
         self.is_validated = False
 
+    @property
+    def snapshot_enabled(self) -> bool:
+        """Whether the resolved values of the options are memoized"""
+        return self._snapshot is not None
+
+    def enable_snapshot(self) -> None:
+        """
+        Memoizes the resolved and converted value of every option the first time
+        it is read, so that reading it again is a dict lookup instead of
+        checking the environment variables, the deprecated options, the config
+        file, the commands and the defaults.
+
+        Changes made through this parser invalidate the snapshot. Changes of the
+        ``AIRFLOW__<SECTION>__<KEY>`` environment variables do not: call
+        :meth:`invalidate_snapshot` after changing them.
+        """
+        if self._snapshot is None:
+            self._snapshot = {}
+            self._converted_snapshot = {}
+
+    def disable_snapshot(self) -> None:
+        """Resolves the options again on every read"""
+        self._snapshot = None
+        self._converted_snapshot = {}
+
+    def invalidate_snapshot(self) -> None:
+        """Drops the memoized values of the options, which are resolved again on the next read"""
+        if self._snapshot is not None:
+            self._snapshot = {}
+            self._converted_snapshot = {}
+
     def _validate(self):
 
         self._validate_config_dependencies()
@@ -282,6 +321,30 @@ class AirflowConfigParser(ConfigParser):
         section = str(section).lower()
         key = str(key).lower()
 
+        if self._snapshot is None or not kwargs.keys() <= {'fallback'}:
+            return self._get_option(section, key, **kwargs)
+
+        value = self._snapshot.get((section, key), _MISSING)
+        if value is _MISSING and (section, key) not in self._snapshot:
+            try:
+                # Resolve the option without fallback, so that the fallback of
+                # this call is not memoized as the value of the option
+                value = self._get_option(section, key, fallback=_UNSET)
+            except (NoOptionError, NoSectionError):
+                value = _MISSING
+            self._snapshot[(section, key)] = value
+        if value is not _MISSING:
+            return value
+        if 'fallback' in kwargs:
+            if kwargs['fallback'] is _UNSET:
+                raise NoOptionError(key, section)
+            return expand_env_var(kwargs['fallback'])
+        log.warning("section/key [%s/%s] not found in config", section, key)
+        raise AirflowConfigException(
+            "section/key [{section}/{key}] not found "
+            "in config".format(section=section, key=key))
+
+    def _get_option(self, section, key, **kwargs):
         deprecated_section, deprecated_key = self.deprecated_options.get((section, key), (None, None))
 
         # first check environment variables
@@ -333,8 +396,25 @@ class AirflowConfigParser(ConfigParser):
                 "section/key [{section}/{key}] not found "
                 "in config".format(section=section, key=key))
 
-    def getboolean(self, section, key, **kwargs):
-        val = str(self.get(section, key, **kwargs)).lower().strip()
+    def _get_converted(self, section, key, converter, **kwargs):
+        """Returns the value of an option converted, memoized in snapshot mode"""
+        if self._snapshot is None or not kwargs.keys() <= {'fallback'}:
+            return converter(section, key, self.get(section, key, **kwargs))
+
+        cache_key = (str(section).lower(), str(key).lower(), converter)
+        try:
+            return self._converted_snapshot[cache_key]
+        except KeyError:
+            pass
+        value = converter(section, key, self.get(section, key, **kwargs))
+        # Only memoize the value of the option, not the fallback of this call
+        if self._snapshot.get(cache_key[:2], _MISSING) is not _MISSING:
+            self._converted_snapshot[cache_key] = value
+        return value
+
+    @staticmethod
+    def _to_boolean(section, key, val):
+        val = str(val).lower().strip()
         if '#' in val:
             val = val.split('#')[0].strip()
         if val in ('t', 'true', '1'):
@@ -347,9 +427,8 @@ class AirflowConfigParser(ConfigParser):
                 f'Current value: "{val}".'
             )
 
-    def getint(self, section, key, **kwargs):
-        val = self.get(section, key, **kwargs)
-
+    @staticmethod
+    def _to_int(section, key, val):
         try:
             return int(val)
         except ValueError:
@@ -358,9 +437,8 @@ class AirflowConfigParser(ConfigParser):
                 f'Current value: "{val}".'
             )
 
-    def getfloat(self, section, key, **kwargs):
-        val = self.get(section, key, **kwargs)
-
+    @staticmethod
+    def _to_float(section, key, val):
         try:
             return float(val)
         except ValueError:
@@ -369,6 +447,15 @@ class AirflowConfigParser(ConfigParser):
                 f'Current value: "{val}".'
             )
 
+    def getboolean(self, section, key, **kwargs):
+        return self._get_converted(section, key, self._to_boolean, **kwargs)
+
+    def getint(self, section, key, **kwargs):
+        return self._get_converted(section, key, self._to_int, **kwargs)
+
+    def getfloat(self, section, key, **kwargs):
+        return self._get_converted(section, key, self._to_float, **kwargs)
+
     def getimport(self, section, key, **kwargs):
         """
         Reads options, imports the full qualified name, and returns the object.
@@ -392,12 +479,21 @@ class AirflowConfigParser(ConfigParser):
 
     def read(self, filenames, **kwargs):
         super().read(filenames, **kwargs)
+        self.invalidate_snapshot()
         self._validate()
 
+    def read_file(self, f, source=None):
+        super().read_file(f, source)
+        self.invalidate_snapshot()
+
     def read_dict(self, *args, **kwargs):
         super().read_dict(*args, **kwargs)
         self._validate()
 
+    def set(self, section, option, value=None):
+        super().set(section, option, value)
+        self.invalidate_snapshot()
+
     def has_option(self, section, option):
         try:
             # Using self.get() to avoid reimplementing the priority order
@@ -419,6 +515,7 @@ class AirflowConfigParser(ConfigParser):
 
         if self.airflow_defaults.has_option(section, option) and remove_default:
             self.airflow_defaults.remove_option(section, option)
+        self.invalidate_snapshot()
 
     def getsection(self, section: str) -> Optional[Dict[str, Union[str, int, float, bool]]]:
         """
@@ -722,6 +819,9 @@ if not os.path.isfile(WEBSERVER_CONFIG):
 if conf.getboolean('core', 'unit_test_mode'):
     conf.load_test_config()
 
+if conf.getboolean('core', 'config_snapshot', fallback=False):
+    conf.enable_snapshot()
+
 
 # Historical convenience functions to access config entries
 def load_test_config():   # noqa: D103
@@ -17,10 +17,12 @@
 """
 Base executor - this is the base class for all the implemented executors.
 """
-from collections import OrderedDict
+import json
+from collections import Counter, OrderedDict, defaultdict
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance, TaskInstanceKeyType
 from airflow.stats import Stats
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -42,6 +44,11 @@ CommandType = List[str]
 # Tuple of: command, priority, queue name, SimpleTaskInstance
 QueuedTaskInstanceType = Tuple[CommandType, int, Optional[str], Union[SimpleTaskInstance, TaskInstance]]
 
+# Task that is sent to the executor as part of a batch.
+#
+# Tuple of: key, command, queue name, executor config
+BatchedTaskType = Tuple[TaskInstanceKeyType, CommandType, Optional[str], Any]
+
 # Event_buffer dict value type
 # Tuple of: state, info
 EventBufferValueType = Tuple[Optional[str], Any]
@@ -55,13 +62,39 @@ class BaseExecutor(LoggingMixin):
     :param parallelism: how many jobs should run at one time. Set to
         ``0`` for infinity
     """
+
+    # Executors that can run several task instances in one worker invocation
+    # should set this to True and override ``execute_batch_async``
+    supports_task_batching: bool = False
+
     def __init__(self, parallelism: int = PARALLELISM):
         super().__init__()
         self.parallelism: int = parallelism
+        self.task_batch_size: int = 1
+        if self.supports_task_batching:
+            self.task_batch_size = max(conf.getint('core', 'executor_task_batch_size', fallback=1), 1)
         self.queued_tasks: OrderedDict[TaskInstanceKeyType, QueuedTaskInstanceType] \
             = OrderedDict()
         self.running: Set[TaskInstanceKeyType] = set()
         self.event_buffer: Dict[TaskInstanceKeyType, EventBufferValueType] = {}
+        # queue and pool of each task instance known to this executor
+        self.task_queues: Dict[TaskInstanceKeyType, Optional[str]] = {}
+        self.task_pools: Dict[TaskInstanceKeyType, Optional[str]] = {}
+        self.queue_slots: Dict[str, int] = self._get_slots('executor_queue_slots', 'queue')
+        self.pool_slots: Dict[str, int] = self._get_slots('executor_pool_slots', 'pool')
+
+    @staticmethod
+    def _get_slots(option: str, kind: str) -> Dict[str, int]:
+        slots_option = conf.get('core', option, fallback=None)
+        if not slots_option:
+            return {}
+        try:
+            return {name: int(slots) for name, slots in json.loads(slots_option).items()}
+        except (ValueError, AttributeError):
+            raise AirflowConfigException(
+                "[core] {} must be a JSON object mapping {} names to a number of slots, "
+                "got: {}".format(option, kind, slots_option)
+            )
 
     def start(self):  # pragma: no cover
         """
@@ -77,6 +110,8 @@ class BaseExecutor(LoggingMixin):
         if simple_task_instance.key not in self.queued_tasks and simple_task_instance.key not in self.running:
             self.log.info("Adding to queue: %s", command)
             self.queued_tasks[simple_task_instance.key] = (command, priority, queue, simple_task_instance)
+            self.task_queues[simple_task_instance.key] = queue
+            self.task_pools[simple_task_instance.key] = simple_task_instance.pool
         else:
             self.log.error("could not queue task %s", simple_task_instance.key)
 
@@ -123,6 +158,79 @@ class BaseExecutor(LoggingMixin):
         """
         return task_instance.key in self.queued_tasks or task_instance.key in self.running
 
+    def waiting_tasks(self) -> Set[TaskInstanceKeyType]:
+        """
+        Returns the task instances waiting to be picked up by a worker. Executors
+        that hand tasks over to a broker should also return the tasks still waiting
+        in it.
+        """
+        return set(self.queued_tasks)
+
+    def queue_usage(self) -> Counter:
+        """
+        Returns the number of task instances picked up by a worker of this executor,
+        per queue.
+        """
+        return self._count_running(self.task_queues)
+
+    def queue_backlog(self) -> Counter:
+        """
+        Returns the number of task instances waiting to be picked up, per queue.
+        """
+        return self._count_waiting(self.task_queues)
+
+    def queue_open_slots(self, queue: Optional[str]) -> Optional[int]:
+        """
+        Returns how many more task instances of the given queue this executor can
+        accept: the slots of the queue in ``[core] executor_queue_slots``, minus
+        the task instances of the queue running and waiting to run.
+
+        :param queue: name of the queue
+        :return: the number of open slots, or None if the queue has no limit
+        """
+        if queue not in self.queue_slots:
+            return None
+        return self.queue_slots[queue] - self.queue_usage()[queue] - self.queue_backlog()[queue]
+
+    def pool_usage(self) -> Counter:
+        """
+        Returns the number of task instances picked up by a worker of this executor,
+        per pool.
+        """
+        return self._count_running(self.task_pools)
+
+    def pool_backlog(self) -> Counter:
+        """
+        Returns the number of task instances waiting to be picked up, per pool.
+        """
+        return self._count_waiting(self.task_pools)
+
+    def pool_open_slots(self, pool: Optional[str]) -> Optional[int]:
+        """
+        Returns how many more task instances of the given pool this executor can
+        accept: the slots of the pool in ``[core] executor_pool_slots``, minus
+        the task instances of the pool running and waiting to run.
+
+        :param pool: name of the pool
+        :return: the number of open slots, or None if the pool has no limit
+        """
+        if pool not in self.pool_slots:
+            return None
+        return self.pool_slots[pool] - self.pool_usage()[pool] - self.pool_backlog()[pool]
+
+    def _count_running(self, names: Dict[TaskInstanceKeyType, Optional[str]]) -> Counter:
+        waiting = self.waiting_tasks()
+        return Counter(names.get(key) for key in self.running if key not in waiting)
+
+    def _count_waiting(self, names: Dict[TaskInstanceKeyType, Optional[str]]) -> Counter:
+        return Counter(names.get(key) for key in self.waiting_tasks())
+
+    def _prune_task_queues(self) -> None:
+        for key in list(self.task_queues):
+            if key not in self.queued_tasks and key not in self.running:
+                del self.task_queues[key]
+                self.task_pools.pop(key, None)
+
     def sync(self) -> None:
         """
         Sync will get called periodically by the heartbeat method.
@@ -136,7 +244,9 @@ class BaseExecutor(LoggingMixin):
         if not self.parallelism:
             open_slots = len(self.queued_tasks)
         else:
-            open_slots = self.parallelism - len(self.running)
+            # When task batching is enabled every worker slot runs up to
+            # task_batch_size task instances
+            open_slots = self.parallelism * self.task_batch_size - len(self.running)
 
         num_running_tasks = len(self.running)
         num_queued_tasks = len(self.queued_tasks)
@@ -154,6 +264,18 @@ class BaseExecutor(LoggingMixin):
         # Calling child class sync method
         self.log.debug("Calling the %s sync method", self.__class__)
         self.sync()
+        self._prune_task_queues()
+
+        for kind, slots, names in (
+            ('queue', self.queue_slots, self.task_queues),
+            ('pool', self.pool_slots, self.task_pools),
+        ):
+            if not slots:
+                continue
+            usage, backlog = self._count_running(names), self._count_waiting(names)
+            for name, name_slots in slots.items():
+                Stats.gauge(f'executor.{kind}_open_slots.{name}', name_slots - usage[name] - backlog[name])
+                Stats.gauge(f'executor.{kind}_backlog.{name}', backlog[name])
 
     def order_queued_tasks_by_priority(self) -> List[Tuple[TaskInstanceKeyType, QueuedTaskInstanceType]]:
         """
@@ -173,15 +295,23 @@ class BaseExecutor(LoggingMixin):
         :param open_slots: Number of open slots
         """
         sorted_queue = self.order_queued_tasks_by_priority()
+        batches: Dict[Tuple[Optional[str], Optional[str]], List[BatchedTaskType]] = defaultdict(list)
 
         for _ in range(min((open_slots, len(self.queued_tasks)))):
-            key, (command, _, _, simple_ti) = sorted_queue.pop(0)
+            key, (command, _, queue, simple_ti) = sorted_queue.pop(0)
             self.queued_tasks.pop(key)
             self.running.add(key)
-            self.execute_async(key=key,
-                               command=command,
-                               queue=None,
-                               executor_config=simple_ti.executor_config)
+            if self.task_batch_size > 1:
+                batches[(queue, simple_ti.pool)].append((key, command, queue, simple_ti.executor_config))
+            else:
+                self.execute_async(key=key,
+                                   command=command,
+                                   queue=None,
+                                   executor_config=simple_ti.executor_config)
+
+        for tasks in batches.values():
+            for i in range(0, len(tasks), self.task_batch_size):
+                self.execute_batch_async(tasks[i:i + self.task_batch_size])
 
     def change_state(self, key: TaskInstanceKeyType, state: str, info=None) -> None:
         """
@@ -252,6 +382,17 @@ class BaseExecutor(LoggingMixin):
         """
         raise NotImplementedError()
 
+    def execute_batch_async(self, tasks: List[BatchedTaskType]) -> None:
+        """
+        This method will execute a batch of task instances sharing the same
+        queue and pool asynchronously, in one worker invocation if the executor
+        supports it. By default each task is sent to ``execute_async``.
+
+        :param tasks: list of tuples of key, command, queue and executor config
+        """
+        for key, command, queue, executor_config in tasks:
+            self.execute_async(key=key, command=command, queue=queue, executor_config=executor_config)
+
     def end(self) -> None:  # pragma: no cover
         """
         This method is called when the caller is done submitting job and
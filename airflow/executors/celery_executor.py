@@ -258,6 +258,15 @@ class CeleryExecutor(BaseExecutor):
         except Exception:  # pylint: disable=broad-except
             self.log.exception("Error syncing the Celery executor, ignoring it.")
 
+    def waiting_tasks(self) -> Set[TaskInstanceKeyType]:
+        """
+        Returns the task instances waiting to be picked up, including the tasks
+        sent to Celery but not started by a worker yet.
+        """
+        waiting = super().waiting_tasks()
+        waiting.update(key for key, state in self.last_state.items() if state == celery_states.PENDING)
+        return waiting
+
     def end(self, synchronous: bool = False) -> None:
         if synchronous:
             while any([task.state not in celery_states.READY_STATES for task in self.tasks.values()]):
@@ -26,8 +26,9 @@ import datetime
 import json
 import multiprocessing
 import time
+import zlib
 from queue import Empty, Queue  # pylint: disable=unused-import
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, MutableMapping, Optional, Set, Tuple, Union
 
 import kubernetes
 from dateutil import parser
@@ -47,12 +48,17 @@ from airflow.kubernetes.pod_launcher import PodLauncher
 from airflow.kubernetes.worker_configuration import WorkerConfiguration
 from airflow.models import KubeResourceVersion, KubeWorkerIdentifier, TaskInstance
 from airflow.models.taskinstance import TaskInstanceKeyType
+from airflow.stats import Stats
+from airflow.utils import timezone
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import create_session, provide_session
 from airflow.utils.state import State
 
 MAX_LABEL_LEN = 63
 
+# Label used to assign worker pods to one of the KubernetesJobWatcher shards
+WATCHER_SHARD_LABEL = 'airflow-watcher-shard'
+
 # TaskInstance key, command, configuration
 KubernetesJobType = Tuple[TaskInstanceKeyType, CommandType, Any]
 
@@ -107,6 +113,8 @@ class KubeConfig:  # pylint: disable=too-many-instance-attributes
             self.kubernetes_section, 'delete_worker_pods_on_failure')
         self.worker_pods_creation_batch_size = conf.getint(
             self.kubernetes_section, 'worker_pods_creation_batch_size')
+        self.worker_pods_watcher_shards = conf.getint(
+            self.kubernetes_section, 'worker_pods_watcher_shards', fallback=1)
         self.worker_service_account_name = conf.get(
             self.kubernetes_section, 'worker_service_account_name')
         self.image_pull_secrets = conf.get(self.kubernetes_section, 'image_pull_secrets')
@@ -281,21 +289,47 @@ class KubeConfig:  # pylint: disable=too-many-instance-attributes
                 'or `git_ssh_key_secret_name` must be set for authentication '
                 'through ssh key, but not both')
         # pylint: enable=too-many-boolean-expressions
+        if self.worker_pods_watcher_shards < 1:
+            raise AirflowConfigException(
+                'In kubernetes mode `worker_pods_watcher_shards` must be a positive integer')
+
+
+def get_watcher_shard(dag_id: str, task_id: str, num_shards: int) -> int:
+    """
+    Returns the watcher shard responsible for the pods of the given task.
+    The assignment is stable across processes and scheduler restarts.
+
+    :param dag_id: the DAG id
+    :param task_id: the task id
+    :param num_shards: total number of watcher shards
+    :return: the shard number, between ``0`` and ``num_shards - 1``
+    """
+    return zlib.crc32('{}.{}'.format(dag_id, task_id).encode('utf-8')) % num_shards
 
 
 class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
-    """Watches for Kubernetes jobs"""
+    """
+    Watches for Kubernetes jobs
+
+    When ``shard`` is set, only the pods labelled with that watcher shard are watched.
+    The last seen resource version is published to ``resource_versions`` so that
+    a replacement watcher can resume from it instead of starting from scratch.
+    """
 
     def __init__(self,
                  watcher_queue: 'Queue[KubernetesWatchType]',
                  resource_version: Optional[str],
                  worker_uuid: Optional[str],
-                 kube_config: Configuration):
+                 kube_config: Configuration,
+                 shard: Optional[int] = None,
+                 resource_versions: Optional[MutableMapping[int, str]] = None):
         super().__init__()
         self.worker_uuid = worker_uuid
         self.watcher_queue = watcher_queue
         self.resource_version = resource_version
         self.kube_config = kube_config
+        self.shard = shard
+        self.resource_versions = resource_versions
 
     def run(self) -> None:
         """Performs watching"""
@@ -328,7 +362,10 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
         )
         watcher = watch.Watch()
 
-        kwargs = {'label_selector': 'airflow-worker={}'.format(worker_uuid)}
+        label_selector = 'airflow-worker={}'.format(worker_uuid)
+        if self.shard is not None:
+            label_selector += ',{}={}'.format(WATCHER_SHARD_LABEL, self.shard)
+        kwargs = {'label_selector': label_selector}
         if resource_version:
             kwargs['resource_version'] = resource_version
         if kube_config.kube_client_request_args:
@@ -342,8 +379,10 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
                 'Event: %s had an event of type %s',
                 task.metadata.name, event['type']
             )
+            Stats.incr('kubernetes_executor.watcher.events')
             if event['type'] == 'ERROR':
                 return self.process_error(event)
+            self._emit_event_lag(task)
             self.process_status(
                 pod_id=task.metadata.name,
                 namespace=task.metadata.namespace,
@@ -353,9 +392,32 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
                 event=event,
             )
             last_resource_version = task.metadata.resource_version
+            self._checkpoint_resource_version(last_resource_version)
 
         return last_resource_version
 
+    def _checkpoint_resource_version(self, resource_version: Optional[str]) -> None:
+        """Publishes the last seen resource version so a restarted watcher can resume from it"""
+        if resource_version and self.resource_versions is not None:
+            self.resource_versions[self.shard or 0] = resource_version
+
+    @staticmethod
+    def _emit_event_lag(pod: Any) -> None:
+        """
+        Emits the delay between the last container state change of the pod
+        and the moment the watcher received the event.
+        """
+        container_statuses = pod.status.container_statuses if pod.status else None
+        if not container_statuses:
+            return
+        finished_at = [
+            status.state.terminated.finished_at
+            for status in container_statuses
+            if status.state and status.state.terminated and status.state.terminated.finished_at
+        ]
+        if finished_at:
+            Stats.timing('kubernetes_executor.watcher.event_lag', timezone.utcnow() - max(finished_at))
+
     def process_error(self, event: Any) -> str:
         """Process error response"""
         self.log.error(
@@ -369,6 +431,7 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
                 (raw_object['message'],)
             )
             # Return resource version 0
+            self._checkpoint_resource_version('0')
             return '0'
         raise AirflowException(
             'Kubernetes failure for %s with code %s and message: %s' %
@@ -424,26 +487,41 @@ class AirflowKubernetesScheduler(LoggingMixin):
         self.worker_configuration_pod = WorkerConfiguration(kube_config=self.kube_config).as_pod()
         self._manager = multiprocessing.Manager()
         self.watcher_queue = self._manager.Queue()
+        self.watcher_resource_versions: MutableMapping[int, str] = self._manager.dict()
         self.worker_uuid = worker_uuid
-        self.kube_watcher = self._make_kube_watcher()
-
-    def _make_kube_watcher(self) -> KubernetesJobWatcher:
-        resource_version = KubeResourceVersion.get_current_resource_version()
+        self.num_watcher_shards = self.kube_config.worker_pods_watcher_shards
+        self.kube_watchers: List[KubernetesJobWatcher] = [
+            self._make_kube_watcher(shard) for shard in range(self.num_watcher_shards)
+        ]
+
+    def _make_kube_watcher(self, shard: int = 0) -> KubernetesJobWatcher:
+        resource_version = self.watcher_resource_versions.get(shard)
+        if not resource_version:
+            resource_version = KubeResourceVersion.get_current_resource_version()
         watcher = KubernetesJobWatcher(watcher_queue=self.watcher_queue,
                                        resource_version=resource_version,
                                        worker_uuid=self.worker_uuid,
-                                       kube_config=self.kube_config)
+                                       kube_config=self.kube_config,
+                                       shard=shard if self.num_watcher_shards > 1 else None,
+                                       resource_versions=self.watcher_resource_versions)
         watcher.start()
         return watcher
 
+    @property
+    def kube_watcher(self) -> KubernetesJobWatcher:
+        """The watcher of the first shard, kept for backward compatibility"""
+        return self.kube_watchers[0]
+
     def _health_check_kube_watcher(self):
-        if self.kube_watcher.is_alive():
-            pass
-        else:
+        for shard, watcher in enumerate(self.kube_watchers):
+            if watcher.is_alive():
+                continue
             self.log.error(
-                'Error while health checking kube watcher process. '
-                'Process died for unknown reasons')
-            self.kube_watcher = self._make_kube_watcher()
+                'Error while health checking kube watcher process of shard %s. '
+                'Process died for unknown reasons, resuming from resource_version: %s',
+                shard, self.watcher_resource_versions.get(shard))
+            Stats.incr('kubernetes_executor.watcher.restarts')
+            self.kube_watchers[shard] = self._make_kube_watcher(shard)
 
     def run_next(self, next_job: KubernetesJobType) -> None:
         """
@@ -471,6 +549,9 @@ class AirflowKubernetesScheduler(LoggingMixin):
             kube_executor_config=kube_executor_config,
             worker_config=self.worker_configuration_pod
         )
+        if self.num_watcher_shards > 1:
+            pod.metadata.labels[WATCHER_SHARD_LABEL] = str(
+                get_watcher_shard(dag_id, task_id, self.num_watcher_shards))
         # Reconcile the pod generated by the Operator and the Pod
         # generated by the .cfg file
         self.log.debug("Kubernetes running for command %s", command)
@@ -501,6 +582,7 @@ class AirflowKubernetesScheduler(LoggingMixin):
 
         """
         self._health_check_kube_watcher()
+        Stats.gauge('kubernetes_executor.watcher_queue_size', self.watcher_queue.qsize())
         while True:
             try:
                 task = self.watcher_queue.get_nowait()
@@ -669,10 +751,12 @@ class AirflowKubernetesScheduler(LoggingMixin):
 
     def terminate(self) -> None:
         """Terminates the watcher."""
-        self.log.debug("Terminating kube_watcher...")
-        self.kube_watcher.terminate()
-        self.kube_watcher.join()
-        self.log.debug("kube_watcher=%s", self.kube_watcher)
+        self.log.debug("Terminating kube_watchers...")
+        for watcher in self.kube_watchers:
+            watcher.terminate()
+        for watcher in self.kube_watchers:
+            watcher.join()
+            self.log.debug("kube_watcher=%s", watcher)
         self.log.debug("Flushing watcher_queue...")
         self._flush_watcher_queue()
         # Queue should be empty...
@@ -720,28 +804,20 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
             'When executor started up, found %s queued task instances',
             len(queued_tasks)
         )
+        if not queued_tasks:
+            return
 
+        launched_pod_keys = self._get_launched_pod_keys()
         for task in queued_tasks:
             # noinspection PyProtectedMember
             # pylint: disable=protected-access
-            dict_string = (
-                "dag_id={},task_id={},execution_date={},airflow-worker={}".format(
-                    pod_generator.make_safe_label_value(task.dag_id),
-                    pod_generator.make_safe_label_value(task.task_id),
-                    AirflowKubernetesScheduler._datetime_to_label_safe_datestring(
-                        task.execution_date
-                    ),
-                    self.worker_uuid
-                )
+            pod_key = (
+                pod_generator.make_safe_label_value(task.dag_id),
+                pod_generator.make_safe_label_value(task.task_id),
+                AirflowKubernetesScheduler._datetime_to_label_safe_datestring(task.execution_date),
             )
             # pylint: enable=protected-access
-            kwargs = dict(label_selector=dict_string)
-            if self.kube_config.kube_client_request_args:
-                for key, value in self.kube_config.kube_client_request_args.items():
-                    kwargs[key] = value
-            pod_list = self.kube_client.list_namespaced_pod(
-                self.kube_config.kube_namespace, **kwargs)
-            if not pod_list.items:
+            if pod_key not in launched_pod_keys:
                 self.log.info(
                     'TaskInstance: %s found in queued state but was not launched, '
                     'rescheduling', task
@@ -752,6 +828,27 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
                     TaskInstance.execution_date == task.execution_date
                 ).update({TaskInstance.state: State.NONE})
 
+    def _get_launched_pod_keys(self) -> Set[Tuple[str, str, str]]:
+        """
+        Lists all the pods launched by this executor with a single label-filtered call
+        and returns their ``(dag_id, task_id, execution_date)`` labels.
+        """
+        if not self.kube_client:
+            raise AirflowException(NOT_STARTED_MESSAGE)
+        kwargs = dict(label_selector='airflow-worker={}'.format(self.worker_uuid))
+        if self.kube_config.kube_client_request_args:
+            for key, value in self.kube_config.kube_client_request_args.items():
+                kwargs[key] = value
+        pod_list = self.kube_client.list_namespaced_pod(self.kube_config.kube_namespace, **kwargs)
+        launched_pod_keys = set()
+        for pod in pod_list.items:
+            labels = pod.metadata.labels or {}
+            try:
+                launched_pod_keys.add((labels['dag_id'], labels['task_id'], labels['execution_date']))
+            except KeyError:
+                self.log.debug('Ignoring pod %s with incomplete labels: %s', pod.metadata.name, labels)
+        return launched_pod_keys
+
     def _inject_secrets(self) -> None:
         def _create_or_update_secret(secret_name, secret_path):
             try:
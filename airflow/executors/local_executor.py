@@ -22,14 +22,19 @@ LocalExecutor
     For more information on how the LocalExecutor works, take a look at the guide:
     :ref:`executor:LocalExecutor`
 """
+import os
 import subprocess
 from multiprocessing import Manager, Process
 from multiprocessing.managers import SyncManager
 from queue import Empty, Queue  # pylint: disable=unused-import  # noqa: F401
-from typing import Any, List, Optional, Tuple, Union  # pylint: disable=unused-import # noqa: F401
+from typing import Any, Dict, List, Optional, Tuple, Union  # pylint: disable=unused-import # noqa: F401
+
+from setproctitle import setproctitle  # pylint: disable=no-name-in-module
 
 from airflow.exceptions import AirflowException
-from airflow.executors.base_executor import NOT_STARTED_MESSAGE, PARALLELISM, BaseExecutor, CommandType
+from airflow.executors.base_executor import (
+    NOT_STARTED_MESSAGE, PARALLELISM, BaseExecutor, BatchedTaskType, CommandType,
+)
 from airflow.models.taskinstance import (  # pylint: disable=unused-import # noqa: F401
     TaskInstanceKeyType, TaskInstanceStateType,
 )
@@ -41,6 +46,9 @@ from airflow.utils.state import State
 # "Poison Pill" - worker seeing Poison Pill should take the pill and ... die instantly.
 ExecutorWorkType = Tuple[Optional[TaskInstanceKeyType], Optional[CommandType]]
 
+# A batch of work executed sequentially by one worker: list of Key and Command
+ExecutorBatchWorkType = List[Tuple[TaskInstanceKeyType, CommandType]]
+
 
 class LocalWorkerBase(Process, LoggingMixin):
     """
@@ -72,6 +80,79 @@ class LocalWorkerBase(Process, LoggingMixin):
             self.log.error("Failed to execute task %s.", str(e))
         self.result_queue.put((key, state))
 
+    def execute_batch(self, batch: ExecutorBatchWorkType) -> None:
+        """
+        Executes a batch of commands in this already running process and stores
+        the result state of each of them in the result queue.
+
+        Every command is run in a fork of this process instead of a new Python
+        interpreter, and the DAGs are only parsed once per batch.
+
+        :param batch: list of keys and commands to execute
+        """
+        from airflow.cli.cli_parser import get_parser
+
+        parser = get_parser()
+        dags: Dict[Tuple[str, str], Any] = {}
+        for key, command in batch:
+            self.log.info(
+                "%s running %s as part of a batch of %d", self.__class__.__name__, command, len(batch)
+            )
+            # [1:] - remove "airflow" from the start of the command
+            args = parser.parse_args(command[1:])
+            dag = None
+            if not args.pickle:
+                dag = self._get_batch_dag(dags, args.subdir, args.dag_id)
+            self.result_queue.put((key, self._execute_work_in_fork(args, dag)))
+
+    def _get_batch_dag(self, dags: Dict[Tuple[str, str], Any], subdir: str, dag_id: str) -> Any:
+        from airflow.utils.cli import get_dag
+
+        if (subdir, dag_id) not in dags:
+            try:
+                dags[(subdir, dag_id)] = get_dag(subdir, dag_id)
+            except Exception:  # pylint: disable=broad-except
+                # Let the task command fail and report it by itself
+                self.log.exception("Failed to load DAG %s, it will be loaded by the task command", dag_id)
+                dags[(subdir, dag_id)] = None
+        return dags[(subdir, dag_id)]
+
+    def _execute_work_in_fork(self, args: Any, dag: Any) -> str:
+        pid = os.fork()
+        if pid:
+            # In parent, wait for the child
+            _, ret = os.waitpid(pid, 0)
+            return State.SUCCESS if ret == 0 else State.FAILED
+
+        import signal
+
+        from airflow import settings
+        from airflow.sentry import Sentry
+
+        return_code = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+            # Force a new SQLAlchemy session. We can't share open DB handles
+            # between process. The cli code will re-create this as part of its
+            # normal startup
+            settings.engine.pool.dispose()
+            settings.engine.dispose()
+
+            setproctitle("airflow task supervisor: {0.dag_id} {0.task_id} {0.execution_date}".format(args))
+            if dag:
+                args.func(args, dag=dag)
+            else:
+                args.func(args)
+            return_code = 0
+        except Exception as e:  # pylint: disable=broad-except
+            self.log.error("Failed to execute task %s.", str(e))
+        finally:
+            # Explicitly flush any pending exception to Sentry if enabled
+            Sentry.flush()
+            os._exit(return_code)  # pylint: disable=protected-access
+
 
 class LocalWorker(LocalWorkerBase):
     """
@@ -93,6 +174,23 @@ class LocalWorker(LocalWorkerBase):
         self.execute_work(key=self.key, command=self.command)
 
 
+class LocalBatchWorker(LocalWorkerBase):
+    """
+    Local worker that executes a batch of tasks sequentially.
+
+    :param result_queue: queue where results of the tasks are put.
+    :param batch: keys and commands to execute
+    """
+    def __init__(self,
+                 result_queue: 'Queue[TaskInstanceStateType]',
+                 batch: ExecutorBatchWorkType):
+        super().__init__(result_queue)
+        self.batch: ExecutorBatchWorkType = batch
+
+    def run(self) -> None:
+        self.execute_batch(self.batch)
+
+
 class QueuedLocalWorker(LocalWorkerBase):
     """
     LocalWorker implementation that is waiting for tasks from a queue and will
@@ -103,15 +201,19 @@ class QueuedLocalWorker(LocalWorkerBase):
     :param result_queue: queue where worker puts results after finishing tasks
     """
     def __init__(self,
-                 task_queue: 'Queue[ExecutorWorkType]',
+                 task_queue: 'Queue[Union[ExecutorWorkType, ExecutorBatchWorkType]]',
                  result_queue: 'Queue[TaskInstanceStateType]'):
         super().__init__(result_queue=result_queue)
         self.task_queue = task_queue
 
     def run(self) -> None:
         while True:
-            key, command = self.task_queue.get()
+            work = self.task_queue.get()
             try:
+                if isinstance(work, list):
+                    self.execute_batch(work)
+                    continue
+                key, command = work
                 if key is None or command is None:
                     # Received poison pill, no more tasks to run
                     break
@@ -128,6 +230,9 @@ class LocalExecutor(BaseExecutor):
 
     :param parallelism: how many parallel processes are run in the executor
     """
+
+    supports_task_batching = True
+
     def __init__(self, parallelism: int = PARALLELISM):
         super().__init__(parallelism=parallelism)
         self.manager: Optional[SyncManager] = None
@@ -135,6 +240,7 @@ class LocalExecutor(BaseExecutor):
         self.workers: List[QueuedLocalWorker] = []
         self.workers_used: int = 0
         self.workers_active: int = 0
+        self.heartbeat_agent: Optional[Process] = None
         self.impl: Optional[Union['LocalExecutor.UnlimitedParallelism',
                                   'LocalExecutor.LimitedParallelism']] = None
 
@@ -175,6 +281,19 @@ class LocalExecutor(BaseExecutor):
             self.executor.workers_active += 1
             local_worker.start()
 
+        def execute_batch_async(self, batch: ExecutorBatchWorkType) -> None:
+            """
+            Executes a batch of tasks asynchronously in one worker process.
+
+            :param batch: keys and commands to execute
+            """
+            if not self.executor.result_queue:
+                raise AirflowException(NOT_STARTED_MESSAGE)
+            local_worker = LocalBatchWorker(self.executor.result_queue, batch=batch)
+            self.executor.workers_used += 1
+            self.executor.workers_active += len(batch)
+            local_worker.start()
+
         # pylint: enable=unused-argument # pragma: no cover
         def sync(self) -> None:
             """
@@ -205,7 +324,7 @@ class LocalExecutor(BaseExecutor):
         """
         def __init__(self, executor: 'LocalExecutor'):
             self.executor: 'LocalExecutor' = executor
-            self.queue: Optional['Queue[ExecutorWorkType]'] = None
+            self.queue: Optional['Queue[Union[ExecutorWorkType, ExecutorBatchWorkType]]'] = None
 
         def start(self) -> None:
             """Starts limited parallelism implementation."""
@@ -244,6 +363,16 @@ class LocalExecutor(BaseExecutor):
                 raise AirflowException(NOT_STARTED_MESSAGE)
             self.queue.put((key, command))
 
+        def execute_batch_async(self, batch: ExecutorBatchWorkType) -> None:
+            """
+            Executes a batch of tasks asynchronously in one of the workers.
+
+            :param batch: keys and commands to execute
+            """
+            if not self.queue:
+                raise AirflowException(NOT_STARTED_MESSAGE)
+            self.queue.put(batch)
+
         def sync(self):
             """
             Sync will get called periodically by the heartbeat method.
@@ -269,6 +398,9 @@ class LocalExecutor(BaseExecutor):
 
     def start(self) -> None:
         """Starts the executor"""
+        from airflow.jobs.heartbeat_agent import start_heartbeat_agent
+
+        self.heartbeat_agent = start_heartbeat_agent()
         self.manager = Manager()
         self.result_queue = self.manager.Queue()
         self.workers = []
@@ -292,6 +424,19 @@ class LocalExecutor(BaseExecutor):
 
         self.impl.execute_async(key=key, command=command, queue=queue, executor_config=executor_config)
 
+    def execute_batch_async(self, tasks: List[BatchedTaskType]) -> None:
+        """Execute a batch of tasks asynchronously in a single worker."""
+        if not self.impl:
+            raise AirflowException(NOT_STARTED_MESSAGE)
+
+        batch: ExecutorBatchWorkType = []
+        for key, command, _, _ in tasks:
+            if command[0:3] != ["airflow", "tasks", "run"]:
+                raise ValueError('The command must start with ["airflow", "tasks", "run"].')
+            batch.append((key, command))
+
+        self.impl.execute_batch_async(batch)
+
     def sync(self) -> None:
         """
         Sync will get called periodically by the heartbeat method.
@@ -311,6 +456,8 @@ class LocalExecutor(BaseExecutor):
             raise AirflowException(NOT_STARTED_MESSAGE)
         self.impl.end()
         self.manager.shutdown()
+        if self.heartbeat_agent:
+            self.heartbeat_agent.terminate()
 
     def terminate(self):
         """Terminate the executor is not doing anything."""
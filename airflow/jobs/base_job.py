@@ -22,7 +22,7 @@ from time import sleep
 from typing import Optional
 
 from sqlalchemy import Column, Index, Integer, String, and_
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, TimeoutError as SQLAlchemyTimeoutError
 from sqlalchemy.orm.session import make_transient
 
 from airflow.configuration import conf
@@ -33,6 +33,7 @@ from airflow.models.dagrun import DagRun
 from airflow.models.taskinstance import TaskInstance
 from airflow.stats import Stats
 from airflow.utils import helpers, timezone
+from airflow.utils.connection_slots import max_slot_wait
 from airflow.utils.helpers import convert_camel_to_snake
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.net import get_hostname
@@ -180,42 +181,45 @@ class BaseJob(Base, LoggingMixin):
 
         previous_heartbeat = self.latest_heartbeat
 
-        try:
-            with create_session() as session:
-                # This will cause it to load from the db
-                session.merge(self)
-                previous_heartbeat = self.latest_heartbeat
-
-            if self.state == State.SHUTDOWN:
-                self.kill()
-
-            # Figure out how long to sleep for
-            sleep_for = 0
-            if self.latest_heartbeat:
-                seconds_remaining = self.heartrate - \
-                    (timezone.utcnow() - self.latest_heartbeat)\
-                    .total_seconds()
-                sleep_for = max(0, seconds_remaining)
-            sleep(sleep_for)
-
-            # Update last heartbeat time
-            with create_session() as session:
-                # Make the sesion aware of this object
-                session.merge(self)
-                self.latest_heartbeat = timezone.utcnow()
-                session.commit()
-                # At this point, the DB has updated.
-                previous_heartbeat = self.latest_heartbeat
-
-                self.heartbeat_callback(session=session)
-                self.log.debug('[heartbeat]')
-        except OperationalError:
-            Stats.incr(
-                convert_camel_to_snake(self.__class__.__name__) + '_heartbeat_failure', 1,
-                1)
-            self.log.exception("%s heartbeat got an exception", self.__class__.__name__)
-            # We didn't manage to heartbeat, so make sure that the timestamp isn't updated
-            self.latest_heartbeat = previous_heartbeat
+        # Don't wait longer than a heartbeat for a connection slot of the host, see
+        # [core] task_connection_slots, rather miss this heartbeat
+        with max_slot_wait(self.heartrate / 2):
+            try:
+                with create_session() as session:
+                    # This will cause it to load from the db
+                    session.merge(self)
+                    previous_heartbeat = self.latest_heartbeat
+
+                if self.state == State.SHUTDOWN:
+                    self.kill()
+
+                # Figure out how long to sleep for
+                sleep_for = 0
+                if self.latest_heartbeat:
+                    seconds_remaining = self.heartrate - \
+                        (timezone.utcnow() - self.latest_heartbeat)\
+                        .total_seconds()
+                    sleep_for = max(0, seconds_remaining)
+                sleep(sleep_for)
+
+                # Update last heartbeat time
+                with create_session() as session:
+                    # Make the sesion aware of this object
+                    session.merge(self)
+                    self.latest_heartbeat = timezone.utcnow()
+                    session.commit()
+                    # At this point, the DB has updated.
+                    previous_heartbeat = self.latest_heartbeat
+
+                    self.heartbeat_callback(session=session)
+                    self.log.debug('[heartbeat]')
+            except (OperationalError, SQLAlchemyTimeoutError):
+                Stats.incr(
+                    convert_camel_to_snake(self.__class__.__name__) + '_heartbeat_failure', 1,
+                    1)
+                self.log.exception("%s heartbeat got an exception", self.__class__.__name__)
+                # We didn't manage to heartbeat, so make sure that the timestamp isn't updated
+                self.latest_heartbeat = previous_heartbeat
 
     def run(self):
         """
@@ -0,0 +1,225 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Shared heartbeat for the LocalTaskJobs running on a host.
+
+Instead of every LocalTaskJob updating its own ``job`` row and refreshing its
+task instance from the database, each of them touches a file in a directory
+owned by a per-host :class:`HeartbeatAgent`. The agent heartbeats all the jobs
+that are alive in a single UPDATE, reads back the job and task instance states
+in a single SELECT, and writes them to a status file read by each job.
+"""
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from airflow.configuration import conf
+from airflow.jobs.base_job import BaseJob
+from airflow.models.taskinstance import TaskInstance
+from airflow.stats import Stats
+from airflow.utils import helpers, timezone
+from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.session import create_session
+
+# Environment variable holding the directory of the heartbeat agent of the host.
+# It is inherited by all the task processes started by the executor or worker.
+HEARTBEAT_AGENT_DIR_ENV = 'AIRFLOW_HEARTBEAT_AGENT_DIR'
+
+HEARTBEAT_FILE_SUFFIX = '.heartbeat'
+STATUS_FILE_SUFFIX = '.status'
+
+# Number of heartbeats a job may miss before the agent stops heartbeating it
+MISSED_HEARTBEATS_LIMIT = 3
+
+
+class HeartbeatAgentClient(LoggingMixin):
+    """
+    Used by a LocalTaskJob to heartbeat through the agent of the host.
+
+    :param directory: directory watched by the heartbeat agent
+    :type directory: str
+    :param job_id: id of the job heartbeating
+    :type job_id: int
+    """
+
+    def __init__(self, directory: str, job_id: int):
+        super().__init__()
+        self.heartbeat_path = os.path.join(directory, f"{job_id}{HEARTBEAT_FILE_SUFFIX}")
+        self.status_path = os.path.join(directory, f"{job_id}{STATUS_FILE_SUFFIX}")
+
+    @classmethod
+    def from_env(cls, job_id: int) -> Optional['HeartbeatAgentClient']:
+        """Returns a client if a heartbeat agent is running on this host, None otherwise"""
+        directory = os.environ.get(HEARTBEAT_AGENT_DIR_ENV)
+        if directory and os.path.isdir(directory):
+            return cls(directory, job_id)
+        return None
+
+    def beat(self) -> None:
+        """Signals the agent that the job is still alive"""
+        with open(self.heartbeat_path, 'a'):
+            os.utime(self.heartbeat_path, None)
+
+    def read_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the last status published by the agent for this job, or None if
+        the agent has not heartbeat it yet.
+        """
+        try:
+            with open(self.status_path) as status_file:
+                return json.load(status_file)
+        except (OSError, ValueError):
+            return None
+
+    def unregister(self) -> None:
+        """Stops heartbeating the job through the agent"""
+        for path in (self.heartbeat_path, self.status_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class HeartbeatAgent(LoggingMixin):
+    """
+    Heartbeats all the LocalTaskJobs running on this host with one multi-row
+    UPDATE per ``job_heartbeat_sec``, and publishes the state of their job and
+    task instance back to them.
+
+    :param directory: directory in which the jobs register their heartbeat files
+    :type directory: str
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.heartrate = conf.getfloat('scheduler', 'JOB_HEARTBEAT_SEC')
+        # The jobs touch their heartbeat file every heartrate, so that one that stops
+        # soon turns into a zombie for the scheduler
+        self.liveness_threshold = self.heartrate * MISSED_HEARTBEATS_LIMIT
+        self.max_tis_per_query = conf.getint('scheduler', 'max_tis_per_query')
+
+    def run(self) -> None:
+        """Heartbeats the jobs of the host until the process is terminated"""
+        self.log.info("Starting the heartbeat agent in %s", self.directory)
+        while True:
+            start = time.monotonic()
+            self.heartbeat()
+            time.sleep(max(0.0, self.heartrate - (time.monotonic() - start)))
+
+    def _alive_job_ids(self) -> List[int]:
+        job_ids = []
+        now = time.time()
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(HEARTBEAT_FILE_SUFFIX):
+                continue
+            try:
+                job_id = int(file_name[:-len(HEARTBEAT_FILE_SUFFIX)])
+            except ValueError:
+                # Not written by a job
+                continue
+            path = os.path.join(self.directory, file_name)
+            try:
+                last_beat = os.path.getmtime(path)
+            except OSError:
+                continue
+            if now - last_beat > self.liveness_threshold:
+                # The job process is gone without unregistering
+                HeartbeatAgentClient(self.directory, job_id).unregister()
+                continue
+            job_ids.append(job_id)
+        return job_ids
+
+    def heartbeat(self) -> None:
+        """Heartbeats all the jobs alive on the host and publishes their status"""
+        job_ids = self._alive_job_ids()
+        Stats.gauge('heartbeat_agent.jobs', len(job_ids))
+        if not job_ids:
+            return
+
+        try:
+            for chunk in helpers.chunks(job_ids, self.max_tis_per_query):
+                self._heartbeat_jobs(chunk)
+        except OperationalError:
+            Stats.incr('heartbeat_agent_heartbeat_failure', 1, 1)
+            self.log.exception("Heartbeat agent got an exception")
+
+    def _heartbeat_jobs(self, job_ids: List[int]) -> None:
+        with create_session() as session:
+            latest_heartbeat = timezone.utcnow()
+            session.query(BaseJob).filter(
+                BaseJob.id.in_(job_ids)
+            ).update({BaseJob.latest_heartbeat: latest_heartbeat}, synchronize_session=False)
+            session.commit()
+
+            rows = (
+                session
+                .query(BaseJob.id, BaseJob.state, TaskInstance.state, TaskInstance.hostname, TaskInstance.pid)
+                .outerjoin(TaskInstance, TaskInstance.job_id == BaseJob.id)
+                .filter(BaseJob.id.in_(job_ids))
+                .all()
+            )
+
+        for job_id, job_state, ti_state, hostname, pid in rows:
+            self._publish_status(job_id, {
+                'latest_heartbeat': latest_heartbeat.isoformat(),
+                'job_state': job_state,
+                'ti_state': ti_state,
+                'hostname': hostname,
+                'pid': pid,
+            })
+
+    def _publish_status(self, job_id: int, status: Dict[str, Any]) -> None:
+        status_path = os.path.join(self.directory, f"{job_id}{STATUS_FILE_SUFFIX}")
+        # Write then rename so that the job never reads a partial status
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, delete=False) as tmp_file:
+            json.dump(status, tmp_file)
+        os.replace(tmp_file.name, status_path)
+
+
+def _run_heartbeat_agent(directory: str) -> None:
+    # Process.terminate sends a SIGTERM, exit through the finally clause then
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        HeartbeatAgent(directory).run()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def start_heartbeat_agent() -> Optional[Process]:
+    """
+    Starts the heartbeat agent of this host in a sub-process when
+    ``[scheduler] shared_task_heartbeat`` is enabled. The task processes
+    started afterwards by this process heartbeat through it. The agent removes
+    its directory when it is terminated.
+    """
+    if not conf.getboolean('scheduler', 'shared_task_heartbeat', fallback=False):
+        return None
+    directory = tempfile.mkdtemp(prefix='airflow-heartbeat-')
+    os.environ[HEARTBEAT_AGENT_DIR_ENV] = directory
+    sub_proc = Process(target=_run_heartbeat_agent, args=(directory,), daemon=True)
+    sub_proc.start()
+    return sub_proc
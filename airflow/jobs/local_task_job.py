@@ -19,11 +19,13 @@
 
 import os
 import signal
+from time import sleep
 from typing import Optional
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.jobs.base_job import BaseJob
+from airflow.jobs.heartbeat_agent import HeartbeatAgentClient
 from airflow.models.taskinstance import TaskInstance
 from airflow.stats import Stats
 from airflow.task.task_runner import get_task_runner
@@ -63,6 +65,8 @@ class LocalTaskJob(BaseJob):
         self.pickle_id = pickle_id
         self.mark_success = mark_success
         self.task_runner = None
+        self.heartbeat_agent_client: Optional[HeartbeatAgentClient] = None
+        self._last_agent_heartbeat = None
 
         # terminating state is used so that a job don't try to
         # terminate multiple times
@@ -72,6 +76,9 @@ class LocalTaskJob(BaseJob):
 
     def _execute(self):
         self.task_runner = get_task_runner(self)
+        self.heartbeat_agent_client = HeartbeatAgentClient.from_env(self.id)
+        if self.heartbeat_agent_client:
+            self.log.info("Heartbeating through the heartbeat agent of the host")
 
         # pylint: disable=unused-argument
         def signal_handler(signum, frame):
@@ -121,6 +128,44 @@ class LocalTaskJob(BaseJob):
                                                    heartbeat_time_limit))
         finally:
             self.on_kill()
+            if self.heartbeat_agent_client:
+                self.heartbeat_agent_client.unregister()
+
+    def heartbeat(self, only_if_necessary: bool = False):
+        """
+        Heartbeats the job, through the heartbeat agent of the host if there
+        is one running, see :class:`~airflow.jobs.heartbeat_agent.HeartbeatAgent`.
+        """
+        if not self.heartbeat_agent_client:
+            super().heartbeat(only_if_necessary=only_if_necessary)
+            return
+
+        if self._last_agent_heartbeat:
+            seconds_remaining = self.heartrate - \
+                (timezone.utcnow() - self._last_agent_heartbeat).total_seconds()
+            if seconds_remaining > 0 and only_if_necessary:
+                return
+            sleep(max(0, seconds_remaining))
+        self._last_agent_heartbeat = timezone.utcnow()
+        self.heartbeat_agent_client.beat()
+
+        status = self.heartbeat_agent_client.read_status()
+        if not status:
+            # The agent has not heartbeat this job yet
+            return
+        self.latest_heartbeat = timezone.parse(status['latest_heartbeat'])
+
+        if status['job_state'] == State.SHUTDOWN:
+            self.kill()
+
+        task_instance_unchanged = (
+            status['ti_state'] == State.RUNNING and
+            status['hostname'] == get_hostname() and
+            status['pid'] == os.getpid()
+        )
+        # Only go to the database when the task instance has been changed externally
+        if self.terminating or not task_instance_unchanged:
+            self.heartbeat_callback()
 
     def on_kill(self):
         self.task_runner.terminate()
@@ -162,6 +207,8 @@ class LocalTaskJob(BaseJob):
                 "Taking the poison pill.",
                 ti.state
             )
+            if ti.state in (State.FAILED, State.SUCCESS):
+                self._load_task_callbacks()
             if ti.state == State.FAILED and ti.task.on_failure_callback:
                 context = ti.get_template_context()
                 ti.task.on_failure_callback(context)
@@ -170,3 +217,22 @@ class LocalTaskJob(BaseJob):
                 ti.task.on_success_callback(context)
             self.task_runner.terminate()
             self.terminating = True
+
+    def _load_task_callbacks(self):
+        """
+        Replaces a task loaded from the serialized DAGs, which has no callbacks, by the
+        task of the DAG file, so that its callbacks can be called.
+        """
+        from airflow.models.dagbag import DagBag
+        from airflow.serialization.serialized_objects import SerializedBaseOperator
+
+        task = self.task_instance.task
+        if not isinstance(task, SerializedBaseOperator):
+            return
+        dag = DagBag(dag_folder=task.dag.fileloc, include_examples=False).get_dag(task.dag_id)
+        if dag is not None and dag.has_task(task.task_id):
+            self.task_instance.task = dag.get_task(task.task_id)
+        else:
+            self.log.warning(
+                "Could not load task %s from file %s to call its callbacks", task.task_id, task.dag.fileloc
+            )
@@ -42,9 +42,10 @@ from airflow.executors.executor_loader import UNPICKLEABLE_EXECUTORS
 from airflow.jobs.base_job import BaseJob
 from airflow.models import DAG, DagModel, SlaMiss, errors
 from airflow.models.dagrun import DagRun
+from airflow.models.dagstatesummary import DagStateSummary
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstanceKeyType
 from airflow.operators.dummy_operator import DummyOperator
-from airflow.stats import Stats
+from airflow.stats import Stats, serve_metrics
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import SCHEDULED_DEPS
 from airflow.ti_deps.dependencies_states import EXECUTION_STATES
@@ -874,6 +875,10 @@ class DagFileProcessor(LoggingMixin):
 
         self._schedule_task_instances(dagbag, ti_keys_to_schedule, session)
 
+        if conf.getboolean('scheduler', 'maintain_dag_state_summary', fallback=False):
+            # Paused DAGs are shown on the home page as well
+            DagStateSummary.refresh(dagbag.dag_ids, session=session)
+
         # Record import errors into the ORM
         try:
             self.update_import_errors(session, dagbag)
@@ -1209,6 +1214,8 @@ class SchedulerJob(BaseJob):
         num_tasks_in_executor = 0
         # Number of tasks that cannot be scheduled because of no open slot in pool
         num_starving_tasks_total = 0
+        # Open slots of the executor queues, only for the queues with a limited capacity
+        executor_queue_open_slots: Dict[Optional[str], Optional[int]] = {}
 
         # Go through each pool, and queue up a task for execution if there are
         # any open slots in the pool.
@@ -1223,6 +1230,8 @@ class SchedulerJob(BaseJob):
                 continue
 
             open_slots = pools[pool].open_slots(session=session)
+            # Task instances of the pool the executor can still accept, None if it has no limit
+            executor_pool_open_slots = self.executor.pool_open_slots(pool)
 
             num_ready = len(task_instances)
             self.log.info(
@@ -1247,6 +1256,12 @@ class SchedulerJob(BaseJob):
                     num_starving_tasks_total += num_unhandled
                     break
 
+                if executor_pool_open_slots is not None and executor_pool_open_slots <= 0:
+                    self.log.info(
+                        "Not scheduling since there are no open slots for pool %s in the executor", pool
+                    )
+                    break
+
                 # Check to make sure that the task concurrency of the DAG hasn't been
                 # reached.
                 dag_id = task_instance.dag_id
@@ -1287,6 +1302,15 @@ class SchedulerJob(BaseJob):
                     num_tasks_in_executor += 1
                     continue
 
+                queue = task_instance.queue
+                if queue not in executor_queue_open_slots:
+                    executor_queue_open_slots[queue] = self.executor.queue_open_slots(queue)
+                queue_open_slots = executor_queue_open_slots[queue]
+                if queue_open_slots is not None and queue_open_slots <= 0:
+                    self.log.info("Not executing %s since there are no open slots "
+                                  "in the executor queue %s.", task_instance, queue)
+                    continue
+
                 if task_instance.pool_slots > open_slots:
                     self.log.info("Not executing %s since it requires %s slots "
                                   "but there are %s open slots in the pool %s.",
@@ -1298,6 +1322,10 @@ class SchedulerJob(BaseJob):
 
                 executable_tis.append(task_instance)
                 open_slots -= task_instance.pool_slots
+                if queue_open_slots is not None:
+                    executor_queue_open_slots[queue] = queue_open_slots - 1
+                if executor_pool_open_slots is not None:
+                    executor_pool_open_slots -= 1
                 dag_concurrency_map[dag_id] += 1
                 task_concurrency_map[(task_instance.dag_id, task_instance.task_id)] += 1
 
@@ -1558,6 +1586,7 @@ class SchedulerJob(BaseJob):
             async_mode=async_mode,
         )
 
+        metrics_server = None
         try:
             self.executor.start()
 
@@ -1569,6 +1598,9 @@ class SchedulerJob(BaseJob):
             # Start after resetting orphaned tasks to avoid stressing out DB.
             self.processor_agent.start()
 
+            # Start after the DAG processor manager so that it does not inherit the socket
+            metrics_server = serve_metrics(conf.getint('scheduler', 'prometheus_port'))
+
             execute_start_time = timezone.utcnow()
 
             self._run_scheduler_loop()
@@ -1593,6 +1625,9 @@ class SchedulerJob(BaseJob):
             self.log.exception("Exception when executing execute_helper")
         finally:
             self.processor_agent.end()
+            if metrics_server:
+                metrics_server.shutdown()
+                metrics_server.server_close()
             self.log.info("Exited execute loop")
 
     @staticmethod
@@ -0,0 +1,309 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+In-process registry of the metrics, exposed in the Prometheus text format.
+
+The stats sent through :class:`~airflow.stats.Stats` are recorded in the
+registry of the process as labeled counters, gauges and histograms: the
+dynamic parts of the known stat names, like the ``dag_id`` of
+``dagrun.duration.success.<dag_id>``, become labels of a single metric instead
+of being part of its name. The registry is served over HTTP by the scheduler,
+the DAG processor manager and the monitor of the webserver workers.
+"""
+import bisect
+import logging
+import math
+import re
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+# Upper bounds of the buckets of the histograms, in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, math.inf
+)
+
+# Value of a label once the metric reached the maximum number of values of the label
+OTHER_LABEL_VALUE = '__other__'
+
+# Counters that are also decremented, which are exposed as gauges
+UP_DOWN_COUNTERS = frozenset([
+    'dag_processing.processes',
+])
+
+# Stat names holding dynamic parts, turned into labels. The groups of the
+# pattern used in the name of the metric are not labels.
+LABELED_STATS: List[Tuple[Pattern, str]] = [(re.compile(pattern), name) for pattern, name in [
+    (r'^ti\.start\.(?P<dag_id>[^.]+)\.(?P<task_id>.+)$', 'ti.start'),
+    (r'^ti\.finish\.(?P<dag_id>[^.]+)\.(?P<task_id>.+)\.(?P<state>[^.]+)$', 'ti.finish'),
+    (r'^dag\.(?P<dag_id>[^.]+)\.(?P<task_id>.+)\.duration$', 'task.duration'),
+    (r'^dagrun\.duration\.(?P<state>[^.]+)\.(?P<dag_id>.+)$', 'dagrun.duration'),
+    (r'^dagrun\.dependency-check\.(?P<dag_id>.+)$', 'dagrun.dependency_check'),
+    (r'^dagrun\.schedule_delay\.(?P<dag_id>.+)$', 'dagrun.schedule_delay'),
+    (r'^task_removed_from_dag\.(?P<dag_id>.+)$', 'task_removed_from_dag'),
+    (r'^task_restored_to_dag\.(?P<dag_id>.+)$', 'task_restored_to_dag'),
+    (r'^task_instance_created-(?P<operator>.+)$', 'task_instance_created'),
+    (r'^operator_(?P<kind>failures|successes)_(?P<operator>.+)$', 'operator_{kind}'),
+    (r'^pool\.(?P<kind>open_slots|queued_slots|running_slots|starving_tasks)\.(?P<pool>.+)$', 'pool.{kind}'),
+    (r'^executor\.(?P<kind>queue_open_slots|queue_backlog)\.(?P<queue>.+)$', 'executor.{kind}'),
+    (r'^executor\.(?P<kind>pool_open_slots|pool_backlog)\.(?P<pool>.+)$', 'executor.{kind}'),
+    (r'^dag_processing\.(?P<kind>last_run\.seconds_ago|last_duration|last_runtime)\.(?P<file>.+)$',
+     'dag_processing.{kind}'),
+    (r'^dag\.loading-duration\.(?P<file>.+)$', 'dag.loading_duration'),
+]]
+
+_INVALID_NAME_CHARACTERS = re.compile(r'[^a-zA-Z0-9_:]')
+_INVALID_LABEL_CHARACTERS = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def sanitize_metric_name(name: str) -> str:
+    """Replaces the characters that are not allowed in the name of a metric"""
+    name = _INVALID_NAME_CHARACTERS.sub('_', name)
+    return '_' + name if name[:1].isdigit() else name
+
+
+def _sanitize_label_name(name: str) -> str:
+    name = _INVALID_LABEL_CHARACTERS.sub('_', name)
+    return '_' + name if name[:1].isdigit() else name
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def parse_stat(stat: str, tags: Optional[Iterable[str]] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Returns the name of the metric of a stat and its labels, taken from the
+    dynamic parts of the known stat names and from ``key:value`` tags.
+
+    :param stat: name of the stat
+    :param tags: DogStatsd-like tags of the stat
+    """
+    name, labels = stat, {}
+    for pattern, metric_name in LABELED_STATS:
+        match = pattern.match(stat)
+        if match:
+            groups = match.groupdict()
+            name = metric_name.format(**groups)
+            labels = {key: value for key, value in groups.items() if '{%s}' % key not in metric_name}
+            break
+    for tag in tags or ():
+        key, _, value = tag.partition(':')
+        labels[_sanitize_label_name(key)] = value
+    return name, labels
+
+
+class _Family:
+    """Metric with all its label values"""
+
+    def __init__(self, name: str, metric_type: str, buckets: Sequence[float]):
+        self.name = name
+        self.type = metric_type
+        self.buckets = buckets
+        # Label names and values of a series, sorted by name, to its value, or for a
+        # histogram to its bucket counts, sum and count
+        self.series: Dict[Tuple[Tuple[str, str], ...], list] = {}
+        self.label_values: Dict[str, set] = {}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labeled counters, gauges and histograms.
+
+    :param prefix: prefix of the names of the metrics
+    :param dropped_labels: labels removed from every metric, aggregating their
+        series, to limit the cardinality of the metrics
+    :param max_label_values: maximum number of values of a label of a metric,
+        the series of the other values are aggregated under ``__other__``
+    :param buckets: upper bounds of the buckets of the histograms, in seconds
+    """
+
+    def __init__(
+        self,
+        prefix: str = 'airflow',
+        dropped_labels: Iterable[str] = (),
+        max_label_values: int = 1000,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.prefix = sanitize_metric_name(prefix) + '_' if prefix else ''
+        self.dropped_labels: FrozenSet[str] = frozenset(dropped_labels)
+        self.max_label_values = max_label_values
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Removes all the metrics, e.g. in a process forked from another one"""
+        with self._lock:
+            self._families = {}
+
+    def _get_series(self, name: str, metric_type: str, labels: Dict[str, str]) -> Optional[list]:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _Family(name, metric_type, self.buckets)
+        elif family.type != metric_type:
+            log.warning("Metric %s is a %s, not recording it as a %s", name, family.type, metric_type)
+            return None
+
+        key = []
+        for label, value in sorted(labels.items()):
+            if label in self.dropped_labels:
+                continue
+            values = family.label_values.setdefault(label, set())
+            if value not in values:
+                if len(values) >= self.max_label_values:
+                    value = OTHER_LABEL_VALUE
+                else:
+                    values.add(value)
+            key.append((label, str(value)))
+        key = tuple(key)
+
+        series = family.series.get(key)
+        if series is None:
+            if metric_type == HISTOGRAM:
+                series = family.series[key] = [[0] * len(self.buckets), 0.0, 0]
+            else:
+                series = family.series[key] = [0.0]
+        return series
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """Increments a counter"""
+        if value < 0:
+            log.warning("Counter %s can not be decremented", name)
+            return
+        with self._lock:
+            series = self._get_series(name, COUNTER, labels or {})
+            if series is not None:
+                series[0] += value
+
+    def set(
+        self, name: str, value: float, labels: Optional[Dict[str, str]] = None, delta: bool = False
+    ) -> None:
+        """Sets a gauge, or changes it by the value when ``delta`` is True"""
+        with self._lock:
+            series = self._get_series(name, GAUGE, labels or {})
+            if series is not None:
+                series[0] = series[0] + value if delta else value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Records an observation of a histogram"""
+        with self._lock:
+            series = self._get_series(name, HISTOGRAM, labels or {})
+            if series is not None:
+                bucket_counts = series[0]
+                bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+                series[1] += value
+                series[2] += 1
+
+    def generate_latest(self) -> str:
+        """Returns all the metrics in the Prometheus text format"""
+        lines = []
+        with self._lock:
+            for family in sorted(self._families.values(), key=lambda family: family.name):
+                name = self.prefix + sanitize_metric_name(family.name)
+                if family.type == COUNTER:
+                    name += '_total'
+                elif family.type == HISTOGRAM:
+                    name += '_seconds'
+                lines.append(f'# TYPE {name} {family.type}')
+                for key, series in sorted(family.series.items()):
+                    if family.type != HISTOGRAM:
+                        lines.append(f'{name}{self._format_labels(key)} {_format_value(series[0])}')
+                        continue
+                    bucket_counts, total, count = series
+                    cumulative_count = 0
+                    for upper_bound, bucket_count in zip(family.buckets, bucket_counts):
+                        cumulative_count += bucket_count
+                        labels = self._format_labels(key + (('le', _format_value(upper_bound)),))
+                        lines.append(f'{name}_bucket{labels} {cumulative_count}')
+                    lines.append(f'{name}_sum{self._format_labels(key)} {_format_value(total)}')
+                    lines.append(f'{name}_count{self._format_labels(key)} {count}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @staticmethod
+    def _format_labels(key: Tuple[Tuple[str, str], ...]) -> str:
+        if not key:
+            return ''
+        return '{' + ','.join(f'{label}="{_escape_label_value(value)}"' for label, value in key) + '}'
+
+
+def timing_to_seconds(dt) -> float:
+    """Converts a timing sent to Stats, a timedelta or milliseconds, to seconds"""
+    if isinstance(dt, timedelta):
+        return dt.total_seconds()
+    return dt / 1000
+
+
+class _MetricsHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def _make_handler(registry: MetricsRegistry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serves the metrics of the registry on every path"""
+
+        def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+            output = registry.generate_latest().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(output)))
+            self.end_headers()
+            self.wfile.write(output)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            log.debug("Metrics server: " + format, *args)
+
+    return MetricsHandler
+
+
+def start_metrics_server(registry: MetricsRegistry, port: int, host: str = '') -> HTTPServer:
+    """
+    Serves the metrics of a registry over HTTP in a daemon thread.
+
+    :param registry: registry of the metrics to serve
+    :param port: port to listen on
+    :param host: address to listen on, all of them by default
+    :return: the server, to be shut down by the caller
+    """
+    server = _MetricsHTTPServer((host, port), _make_handler(registry))
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    log.info("Serving the metrics on port %s", port)
+    return server
@@ -0,0 +1,50 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add TI state and job_id index used to find zombies
+
+Revision ID: 2c6edca13270
+Revises: 8f966b9c467a
+Create Date: 2020-07-20 10:14:51.120745
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2c6edca13270'
+down_revision = '8f966b9c467a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply Add TI state and job_id index used to find zombies"""
+    # The index is partial on the databases supporting it, so that it only
+    # contains the running task instances
+    op.create_index(
+        'ti_state_job_id', 'task_instance', ['state', 'job_id'], unique=False,
+        postgresql_where=sa.text("state = 'running'"),
+        sqlite_where=sa.text("state = 'running'"),
+    )
+
+
+def downgrade():
+    """Unapply Add TI state and job_id index used to find zombies"""
+    op.drop_index('ti_state_job_id', table_name='task_instance')
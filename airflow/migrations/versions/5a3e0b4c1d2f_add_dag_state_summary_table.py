@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add dag_state_summary table
+
+Revision ID: 5a3e0b4c1d2f
+Revises: 2c6edca13270
+Create Date: 2020-07-22 09:41:07.318820
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from airflow.models.base import COLLATION_ARGS
+
+# revision identifiers, used by Alembic.
+revision = '5a3e0b4c1d2f'
+down_revision = '2c6edca13270'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply Add dag_state_summary table"""
+    op.create_table(
+        'dag_state_summary',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dag_id', sa.String(length=250, **COLLATION_ARGS), nullable=False),
+        sa.Column('category', sa.String(length=20), nullable=False),
+        sa.Column('state', sa.String(length=20), nullable=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_dag_state_summary_dag_id', 'dag_state_summary', ['dag_id', 'category'], unique=False
+    )
+
+
+def downgrade():
+    """Unapply Add dag_state_summary table"""
+    op.drop_index('idx_dag_state_summary_dag_id', table_name='dag_state_summary')
+    op.drop_table('dag_state_summary')
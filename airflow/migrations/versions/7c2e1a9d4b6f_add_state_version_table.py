@@ -0,0 +1,50 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add state_version table
+
+Revision ID: 7c2e1a9d4b6f
+Revises: b3d71c0f9a42
+Create Date: 2020-08-03 10:27:45.183560
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7c2e1a9d4b6f'
+down_revision = 'b3d71c0f9a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply Add state_version table"""
+    state_version = op.create_table(
+        'state_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(state_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade():
+    """Unapply Add state_version table"""
+    op.drop_table('state_version')
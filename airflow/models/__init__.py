@@ -15,27 +15,103 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-"""Airflow models"""
+"""
+Airflow models
+
+The models are imported on first access to their name, so that importing a
+single model, or a module needing none of them such as the parser of the CLI,
+does not import them all.
+"""
+import sys
+from importlib import import_module
+
 from airflow.models.base import ID_LEN, Base
-from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
-from airflow.models.connection import Connection
-from airflow.models.dag import DAG, DagModel, DagTag
-from airflow.models.dagbag import DagBag
-from airflow.models.dagpickle import DagPickle
-from airflow.models.dagrun import DagRun
-from airflow.models.errors import ImportError  # pylint: disable=redefined-builtin
-from airflow.models.log import Log
-from airflow.models.pool import Pool
-from airflow.models.renderedtifields import RenderedTaskInstanceFields
-from airflow.models.skipmixin import SkipMixin
-from airflow.models.slamiss import SlaMiss
-from airflow.models.taskfail import TaskFail
-from airflow.models.taskinstance import TaskInstance, clear_task_instances
-from airflow.models.taskreschedule import TaskReschedule
-from airflow.models.variable import Variable
-from airflow.models.xcom import XCOM_RETURN_KEY, XCom
-
-try:
+
+# Modules of the models, keyed by the names this package exports
+__lazy_imports = {
+    'BaseOperator': 'airflow.models.baseoperator',
+    'BaseOperatorLink': 'airflow.models.baseoperator',
+    'Connection': 'airflow.models.connection',
+    'DAG': 'airflow.models.dag',
+    'DagModel': 'airflow.models.dag',
+    'DagTag': 'airflow.models.dag',
+    'DagBag': 'airflow.models.dagbag',
+    'DagPickle': 'airflow.models.dagpickle',
+    'DagRun': 'airflow.models.dagrun',
+    'DagStateSummary': 'airflow.models.dagstatesummary',
+    'ImportError': 'airflow.models.errors',
+    'Log': 'airflow.models.log',
+    'Pool': 'airflow.models.pool',
+    'RenderedTaskInstanceFields': 'airflow.models.renderedtifields',
+    'SkipMixin': 'airflow.models.skipmixin',
+    'SlaMiss': 'airflow.models.slamiss',
+    'StateVersion': 'airflow.models.stateversion',
+    'TaskFail': 'airflow.models.taskfail',
+    'TaskInstance': 'airflow.models.taskinstance',
+    'clear_task_instances': 'airflow.models.taskinstance',
+    'TaskReschedule': 'airflow.models.taskreschedule',
+    'Variable': 'airflow.models.variable',
+    'XCOM_RETURN_KEY': 'airflow.models.xcom',
+    'XCom': 'airflow.models.xcom',
+    'KubeResourceVersion': 'airflow.models.kubernetes',
+    'KubeWorkerIdentifier': 'airflow.models.kubernetes',
+}
+
+__all__ = ['ID_LEN', 'Base', *__lazy_imports]
+
+
+def __getattr__(name):
+    # PEP-562: Lazy loaded attributes on python modules
+    path = __lazy_imports.get(name)
+    if path is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    value = getattr(import_module(path), name)
+    # Store the value, so that the next accesses do not go through this function
+    globals()[name] = value
+    return value
+
+
+def import_all_models():
+    """
+    Imports all the models, so that the metadata of ``Base`` knows all the
+    tables, e.g. to create or drop them.
+    """
+    for name in __lazy_imports:
+        __getattr__(name)
+    import_module('airflow.models.dagcode')
+    import_module('airflow.models.serialized_dag')
+    import_module('airflow.jobs.base_job')
+
+
+# This is never executed, but tricks static analyzers (PyDev, PyCharm,
+# pylint, etc.) into knowing the types of these symbols, and what
+# they contain.
+STATICA_HACK = True
+globals()['kcah_acitats'[::-1].upper()] = False
+if STATICA_HACK:  # pragma: no cover
+    from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
+    from airflow.models.connection import Connection
+    from airflow.models.dag import DAG, DagModel, DagTag
+    from airflow.models.dagbag import DagBag
+    from airflow.models.dagpickle import DagPickle
+    from airflow.models.dagrun import DagRun
+    from airflow.models.dagstatesummary import DagStateSummary
+    from airflow.models.errors import ImportError  # pylint: disable=redefined-builtin
     from airflow.models.kubernetes import KubeResourceVersion, KubeWorkerIdentifier
-except ImportError:
-    pass
+    from airflow.models.log import Log
+    from airflow.models.pool import Pool
+    from airflow.models.renderedtifields import RenderedTaskInstanceFields
+    from airflow.models.skipmixin import SkipMixin
+    from airflow.models.slamiss import SlaMiss
+    from airflow.models.stateversion import StateVersion
+    from airflow.models.taskfail import TaskFail
+    from airflow.models.taskinstance import TaskInstance, clear_task_instances
+    from airflow.models.taskreschedule import TaskReschedule
+    from airflow.models.variable import Variable
+    from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+
+
+if sys.version_info < (3, 7):
+    from pep562 import Pep562
+
+    Pep562(__name__)
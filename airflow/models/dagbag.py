@@ -25,7 +25,7 @@ import sys
 import textwrap
 import zipfile
 from datetime import datetime, timedelta
-from typing import List, NamedTuple
+from typing import Dict, List, NamedTuple
 
 from croniter import CroniterBadCronError, CroniterBadDateError, CroniterNotAlphaError, croniter
 from tabulate import tabulate
@@ -93,6 +93,8 @@ class DagBag(BaseDagBag, LoggingMixin):
         self.import_errors = {}
         self.has_logged = False
         self.store_serialized_dags = store_serialized_dags
+        # Hash of the serialized DAGs read from the DB, keyed by root dag_id
+        self.dags_hash: Dict[str, str] = {}
 
         self.collect_dags(
             dag_folder=dag_folder,
@@ -128,11 +130,7 @@ class DagBag(BaseDagBag, LoggingMixin):
                 row = SerializedDagModel.get(dag_id)
                 if not row:
                     return None
-
-                dag = row.dag
-                for subdag in dag.subdags:
-                    self.dags[subdag.dag_id] = subdag
-                self.dags[dag.dag_id] = dag
+                self._add_dag_from_db(row.dag, row.dag_hash)
 
             return self.dags.get(dag_id)
 
@@ -164,6 +162,58 @@ class DagBag(BaseDagBag, LoggingMixin):
                 del self.dags[dag_id]
         return self.dags.get(dag_id)
 
+    def _add_dag_from_db(self, dag, dag_hash):
+        """Adds a DAG read from the serialized_dag table, with its subdags"""
+        for subdag in dag.subdags:
+            self.dags[subdag.dag_id] = subdag
+        self.dags[dag.dag_id] = dag
+        self.dags_hash[dag.dag_id] = dag_hash
+
+    def _remove_dag_from_db(self, dag_id):
+        """Removes a DAG read from the serialized_dag table, with its subdags"""
+        dag = self.dags.pop(dag_id, None)
+        if dag is not None:
+            for subdag in dag.subdags:
+                self.dags.pop(subdag.dag_id, None)
+        self.dags_hash.pop(dag_id, None)
+
+    def collect_dags_from_db(self):
+        """Collects all the DAGs from the serialized_dag table"""
+        from airflow.models.serialized_dag import SerializedDagModel
+
+        self.log.info("Filling up the DagBag from the database")
+        with Stats.timer('collect_db_dags'):
+            for dag, dag_hash in SerializedDagModel.read_dags_with_hashes().values():
+                self._add_dag_from_db(dag, dag_hash)
+        Stats.gauge('dagbag_size', len(self.dags), 1)
+
+    def refresh_dags_from_db(self) -> int:
+        """
+        Refreshes in place the DAGs read from the serialized_dag table: the DAGs
+        whose hash changed are read again and the DAGs removed from the table
+        are dropped. Only the hashes are read when no DAG changed. DAGs that
+        were not read yet are left to :meth:`get_dag`.
+
+        :return: the number of DAGs read again or dropped
+        """
+        from airflow.models.serialized_dag import SerializedDagModel
+
+        dag_hashes = SerializedDagModel.get_dag_hashes()
+        removed = [dag_id for dag_id in self.dags_hash if dag_id not in dag_hashes]
+        changed = [
+            dag_id for dag_id, dag_hash in self.dags_hash.items()
+            if dag_id in dag_hashes and dag_hashes[dag_id] != dag_hash
+        ]
+        for dag_id in removed:
+            self._remove_dag_from_db(dag_id)
+        if changed:
+            for dag_id, (dag, dag_hash) in SerializedDagModel.read_dags_with_hashes(dag_ids=changed).items():
+                self._remove_dag_from_db(dag_id)
+                self._add_dag_from_db(dag, dag_hash)
+        if removed or changed:
+            self.log.info("Refreshed %d DAGs and removed %d DAGs", len(changed), len(removed))
+        return len(changed) + len(removed)
+
     def process_file(self, filepath, only_if_updated=True, safe_mode=True):
         """
         Given a path to a python module or zip file, this method imports
@@ -0,0 +1,183 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Per-DAG summary of the DAG run and task instance states"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Column, Index, Integer, String, func
+from sqlalchemy.orm import Session
+
+from airflow.models.base import COLLATION_ARGS, ID_LEN, Base
+from airflow.models.dag import DagModel
+from airflow.models.dagrun import DagRun
+from airflow.models.stateversion import StateVersion, is_tracking_state_changes
+from airflow.models.taskinstance import TaskInstance
+from airflow.utils.session import provide_session
+from airflow.utils.state import State
+
+
+class DagStateSummary(Base):
+    """
+    Number of DAG runs and task instances in each state, per DAG.
+
+    The scheduler refreshes the summary of the DAGs of a file every time it
+    processes the file, so that the home page reads the counts of all the DAGs
+    from this table instead of aggregating ``dag_run`` and ``task_instance``.
+    """
+
+    __tablename__ = "dag_state_summary"
+
+    # Count of the DAG runs per state
+    DAG_RUNS = 'dag_runs'
+    # Count of the task instances of the running DAG runs per state
+    RUNNING_RUN_TASKS = 'running_run_tasks'
+    # Count of the task instances of the most recent DAG run that is not running per state
+    LAST_RUN_TASKS = 'last_run_tasks'
+
+    id = Column(Integer, primary_key=True)
+    dag_id = Column(String(ID_LEN, **COLLATION_ARGS), nullable=False)
+    category = Column(String(20), nullable=False)
+    state = Column(String(20))
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_dag_state_summary_dag_id', dag_id, category),
+    )
+
+    def __init__(self, dag_id: str, category: str, state: Optional[str], count: int):
+        self.dag_id = dag_id
+        self.category = category
+        self.state = state
+        self.count = count
+
+    def __repr__(self):
+        return f'<DagStateSummary: {self.dag_id} {self.category} {self.state}={self.count}>'
+
+    @classmethod
+    @provide_session
+    def refresh(cls, dag_ids: Iterable[str], session: Session = None) -> None:
+        """
+        Recomputes the summary of the given DAGs. Every query is restricted
+        to these DAGs so that it only reads their runs and task instances.
+
+        :param dag_ids: ids of the DAGs to refresh
+        :param session: ORM Session
+        """
+        dag_ids = list(dag_ids)
+        if not dag_ids:
+            return
+
+        dag_run_counts = (
+            session.query(DagRun.dag_id, DagRun.state, func.count())
+            .filter(DagRun.dag_id.in_(dag_ids))
+            .group_by(DagRun.dag_id, DagRun.state)
+        )
+
+        running_run_task_counts = (
+            session.query(TaskInstance.dag_id, TaskInstance.state, func.count())
+            .join(DagRun, (DagRun.dag_id == TaskInstance.dag_id) &
+                  (DagRun.execution_date == TaskInstance.execution_date))
+            .filter(DagRun.dag_id.in_(dag_ids), DagRun.state == State.RUNNING)
+            .group_by(TaskInstance.dag_id, TaskInstance.state)
+        )
+
+        last_dag_run = (
+            session.query(DagRun.dag_id, func.max(DagRun.execution_date).label('execution_date'))
+            .filter(DagRun.dag_id.in_(dag_ids), DagRun.state != State.RUNNING)
+            .group_by(DagRun.dag_id)
+            .subquery('last_dag_run')
+        )
+        last_run_task_counts = (
+            session.query(TaskInstance.dag_id, TaskInstance.state, func.count())
+            .join(last_dag_run, (last_dag_run.c.dag_id == TaskInstance.dag_id) &
+                  (last_dag_run.c.execution_date == TaskInstance.execution_date))
+            .group_by(TaskInstance.dag_id, TaskInstance.state)
+        )
+
+        new_counts: Dict[str, Set[Tuple[str, Optional[str], int]]] = defaultdict(set)
+        for category, query in (
+            (cls.DAG_RUNS, dag_run_counts),
+            (cls.RUNNING_RUN_TASKS, running_run_task_counts),
+            (cls.LAST_RUN_TASKS, last_run_task_counts),
+        ):
+            for dag_id, state, count in query:
+                new_counts[dag_id].add((category, state, count))
+
+        current_counts: Dict[str, Set[Tuple[str, Optional[str], int]]] = defaultdict(set)
+        for dag_id, category, state, count in (
+            session.query(cls.dag_id, cls.category, cls.state, cls.count).filter(cls.dag_id.in_(dag_ids))
+        ):
+            current_counts[dag_id].add((category, state, count))
+
+        # Only rewrite the summary of the DAGs that changed, so that the version
+        # of the summary only moves when its content does
+        changed_dag_ids = [dag_id for dag_id in dag_ids if new_counts[dag_id] != current_counts[dag_id]]
+        if not changed_dag_ids:
+            return
+
+        session.query(cls).filter(cls.dag_id.in_(changed_dag_ids)).delete(synchronize_session=False)
+        session.bulk_save_objects([
+            cls(dag_id=dag_id, category=category, state=state, count=count)
+            for dag_id in changed_dag_ids
+            for category, state, count in new_counts[dag_id]
+        ])
+        if is_tracking_state_changes():
+            StateVersion.bump(session)
+        session.flush()
+
+    @classmethod
+    @provide_session
+    def get_version(cls, session: Session = None) -> int:
+        """
+        Returns the version of the whole summary, bumped every time the summary
+        of a DAG is rewritten while the state changes are tracked, see
+        :func:`~airflow.models.stateversion.track_state_changes`.
+
+        :param session: ORM Session
+        """
+        return StateVersion.get_version(session)
+
+    @classmethod
+    @provide_session
+    def get_counts(
+        cls,
+        categories: Iterable[str],
+        dag_ids: Optional[Iterable[str]] = None,
+        only_active: bool = False,
+        session: Session = None,
+    ) -> Dict[str, Dict[Optional[str], int]]:
+        """
+        Returns the number of DAG runs or task instances per DAG and state,
+        summed over the given categories.
+
+        :param categories: categories of the summary to sum
+        :param dag_ids: ids of the DAGs to return, all the DAGs if None
+        :param only_active: whether to only return the active DAGs
+        :param session: ORM Session
+        :return: a mapping of DAG id to a mapping of state to count
+        """
+        query = session.query(cls.dag_id, cls.state, cls.count).filter(cls.category.in_(list(categories)))
+        if dag_ids is not None:
+            query = query.filter(cls.dag_id.in_(list(dag_ids)))
+        if only_active:
+            query = query.join(DagModel, DagModel.dag_id == cls.dag_id).filter(DagModel.is_active)
+
+        counts: Dict[str, Dict[Optional[str], int]] = defaultdict(lambda: defaultdict(int))
+        for dag_id, state, count in query:
+            counts[dag_id][state] += count
+        return counts
@@ -18,9 +18,10 @@
 
 """Serialzed DAG table in database."""
 
+import hashlib
 import logging
 from datetime import timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import sqlalchemy_jsonfield
 from sqlalchemy import BigInteger, Column, Index, String, and_
@@ -64,6 +65,9 @@ class SerializedDagModel(Base):
     fileloc_hash = Column(BigInteger, nullable=False)
     data = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
     last_updated = Column(UtcDateTime, nullable=False)
+    # Hash of the serialized DAG, telling readers whether the DAG changed
+    # without reading it, as last_updated moves every time the DAG is written
+    dag_hash = Column(String(32), nullable=False)
 
     __table_args__ = (
         Index('idx_fileloc_hash', fileloc_hash, unique=False),
@@ -75,6 +79,7 @@ class SerializedDagModel(Base):
         self.fileloc_hash = DagCode.dag_fileloc_hash(self.fileloc)
         self.data = SerializedDAG.to_dict(dag)
         self.last_updated = timezone.utcnow()
+        self.dag_hash = hashlib.md5(json.dumps(self.data, sort_keys=True).encode("utf-8")).hexdigest()
 
     @classmethod
     @provide_session
@@ -106,7 +111,22 @@ class SerializedDagModel(Base):
         :param session: ORM Session
         :returns: a dict of DAGs read from database
         """
+        return {dag_id: dag for dag_id, (dag, _) in cls.read_dags_with_hashes(session=session).items()}
+
+    @classmethod
+    @provide_session
+    def read_dags_with_hashes(
+        cls, dag_ids: Optional[List[str]] = None, session=None
+    ) -> Dict[str, Tuple['SerializedDAG', str]]:
+        """Reads DAGs in serialized_dag table, along with their hash.
+
+        :param dag_ids: the DAGs to read, all of them if None
+        :param session: ORM Session
+        :returns: a dict of (DAG, hash) tuples read from database
+        """
         serialized_dags = session.query(cls)
+        if dag_ids is not None:
+            serialized_dags = serialized_dags.filter(cls.dag_id.in_(dag_ids))
 
         dags = {}
         for row in serialized_dags:
@@ -115,7 +135,7 @@ class SerializedDagModel(Base):
 
             # Sanity check.
             if dag.dag_id == row.dag_id:
-                dags[row.dag_id] = dag
+                dags[row.dag_id] = (dag, row.dag_hash)
             else:
                 log.warning(
                     "dag_id Mismatch in DB: Row with dag_id '%s' has Serialised DAG "
@@ -132,6 +152,16 @@ class SerializedDagModel(Base):
             dag = SerializedDAG.from_json(self.data)
         return dag
 
+    @classmethod
+    @provide_session
+    def get_dag_hashes(cls, session=None) -> Dict[str, str]:
+        """Returns the hash of every serialized DAG, without reading the DAGs.
+
+        :param session: ORM Session
+        :returns: a dict of DAG hashes keyed by dag_id
+        """
+        return dict(session.query(cls.dag_id, cls.dag_hash))
+
     @classmethod
     @provide_session
     def remove_dag(cls, dag_id: str, session=None):
@@ -0,0 +1,150 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Version of the tables polled by the webserver.
+
+The version is a single counter bumped in the transaction of every write to the
+tracked tables, so that the webserver can tell from it alone whether a response
+it computed from them is still valid. Keeping it costs a row lock and a query in
+every transaction writing to them, so the listeners bumping it are only
+registered when the response cache of the webserver is enabled.
+"""
+from itertools import chain
+from typing import Dict, FrozenSet
+
+from sqlalchemy import Column, Integer, event, inspect
+from sqlalchemy.orm import Session
+
+from airflow.configuration import conf
+from airflow.models.base import Base
+
+# Tables whose writes bump the version: the inserts and deletes of their rows, and
+# the updates of these columns
+TRACKED_TABLES: Dict[str, FrozenSet[str]] = {
+    'dag': frozenset({'is_active'}),
+    'dag_run': frozenset({'dag_id', 'execution_date'}),
+}
+
+# Key of ``Session.info`` telling that the version was bumped in the current transaction
+_BUMPED_KEY = 'airflow_state_version_bumped'
+
+
+class StateVersion(Base):
+    """
+    Single row holding the version of the tables polled by the webserver.
+
+    Unlike the number of rows or the highest id of a table, it never goes back
+    to a previous value. A single row is bumped whatever the table written to,
+    so that concurrent transactions always lock it in the same order.
+    """
+
+    __tablename__ = 'state_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    @classmethod
+    def bump(cls, session: Session) -> None:
+        """Bumps the version once per transaction of the session"""
+        if session.info.get(_BUMPED_KEY):
+            return
+        table = cls.__table__
+        result = session.execute(table.update().values(version=table.c.version + 1))
+        if not result.rowcount:
+            session.execute(table.insert().values(id=1, version=1))
+        session.info[_BUMPED_KEY] = True
+
+    @classmethod
+    def get_version(cls, session: Session) -> int:
+        """Returns the current version"""
+        return session.query(cls.version).filter(cls.id == 1).scalar() or 0
+
+
+def state_versions_enabled() -> bool:
+    """Whether the version is kept, i.e. whether the response cache of the webserver is enabled"""
+    return conf.getint('webserver', 'response_cache_ttl', fallback=0) > 0
+
+
+def _tracked_table(instance_or_class):
+    table_name = getattr(instance_or_class, '__tablename__', None)
+    return table_name if table_name in TRACKED_TABLES else None
+
+
+def _has_tracked_changes(instance, table_name):
+    attrs = inspect(instance).attrs
+    return any(attrs[column].history.has_changes() for column in TRACKED_TABLES[table_name])
+
+
+def _bump_on_flush(session, flush_context):  # pylint: disable=unused-argument
+    if session.info.get(_BUMPED_KEY):
+        return
+    for instance in chain(session.new, session.deleted):
+        if _tracked_table(instance):
+            StateVersion.bump(session)
+            return
+    for instance in session.dirty:
+        table_name = _tracked_table(instance)
+        if table_name and _has_tracked_changes(instance, table_name):
+            StateVersion.bump(session)
+            return
+
+
+def _bump_on_bulk_delete(delete_context):
+    if _tracked_table(delete_context.mapper.class_) and delete_context.rowcount:
+        StateVersion.bump(delete_context.session)
+
+
+def _bump_on_bulk_update(update_context):
+    table_name = _tracked_table(update_context.mapper.class_)
+    if not table_name or not update_context.rowcount:
+        return
+    columns = {getattr(column, 'key', column) for column in update_context.values}
+    if columns & TRACKED_TABLES[table_name]:
+        StateVersion.bump(update_context.session)
+
+
+def _reset_bumped(session, *args):  # pylint: disable=unused-argument
+    session.info.pop(_BUMPED_KEY, None)
+
+
+_LISTENERS = (
+    ('after_flush', _bump_on_flush),
+    ('after_bulk_delete', _bump_on_bulk_delete),
+    ('after_bulk_update', _bump_on_bulk_update),
+    ('after_commit', _reset_bumped),
+    ('after_rollback', _reset_bumped),
+)
+
+
+def track_state_changes() -> None:
+    """Bumps the version on every transaction of the ORM sessions writing to the tracked tables"""
+    for identifier, listener in _LISTENERS:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+def untrack_state_changes() -> None:
+    """Stops bumping the version"""
+    for identifier, listener in _LISTENERS:
+        if event.contains(Session, identifier, listener):
+            event.remove(Session, identifier, listener)
+
+
+def is_tracking_state_changes() -> bool:
+    """Whether the version is bumped by the writes of this process"""
+    return event.contains(Session, 'after_flush', _bump_on_flush)
@@ -47,7 +47,7 @@ from airflow.models.log import Log
 from airflow.models.taskfail import TaskFail
 from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.variable import Variable
-from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+from airflow.models.xcom import XCOM_RETURN_KEY, XCom, XComPrefetch
 from airflow.sentry import Sentry
 from airflow.settings import STORE_SERIALIZED_DAGS
 from airflow.stats import Stats
@@ -177,6 +177,9 @@ class TaskInstance(Base, LoggingMixin):     # pylint: disable=R0902,R0904
         Index('ti_state_lkp', dag_id, task_id, execution_date, state),
         Index('ti_pool', pool, state, priority_weight),
         Index('ti_job_id', job_id),
+        # Narrow index used to find zombies, partial where the database supports it
+        Index('ti_state_job_id', state, job_id,
+              postgresql_where=(state == 'running'), sqlite_where=(state == 'running')),
     )
 
     def __init__(self, task, execution_date: datetime, state: Optional[str] = None):
@@ -217,6 +220,8 @@ class TaskInstance(Base, LoggingMixin):     # pylint: disable=R0902,R0904
     def init_on_load(self):
         """ Initialize the attributes that aren't stored in the DB. """
         self.test_mode = False  # can be changed when calling 'run'
+        # XComs of the upstream tasks, read when the task instance starts running
+        self._xcom_prefetch: Optional[XComPrefetch] = None
 
     @property
     def try_number(self):
@@ -1061,6 +1066,7 @@ class TaskInstance(Base, LoggingMixin):     # pylint: disable=R0902,R0904
             self.handle_failure(e, test_mode, context)
             raise
         finally:
+            self._xcom_prefetch = None
             Stats.incr('ti.finish.{}.{}.{}'.format(task.dag_id, task.task_id, self.state))
 
         self._run_success_callback(context, task)
@@ -1112,6 +1118,13 @@ class TaskInstance(Base, LoggingMixin):     # pylint: disable=R0902,R0904
         self.clear_xcom_data()
         start_time = time.time()
 
+        if conf.getboolean('core', 'prefetch_upstream_xcoms', fallback=False):
+            # The templates and XComArgs of the task pull the XComs of its upstream tasks
+            self._xcom_prefetch = XComPrefetch.fetch(
+                self.dag_id, self.execution_date, task_copy.upstream_task_ids, session=session
+            )
+            self.log.debug("Prefetched %d XComs of the upstream tasks", len(self._xcom_prefetch))
+
         self.render_templates(context=context)
         if STORE_SERIALIZED_DAGS:
             RTIF.write(RTIF(ti=self, render_templates=False), session=session)
@@ -1667,6 +1680,15 @@ class TaskInstance(Base, LoggingMixin):     # pylint: disable=R0902,R0904
         if dag_id is None:
             dag_id = self.dag_id
 
+        if is_container(task_ids):
+            task_ids = list(task_ids)
+        prefetch = getattr(self, '_xcom_prefetch', None)
+        if (
+            prefetch is not None and task_ids and key and dag_id == self.dag_id and
+            not include_prior_dates and prefetch.has(task_ids, key)
+        ):
+            return prefetch.pull(task_ids, key)
+
         query = XCom.get_many(
             execution_date=self.execution_date,
             key=key,
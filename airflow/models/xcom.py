@@ -20,7 +20,7 @@ import json
 import logging
 import pickle
 from json import JSONDecodeError
-from typing import Any, Iterable, Optional, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
 import pendulum
 from sqlalchemy import Column, LargeBinary, String, and_
@@ -291,3 +291,65 @@ def resolve_xcom_backend():
 
 
 XCom = resolve_xcom_backend()
+
+
+class XComPrefetch:
+    """
+    XComs of some tasks of a DAG run, read in a single query, so that the pulls of
+    a running task instance do not query the database for each of them. The values
+    are deserialized by every pull, so that pulls do not share mutable values.
+
+    :param rows: rows of the XComs, with their task id, key, value and timestamp
+    """
+
+    def __init__(self, rows: Iterable):
+        self._rows: Dict[Tuple[str, str], Any] = {(row.task_id, row.key): row for row in rows}
+
+    def __len__(self):
+        return len(self._rows)
+
+    @classmethod
+    @provide_session
+    def fetch(
+        cls,
+        dag_id: str,
+        execution_date: pendulum.DateTime,
+        task_ids: Iterable[str],
+        session: Session = None,
+    ) -> 'XComPrefetch':
+        """
+        Reads all the XComs of the given tasks of a DAG run.
+
+        :param dag_id: id of the DAG
+        :param execution_date: execution date of the DAG run
+        :param task_ids: ids of the tasks
+        :param session: database session
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return cls([])
+        query = XCom.get_many(
+            execution_date=execution_date, task_ids=task_ids, dag_ids=dag_id, session=session
+        ).with_entities(XCom.task_id, XCom.key, XCom.value, XCom.timestamp)
+        return cls(query)
+
+    def has(self, task_ids: Union[str, Iterable[str]], key: str) -> bool:
+        """Whether the XComs of the tasks with the given key were all read"""
+        if not is_container(task_ids):
+            task_ids = [task_ids]
+        return all((task_id, key) in self._rows for task_id in task_ids)
+
+    def pull(self, task_ids: Union[str, Iterable[str]], key: str) -> Any:
+        """
+        Returns the XComs of the tasks with the given key, like ``TaskInstance.xcom_pull``
+        does for the DAG run. Check that they were read with ``has`` first.
+        """
+        if not is_container(task_ids):
+            return XCom.deserialize_value(self._rows[(task_ids, key)])
+        # Sort them like the query of XCom.get_many does
+        rows = sorted(
+            (self._rows[(task_id, key)] for task_id in dict.fromkeys(task_ids)),
+            key=lambda row: row.timestamp,
+            reverse=True,
+        )
+        return [XCom.deserialize_value(row) for row in rows]
@@ -17,20 +17,26 @@
 # under the License.
 """Manages all plugins."""
 # noinspection PyDeprecation
+import functools
+import hashlib
 import importlib
 import importlib.machinery
 import importlib.util
 import inspect
+import json
 import logging
 import os
 import sys
 import types
+from tempfile import NamedTemporaryFile
 from typing import Any, Dict, List, Optional, Type
 
 import pkg_resources
 
 from airflow import settings  # type: ignore
+from airflow.configuration import AIRFLOW_HOME, conf
 from airflow.utils.file import find_path_from_directory  # type: ignore
+from airflow.version import version
 
 log = logging.getLogger(__name__)
 
@@ -38,6 +44,22 @@ import_errors: Dict[str, str] = {}
 
 plugins = None  # type: Optional[List[AirflowPlugin]]
 
+# Attributes of the plugins holding their components, by kind of components
+PLUGIN_CATEGORIES = {
+    'dag': ('operators', 'sensors', 'hooks', 'macros'),
+    'executors': ('executors',),
+    'web_ui': ('admin_views', 'flask_blueprints', 'menu_links', 'appbuilder_views', 'appbuilder_menu_items'),
+    'operator_extra_links': ('global_operator_extra_links', 'operator_extra_links'),
+}
+
+PLUGINS_MANIFEST_PATH = os.path.join(AIRFLOW_HOME, 'plugins_manifest.json')
+
+# Sources of plugins, files or entry points, with the categories of their components,
+# as recorded in the manifest
+plugin_sources: List[Dict[str, Any]] = []
+# Sources listed by the cached manifest whose plugins are not loaded yet
+_pending_plugin_sources: Optional[List[Dict[str, Any]]] = None
+
 # Plugin components to integrate as modules
 operators_modules: Optional[List[Any]] = None
 sensors_modules: Optional[List[Any]] = None
@@ -131,65 +153,158 @@ def is_valid_plugin(plugin_obj):
     return False
 
 
+def _record_plugin_source(source: Dict[str, Any], loaded: List[AirflowPlugin]) -> None:
+    """Records the categories of the components of the plugins of a source, for the manifest"""
+    categories = sorted(
+        category for category, attributes in PLUGIN_CATEGORIES.items()
+        if any(getattr(plugin, attribute) for plugin in loaded for attribute in attributes)
+    )
+    if loaded:
+        plugin_sources.append(dict(source, categories=categories))
+
+
+def _load_entrypoint_plugin(name: str, module_name: str, load) -> List[AirflowPlugin]:
+    global import_errors  # pylint: disable=global-statement
+    global plugins  # pylint: disable=global-statement
+
+    loaded = []
+    log.debug('Importing entry_point plugin %s', name)
+    try:
+        plugin_class = load()
+        if is_valid_plugin(plugin_class):
+            plugin_instance = plugin_class()
+            if callable(getattr(plugin_instance, 'on_load', None)):
+                plugin_instance.on_load()
+                plugins.append(plugin_instance)
+                loaded.append(plugin_instance)
+    except Exception as e:  # pylint: disable=broad-except
+        log.exception("Failed to import plugin %s", name)
+        import_errors[module_name] = str(e)
+    return loaded
+
+
 def load_entrypoint_plugins():
     """
     Load and register plugins AirflowPlugin subclasses from the entrypoints.
     The entry_point group should be 'airflow.plugins'.
     """
+    entry_points = pkg_resources.iter_entry_points('airflow.plugins')
+
+    log.debug("Loading plugins from entrypoints")
+
+    for entry_point in entry_points:
+        loaded = _load_entrypoint_plugin(entry_point.name, entry_point.module_name, entry_point.load)
+        if loaded:
+            # The manifest lets processes import the plugin without scanning the entry points
+            _record_plugin_source({
+                'kind': 'entrypoint',
+                'name': entry_point.name,
+                'module': entry_point.module_name,
+                'attrs': list(entry_point.attrs),
+            }, loaded)
+
+
+def _list_plugin_files() -> List[str]:
+    return [
+        file_path
+        for file_path in find_path_from_directory(settings.PLUGINS_FOLDER, ".airflowignore")
+        if os.path.isfile(file_path) and os.path.splitext(file_path)[1] == '.py'
+    ]
+
+
+def _load_plugin_file(file_path: str) -> List[AirflowPlugin]:
     global import_errors  # pylint: disable=global-statement
     global plugins  # pylint: disable=global-statement
 
-    entry_points = pkg_resources.iter_entry_points('airflow.plugins')
+    loaded = []
+    mod_name = os.path.splitext(os.path.split(file_path)[-1])[0]
+    try:
+        loader = importlib.machinery.SourceFileLoader(mod_name, file_path)
+        spec = importlib.util.spec_from_loader(mod_name, loader)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = mod
+        loader.exec_module(mod)
+        log.debug('Importing plugin module %s', file_path)
 
-    log.debug("Loading plugins from entrypoints")
+        for mod_attr_value in (m for m in mod.__dict__.values() if is_valid_plugin(m)):
+            plugin_instance = mod_attr_value()
+            plugins.append(plugin_instance)
+            loaded.append(plugin_instance)
 
-    for entry_point in entry_points:  # pylint: disable=too-many-nested-blocks
-        log.debug('Importing entry_point plugin %s', entry_point.name)
-        try:
-            plugin_class = entry_point.load()
-            if is_valid_plugin(plugin_class):
-                plugin_instance = plugin_class()
-                if callable(getattr(plugin_instance, 'on_load', None)):
-                    plugin_instance.on_load()
-                    plugins.append(plugin_instance)
-        except Exception as e:  # pylint: disable=broad-except
-            log.exception("Failed to import plugin %s", entry_point.name)
-            import_errors[entry_point.module_name] = str(e)
+    except Exception as e:  # pylint: disable=broad-except
+        log.exception(e)
+        log.error('Failed to import plugin %s', file_path)
+        import_errors[file_path] = str(e)
+    return loaded
 
 
 def load_plugins_from_plugin_directory():
     """
     Load and register Airflow Plugins from plugins directory
     """
-    global import_errors  # pylint: disable=global-statement
-    global plugins  # pylint: disable=global-statement
     log.debug("Loading plugins from directory: %s", settings.PLUGINS_FOLDER)
 
-    for file_path in find_path_from_directory(
-            settings.PLUGINS_FOLDER, ".airflowignore"):
+    for file_path in _list_plugin_files():
+        _record_plugin_source({'kind': 'file', 'path': file_path}, _load_plugin_file(file_path))
 
-        if not os.path.isfile(file_path):
-            continue
-        mod_name, file_ext = os.path.splitext(os.path.split(file_path)[-1])
-        if file_ext != '.py':
-            continue
 
+def _load_plugin_source(source: Dict[str, Any]) -> None:
+    """Loads the plugins of a source listed by the manifest"""
+    if source['kind'] == 'file':
+        _load_plugin_file(source['path'])
+        return
+
+    def load():
+        return functools.reduce(getattr, source['attrs'], importlib.import_module(source['module']))
+
+    _load_entrypoint_plugin(source['name'], source['module'], load)
+
+
+def get_plugins_fingerprint(file_paths: List[str]) -> str:
+    """
+    Returns a fingerprint of the plugins that may be installed: of the plugin files, through their
+    modification times and sizes, and of the installed distributions, through the modification
+    times of the site-packages directories, which change when a distribution is installed or
+    removed.
+
+    :param file_paths: paths of the plugin files
+    """
+    hasher = hashlib.sha1(f'{version}\n{settings.PLUGINS_FOLDER}\n'.encode('utf-8'))
+    site_dirs = sorted({
+        path for path in sys.path if os.path.basename(path) in ('site-packages', 'dist-packages')
+    })
+    for path in site_dirs + sorted(file_paths):
         try:
-            loader = importlib.machinery.SourceFileLoader(mod_name, file_path)
-            spec = importlib.util.spec_from_loader(mod_name, loader)
-            mod = importlib.util.module_from_spec(spec)
-            sys.modules[spec.name] = mod
-            loader.exec_module(mod)
-            log.debug('Importing plugin module %s', file_path)
-
-            for mod_attr_value in (m for m in mod.__dict__.values() if is_valid_plugin(m)):
-                plugin_instance = mod_attr_value()
-                plugins.append(plugin_instance)
+            stat = os.stat(path)
+        except OSError:
+            continue
+        hasher.update(f'{path}\n{stat.st_mtime_ns}\n{stat.st_size}\n'.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def read_plugins_manifest(fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Returns the cached manifest of the plugins, None when it is missing or stale"""
+    try:
+        with open(PLUGINS_MANIFEST_PATH) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('fingerprint') != fingerprint:
+        return None
+    return manifest
+
 
-        except Exception as e:  # pylint: disable=broad-except
-            log.exception(e)
-            log.error('Failed to import plugin %s', file_path)
-            import_errors[file_path] = str(e)
+def write_plugins_manifest(fingerprint: str) -> None:
+    """Writes the manifest of the plugins loaded, replacing the cached one atomically"""
+    manifest = {'fingerprint': fingerprint, 'sources': plugin_sources, 'import_errors': import_errors}
+    try:
+        with NamedTemporaryFile(
+            'w', dir=os.path.dirname(PLUGINS_MANIFEST_PATH), suffix='.tmp', delete=False
+        ) as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(manifest_file.name, PLUGINS_MANIFEST_PATH)
+    except OSError:
+        log.debug("Could not write the manifest of the plugins to %s", PLUGINS_MANIFEST_PATH, exc_info=True)
 
 
 # pylint: disable=protected-access
@@ -208,27 +323,59 @@ def make_module(name: str, objects: List[Any]):
 # pylint: enable=protected-access
 
 
-def ensure_plugins_loaded():
+def ensure_plugins_loaded(category: Optional[str] = None):
     """
     Load plugins from plugins directory and entrypoints.
 
-    Plugins are only loaded if they have not been previously loaded.
+    Plugins are only loaded if they have not been previously loaded. With
+    ``[core] cache_plugins_manifest``, only the plugins providing the given
+    category of components are loaded, as listed by the cached manifest.
+
+    :param category: key of ``PLUGIN_CATEGORIES``, None to load all the plugins
     """
     global plugins  # pylint: disable=global-statement
+    global plugin_sources  # pylint: disable=global-statement
+    global _pending_plugin_sources  # pylint: disable=global-statement
 
-    if plugins is not None:
+    if plugins is not None and not _pending_plugin_sources:
         log.debug("Plugins are already loaded. Skipping.")
         return
 
-    if not settings.PLUGINS_FOLDER:
-        raise ValueError("Plugins folder is not set")
-
-    log.debug("Loading plugins")
-
-    plugins = []
-
-    load_plugins_from_plugin_directory()
-    load_entrypoint_plugins()
+    if plugins is None:
+        if not settings.PLUGINS_FOLDER:
+            raise ValueError("Plugins folder is not set")
+
+        log.debug("Loading plugins")
+
+        plugins = []
+        plugin_sources = []
+
+        if not conf.getboolean('core', 'cache_plugins_manifest', fallback=False):
+            load_plugins_from_plugin_directory()
+            load_entrypoint_plugins()
+            return
+
+        fingerprint = get_plugins_fingerprint(_list_plugin_files())
+        manifest = read_plugins_manifest(fingerprint)
+        if manifest is None:
+            log.debug("Building the manifest of the plugins")
+            load_plugins_from_plugin_directory()
+            load_entrypoint_plugins()
+            write_plugins_manifest(fingerprint)
+            return
+
+        plugin_sources = manifest['sources']
+        import_errors.update(manifest['import_errors'])
+        _pending_plugin_sources = list(plugin_sources)
+
+    log.debug("Loading plugins providing %s", category or "any component")
+    pending = []
+    for source in _pending_plugin_sources:
+        if category is None or category in source['categories']:
+            _load_plugin_source(source)
+        else:
+            pending.append(source)
+    _pending_plugin_sources = pending
 
 
 def initialize_web_ui_plugins():
@@ -250,7 +397,7 @@ def initialize_web_ui_plugins():
             flask_appbuilder_menu_links is not None:
         return
 
-    ensure_plugins_loaded()
+    ensure_plugins_loaded('web_ui')
 
     if plugins is None:
         raise AirflowPluginException("Can't load plugins.")
@@ -294,7 +441,7 @@ def initialize_extra_operators_links_plugins():
             registered_operator_link_classes is not None:
         return
 
-    ensure_plugins_loaded()
+    ensure_plugins_loaded('operator_extra_links')
 
     if plugins is None:
         raise AirflowPluginException("Can't load plugins.")
@@ -326,7 +473,7 @@ def integrate_executor_plugins() -> None:
     if executors_modules is not None:
         return
 
-    ensure_plugins_loaded()
+    ensure_plugins_loaded('executors')
 
     if plugins is None:
         raise AirflowPluginException("Can't load plugins.")
@@ -361,7 +508,7 @@ def integrate_dag_plugins() -> None:
             macros_modules is not None:
         return
 
-    ensure_plugins_loaded()
+    ensure_plugins_loaded('dag')
 
     if plugins is None:
         raise AirflowPluginException("Can't load plugins.")
@@ -20,7 +20,10 @@ import os
 from cached_property import cached_property
 
 from airflow.configuration import conf
-from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.file_task_handler import LOG_STREAM_CHUNK_SIZE, FileTaskHandler
+from airflow.utils.log.log_compression import (
+    compress_file, filter_log_parts, get_log_part_location, get_remote_log_compression, read_log_parts,
+)
 from airflow.utils.log.logging_mixin import LoggingMixin
 
 
@@ -86,10 +89,14 @@ class S3TaskHandler(FileTaskHandler, LoggingMixin):
         local_loc = os.path.join(self.local_base, self.log_relative_path)
         remote_loc = os.path.join(self.remote_base, self.log_relative_path)
         if os.path.exists(local_loc):
-            # read log and remove old logs to get just the latest additions
-            with open(local_loc, 'r') as logfile:
-                log = logfile.read()
-            self.s3_write(log, remote_loc)
+            compression = get_remote_log_compression()
+            if compression:
+                self.s3_write_part(local_loc, remote_loc, compression)
+            else:
+                # read log and remove old logs to get just the latest additions
+                with open(local_loc, 'r') as logfile:
+                    log = logfile.read()
+                self.s3_write(log, remote_loc)
 
         # Mark closed so we don't double write if close is called twice
         self.closed = True
@@ -110,6 +117,16 @@ class S3TaskHandler(FileTaskHandler, LoggingMixin):
         log_relative_path = self._render_filename(ti, try_number)
         remote_loc = os.path.join(self.remote_base, log_relative_path)
 
+        log_parts = self.s3_log_parts(remote_loc)
+        if log_parts:
+            try:
+                remote_log = b''.join(self.s3_read_parts(remote_loc, log_parts)).decode('utf-8', 'replace')
+            except Exception:  # pylint: disable=broad-except
+                remote_log = 'Could not read logs from {}'.format(remote_loc)
+                self.log.exception(remote_log)
+            log = '*** Reading remote log from {}.\n{}\n'.format(
+                remote_loc, remote_log)
+            return log, {'end_of_log': True}
         if self.s3_log_exists(remote_loc):
             # If S3 remote file exists, we do not fetch logs from task instance
             # local machine even if there are errors reading remote logs, as
@@ -121,6 +138,13 @@ class S3TaskHandler(FileTaskHandler, LoggingMixin):
         else:
             return super()._read(ti, try_number)
 
+    def _read_remote_chunks(self, ti, try_number):
+        remote_loc = os.path.join(self.remote_base, self._render_filename(ti, try_number))
+        log_parts = self.s3_log_parts(remote_loc)
+        if not log_parts:
+            return None
+        return self.s3_read_parts(remote_loc, log_parts)
+
     def s3_log_exists(self, remote_log_location):
         """
         Check if remote_log_location exists in remote storage
@@ -134,6 +158,35 @@ class S3TaskHandler(FileTaskHandler, LoggingMixin):
             pass
         return False
 
+    def s3_log_parts(self, remote_log_location):
+        """
+        Returns the compressed parts of the log at remote_log_location, in
+        upload order.
+
+        :param remote_log_location: log's location in remote storage
+        :return: locations of the parts, empty if there are none
+        """
+        try:
+            bucket, key = self.hook.parse_s3_url(remote_log_location)
+            keys = self.hook.list_keys(bucket, prefix=key) or []
+        except Exception:  # pylint: disable=broad-except
+            return []
+        return ['s3://{}/{}'.format(bucket, part) for part in filter_log_parts(key, keys)]
+
+    def s3_read_parts(self, remote_log_location, log_parts):
+        """
+        Streams the decompressed log at remote_log_location in chunks of bytes,
+        starting with the log uploaded without compression if there is one.
+
+        :param remote_log_location: log's location in remote storage
+        :param log_parts: compressed parts of the log
+        """
+        locations = [remote_log_location] if self.s3_log_exists(remote_log_location) else []
+        return read_log_parts(
+            locations + list(log_parts),
+            lambda location: self.hook.get_key(location).get()['Body'].iter_chunks(LOG_STREAM_CHUNK_SIZE),
+        )
+
     def s3_read(self, remote_log_location, return_error=False):
         """
         Returns the log found at the remote_log_location. Returns '' if no
@@ -180,3 +233,30 @@ class S3TaskHandler(FileTaskHandler, LoggingMixin):
             )
         except Exception:  # pylint: disable=broad-except
             self.log.exception('Could not write logs to %s', remote_log_location)
+
+    def s3_write_part(self, local_log_location, remote_log_location, compression):
+        """
+        Uploads the local log as a new compressed part of the log at
+        remote_log_location, without reading the remote log. Fails silently
+        if no hook was created.
+
+        :param local_log_location: path of the local log
+        :type local_log_location: str
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        :param compression: compression of the part, gzip or zstd
+        :type compression: str
+        """
+        part_location = get_log_part_location(remote_log_location, compression)
+        compressed_path = compress_file(local_log_location, compression)
+        try:
+            self.hook.load_file(
+                compressed_path,
+                key=part_location,
+                replace=True,
+                encrypt=conf.getboolean('logging', 'ENCRYPT_S3_LOGS'),
+            )
+        except Exception:  # pylint: disable=broad-except
+            self.log.exception('Could not write logs to %s', part_location)
+        finally:
+            os.remove(compressed_path)
@@ -35,6 +35,7 @@ from airflow.serialization.enums import DagAttributeTypes as DAT, Encoding
 from airflow.serialization.helpers import serialize_template_field
 from airflow.serialization.json_schema import Validator, load_dag_schema
 from airflow.settings import json
+from airflow.ti_deps.deps.base_ti_dep import BaseTIDep
 from airflow.utils.code_utils import get_python_source
 from airflow.utils.module_loading import import_string
 
@@ -48,6 +49,9 @@ BUILTIN_OPERATOR_EXTRA_LINKS: List[str] = [
     "airflow.providers.qubole.operators.qubole.QDSLink"
 ]
 
+# Only the dependencies of these packages are loaded back from serialized operators
+BUILTIN_TI_DEPS_PACKAGE = "airflow.ti_deps.deps."
+
 
 class BaseSerialization:
     """BaseSerialization provides utils for serialization."""
@@ -314,6 +318,19 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
         self.ui_fgcolor = BaseOperator.ui_fgcolor
         self.template_fields = BaseOperator.template_fields
         self.operator_extra_links = BaseOperator.operator_extra_links
+        self._deps: Optional[Set[BaseTIDep]] = None
+        # Import paths of the dependencies of the operator that could not be loaded
+        self.unloaded_deps: List[str] = []
+
+    @property
+    def deps(self) -> Set[BaseTIDep]:
+        if self._deps is None:
+            return BaseOperator.deps.fget(self)
+        return self._deps
+
+    @deps.setter
+    def deps(self, deps: Set[BaseTIDep]):
+        self._deps = deps
 
     @property
     def task_type(self) -> str:
@@ -336,6 +353,15 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
             serialize_op['_operator_extra_links'] = \
                 cls._serialize_operator_extra_links(op.operator_extra_links)
 
+        # Only store the dependencies of operators overriding the default ones, like sensors
+        deps = op.deps
+        unloaded_deps = getattr(op, 'unloaded_deps', [])
+        if deps != BaseOperator.deps.fget(op) or unloaded_deps:
+            serialize_op['deps'] = sorted(
+                {f"{dep.__class__.__module__}.{dep.__class__.__name__}" for dep in deps} |
+                set(unloaded_deps)
+            )
+
         # Store all template_fields as they are if there are JSON Serializable
         # If not, store them as strings
         if op.template_fields:
@@ -393,6 +419,8 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
 
                 v = list(op_predefined_extra_links.values())
                 k = "operator_extra_links"
+            elif k == "deps":
+                v = cls._deserialize_deps(v, op)
             elif k in cls._decorated_fields or k not in op.get_serialized_fields():
                 v = cls._deserialize(v)
             # else use v as it is
@@ -419,6 +447,36 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
                 return True
         return super()._is_excluded(var, attrname, op)
 
+    @classmethod
+    def _deserialize_deps(cls, deps: List[str], op: 'SerializedBaseOperator') -> Set[BaseTIDep]:
+        """
+        Deserializes the dependencies of an operator. Only the dependencies of Airflow
+        without constructor arguments are loaded, as only their import paths are
+        serialized. The import paths of the others are kept in ``op.unloaded_deps``.
+
+        :param deps: import paths of the dependencies
+        :param op: deserialized operator
+        :return: the loaded dependencies
+        """
+        instances = set()
+        for path in deps:
+            dep = None
+            if path.startswith(BUILTIN_TI_DEPS_PACKAGE):
+                try:
+                    dep_class = import_string(path)
+                    # The state set by the constructor of the dependency is not serialized
+                    if dep_class.__init__ is BaseTIDep.__init__:
+                        dep = dep_class()
+                except Exception:  # pylint: disable=broad-except
+                    log.debug("Could not load dependency %s of serialized task %s", path, op.task_id,
+                              exc_info=True)
+            if dep is None:
+                log.debug("Not loading dependency %s of serialized task %s", path, op.task_id)
+                op.unloaded_deps.append(path)
+            else:
+                instances.add(dep)
+        return instances
+
     @classmethod
     def _deserialize_operator_extra_links(
         cls,
@@ -29,8 +29,6 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session as SASession
 from sqlalchemy.pool import NullPool
 
-# noinspection PyUnresolvedReferences
-from airflow import api
 from airflow.logging_config import configure_logging
 from airflow.utils.orm_event_handlers import setup_event_handlers
 
@@ -73,8 +71,9 @@ PLUGINS_FOLDER: Optional[str] = None
 LOGGING_CLASS_PATH: Optional[str] = None
 DAGS_FOLDER: str = os.path.expanduser(conf.get('core', 'DAGS_FOLDER'))
 
-engine: Optional[Engine] = None
-Session: Optional[SASession] = None
+# The ORM is configured on the first access to the engine or the sessions, see __getattr__
+engine: Optional[Engine]
+Session: Optional[SASession]
 
 # The JSON library to use for DAG Serialization and De-Serialization
 json = json  # pylint: disable=self-assigning-variable
@@ -156,8 +155,14 @@ def configure_vars():
     )
 
 
-def configure_orm(disable_connection_pool=False):
-    """ Configure ORM using SQLAlchemy"""
+def configure_orm(disable_connection_pool=False, limit_host_connections=False):
+    """
+    Configure ORM using SQLAlchemy
+
+    :param disable_connection_pool: whether to open a new connection for every session
+    :param limit_host_connections: whether the connections take one of the slots shared by
+        the task processes of the host, when ``[core] task_connection_slots`` is set
+    """
     log.debug("Setting up DB connection pool (PID %s)", os.getpid())
     global engine
     global Session
@@ -216,6 +221,20 @@ def configure_orm(disable_connection_pool=False):
 
     engine = create_engine(SQL_ALCHEMY_CONN, connect_args=connect_args, **engine_args)
     setup_event_handlers(engine)
+    if limit_host_connections:
+        from airflow.utils.connection_slots import get_host_connection_slots, limit_connections
+
+        slots = get_host_connection_slots(SQL_ALCHEMY_CONN)
+        if slots:
+            log.debug("settings.configure_orm(): Sharing %d connection slots in %s", slots.slots,
+                      slots.directory)
+            limit_connections(engine, slots)
+
+    from airflow.models.stateversion import state_versions_enabled, track_state_changes
+
+    if state_versions_enabled():
+        # Version the tables polled by the webserver, see airflow.models.stateversion
+        track_state_changes()
 
     Session = scoped_session(
         sessionmaker(autocommit=False,
@@ -230,14 +249,28 @@ def dispose_orm():
     global engine
     global Session
 
-    if Session:
+    if globals().get('Session'):
         Session.remove()
         Session = None
-    if engine:
+    if globals().get('engine'):
         engine.dispose()
         engine = None
 
 
+def _get_orm(name: str):
+    if name not in globals():
+        configure_orm()
+    return globals()[name]
+
+
+def __getattr__(name):
+    # PEP-562: Configure the ORM on the first access to the engine or the sessions,
+    # so that the processes not using the database do not pay for it
+    if name in ('engine', 'Session'):
+        return _get_orm(name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
+
+
 def configure_adapters():
     """ Register Adapters and DB Converters """
     from pendulum import DateTime as Pendulum
@@ -264,7 +297,7 @@ def validate_session():
     if not worker_precheck:
         return True
     else:
-        check_session = sessionmaker(bind=engine)
+        check_session = sessionmaker(bind=_get_orm('engine'))
         session = check_session()
         try:
             session.execute("select 1")  # pylint: disable=no-member
@@ -328,10 +361,15 @@ def initialize():
     global LOGGING_CLASS_PATH
     LOGGING_CLASS_PATH = configure_logging()
     configure_adapters()
-    # The webservers import this file from models.py with the default settings.
-    configure_orm()
+    if sys.version_info < (3, 7):
+        # Without module __getattr__ the ORM can not be configured on first use
+        configure_orm()
+    else:
+        # Configure the ORM again on the next use, e.g. in a process forked after a
+        # reload of this module, rather than using the connections of the parent
+        globals().pop('engine', None)
+        globals().pop('Session', None)
     configure_action_logging()
-    api.load_auth()
 
     # Ensure we close DB connections at scheduler and gunicon worker terminations
     atexit.register(dispose_orm)
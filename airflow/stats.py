@@ -17,15 +17,23 @@
 # under the License.
 
 
+import atexit
 import logging
+import os
+import random
 import socket
 import string
 import textwrap
-from functools import wraps
-from typing import Callable, Optional
+import threading
+import time
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowConfigException, InvalidStatsNameException
+from airflow.metrics_registry import (
+    UP_DOWN_COUNTERS, MetricsRegistry, parse_stat, start_metrics_server, timing_to_seconds,
+)
 from airflow.typing_compat import Protocol
 
 log = logging.getLogger(__name__)
@@ -45,6 +53,67 @@ class StatsLogger(Protocol):
     def timing(cls, stat: str, dt) -> None:
         ...
 
+    def timer(cls, stat: str, *args, **kwargs) -> 'Timer':
+        ...
+
+
+class Timer:
+    """
+    Context manager timing a block of code, sending its duration in
+    milliseconds as a timing when the block exits.
+
+    .. code-block:: python
+
+        with Stats.timer('dag_processing.total_parse_time') as timer:
+            ...
+        print(timer.duration)
+
+    :param send: callable sending the duration, in milliseconds
+    """
+
+    def __init__(self, send: Optional[Callable[[float], Any]] = None):
+        self._send = send
+        self._start_time: Optional[float] = None
+        self.duration: Optional[float] = None
+
+    def __enter__(self) -> 'Timer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self) -> 'Timer':
+        """Starts the timer"""
+        self._start_time = time.perf_counter()
+        return self
+
+    def stop(self, send: bool = True) -> None:
+        """Stops the timer, and sends the duration unless ``send`` is False"""
+        self.duration = (time.perf_counter() - self._start_time) * 1000
+        if send and self._send is not None:
+            self._send(self.duration)
+
+
+class _NullTimer:
+    """Timer of the DummyStatsLogger, that does not measure anything"""
+
+    duration = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def start(self):
+        return self
+
+    def stop(self, send=True):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
 
 class DummyStatsLogger:
     """If no StatsLogger is configured, DummyStatsLogger is used as a fallback"""
@@ -64,6 +133,10 @@ class DummyStatsLogger:
     def timing(cls, stat, dt):
         pass
 
+    @classmethod
+    def timer(cls, stat, *args, **kwargs):
+        return _NULL_TIMER
+
 
 # Only characters in the character set are considered valid
 # for the stat_name if stat_name_default_handler is used.
@@ -94,19 +167,38 @@ def get_current_handler_stat_name_func() -> Callable[[str], str]:
     return conf.getimport('scheduler', 'stat_name_handler') or stat_name_default_handler
 
 
+# Maximum number of stat names whose validation is memoized
+MAX_CACHED_STAT_NAMES = 4096
+
+
+def _validate_stat_name(stat) -> Optional[str]:
+    try:
+        return get_current_handler_stat_name_func()(stat)
+    except InvalidStatsNameException:
+        log.error('Invalid stat name: %s.', stat, exc_info=True)
+        return None
+
+
+_validate_cached_stat_name = lru_cache(maxsize=MAX_CACHED_STAT_NAMES)(_validate_stat_name)
+
+
 def validate_stat(fn):
     """Check if stat name contains invalid characters.
-    Log and not emit stats if name is invalid
+    Log and not emit stats if name is invalid.
+
+    The result of the validation of every stat name is memoized, so that the
+    name handler only runs the first time a stat is sent.
     """
     @wraps(fn)
     def wrapper(_self, stat, *args, **kwargs):
-        try:
-            handler_stat_name_func = get_current_handler_stat_name_func()
-            stat_name = handler_stat_name_func(stat)
-            return fn(_self, stat_name, *args, **kwargs)
-        except InvalidStatsNameException:
-            log.error('Invalid stat name: %s.', stat, exc_info=True)
-            return
+        # Only strings can be memoized, the handler rejects anything else
+        if isinstance(stat, str):
+            stat_name = _validate_cached_stat_name(stat)
+        else:
+            stat_name = _validate_stat_name(stat)
+        if stat_name is None:
+            return None
+        return fn(_self, stat_name, *args, **kwargs)
 
     return wrapper
 
@@ -119,12 +211,18 @@ class AllowListValidator:
             self.allow_list = tuple([item.strip().lower() for item in allow_list.split(',')])
         else:
             self.allow_list = None
+        # Memoized results of the test of the stat names
+        self._allowed: Dict[str, bool] = {}
 
     def test(self, stat):
-        if self.allow_list is not None:
-            return stat.strip().lower().startswith(self.allow_list)
-        else:
+        if self.allow_list is None:
             return True  # default is all metrics allowed
+        allowed = self._allowed.get(stat)
+        if allowed is None:
+            allowed = stat.strip().lower().startswith(self.allow_list)
+            if len(self._allowed) < MAX_CACHED_STAT_NAMES:
+                self._allowed[stat] = allowed
+        return allowed
 
 
 class SafeStatsdLogger:
@@ -154,6 +252,9 @@ class SafeStatsdLogger:
         if self.allow_list_validator.test(stat):
             return self.statsd.timing(stat, dt)
 
+    def timer(self, stat, *args, **kwargs):
+        return Timer(lambda duration: self.timing(stat, duration, *args, **kwargs))
+
 
 class SafeDogStatsdLogger:
     """DogStatsd Logger"""
@@ -186,6 +287,266 @@ class SafeDogStatsdLogger:
             tags = tags or []
             return self.dogstatsd.timing(metric=stat, value=dt, tags=tags)
 
+    def timer(self, stat, *args, **kwargs):
+        return Timer(lambda duration: self.timing(stat, duration, *args, **kwargs))
+
+
+class StatsBuffer:
+    """
+    Metrics aggregated in memory between two flushes.
+
+    Counters are summed and gauges keep their last value, per stat and tags,
+    while timings are kept one by one. The buffer is flushed when it holds
+    ``max_size`` metrics, every ``flush_interval`` seconds by a daemon thread
+    started with the first metric of the process, and when the process exits.
+    Flushes run both in that thread and in the thread adding a metric, so they
+    send one at a time: the clients' buffers and pipelines are not thread-safe.
+
+    :param send: callable sending the counters, gauges and timings of a flush
+    :param flush_interval: maximum number of seconds between two flushes
+    :param max_size: maximum number of metrics held between two flushes
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[Tuple[str, Tuple[str, ...]], float],
+                        Dict[Tuple[str, Tuple[str, ...]], Tuple[float, bool]],
+                        List[Tuple[str, Tuple[str, ...], Any]]], None],
+        flush_interval: float,
+        max_size: int,
+    ):
+        self._send = send
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._reset()
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            # The parent process sends the metrics buffered before the fork
+            os.register_at_fork(after_in_child=self._reset)  # pylint: disable=no-member
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        # Held while sending, so that concurrent flushes do not share the client buffer
+        self._send_lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+        self._gauges: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, bool]] = {}
+        self._timings: List[Tuple[str, Tuple[str, ...], Any]] = []
+        self._last_flush_time = time.monotonic()
+        # Threads do not survive a fork, so every process starts its own
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _start_flush_thread(self) -> None:
+        with self._lock:
+            if self._flush_thread is not None:
+                return
+            self._flush_thread = threading.Thread(
+                target=self._flush_periodically, name="stats-buffer-flush", daemon=True
+            )
+        self._flush_thread.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self) -> None:
+        """Stops the thread flushing the buffer periodically, after a last flush"""
+        self._stopped.set()
+        self.flush()
+
+    def __len__(self):
+        return len(self._counters) + len(self._gauges) + len(self._timings)
+
+    def incr(self, stat: str, count: float, rate: float, tags: Tuple[str, ...] = ()) -> None:
+        """Adds to a counter, scaled up by the sample rate when the increment is sampled"""
+        if rate < 1:
+            if random.random() > rate:
+                return
+            count = count / rate
+        key = (stat, tags)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + count
+        self._maybe_flush()
+
+    def gauge(self, stat: str, value: float, rate: float, delta: bool, tags: Tuple[str, ...] = ()) -> None:
+        """Sets a gauge, or changes it by the value when ``delta`` is True"""
+        if rate < 1 and random.random() > rate:
+            return
+        key = (stat, tags)
+        with self._lock:
+            if delta and key in self._gauges:
+                current, current_delta = self._gauges[key]
+                self._gauges[key] = (current + value, current_delta)
+            else:
+                self._gauges[key] = (value, delta)
+        self._maybe_flush()
+
+    def timing(self, stat: str, dt, tags: Tuple[str, ...] = ()) -> None:
+        """Adds a timing"""
+        with self._lock:
+            self._timings.append((stat, tags, dt))
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if self._flush_thread is None:
+            self._start_flush_thread()
+        if len(self) >= self.max_size or time.monotonic() - self._last_flush_time >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sends the buffered metrics"""
+        with self._send_lock:
+            with self._lock:
+                counters, gauges, timings = self._counters, self._gauges, self._timings
+                self._counters, self._gauges, self._timings = {}, {}, []
+                self._last_flush_time = time.monotonic()
+            if counters or gauges or timings:
+                try:
+                    self._send(counters, gauges, timings)
+                except Exception:  # pylint: disable=broad-except
+                    log.warning("Could not send the buffered metrics", exc_info=True)
+
+
+class BufferedStatsdLogger(SafeStatsdLogger):
+    """
+    Statsd Logger aggregating the metrics in memory, and sending them in
+    multi-metric packets through a pipeline of the client on every flush.
+    """
+
+    def __init__(
+        self, statsd_client, allow_list_validator=AllowListValidator(), flush_interval=1.0, max_size=1000
+    ):
+        super().__init__(statsd_client, allow_list_validator)
+        self.buffer = StatsBuffer(self._send, flush_interval, max_size)
+
+    @validate_stat
+    def incr(self, stat, count=1, rate=1):
+        if self.allow_list_validator.test(stat):
+            self.buffer.incr(stat, count, rate)
+
+    @validate_stat
+    def decr(self, stat, count=1, rate=1):
+        if self.allow_list_validator.test(stat):
+            self.buffer.incr(stat, -count, rate)
+
+    @validate_stat
+    def gauge(self, stat, value, rate=1, delta=False):
+        if self.allow_list_validator.test(stat):
+            self.buffer.gauge(stat, value, rate, delta)
+
+    @validate_stat
+    def timing(self, stat, dt):
+        if self.allow_list_validator.test(stat):
+            self.buffer.timing(stat, dt)
+
+    def flush(self):
+        """Sends the buffered metrics"""
+        self.buffer.flush()
+
+    def _send(self, counters, gauges, timings):
+        pipeline = self.statsd.pipeline()
+        for (stat, _), count in counters.items():
+            pipeline.incr(stat, count)
+        for (stat, _), (value, delta) in gauges.items():
+            pipeline.gauge(stat, value, delta=delta)
+        for stat, _, dt in timings:
+            pipeline.timing(stat, dt)
+        pipeline.send()
+
+
+class BufferedDogStatsdLogger(SafeDogStatsdLogger):
+    """
+    DogStatsd Logger aggregating the metrics in memory, per metric and tags,
+    and sending them in multi-metric packets on every flush.
+    """
+
+    def __init__(
+        self, dogstatsd_client, allow_list_validator=AllowListValidator(), flush_interval=1.0, max_size=1000
+    ):
+        super().__init__(dogstatsd_client, allow_list_validator)
+        self.buffer = StatsBuffer(self._send, flush_interval, max_size)
+
+    @validate_stat
+    def incr(self, stat, count=1, rate=1, tags=None):
+        if self.allow_list_validator.test(stat):
+            self.buffer.incr(stat, count, rate, tuple(tags or ()))
+
+    @validate_stat
+    def decr(self, stat, count=1, rate=1, tags=None):
+        if self.allow_list_validator.test(stat):
+            self.buffer.incr(stat, -count, rate, tuple(tags or ()))
+
+    @validate_stat
+    def gauge(self, stat, value, rate=1, delta=False, tags=None):
+        if self.allow_list_validator.test(stat):
+            # Like SafeDogStatsdLogger, DogStatsd gauges are always set to the value
+            self.buffer.gauge(stat, value, rate, False, tuple(tags or ()))
+
+    @validate_stat
+    def timing(self, stat, dt, tags=None):
+        if self.allow_list_validator.test(stat):
+            self.buffer.timing(stat, dt, tuple(tags or ()))
+
+    def flush(self):
+        """Sends the buffered metrics"""
+        self.buffer.flush()
+
+    def _send(self, counters, gauges, timings):
+        self.dogstatsd.open_buffer()
+        try:
+            for (stat, tags), count in counters.items():
+                self.dogstatsd.increment(metric=stat, value=count, tags=list(tags))
+            for (stat, tags), (value, _) in gauges.items():
+                self.dogstatsd.gauge(metric=stat, value=value, tags=list(tags))
+            for stat, tags, dt in timings:
+                self.dogstatsd.timing(metric=stat, value=dt, tags=list(tags))
+        finally:
+            self.dogstatsd.close_buffer()
+
+
+class PrometheusStatsLogger:
+    """
+    Stats logger recording the stats in the in-process metrics registry, to be
+    scraped by Prometheus. Timings are recorded as histograms in seconds.
+    """
+
+    def __init__(self, registry: MetricsRegistry, allow_list_validator=AllowListValidator()):
+        self.registry = registry
+        self.allow_list_validator = allow_list_validator
+
+    @validate_stat
+    def incr(self, stat, count=1, rate=1, tags=None):
+        if self.allow_list_validator.test(stat):
+            name, labels = parse_stat(stat, tags)
+            if stat in UP_DOWN_COUNTERS:
+                self.registry.set(name, count, labels, delta=True)
+            else:
+                self.registry.inc(name, count, labels)
+
+    @validate_stat
+    def decr(self, stat, count=1, rate=1, tags=None):
+        if self.allow_list_validator.test(stat):
+            name, labels = parse_stat(stat, tags)
+            if stat in UP_DOWN_COUNTERS:
+                self.registry.set(name, -count, labels, delta=True)
+            else:
+                log.warning("Counter %s can not be decremented", stat)
+
+    @validate_stat
+    def gauge(self, stat, value, rate=1, delta=False, tags=None):
+        if self.allow_list_validator.test(stat):
+            name, labels = parse_stat(stat, tags)
+            self.registry.set(name, value, labels, delta=delta)
+
+    @validate_stat
+    def timing(self, stat, dt, tags=None):
+        if self.allow_list_validator.test(stat):
+            name, labels = parse_stat(stat, tags)
+            self.registry.observe(name, timing_to_seconds(dt), labels)
+
+    def timer(self, stat, *args, **kwargs):
+        return Timer(lambda duration: self.timing(stat, duration, *args, **kwargs))
+
 
 class _Stats(type):
     instance: Optional[StatsLogger] = None
@@ -202,6 +563,8 @@ class _Stats(type):
                     self.__class__.instance = self.get_dogstatsd_logger()
                 elif conf.getboolean('scheduler', 'statsd_on'):
                     self.__class__.instance = self.get_statsd_logger()
+                elif conf.getboolean('scheduler', 'prometheus_on'):
+                    self.__class__.instance = self.get_prometheus_logger()
                 else:
                     self.__class__.instance = DummyStatsLogger()
             except (socket.gaierror, ImportError) as e:
@@ -231,6 +594,9 @@ class _Stats(type):
             port=conf.getint('scheduler', 'statsd_port'),
             prefix=conf.get('scheduler', 'statsd_prefix'))
         allow_list_validator = AllowListValidator(conf.get('scheduler', 'statsd_allow_list', fallback=None))
+        flush_interval, max_buffer_size = self.get_buffer_settings()
+        if flush_interval > 0:
+            return BufferedStatsdLogger(statsd, allow_list_validator, flush_interval, max_buffer_size)
         return SafeStatsdLogger(statsd, allow_list_validator)
 
     def get_dogstatsd_logger(self):
@@ -242,8 +608,26 @@ class _Stats(type):
             constant_tags=self.get_constant_tags())
         dogstatsd_allow_list = conf.get('scheduler', 'statsd_allow_list', fallback=None)
         allow_list_validator = AllowListValidator(dogstatsd_allow_list)
+        flush_interval, max_buffer_size = self.get_buffer_settings()
+        if flush_interval > 0:
+            return BufferedDogStatsdLogger(dogstatsd, allow_list_validator, flush_interval, max_buffer_size)
         return SafeDogStatsdLogger(dogstatsd, allow_list_validator)
 
+    def get_prometheus_logger(self):
+        dropped_labels = conf.get('scheduler', 'prometheus_dropped_labels', fallback='')
+        registry = MetricsRegistry(
+            prefix=conf.get('scheduler', 'statsd_prefix'),
+            dropped_labels=[label.strip() for label in dropped_labels.split(',') if label.strip()],
+            max_label_values=conf.getint('scheduler', 'prometheus_max_label_values'),
+        )
+        allow_list_validator = AllowListValidator(conf.get('scheduler', 'statsd_allow_list', fallback=None))
+        return PrometheusStatsLogger(registry, allow_list_validator)
+
+    def get_buffer_settings(self):
+        flush_interval = conf.getfloat('scheduler', 'statsd_flush_interval')
+        max_buffer_size = conf.getint('scheduler', 'statsd_max_buffer_size')
+        return flush_interval, max_buffer_size
+
     def get_constant_tags(self):
         tags = []
         tags_in_string = conf.get('scheduler', 'statsd_datadog_tags', fallback=None)
@@ -257,3 +641,21 @@ class _Stats(type):
 
 class Stats(metaclass=_Stats):  # noqa: D101
     pass
+
+
+def serve_metrics(port: int, reset: bool = False):
+    """
+    Serves the metrics of the process over HTTP when they are recorded for
+    Prometheus, doing nothing otherwise.
+
+    :param port: port to listen on
+    :param reset: whether to drop the metrics recorded before, e.g. by the
+        process this one was forked from
+    :return: the server, to be shut down by the caller, or None
+    """
+    instance = Stats.instance
+    if not isinstance(instance, PrometheusStatsLogger):
+        return None
+    if reset:
+        instance.registry.clear()
+    return start_metrics_server(instance.registry, port)
@@ -32,15 +32,17 @@ import threading
 import traceback
 from argparse import Namespace
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from airflow import settings
 from airflow.exceptions import AirflowException
-from airflow.models import DAG, DagBag, DagModel, DagPickle, Log
 from airflow.utils import cli_action_loggers
 from airflow.utils.platform import is_terminal_support_colors
 from airflow.utils.session import provide_session
 
+if TYPE_CHECKING:
+    from airflow.models import DAG
+
 
 def action_logging(f):
     """
@@ -116,6 +118,9 @@ def _build_metrics(func_name, namespace):
     metrics['execution_date'] = tmp_dic.get('execution_date')
     metrics['host_name'] = socket.gethostname()
 
+    # Importing the models is deferred, so that building the parser of the CLI does not import them
+    from airflow.models import Log
+
     extra = json.dumps({k: metrics[k] for k in ('host_name', 'full_command')})
     log = Log(
         event='cli_{}'.format(func_name),
@@ -141,6 +146,8 @@ def process_subdir(subdir: Optional[str]):
 
 def get_dag_by_file_location(dag_id: str):
     """Returns DAG of a given dag_id by looking up file location"""
+    from airflow.models import DagBag, DagModel
+
     # Benefit is that logging from other dags in dagbag will not appear
     dag_model = DagModel.get_current(dag_id)
     if dag_model is None:
@@ -151,8 +158,10 @@ def get_dag_by_file_location(dag_id: str):
     return dagbag.dags[dag_id]
 
 
-def get_dag(subdir: Optional[str], dag_id: str) -> DAG:
+def get_dag(subdir: Optional[str], dag_id: str) -> "DAG":
     """Returns DAG of a given dag_id"""
+    from airflow.models import DagBag
+
     dagbag = DagBag(process_subdir(subdir))
     if dag_id not in dagbag.dags:
         raise AirflowException(
@@ -163,6 +172,8 @@ def get_dag(subdir: Optional[str], dag_id: str) -> DAG:
 
 def get_dags(subdir: Optional[str], dag_id: str, use_regex: bool = False):
     """Returns DAG(s) matching a given regex or dag_id"""
+    from airflow.models import DagBag
+
     if not use_regex:
         return [get_dag(subdir, dag_id)]
     dagbag = DagBag(process_subdir(subdir))
@@ -177,6 +188,8 @@ def get_dags(subdir: Optional[str], dag_id: str, use_regex: bool = False):
 @provide_session
 def get_dag_by_pickle(pickle_id, session=None):
     """Fetch DAG from the database using pickling"""
+    from airflow.models import DagPickle
+
     dag_pickle = session.query(DagPickle).filter(DagPickle.id == pickle_id).first()
     if not dag_pickle:
         raise AirflowException("Who hid the pickle!? [missing pickle]")
@@ -0,0 +1,217 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Host-wide limit of the connections opened to the metadata database.
+
+The task processes of a host share a fixed number of slots, one lock file per
+slot. A process holds a slot while it has connections open, so that at most
+``slots`` task processes of the host are connected at once and the others wait
+for a slot before connecting. All the connections of a process share its slot,
+so that a process holding a slot never waits for another one.
+
+A lock is released when the last descriptor of its lock file is closed. The
+descriptors are not inherited by the programs a process executes, and a forked
+process closes the ones it inherited right after the fork, so that the slot of
+a process is released when it exits, even when it is killed.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import event, exc
+
+from airflow.configuration import conf
+
+log = logging.getLogger(__name__)
+
+# Time to wait between two attempts to take a slot, in seconds
+_POLL_INTERVAL = 0.05
+_MAX_POLL_INTERVAL = 1.0
+
+# Slots of the process, whose descriptors a forked process closes
+_instances: 'weakref.WeakSet[HostConnectionSlots]' = weakref.WeakSet()
+
+# Maximum time the connections of the current thread wait for a slot, see max_slot_wait
+_wait_limit = threading.local()
+
+
+@contextmanager
+def max_slot_wait(seconds: float):
+    """
+    Caps the time the connections opened by the current thread in the block wait
+    for a slot, e.g. to heartbeat in time rather than wait for the slot timeout.
+
+    :param seconds: maximum number of seconds to wait for a slot
+    """
+    previous = getattr(_wait_limit, 'seconds', None)
+    _wait_limit.seconds = seconds if previous is None else min(previous, seconds)
+    try:
+        yield
+    finally:
+        _wait_limit.seconds = previous
+
+
+class HostConnectionSlots:
+    """
+    Slots of connections shared by the processes of a host.
+
+    :param directory: directory of the lock files of the slots
+    :param slots: number of slots
+    :param timeout: seconds to wait for a slot before raising ``sqlalchemy.exc.TimeoutError``
+    """
+
+    def __init__(self, directory: str, slots: int, timeout: float):
+        if slots < 1:
+            raise ValueError(f"The number of connection slots must be positive, got {slots}")
+        self.directory = directory
+        self.slots = slots
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._fd: Optional[int] = None
+        self._connections = 0
+        _instances.add(self)
+
+    @property
+    def held(self) -> bool:
+        """Whether this process holds a slot"""
+        self._check_pid()
+        return self._fd is not None
+
+    def _check_pid(self):
+        if self._pid == os.getpid():
+            return
+        # The lock of the slot belongs to the parent process. Closing the inherited
+        # descriptor does not release it, unlike unlocking it would.
+        if self._fd is not None:
+            os.close(self._fd)
+        self._pid = os.getpid()
+        self._fd = None
+        self._connections = 0
+
+    def _after_fork_in_child(self):
+        # Another thread of the parent may have held the lock when it forked
+        self._lock = threading.Lock()
+        self._check_pid()
+
+    def _try_lock_slot(self) -> Optional[int]:
+        os.makedirs(self.directory, exist_ok=True)
+        for slot in random.sample(range(self.slots), self.slots):
+            fd = os.open(
+                os.path.join(self.directory, f'slot-{slot}'), os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o666
+            )
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def acquire(self) -> None:
+        """Takes a slot for a new connection, waiting for one if this process holds none"""
+        with self._lock:
+            self._check_pid()
+            if self._fd is None:
+                max_wait = getattr(_wait_limit, 'seconds', None)
+                timeout = self.timeout if max_wait is None else min(self.timeout, max_wait)
+                deadline = time.monotonic() + timeout
+                interval = _POLL_INTERVAL
+                fd = self._try_lock_slot()
+                while fd is None:
+                    if time.monotonic() >= deadline:
+                        raise exc.TimeoutError(
+                            f"All the {self.slots} connection slots of the host are taken, "
+                            f"timed out after {timeout} seconds"
+                        )
+                    time.sleep(interval)
+                    interval = min(interval * 2, _MAX_POLL_INTERVAL)
+                    fd = self._try_lock_slot()
+                self._fd = fd
+            self._connections += 1
+
+    def release(self) -> None:
+        """Releases the slot of a closed connection, freeing it after the last connection"""
+        with self._lock:
+            self._check_pid()
+            if self._connections == 0:
+                return
+            self._connections -= 1
+            if self._connections == 0 and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+
+
+def _close_inherited_slots():
+    for slots in list(_instances):
+        slots._after_fork_in_child()  # pylint: disable=protected-access
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_close_inherited_slots)
+
+
+def get_host_connection_slots(sql_alchemy_conn: str) -> Optional[HostConnectionSlots]:
+    """
+    Returns the connection slots shared by the task processes of the host, None when
+    ``[core] task_connection_slots`` is not set.
+    """
+    slots = conf.getint('core', 'task_connection_slots', fallback=0)
+    if slots <= 0:
+        return None
+    directory = conf.get('core', 'task_connection_slots_folder', fallback='')
+    if not directory:
+        # Keep the slots of different databases apart
+        digest = hashlib.md5(sql_alchemy_conn.encode('utf-8')).hexdigest()[:12]
+        directory = os.path.join(tempfile.gettempdir(), f'airflow-connection-slots-{digest}')
+    timeout = conf.getfloat('core', 'task_connection_slot_timeout', fallback=300)
+    return HostConnectionSlots(directory, slots, timeout)
+
+
+def limit_connections(engine, slots: HostConnectionSlots) -> None:
+    """
+    Makes every connection opened by the engine take a slot of the host, until it
+    is closed. Meant for engines without pool, whose connections are closed when
+    they are returned.
+    """
+    # pylint: disable=unused-argument, unused-variable
+    @event.listens_for(engine, "do_connect")
+    def do_connect(dialect, conn_rec, cargs, cparams):
+        slots.acquire()
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except Exception:
+            slots.release()
+            raise
+
+    @event.listens_for(engine, "close")
+    def close(dbapi_connection, connection_record):
+        slots.release()
+
+    @event.listens_for(engine, "close_detached")
+    def close_detached(dbapi_connection):
+        slots.release()
@@ -42,7 +42,7 @@ from airflow.exceptions import AirflowException
 from airflow.models import errors
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance
 from airflow.settings import STORE_DAG_CODE, STORE_SERIALIZED_DAGS
-from airflow.stats import Stats
+from airflow.stats import Stats, serve_metrics
 from airflow.utils import timezone
 from airflow.utils.file import list_py_file_paths
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -450,12 +450,15 @@ class DagFileProcessorAgent(LoggingMixin, MultiprocessingStartMethodMixin):
         # do not recreate the SQLA connection pool.
         os.environ['CONFIG_PROCESSOR_MANAGER_LOGGER'] = 'True'
         os.environ['AIRFLOW__LOGGING__COLORED_CONSOLE_LOG'] = 'False'
+        conf.invalidate_snapshot()
         # Replicating the behavior of how logging module was loaded
         # in logging_config.py
         importlib.reload(import_module(airflow.settings.LOGGING_CLASS_PATH.rsplit('.', 1)[0]))
         importlib.reload(airflow.settings)
         airflow.settings.initialize()
         del os.environ['CONFIG_PROCESSOR_MANAGER_LOGGER']
+        # The metrics recorded by the scheduler before the fork are served by the scheduler
+        serve_metrics(conf.getint('scheduler', 'prometheus_dag_processor_port'), reset=True)
         processor_manager = DagFileProcessorManager(dag_directory,
                                                     max_runs,
                                                     processor_factory,
@@ -821,11 +824,14 @@ class DagFileProcessorManager(LoggingMixin):  # pylint: disable=too-many-instanc
                     poll_time = 0.0
 
     def _add_callback_to_queue(self, request: FailureCallbackRequest):
-        self._callback_to_execute[request.full_filepath].append(request)
+        self._add_callbacks_to_queue(request.full_filepath, [request])
+
+    def _add_callbacks_to_queue(self, file_path: str, requests: List[FailureCallbackRequest]):
+        self._callback_to_execute[file_path].extend(requests)
         # Callback has a higher priority over DAG Run scheduling
-        if request.full_filepath in self._file_path_queue:
-            self._file_path_queue.remove(request.full_filepath)
-        self._file_path_queue.insert(0, request.full_filepath)
+        if file_path in self._file_path_queue:
+            self._file_path_queue.remove(file_path)
+        self._file_path_queue.insert(0, file_path)
 
     def _refresh_dag_dir(self):
         """
@@ -1210,6 +1216,8 @@ class DagFileProcessorManager(LoggingMixin):  # pylint: disable=too-many-instanc
             limit_dttm = timezone.utcnow() - timedelta(seconds=self._zombie_threshold_secs)
             self.log.info("Failing jobs without heartbeat after %s", limit_dttm)
 
+            # Running task instances are found through the narrow ``ti_state_job_id``
+            # index, so this query does not grow with the task instance history
             zombies = (
                 session.query(TI, DM.fileloc)
                 .join(LJ, TI.job_id == LJ.id)
@@ -1224,6 +1232,7 @@ class DagFileProcessorManager(LoggingMixin):  # pylint: disable=too-many-instanc
             )
 
             self._last_zombie_query_time = timezone.utcnow()
+            requests_by_file: Dict[str, List[FailureCallbackRequest]] = defaultdict(list)
             for ti, file_loc in zombies:
                 request = FailureCallbackRequest(
                     full_filepath=file_loc,
@@ -1231,8 +1240,12 @@ class DagFileProcessorManager(LoggingMixin):  # pylint: disable=too-many-instanc
                     msg="Detected as zombie",
                 )
                 self.log.info("Detected zombie job: %s", request)
-                self._add_callback_to_queue(request)
-                Stats.incr('zombies_killed')
+                requests_by_file[request.full_filepath].append(request)
+
+            for file_path, requests in requests_by_file.items():
+                self._add_callbacks_to_queue(file_path, requests)
+            if zombies:
+                Stats.incr('zombies_killed', len(zombies))
 
     def _cleanup_stale_dags(self):
         """
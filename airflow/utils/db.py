@@ -29,6 +29,7 @@ from airflow.jobs.base_job import BaseJob  # noqa: F401 # pylint: disable=unused
 from airflow.models import (  # noqa: F401 # pylint: disable=unused-import
     DAG, XCOM_RETURN_KEY, BaseOperator, BaseOperatorLink, Connection, DagBag, DagModel, DagPickle, DagRun,
     DagTag, Log, Pool, SkipMixin, SlaMiss, TaskFail, TaskInstance, TaskReschedule, Variable, XCom,
+    import_all_models,
 )
 # We need to add this model manually to get reset working well
 # noinspection PyUnresolvedReferences
@@ -40,6 +41,9 @@ from airflow.utils.session import (  # noqa: F401 # pylint: disable=unused-impor
 
 log = logging.getLogger(__name__)
 
+# The models are loaded lazily, but the metadata must know all the tables to create or drop them
+import_all_models()
+
 
 @provide_session
 def merge_conn(conn, session=None):
@@ -18,14 +18,102 @@
 """File logging handler for tasks."""
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Tuple
 
 import requests
 
 from airflow.configuration import AirflowConfigException, conf
-from airflow.models import TaskInstance
 from airflow.utils.file import mkdirs
 from airflow.utils.helpers import parse_template_string
+from airflow.utils.log.log_index import LogIndex
+
+if TYPE_CHECKING:
+    # Configuring the logging must not import the models
+    from airflow.models import TaskInstance
+
+# Size of the chunks in which logs are streamed, so that the memory used to serve
+# a log does not depend on its size
+LOG_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class LogStream(NamedTuple):
+    """
+    Bytes of a task log, between the ``start`` and ``stop`` offsets, streamed
+    in chunks. ``stop`` and ``size`` are None when they are unknown. When a
+    window of lines was requested, ``lines`` holds the (start, stop) line
+    numbers of the window and the number of lines of the log.
+    """
+
+    chunks: Iterator[bytes]
+    start: int
+    stop: Optional[int]
+    size: Optional[int]
+    lines: Optional[Tuple[int, int, int]] = None
+
+
+def resolve_byte_range(byte_range: Optional[Tuple[int, Optional[int]]], size: int) -> Tuple[int, int]:
+    """
+    Resolves a range of bytes against the size of a log.
+
+    :param byte_range: (start, stop) offsets, stop excluded and None meaning the
+        end of the log. A negative start selects the last bytes of the log.
+    :param size: size of the log
+    :return: the (start, stop) offsets within the log
+    """
+    if byte_range is None:
+        return 0, size
+    start, stop = byte_range
+    if start < 0:
+        start = max(0, size + start)
+    start = min(start, size)
+    stop = size if stop is None else min(stop, size)
+    return start, max(start, stop)
+
+
+def read_file_chunks(path: str, start: int, stop: int) -> Iterator[bytes]:
+    """Reads the bytes of a file between the ``start`` and ``stop`` offsets in chunks"""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = file.read(min(LOG_STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _resolve_line_range_in_bytes(
+    data: bytes, line_range: Tuple[int, Optional[int]]
+) -> Tuple[int, int, int, int, int]:
+    offsets = [0]
+    newline = data.find(b'\n')
+    while newline != -1:
+        offsets.append(newline + 1)
+        newline = data.find(b'\n', newline + 1)
+    if offsets[-1] == len(data):
+        # No last line without line break
+        offsets.pop()
+    num_lines = len(offsets)
+    offsets.append(len(data))
+
+    start, stop = line_range
+    if start < 0:
+        start = max(0, num_lines + start)
+    start = min(start, num_lines)
+    stop = num_lines if stop is None else max(start, min(stop, num_lines))
+    return start, stop, num_lines, offsets[start], offsets[stop]
+
+
+def _slice_chunks(chunks: Iterable[bytes], start: int, stop: int) -> Iterator[bytes]:
+    position = 0
+    for chunk in chunks:
+        chunk_start, position = position, position + len(chunk)
+        if position <= start:
+            continue
+        yield chunk[max(0, start - chunk_start):stop - chunk_start]
+        if position >= stop:
+            break
 
 
 class FileTaskHandler(logging.Handler):
@@ -41,11 +129,12 @@ class FileTaskHandler(logging.Handler):
     def __init__(self, base_log_folder: str, filename_template: str):
         super().__init__()
         self.handler = None  # type: Optional[logging.FileHandler]
+        self.index_logs = False
         self.local_base = base_log_folder
         self.filename_template, self.filename_jinja_template = \
             parse_template_string(filename_template)
 
-    def set_context(self, ti: TaskInstance):
+    def set_context(self, ti: "TaskInstance"):
         """
         Provide task_instance context to airflow task handler.
 
@@ -56,6 +145,7 @@ class FileTaskHandler(logging.Handler):
         if self.formatter:
             self.handler.setFormatter(self.formatter)
         self.handler.setLevel(self.level)
+        self.index_logs = conf.getboolean('logging', 'index_task_logs', fallback=False)
 
     def emit(self, record):
         if self.handler:
@@ -68,6 +158,16 @@ class FileTaskHandler(logging.Handler):
     def close(self):
         if self.handler:
             self.handler.close()
+            if self.index_logs:
+                self._index_log(self.handler.baseFilename)
+
+    def _index_log(self, location):
+        """Writes the line index of a complete log next to it"""
+        try:
+            LogIndex(location).update()
+        except OSError:
+            # The index is only an optimisation, the log can be read without it
+            pass
 
     def _render_filename(self, ti, try_number):
         if self.filename_jinja_template:
@@ -103,7 +203,7 @@ class FileTaskHandler(logging.Handler):
             try:
                 with open(location) as file:
                     log += "*** Reading local file: {}\n".format(location)
-                    log += "".join(file.readlines())
+                    log += file.read()
             except Exception as e:  # pylint: disable=broad-except
                 log = "*** Failed to load local log file: {}\n".format(location)
                 log += "*** {}\n".format(str(e))
@@ -132,22 +232,11 @@ class FileTaskHandler(logging.Handler):
                     ti.hostname, str(f)
                 )
         else:
-            url = os.path.join(
-                "http://{ti.hostname}:{worker_log_server_port}/log", log_relative_path
-            ).format(
-                ti=ti,
-                worker_log_server_port=conf.get('celery', 'WORKER_LOG_SERVER_PORT')
-            )
+            url = self._get_worker_log_url(ti, log_relative_path)
             log += "*** Log file does not exist: {}\n".format(location)
             log += "*** Fetching from: {}\n".format(url)
             try:
-                timeout = None  # No timeout
-                try:
-                    timeout = conf.getint('webserver', 'log_fetch_timeout_sec')
-                except (AirflowConfigException, ValueError):
-                    pass
-
-                response = requests.get(url, timeout=timeout)
+                response = requests.get(url, timeout=self._get_log_fetch_timeout())
                 response.encoding = "utf-8"
 
                 # Check if the resource was properly fetched
@@ -159,6 +248,154 @@ class FileTaskHandler(logging.Handler):
 
         return log, {'end_of_log': True}
 
+    @staticmethod
+    def _get_worker_log_url(ti, log_relative_path):
+        return os.path.join(
+            "http://{ti.hostname}:{worker_log_server_port}/log", log_relative_path
+        ).format(
+            ti=ti,
+            worker_log_server_port=conf.get('celery', 'WORKER_LOG_SERVER_PORT')
+        )
+
+    @staticmethod
+    def _get_log_fetch_timeout():
+        try:
+            return conf.getint('webserver', 'log_fetch_timeout_sec')
+        except (AirflowConfigException, ValueError):
+            return None  # No timeout
+
+    def stream(self, ti, try_number: int,
+               byte_range: Optional[Tuple[int, Optional[int]]] = None,
+               line_range: Optional[Tuple[int, Optional[int]]] = None) -> LogStream:
+        """
+        Streams the log of a try of a task instance in chunks of bytes, from the
+        local log file or from the log server of the worker, without ever holding
+        the whole log in memory.
+
+        :param ti: task instance object
+        :param try_number: try_number to read the log of
+        :param byte_range: optional (start, stop) range of bytes to read, stop
+            excluded and None meaning the end of the log. A negative start reads
+            the last bytes of the log.
+        :param line_range: optional (start, stop) range of lines to read, in the
+            same form as ``byte_range``. Local logs and the logs of the workers
+            are seeked with their line index. Takes precedence over ``byte_range``.
+        :return: the requested bytes of the log
+        """
+        if type(self)._read is not FileTaskHandler._read:  # pylint: disable=unidiomatic-typecheck
+            # Handlers reading the logs from remote storage only read them as a whole,
+            # unless they can stream the whole remote log
+            remote_chunks = None
+            if byte_range is None and line_range is None:
+                remote_chunks = self._read_remote_chunks(ti, try_number)
+            if remote_chunks is not None:
+                return LogStream(remote_chunks, 0, None, None)
+            return self._stream_from_read(ti, try_number, byte_range, line_range)
+
+        log_relative_path = self._render_filename(ti, try_number)
+        location = os.path.join(self.local_base, log_relative_path)
+        if os.path.exists(location):
+            if line_range is not None:
+                log_index = LogIndex(location)
+                log_index.update()
+                start_line, stop_line, start, stop = log_index.resolve_line_range(line_range)
+                return LogStream(read_file_chunks(location, start, stop), start, stop, log_index.size,
+                                 (start_line, stop_line, log_index.num_lines))
+            size = os.path.getsize(location)
+            start, stop = resolve_byte_range(byte_range, size)
+            return LogStream(read_file_chunks(location, start, stop), start, stop, size)
+
+        if conf.get('core', 'executor') == 'KubernetesExecutor':
+            return self._stream_from_read(ti, try_number, byte_range, line_range)
+
+        url = self._get_worker_log_url(ti, log_relative_path)
+        if line_range is not None:
+            return self._stream_lines_from_worker(url, line_range)
+        return self._stream_from_worker(url, byte_range)
+
+    def _read_remote_chunks(  # pylint: disable=unused-argument
+        self, ti, try_number
+    ) -> Optional[Iterator[bytes]]:
+        """
+        Template method streaming the whole remote log of a try in chunks of
+        bytes, or returning None when the log has to be read with ``_read``.
+
+        :param ti: task instance object
+        :param try_number: try_number to read the log of
+        """
+        return None
+
+    def _stream_from_read(self, ti, try_number, byte_range, line_range=None):
+        log, _ = self._read(ti, try_number)
+        data = log.encode('utf-8')
+        lines = None
+        if line_range is not None:
+            start_line, stop_line, num_lines, start, stop = _resolve_line_range_in_bytes(data, line_range)
+            lines = (start_line, stop_line, num_lines)
+        else:
+            start, stop = resolve_byte_range(byte_range, len(data))
+        chunks = (data[offset:min(offset + LOG_STREAM_CHUNK_SIZE, stop)]
+                  for offset in range(start, stop, LOG_STREAM_CHUNK_SIZE))
+        return LogStream(chunks, start, stop, len(data), lines)
+
+    def _stream_lines_from_worker(self, url, line_range):
+        start_line, stop_line = line_range
+        if start_line < 0:
+            params = {'tail_lines': -start_line}
+        else:
+            params = {'start_line': start_line}
+            if stop_line is not None:
+                params['num_lines'] = max(0, stop_line - start_line)
+
+        response = requests.get(url, params=params, timeout=self._get_log_fetch_timeout(), stream=True)
+        response.raise_for_status()
+        if 'X-Log-Lines' not in response.headers:
+            # The log server does not index the logs and returned the whole log
+            data = response.content
+            start_line, stop_line, num_lines, start, stop = _resolve_line_range_in_bytes(data, line_range)
+            return LogStream(iter([data[start:stop]]), start, stop, len(data),
+                             (start_line, stop_line, num_lines))
+        chunks = response.iter_content(LOG_STREAM_CHUNK_SIZE)
+
+        # <start>-<stop>/<total>, the stop being excluded
+        lines, _, num_lines = response.headers['X-Log-Lines'].partition('/')
+        offsets, _, size = response.headers['X-Log-Bytes'].partition('/')
+        start_line, _, stop_line = lines.partition('-')
+        start, _, stop = offsets.partition('-')
+        return LogStream(chunks, int(start), int(stop), int(size),
+                         (int(start_line), int(stop_line), int(num_lines)))
+
+    def _stream_from_worker(self, url, byte_range):
+        headers = {}
+        if byte_range is not None:
+            start, stop = byte_range
+            if start < 0:
+                headers['Range'] = 'bytes={}'.format(start)
+            else:
+                headers['Range'] = 'bytes={}-{}'.format(start, '' if stop is None else stop - 1)
+
+        response = requests.get(url, timeout=self._get_log_fetch_timeout(), headers=headers, stream=True)
+        response.raise_for_status()
+        chunks = response.iter_content(LOG_STREAM_CHUNK_SIZE)
+
+        content_range = response.headers.get('Content-Range')
+        if response.status_code == 206 and content_range:
+            # bytes <start>-<end>/<size>, the size being * when unknown
+            offsets, _, size = content_range.split(' ', 1)[-1].partition('/')
+            range_start, _, range_end = offsets.partition('-')
+            return LogStream(chunks, int(range_start), int(range_end) + 1,
+                             int(size) if size.isdigit() else None)
+
+        content_length = response.headers.get('Content-Length')
+        if content_length is None:
+            return LogStream(chunks, 0, None, None)
+        size = int(content_length)
+        start, stop = resolve_byte_range(byte_range, size)
+        if (start, stop) != (0, size):
+            # The log server ignored the range
+            chunks = _slice_chunks(chunks, start, stop)
+        return LogStream(chunks, start, stop, size)
+
     def read(self, task_instance, try_number=None, metadata=None):
         """
         Read logs of given task instance from local machine.
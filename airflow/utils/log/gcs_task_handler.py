@@ -23,6 +23,10 @@ from cached_property import cached_property
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.log_compression import (
+    compress_file, filter_log_parts, get_download_ranges, get_log_part_location, get_remote_log_compression,
+    read_log_parts,
+)
 from airflow.utils.log.logging_mixin import LoggingMixin
 
 
@@ -86,10 +90,14 @@ class GCSTaskHandler(FileTaskHandler, LoggingMixin):
         local_loc = os.path.join(self.local_base, self.log_relative_path)
         remote_loc = os.path.join(self.remote_base, self.log_relative_path)
         if os.path.exists(local_loc):
-            # read log and remove old logs to get just the latest additions
-            with open(local_loc, 'r') as logfile:
-                log = logfile.read()
-            self.gcs_write(log, remote_loc)
+            compression = get_remote_log_compression()
+            if compression:
+                self.gcs_write_part(local_loc, remote_loc, compression)
+            else:
+                # read log and remove old logs to get just the latest additions
+                with open(local_loc, 'r') as logfile:
+                    log = logfile.read()
+                self.gcs_write(log, remote_loc)
 
         # Mark closed so we don't double write if close is called twice
         self.closed = True
@@ -111,7 +119,11 @@ class GCSTaskHandler(FileTaskHandler, LoggingMixin):
         remote_loc = os.path.join(self.remote_base, log_relative_path)
 
         try:
-            remote_log = self.gcs_read(remote_loc)
+            log_parts = self.gcs_log_parts(remote_loc)
+            if log_parts:
+                remote_log = b''.join(self.gcs_read_parts(remote_loc, log_parts)).decode('utf-8', 'replace')
+            else:
+                remote_log = self.gcs_read(remote_loc)
             log = '*** Reading remote log from {}.\n{}\n'.format(
                 remote_loc, remote_log)
             return log, {'end_of_log': True}
@@ -123,6 +135,59 @@ class GCSTaskHandler(FileTaskHandler, LoggingMixin):
             log += local_log
             return log, metadata
 
+    def _read_remote_chunks(self, ti, try_number):
+        remote_loc = os.path.join(self.remote_base, self._render_filename(ti, try_number))
+        try:
+            log_parts = self.gcs_log_parts(remote_loc)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if not log_parts:
+            return None
+        return self.gcs_read_parts(remote_loc, log_parts)
+
+    def gcs_log_parts(self, remote_log_location):
+        """
+        Returns the compressed parts of the log at remote_log_location, in
+        upload order.
+
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        """
+        bkt, blob = self.parse_gcs_url(remote_log_location)
+        return [
+            'gs://{}/{}'.format(bkt, part)
+            for part in filter_log_parts(blob, self.hook.list(bkt, prefix=blob) or [])
+        ]
+
+    def gcs_read_parts(self, remote_log_location, log_parts):
+        """
+        Streams the decompressed log at remote_log_location in chunks of bytes,
+        starting with the log uploaded without compression if there is one.
+
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        :param log_parts: compressed parts of the log
+        :type log_parts: list
+        """
+        bkt, blob = self.parse_gcs_url(remote_log_location)
+        locations = [remote_log_location] if self.hook.exists(bkt, blob) else []
+        return read_log_parts(locations + list(log_parts), self.gcs_read_chunks)
+
+    def gcs_read_chunks(self, remote_log_location):
+        """
+        Downloads the object at remote_log_location in ranges of bytes, without
+        holding it whole in memory.
+
+        :param remote_log_location: the object's location in remote storage
+        :type remote_log_location: str (path)
+        """
+        bkt, blob_name = self.parse_gcs_url(remote_log_location)
+        blob = self.hook.get_conn().bucket(bkt).get_blob(blob_name)
+        if blob is None:
+            raise AirflowException('{} does not exist'.format(remote_log_location))
+        for start, end in get_download_ranges(blob.size):
+            yield blob.download_as_string(start=start, end=end)
+
     def gcs_read(self, remote_log_location):
         """
         Returns the log found at the remote_log_location.
@@ -167,6 +232,29 @@ class GCSTaskHandler(FileTaskHandler, LoggingMixin):
         except Exception as e:  # pylint: disable=broad-except
             self.log.error('Could not write logs to %s: %s', remote_log_location, e)
 
+    def gcs_write_part(self, local_log_location, remote_log_location, compression):
+        """
+        Uploads the local log as a new compressed part of the log at
+        remote_log_location, without reading the remote log. Fails silently
+        if no hook was created.
+
+        :param local_log_location: path of the local log
+        :type local_log_location: str
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        :param compression: compression of the part, gzip or zstd
+        :type compression: str
+        """
+        part_location = get_log_part_location(remote_log_location, compression)
+        compressed_path = compress_file(local_log_location, compression)
+        try:
+            bkt, blob = self.parse_gcs_url(part_location)
+            self.hook.upload(bkt, blob, compressed_path)
+        except Exception as e:  # pylint: disable=broad-except
+            self.log.error('Could not write logs to %s: %s', part_location, e)
+        finally:
+            os.remove(compressed_path)
+
     @staticmethod
     def parse_gcs_url(gsurl):
         """
@@ -0,0 +1,181 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compression of the task logs uploaded to remote storage.
+
+When ``[logging] remote_log_compression`` is set, the remote task handlers
+upload every log as a new compressed part next to the log location, named
+``<log location>.<upload time><suffix>``, instead of reading the remote log
+back to append to it. Reading the log concatenates the parts in upload order,
+after the uncompressed log written without compression if there is one.
+"""
+import gzip
+import os
+import re
+import shutil
+import zlib
+from tempfile import NamedTemporaryFile
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from airflow.configuration import AirflowConfigException, conf
+from airflow.utils import timezone
+
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+_PART_RE = re.compile(r'\.\d{8}T\d{12}(?P<suffix>\.gz|\.zst)$')
+_READ_CHUNK_SIZE = 64 * 1024
+# Size of the ranges of a remote log downloaded one after the other, by the
+# handlers whose storage client has no streaming download
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def get_remote_log_compression() -> Optional[str]:
+    """Returns the compression of the uploaded logs, None when they are not compressed"""
+    compression = conf.get('logging', 'remote_log_compression', fallback='').strip().lower()
+    if not compression:
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise AirflowConfigException(
+            'Unsupported remote_log_compression {!r}, expected one of {}'.format(
+                compression, ', '.join(sorted(COMPRESSION_SUFFIXES)))
+        )
+    if compression == 'zstd':
+        _import_zstandard()
+    return compression
+
+
+def _import_zstandard():
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise AirflowConfigException(
+            'The zstandard package is needed to read or write logs compressed with zstd. '
+            'Please install it with `pip install zstandard`.'
+        )
+    return zstandard
+
+
+def get_log_part_location(remote_log_location: str, compression: str) -> str:
+    """
+    Returns the location of a new compressed part of a remote log, sorting
+    after the parts uploaded before.
+
+    :param remote_log_location: location of the log in remote storage
+    :param compression: compression of the part
+    """
+    return '{}.{}{}'.format(
+        remote_log_location, timezone.utcnow().strftime('%Y%m%dT%H%M%S%f'), COMPRESSION_SUFFIXES[compression]
+    )
+
+
+def get_log_part_compression(location: str) -> Optional[str]:
+    """Returns the compression of a part of a remote log from its suffix"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if location.endswith(suffix):
+            return compression
+    return None
+
+
+def filter_log_parts(remote_log_location: str, locations: Iterable[str]) -> List[str]:
+    """
+    Returns the compressed parts of a remote log among a listing of locations,
+    in upload order.
+
+    :param remote_log_location: location of the log in remote storage
+    :param locations: locations sharing the prefix of the log location
+    """
+    return sorted(
+        location for location in locations
+        if location.startswith(remote_log_location) and
+        _PART_RE.match(location[len(remote_log_location):])
+    )
+
+
+def compress_file(path: str, compression: str) -> str:
+    """
+    Compresses a file into a temporary file in the same directory, without
+    holding it in memory.
+
+    :param path: path of the file to compress
+    :param compression: compression to use
+    :return: path of the compressed file, to be removed by the caller
+    """
+    with open(path, 'rb') as source, NamedTemporaryFile(
+        dir=os.path.dirname(path), suffix=COMPRESSION_SUFFIXES[compression], delete=False
+    ) as destination:
+        if compression == 'gzip':
+            with gzip.GzipFile(fileobj=destination, mode='wb') as compressed:
+                shutil.copyfileobj(source, compressed, _READ_CHUNK_SIZE)
+        else:
+            zstandard = _import_zstandard()
+            zstandard.ZstdCompressor().copy_stream(source, destination)
+    return destination.name
+
+
+def decompress_chunks(chunks: Iterable[bytes], compression: Optional[str]) -> Iterator[bytes]:
+    """
+    Decompresses a compressed stream of chunks of bytes, chunk by chunk.
+
+    :param chunks: chunks of the compressed bytes
+    :param compression: compression of the bytes, None if they are not compressed
+    """
+    if compression is None:
+        yield from chunks
+        return
+    if compression == 'gzip':
+        # Accept the gzip header and trailer
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    else:
+        decompressor = _import_zstandard().ZstdDecompressor().decompressobj()
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    if compression == 'gzip':
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+def get_download_ranges(size: int, chunk_size: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Returns the byte ranges to download a remote object of the given size in
+    chunks, as inclusive (start, end) offsets.
+
+    :param size: size of the object in bytes
+    :param chunk_size: maximum size of a range, ``DOWNLOAD_CHUNK_SIZE`` by default
+    """
+    chunk_size = chunk_size or DOWNLOAD_CHUNK_SIZE
+    for start in range(0, size, chunk_size):
+        yield start, min(start + chunk_size, size) - 1
+
+
+def read_log_parts(
+    locations: Iterable[str], read_chunks: Callable[[str], Iterable[bytes]]
+) -> Iterator[bytes]:
+    """
+    Reads and decompresses the parts of a remote log one after the other.
+
+    :param locations: locations of the parts, in order
+    :param read_chunks: callable returning the raw chunks of bytes of a location
+    """
+    for location in locations:
+        yield from decompress_chunks(read_chunks(location), get_log_part_compression(location))
@@ -0,0 +1,223 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Sidecar line index of the local log files.
+
+The index of ``<log>`` is stored next to it in ``<log>.idx``: a fixed size
+header followed by fixed size entries, one every ``interval`` lines, holding
+the line number, the byte offset at which the line starts and the timestamp
+of the line. Any line of the log is found by reading a single entry and at
+most ``interval`` lines of the log, whatever the size of the log.
+
+The index only covers complete lines, and is extended from where it stopped
+every time it is updated, so the log is only ever scanned once.
+"""
+import fcntl
+import os
+import re
+import struct
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from airflow.configuration import conf
+
+INDEX_SUFFIX = '.idx'
+
+_MAGIC = b'AFLI'
+# magic, interval, indexed bytes, indexed lines, timestamp of the last entry
+_HEADER = struct.Struct('<4sIQQd')
+# line number, byte offset of the start of the line, timestamp of the line
+_ENTRY = struct.Struct('<QQd')
+
+_SCAN_CHUNK_SIZE = 64 * 1024
+# Number of bytes read at the start of an indexed line to find its timestamp
+_TIMESTAMP_PREFIX_SIZE = 32
+# Lines of the task logs start with the ``asctime`` of the record between brackets
+_TIMESTAMP_RE = re.compile(rb'^\[(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:[,.](\d{1,6}))?')
+
+
+def _parse_timestamp(prefix: bytes) -> Optional[float]:
+    match = _TIMESTAMP_RE.match(prefix)
+    if not match:
+        return None
+    try:
+        timestamp = datetime.strptime(match.group(1).decode().replace('T', ' '), '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+    fraction = match.group(2)
+    return timestamp.timestamp() + (int(fraction) / 10 ** len(fraction) if fraction else 0)
+
+
+class LogIndex:
+    """
+    Line index of a local log file, stored in a sidecar file.
+
+    :param log_path: path of the log file
+    :type log_path: str
+    :param interval: number of lines between two entries of the index,
+        ``[logging] log_index_interval`` by default
+    :type interval: int
+    """
+
+    def __init__(self, log_path: str, interval: Optional[int] = None):
+        self.log_path = log_path
+        self.index_path = log_path + INDEX_SUFFIX
+        self.interval = max(1, interval or conf.getint('logging', 'log_index_interval'))
+        # State of the index after the last update
+        self.size = 0
+        self.indexed_bytes = 0
+        self.indexed_lines = 0
+        self.num_entries = 0
+
+    @property
+    def num_lines(self) -> int:
+        """Number of lines of the log, counting a last line without line break"""
+        return self.indexed_lines + (1 if self.size > self.indexed_bytes else 0)
+
+    def update(self) -> None:
+        """Indexes the lines written to the log since the last update"""
+        index_fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT, 0o666)
+        with os.fdopen(index_fd, 'r+b') as index_file, open(self.log_path, 'rb') as log_file:
+            fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                self._update(index_file, log_file)
+            finally:
+                fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    def _update(self, index_file, log_file) -> None:
+        header = index_file.read(_HEADER.size)
+        self.size = os.fstat(log_file.fileno()).st_size
+        last_timestamp = 0.0
+        if len(header) == _HEADER.size:
+            magic, interval, indexed_bytes, indexed_lines, last_timestamp = _HEADER.unpack(header)
+        if (
+            len(header) != _HEADER.size or magic != _MAGIC or interval != self.interval or
+            indexed_bytes > self.size
+        ):
+            # No index yet, an index of another interval or of a log that was truncated
+            index_file.truncate(0)
+            index_file.write(bytes(_HEADER.size))
+            indexed_bytes, indexed_lines, last_timestamp = 0, 0, 0.0
+
+        entries: List[bytes] = []
+        log_file.seek(indexed_bytes)
+        line_start = position = indexed_bytes
+        while position < self.size:
+            chunk = log_file.read(min(_SCAN_CHUNK_SIZE, self.size - position))
+            if not chunk:
+                break
+            newline = chunk.find(b'\n')
+            while newline != -1:
+                if indexed_lines % self.interval == 0:
+                    prefix = os.pread(log_file.fileno(), _TIMESTAMP_PREFIX_SIZE, line_start)
+                    # Lines without timestamp, like the ones of a traceback, get the one before
+                    last_timestamp = _parse_timestamp(prefix) or last_timestamp
+                    entries.append(_ENTRY.pack(indexed_lines, line_start, last_timestamp))
+                indexed_lines += 1
+                line_start = position + newline + 1
+                newline = chunk.find(b'\n', newline + 1)
+            position += len(chunk)
+        indexed_bytes = line_start
+
+        index_file.seek(0, os.SEEK_END)
+        index_file.write(b''.join(entries))
+        index_file.seek(0)
+        index_file.write(_HEADER.pack(_MAGIC, self.interval, indexed_bytes, indexed_lines, last_timestamp))
+        index_file.flush()
+
+        self.indexed_bytes = indexed_bytes
+        self.indexed_lines = indexed_lines
+        self.num_entries = (indexed_lines + self.interval - 1) // self.interval
+
+    def _read_entry(self, index_file, entry: int) -> Tuple[int, int, float]:
+        index_file.seek(_HEADER.size + entry * _ENTRY.size)
+        return _ENTRY.unpack(index_file.read(_ENTRY.size))
+
+    def get_line_offset(self, line: int) -> int:
+        """
+        Returns the byte offset at which a line starts, or the size of the log
+        if it has fewer lines. Reads at most ``interval`` lines of the log.
+
+        :param line: number of the line, starting at 0
+        """
+        if line <= 0:
+            return 0
+        if line >= self.num_lines:
+            return self.size
+        if line >= self.indexed_lines:
+            # The last line, without line break
+            return self.indexed_bytes
+
+        with open(self.index_path, 'rb') as index_file:
+            entry_line, offset, _ = self._read_entry(index_file, line // self.interval)
+        with open(self.log_path, 'rb') as log_file:
+            log_file.seek(offset)
+            for _ in range(line - entry_line):
+                offset += len(log_file.readline())
+        return offset
+
+    def resolve_line_range(self, line_range: Tuple[int, Optional[int]]) -> Tuple[int, int, int, int]:
+        """
+        Resolves a range of lines into the range of bytes holding them.
+
+        :param line_range: (start, stop) line numbers, stop excluded and None
+            meaning the end of the log. A negative start selects the last lines.
+        :return: the resolved (start, stop) line numbers and the (start, stop)
+            byte offsets of these lines
+        """
+        start, stop = line_range
+        num_lines = self.num_lines
+        if start < 0:
+            start = max(0, num_lines + start)
+        start = min(start, num_lines)
+        stop = num_lines if stop is None else max(start, min(stop, num_lines))
+        return start, stop, self.get_line_offset(start), self.get_line_offset(stop)
+
+    def find_line(self, timestamp: float) -> int:
+        """
+        Returns the number of an indexed line logged at or before the given
+        time, close enough to it that reading from there finds the lines logged
+        from that time on, in at most ``interval`` lines.
+
+        :param timestamp: POSIX timestamp of the time to look for
+        """
+        with open(self.index_path, 'rb') as index_file:
+            low, high = 0, self.num_entries
+            # Binary search of the first entry logged after the timestamp
+            while low < high:
+                middle = (low + high) // 2
+                if self._read_entry(index_file, middle)[2] <= timestamp:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low == 0:
+                return 0
+            return self._read_entry(index_file, low - 1)[0]
+
+
+def index_log_file(log_path: str, interval: Optional[int] = None) -> LogIndex:
+    """
+    Creates or extends the index of a log file.
+
+    :param log_path: path of the log file
+    :param interval: number of lines between two entries of the index
+    :return: the up to date index
+    """
+    log_index = LogIndex(log_path, interval)
+    log_index.update()
+    return log_index
@@ -23,6 +23,7 @@ from cached_property import cached_property
 from airflow.configuration import conf
 from airflow.models import TaskInstance
 from airflow.utils.helpers import render_log_filename
+from airflow.utils.log.file_task_handler import LogStream
 from airflow.utils.log.logging_mixin import ExternalLoggingMixin
 
 
@@ -86,6 +87,26 @@ class TaskLogReader:
                 logs, metadata = self.read_log_chunks(ti, current_try_number, metadata)
                 yield "\n".join(logs) + "\n"
 
+    def read_log_range(self, ti: TaskInstance, try_number: int,
+                       byte_range: Optional[Tuple[int, Optional[int]]] = None,
+                       line_range: Optional[Tuple[int, Optional[int]]] = None) -> LogStream:
+        """
+        Streams a range of bytes of the log of a try, in chunks of bounded size.
+
+        :param ti: The Task Instance
+        :type ti: TaskInstance
+        :param try_number: the task try number
+        :type try_number: int
+        :param byte_range: optional (start, stop) range of bytes, stop excluded and
+            None meaning the end of the log. A negative start reads the last bytes.
+        :type byte_range: Optional[Tuple[int, Optional[int]]]
+        :param line_range: optional (start, stop) range of lines, in the same form as
+            ``byte_range``. Takes precedence over ``byte_range``.
+        :type line_range: Optional[Tuple[int, Optional[int]]]
+        :rtype: airflow.utils.log.file_task_handler.LogStream
+        """
+        return self.log_handler.stream(ti, try_number, byte_range, line_range)
+
     @cached_property
     def log_handler(self):
         """Log handler, which is configured to read logs."""
@@ -101,6 +122,12 @@ class TaskLogReader:
 
         return hasattr(self.log_handler, 'read')
 
+    @property
+    def supports_stream(self):
+        """Checks if the log handler can stream ranges of the logs."""
+
+        return hasattr(self.log_handler, 'stream')
+
     @property
     def supports_external_link(self):
         """Check if the logging handler supports external links (e.g. to Elasticsearch, Stackdriver, etc)."""
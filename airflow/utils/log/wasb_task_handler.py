@@ -23,6 +23,10 @@ from cached_property import cached_property
 
 from airflow.configuration import conf
 from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.log_compression import (
+    compress_file, filter_log_parts, get_download_ranges, get_log_part_location, get_remote_log_compression,
+    read_log_parts,
+)
 from airflow.utils.log.logging_mixin import LoggingMixin
 
 
@@ -86,10 +90,14 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         local_loc = os.path.join(self.local_base, self.log_relative_path)
         remote_loc = os.path.join(self.remote_base, self.log_relative_path)
         if os.path.exists(local_loc):
-            # read log and remove old logs to get just the latest additions
-            with open(local_loc, 'r') as logfile:
-                log = logfile.read()
-            self.wasb_write(log, remote_loc, append=True)
+            compression = get_remote_log_compression()
+            if compression:
+                self.wasb_write_part(local_loc, remote_loc, compression)
+            else:
+                # read log and remove old logs to get just the latest additions
+                with open(local_loc, 'r') as logfile:
+                    log = logfile.read()
+                self.wasb_write(log, remote_loc, append=True)
 
             if self.delete_local_copy:
                 shutil.rmtree(os.path.dirname(local_loc))
@@ -112,6 +120,16 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         log_relative_path = self._render_filename(ti, try_number)
         remote_loc = os.path.join(self.remote_base, log_relative_path)
 
+        log_parts = self.wasb_log_parts(remote_loc)
+        if log_parts:
+            try:
+                remote_log = b''.join(self.wasb_read_parts(remote_loc, log_parts)).decode('utf-8', 'replace')
+            except AzureHttpError:
+                remote_log = 'Could not read logs from {}'.format(remote_loc)
+                self.log.exception(remote_log)
+            log = '*** Reading remote log from {}.\n{}\n'.format(
+                remote_loc, remote_log)
+            return log, {'end_of_log': True}
         if self.wasb_log_exists(remote_loc):
             # If Wasb remote file exists, we do not fetch logs from task instance
             # local machine even if there are errors reading remote logs, as
@@ -123,6 +141,13 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         else:
             return super()._read(ti, try_number)
 
+    def _read_remote_chunks(self, ti, try_number):
+        remote_loc = os.path.join(self.remote_base, self._render_filename(ti, try_number))
+        log_parts = self.wasb_log_parts(remote_loc)
+        if not log_parts:
+            return None
+        return self.wasb_read_parts(remote_loc, log_parts)
+
     def wasb_log_exists(self, remote_log_location):
         """
         Check if remote_log_location exists in remote storage
@@ -136,6 +161,48 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
             pass
         return False
 
+    def wasb_log_parts(self, remote_log_location):
+        """
+        Returns the compressed parts of the log at remote_log_location, in
+        upload order.
+
+        :param remote_log_location: log's location in remote storage
+        :return: locations of the parts, empty if there are none
+        """
+        try:
+            blobs = self.hook.connection.list_blobs(self.wasb_container, remote_log_location)
+            return filter_log_parts(remote_log_location, (blob.name for blob in blobs))
+        except Exception:  # pylint: disable=broad-except
+            return []
+
+    def wasb_read_parts(self, remote_log_location, log_parts):
+        """
+        Streams the decompressed log at remote_log_location in chunks of bytes,
+        starting with the log uploaded without compression if there is one.
+
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        :param log_parts: compressed parts of the log
+        :type log_parts: list
+        """
+        locations = [remote_log_location] if self.wasb_log_exists(remote_log_location) else []
+        return read_log_parts(locations + list(log_parts), self.wasb_read_chunks)
+
+    def wasb_read_chunks(self, remote_log_location):
+        """
+        Downloads the blob at remote_log_location in ranges of bytes, without
+        holding it whole in memory.
+
+        :param remote_log_location: the blob's location in remote storage
+        :type remote_log_location: str (path)
+        """
+        connection = self.hook.connection
+        size = connection.get_blob_properties(
+            self.wasb_container, remote_log_location).properties.content_length
+        for start, end in get_download_ranges(size):
+            yield connection.get_blob_to_bytes(
+                self.wasb_container, remote_log_location, start_range=start, end_range=end).content
+
     def wasb_read(self, remote_log_location, return_error=False):
         """
         Returns the log found at the remote_log_location. Returns '' if no
@@ -182,3 +249,24 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         except AzureHttpError:
             self.log.exception('Could not write logs to %s',
                                remote_log_location)
+
+    def wasb_write_part(self, local_log_location, remote_log_location, compression):
+        """
+        Uploads the local log as a new compressed part of the log at
+        remote_log_location, without reading the remote log.
+
+        :param local_log_location: path of the local log
+        :type local_log_location: str
+        :param remote_log_location: the log's location in remote storage
+        :type remote_log_location: str (path)
+        :param compression: compression of the part, gzip or zstd
+        :type compression: str
+        """
+        part_location = get_log_part_location(remote_log_location, compression)
+        compressed_path = compress_file(local_log_location, compression)
+        try:
+            self.hook.load_file(compressed_path, self.wasb_container, part_location)
+        except AzureHttpError:
+            self.log.exception('Could not write logs to %s', part_location)
+        finally:
+            os.remove(compressed_path)
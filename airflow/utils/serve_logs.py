@@ -21,21 +21,71 @@ import os
 import flask
 
 from airflow.configuration import conf
+from airflow.utils.log.file_task_handler import read_file_chunks
+from airflow.utils.log.log_index import LogIndex
 
+# Query arguments selecting a window of lines of the log
+LINE_WINDOW_ARGS = ('start_line', 'since', 'tail_lines')
 
-def serve_logs():
-    """Serves logs generated by Worker"""
-    print("Starting flask")
+
+def _get_line_range(log_index: LogIndex, args):
+    """Returns the (start, stop) range of lines selected by the query arguments"""
+    num_lines = args.get('num_lines', type=int)
+    tail_lines = args.get('tail_lines', type=int)
+    if tail_lines is not None:
+        return -tail_lines, None
+    start_line = args.get('start_line', type=int)
+    if start_line is None:
+        start_line = log_index.find_line(args.get('since', 0, type=float))
+    return start_line, None if num_lines is None else start_line + num_lines
+
+
+def create_app():
+    """
+    Creates the app serving the logs of the worker.
+
+    Logs are served as a whole, or partially with a ``Range`` header. Windows of
+    lines are selected with the ``start_line``, ``since`` (a POSIX timestamp)
+    or ``tail_lines`` query arguments, optionally with ``num_lines``, and found
+    with the line index of the log. The lines and bytes served are returned in
+    the ``X-Log-Lines`` and ``X-Log-Bytes`` headers, as ``<start>-<stop>/<total>``
+    with the stop excluded.
+    """
     flask_app = flask.Flask(__name__)
 
     @flask_app.route('/log/<path:filename>')
     def serve_logs_view(filename):  # pylint: disable=unused-variable
         log_directory = os.path.expanduser(conf.get('logging', 'BASE_LOG_FOLDER'))
-        return flask.send_from_directory(
-            log_directory,
-            filename,
+        path = flask.safe_join(log_directory, filename)
+        if not any(arg in flask.request.args for arg in LINE_WINDOW_ARGS):
+            return flask.send_from_directory(
+                log_directory,
+                filename,
+                mimetype="application/json",
+                as_attachment=False,
+                conditional=True)
+
+        if not os.path.isfile(path):
+            flask.abort(404)
+        log_index = LogIndex(path)
+        log_index.update()
+        line_range = _get_line_range(log_index, flask.request.args)
+        start_line, stop_line, start, stop = log_index.resolve_line_range(line_range)
+        return flask.Response(
+            read_file_chunks(path, start, stop),
             mimetype="application/json",
-            as_attachment=False)
+            headers={
+                'Content-Length': str(stop - start),
+                'X-Log-Lines': '{}-{}/{}'.format(start_line, stop_line, log_index.num_lines),
+                'X-Log-Bytes': '{}-{}/{}'.format(start, stop, log_index.size),
+            })
+
+    return flask_app
+
 
+def serve_logs():
+    """Serves logs generated by Worker"""
+    print("Starting flask")
+    flask_app = create_app()
     worker_log_server_port = conf.getint('celery', 'WORKER_LOG_SERVER_PORT')
     flask_app.run(host='0.0.0.0', port=worker_log_server_port)
@@ -34,6 +34,7 @@ from airflow.www.extensions.init_appbuilder_links import init_appbuilder_links
 from airflow.www.extensions.init_dagbag import init_dagbag
 from airflow.www.extensions.init_jinja_globals import init_jinja_globals
 from airflow.www.extensions.init_manifest_files import configure_manifest_files
+from airflow.www.extensions.init_response_cache import init_response_cache
 from airflow.www.extensions.init_security import init_api_experimental_auth, init_xframe_protection
 from airflow.www.extensions.init_session import init_logout_timeout, init_permanent_session
 from airflow.www.extensions.init_views import (
@@ -96,6 +97,7 @@ def create_app(config=None, testing=False, app_name="Airflow"):
     init_api_experimental_auth(flask_app)
 
     Cache(app=flask_app, config={'CACHE_TYPE': 'filesystem', 'CACHE_DIR': '/tmp'})
+    init_response_cache(flask_app)
 
     init_flash_views(flask_app)
 
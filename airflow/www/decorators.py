@@ -18,13 +18,17 @@
 
 import functools
 import gzip
+import hashlib
+import json
 from io import BytesIO as IO
 
 import pendulum
-from flask import after_this_request, flash, g, redirect, request, url_for
+from flask import Response, after_this_request, current_app, flash, g, redirect, request, url_for
 
+from airflow.configuration import conf
 from airflow.models import Log
 from airflow.utils.session import create_session
+from airflow.www.extensions.init_response_cache import response_cache
 
 
 def action_logging(f):
@@ -126,3 +130,64 @@ def has_dag_access(**dag_kwargs):
                                         __class__.__name__ + ".login"))
         return wrapper
     return decorator
+
+
+def cached_json_response(state_version=None):
+    """
+    Decorator to cache the JSON response of a view for ``[webserver] response_cache_ttl``
+    seconds, and to answer the conditional requests of the clients polling it.
+
+    Responses are cached per view, roles of the user, version of the permissions and
+    request arguments. When ``state_version`` is given, the cache key and the ETag also
+    include the value it returns, so that a GET request whose ETag still matches is answered with a 304
+    without running the view. Otherwise the ETag is computed from the response.
+
+    :param state_version: cheap callable returning a value that changes whenever the
+        response of the view changes and never goes back to a previous value, such as
+        the version of ``StateVersion``, or None if it cannot tell
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def view_func(*args, **kwargs):
+            ttl = conf.getint('webserver', 'response_cache_ttl', fallback=0)
+            version = state_version() if state_version else None
+            key = None
+            if version is not None or ttl > 0:
+                key = _get_response_cache_key(f.__name__, version)
+
+            if version is not None and request.method in ('GET', 'HEAD') and key in request.if_none_match:
+                response = Response(status=304)
+                response.set_etag(key)
+                return response
+
+            cached = response_cache.get(key) if ttl > 0 else None
+            if cached is None:
+                response = f(*args, **kwargs)
+                if ttl > 0 and response.status_code == 200:
+                    response_cache.set(key, response.get_data(), timeout=ttl)
+            else:
+                response = Response(cached, mimetype='application/json')
+
+            if version is not None:
+                response.set_etag(key)
+            else:
+                response.add_etag()
+            return response.make_conditional(request)
+
+        return view_func
+    return decorator
+
+
+def _get_response_cache_key(view_name, version):
+    roles = sorted(role.id for role in getattr(g.user, 'roles', []))
+    # Granting or revoking a permission changes the DAGs the roles can read
+    permission_version = current_app.appbuilder.sm.get_permission_index().version
+    key = json.dumps([
+        view_name,
+        version,
+        roles,
+        permission_version,
+        sorted(request.args.items(multi=True)),
+        sorted(request.form.items(multi=True)),
+    ], default=str)
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
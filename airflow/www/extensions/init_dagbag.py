@@ -16,9 +16,12 @@
 # under the License.
 
 import os
+import time
 
+from airflow.configuration import conf
 from airflow.models import DagBag
 from airflow.settings import DAGS_FOLDER, STORE_SERIALIZED_DAGS
+from airflow.stats import Stats
 
 
 def init_dagbag(app):
@@ -28,5 +31,34 @@ def init_dagbag(app):
     """
     if os.environ.get('SKIP_DAGS_PARSING') == 'True':
         app.dag_bag = DagBag(os.devnull, include_examples=False)
-    else:
-        app.dag_bag = DagBag(DAGS_FOLDER, store_serialized_dags=STORE_SERIALIZED_DAGS)
+        return
+
+    app.dag_bag = DagBag(DAGS_FOLDER, store_serialized_dags=STORE_SERIALIZED_DAGS)
+    if not STORE_SERIALIZED_DAGS:
+        return
+
+    if conf.getboolean('webserver', 'preload_app', fallback=False):
+        # Read all the DAGs before gunicorn forks the workers, which share them copy-on-write
+        app.dag_bag.collect_dags_from_db()
+
+    refresh_interval = conf.getint('webserver', 'dag_refresh_interval', fallback=30)
+    if refresh_interval > 0:
+        init_dagbag_refresh(app, refresh_interval)
+
+
+def init_dagbag_refresh(app, refresh_interval):
+    """
+    Refresh the serialized DAGs of the DagBag in place, at most every
+    ``refresh_interval`` seconds, before handling a request.
+    """
+    app.dag_bag_last_refresh = time.monotonic()
+
+    @app.before_request
+    def refresh_dag_bag():  # pylint: disable=unused-variable
+        if time.monotonic() - app.dag_bag_last_refresh < refresh_interval:
+            return
+        app.dag_bag_last_refresh = time.monotonic()
+        with Stats.timer('webserver.dag_bag_refresh_duration'):
+            refreshed = app.dag_bag.refresh_dags_from_db()
+        if refreshed:
+            Stats.incr('webserver.dag_bag_refreshed_dags', refreshed)
@@ -0,0 +1,59 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from flask import request
+from flask_caching import Cache
+
+from airflow.configuration import conf
+
+# Cache of the JSON responses polled by the UI, shared by the views
+# decorated with airflow.www.decorators.cached_json_response
+response_cache = Cache()
+
+
+def init_response_cache(app):
+    """
+    Initialize the cache of the JSON responses. Its backend is any Flask-Caching
+    cache type, the default keeps the responses in the memory of each worker and
+    a shared backend such as redis lets all the workers reuse the same entries.
+    """
+    config = {
+        'CACHE_TYPE': conf.get('webserver', 'response_cache_type', fallback='simple'),
+        'CACHE_KEY_PREFIX': 'airflow_response_',
+    }
+    cache_url = conf.get('webserver', 'response_cache_url', fallback=None)
+    if cache_url:
+        config['CACHE_REDIS_URL'] = cache_url
+        config['CACHE_MEMCACHED_SERVERS'] = cache_url.split(',')
+    response_cache.init_app(app, config=config)
+
+
+def init_api_conditional_requests(app, api_blueprint):
+    """
+    Add an ETag to the successful GET responses of the API, so that clients
+    polling it get a 304 Not Modified response when nothing changed.
+    """
+
+    def make_conditional(response):
+        if (request.blueprint == api_blueprint.name and request.method == 'GET' and
+                response.status_code == 200 and not response.direct_passthrough):
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
+    app.after_request(make_conditional)
@@ -22,6 +22,8 @@ import connexion
 from connexion import ProblemException
 from flask import Flask
 
+from airflow.www.extensions.init_response_cache import init_api_conditional_requests
+
 log = logging.getLogger(__name__)
 
 # airflow/www/extesions/init_views.py => airflow/
@@ -106,6 +108,7 @@ def init_api_connexion(app: Flask) -> None:
     ).blueprint
     app.register_error_handler(ProblemException, connexion_app.common_error_handler)
     app.extensions['csrf'].exempt(api_bp)
+    init_api_conditional_requests(app, api_bp)
 
 
 def init_api_experimental(app):
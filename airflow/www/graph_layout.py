@@ -0,0 +1,222 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Server side layout of the Graph view.
+
+The layout only depends on the structure of the DAG, so it is computed once
+per version of the DAG and cached on disk, in ``[webserver] graph_layout_cache_folder``,
+where every webserver worker finds it.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from airflow.configuration import conf
+
+# Tasks of the DAG as (task_id, ui_color, ui_fgcolor, downstream_task_ids) tuples
+DagStructureType = Tuple[Tuple[str, str, str, Tuple[str, ...]], ...]
+
+RANK_SEPARATION = 150
+NODE_SEPARATION = 50
+# Number of passes reordering the nodes of each rank to reduce edge crossings
+ORDERING_SWEEPS = 4
+
+log = logging.getLogger(__name__)
+
+
+def get_dag_structure(dag) -> DagStructureType:
+    """Returns the part of the DAG that the graph layout depends on, as a hashable tuple"""
+    return tuple(
+        (task.task_id, task.ui_color, task.ui_fgcolor, tuple(sorted(task.downstream_task_ids)))
+        for task in sorted(dag.tasks, key=lambda t: t.task_id)
+    )
+
+
+def get_graph_layout(
+    dag, arrange: str, dag_hash: Optional[str] = None, root: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Returns the nodes of the DAG with their coordinates and its edges, ready to
+    be rendered. Layouts are cached per version of the DAG, orientation and root.
+
+    :param dag: the DAG to lay out
+    :param arrange: orientation of the graph, one of LR, RL, TB and BT
+    :param dag_hash: hash of the serialized DAG. When it is not known, the layout
+        is keyed by a hash of the structure of the DAG.
+    :param root: regex of the tasks the DAG was filtered on, if any
+    """
+    structure = None
+    if dag_hash is None:
+        structure = get_dag_structure(dag)
+        dag_hash = hashlib.md5(repr(structure).encode('utf-8')).hexdigest()
+
+    cache_path = _get_cache_path(dag.dag_id, dag_hash, arrange, root)
+    if cache_path:
+        layout = _read_cached_layout(cache_path)
+        if layout is not None:
+            return layout
+
+    if structure is None:
+        structure = get_dag_structure(dag)
+    layout = _compute_graph_layout(structure, arrange)
+    layout['version'] = dag_hash
+    if cache_path:
+        _write_cached_layout(cache_path, dag_hash, layout)
+    return layout
+
+
+def _get_cache_path(dag_id: str, dag_hash: str, arrange: str, root: Optional[str]) -> Optional[str]:
+    folder = conf.get('webserver', 'graph_layout_cache_folder')
+    if not folder:
+        return None
+    name = [dag_hash, arrange]
+    if root:
+        name.append(hashlib.md5(root.encode('utf-8')).hexdigest())
+    return os.path.join(folder, dag_id, '.'.join(name) + '.json')
+
+
+def _read_cached_layout(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as layout_file:
+            return json.load(layout_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        log.warning("Unable to read the cached graph layout %s", path, exc_info=True)
+        return None
+
+
+def _write_cached_layout(path: str, dag_hash: str, layout: Dict[str, Any]) -> None:
+    """Writes the layout atomically, and removes the layouts of the other versions of the DAG"""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith('.json') and not name.startswith(dag_hash + '.'):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as tmp_file:
+            json.dump(layout, tmp_file)
+        os.replace(tmp_file.name, path)
+    except OSError:
+        log.warning("Unable to cache the graph layout in %s", path, exc_info=True)
+
+
+def _rank_nodes(task_ids: List[str], downstream: Dict[str, Tuple[str, ...]]) -> Dict[str, int]:
+    """Ranks every node with the length of the longest path from a root"""
+    indegree: Dict[str, int] = defaultdict(int)
+    for task_id in task_ids:
+        for child in downstream[task_id]:
+            indegree[child] += 1
+
+    ranks = {task_id: 0 for task_id in task_ids}
+    queue = deque(task_id for task_id in task_ids if not indegree[task_id])
+    while queue:
+        task_id = queue.popleft()
+        for child in downstream[task_id]:
+            ranks[child] = max(ranks[child], ranks[task_id] + 1)
+            indegree[child] -= 1
+            if not indegree[child]:
+                queue.append(child)
+    return ranks
+
+
+def _order_layers(
+    layers: List[List[str]],
+    upstream: Dict[str, List[str]],
+    downstream: Dict[str, Tuple[str, ...]],
+) -> None:
+    """Reorders the nodes of every layer by the barycenter of their neighbours"""
+    positions = {task_id: index for layer in layers for index, task_id in enumerate(layer)}
+
+    def reorder(layer: List[str], neighbours) -> None:
+        def barycenter(task_id):
+            linked = neighbours(task_id)
+            if not linked:
+                return positions[task_id]
+            return sum(positions[linked_id] for linked_id in linked) / len(linked)
+
+        layer.sort(key=barycenter)
+        for index, task_id in enumerate(layer):
+            positions[task_id] = index
+
+    for _ in range(ORDERING_SWEEPS):
+        for layer in layers[1:]:
+            reorder(layer, upstream.__getitem__)
+        for layer in reversed(layers[:-1]):
+            reorder(layer, downstream.__getitem__)
+
+
+def _compute_graph_layout(structure: DagStructureType, arrange: str) -> Dict[str, Any]:
+    task_ids = [task_id for task_id, _, _, _ in structure]
+    downstream = {task_id: children for task_id, _, _, children in structure}
+    upstream: Dict[str, List[str]] = {task_id: [] for task_id in task_ids}
+    for task_id in task_ids:
+        for child in downstream[task_id]:
+            upstream[child].append(task_id)
+
+    ranks = _rank_nodes(task_ids, downstream)
+    layers: List[List[str]] = [[] for _ in range(max(ranks.values(), default=-1) + 1)]
+    for task_id in task_ids:
+        layers[ranks[task_id]].append(task_id)
+    _order_layers(layers, upstream, downstream)
+
+    max_rank = len(layers) - 1
+    max_order = max((len(layer) for layer in layers), default=1) - 1
+    coordinates = {}
+    for rank, layer in enumerate(layers):
+        if arrange in ('RL', 'BT'):
+            rank = max_rank - rank
+        for order, task_id in enumerate(layer):
+            if arrange in ('TB', 'BT'):
+                coordinates[task_id] = (order * NODE_SEPARATION, rank * RANK_SEPARATION)
+            else:
+                coordinates[task_id] = (rank * RANK_SEPARATION, order * NODE_SEPARATION)
+
+    if arrange in ('TB', 'BT'):
+        width, height = max_order * NODE_SEPARATION, max_rank * RANK_SEPARATION
+    else:
+        width, height = max_rank * RANK_SEPARATION, max_order * NODE_SEPARATION
+
+    return {
+        'arrange': arrange,
+        'width': max(width, 0),
+        'height': max(height, 0),
+        'nodes': [
+            {
+                'id': task_id,
+                'x': coordinates[task_id][0],
+                'y': coordinates[task_id][1],
+                'rank': ranks[task_id],
+                'color': ui_color,
+                'fgcolor': ui_fgcolor,
+            }
+            for task_id, ui_color, ui_fgcolor, _ in structure
+        ],
+        'edges': [
+            {'source_id': task_id, 'target_id': child}
+            for task_id, _, _, children in structure
+            for child in children
+        ],
+    }
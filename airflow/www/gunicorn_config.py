@@ -17,6 +17,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import gc
+
 import setproctitle
 
 from airflow import settings
@@ -32,3 +34,19 @@ def post_worker_init(_):
     setproctitle.setproctitle(  # pylint: disable=c-extension-no-member
         settings.GUNICORN_WORKER_READY_PREFIX + old_title
     )
+
+
+def pre_fork(server, _):
+    """
+    Prepare the master of a preloaded webserver to fork a worker.
+
+    The connections opened while loading the app must not be shared with the
+    workers, and freezing the objects of the master keeps the garbage collector
+    of the workers from writing to them, which would copy their memory pages.
+    """
+    if not server.cfg.preload_app:
+        return
+    settings.engine.dispose()
+    # Not available before Python 3.7
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
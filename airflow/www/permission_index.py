@@ -0,0 +1,131 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compiled index of the permissions of the roles.
+
+Every webserver worker keeps the permission-views of all the roles in memory,
+as frozen sets of view-menu names keyed by role and permission. The index is
+stamped with the version stored in the ``ab_permission_version`` table, which
+is bumped by every flush touching the roles or permissions, so that a worker
+only rebuilds its index after they changed, whichever process changed them.
+"""
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+from flask import g, has_request_context
+from flask_appbuilder import Model
+from flask_appbuilder.security.sqla import models as sqla_models
+from sqlalchemy import Column, Integer, event
+
+# Models whose changes may change the permissions of the roles
+_PERMISSION_MODELS = (
+    sqla_models.Role,
+    sqla_models.PermissionView,
+    sqla_models.Permission,
+    sqla_models.ViewMenu,
+)
+
+
+class PermissionVersion(Model):
+    """Single row holding the version of the roles and permissions"""
+
+    __tablename__ = 'ab_permission_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def get_permission_version(session) -> int:
+    """Returns the current version of the roles and permissions"""
+    return session.query(PermissionVersion.version).filter(PermissionVersion.id == 1).scalar() or 0
+
+
+def bump_permission_version(session) -> None:
+    """Bumps the version of the roles and permissions, in the transaction of the session"""
+    table = PermissionVersion.__table__
+    result = session.execute(table.update().values(version=table.c.version + 1))
+    if not result.rowcount:
+        session.execute(table.insert().values(id=1, version=1))
+    if has_request_context():
+        # Check the version again in the request that changed it
+        g.pop('_permission_index_checked', None)
+
+
+def _bump_on_permission_changes(session, flush_context):  # pylint: disable=unused-argument
+    for instances in (session.new, session.dirty, session.deleted):
+        if any(isinstance(instance, _PERMISSION_MODELS) for instance in instances):
+            bump_permission_version(session)
+            return
+
+
+def track_permission_changes(session) -> None:
+    """
+    Bumps the version of the roles and permissions on every flush of the
+    session, or of the sessions of a scoped session, that changes them.
+    """
+    if not event.contains(session, 'after_flush', _bump_on_permission_changes):
+        event.listen(session, 'after_flush', _bump_on_permission_changes)
+
+
+class PermissionIndex:
+    """
+    Permission-views of every role, as frozen sets of view-menu names keyed
+    by role id and permission name.
+
+    :param version: version of the roles and permissions the index was built from
+    :param permissions: view-menu names keyed by role id and permission name
+    """
+
+    def __init__(self, version: int, permissions: Dict[int, Dict[str, FrozenSet[str]]]):
+        self.version = version
+        self._permissions = permissions
+
+    @classmethod
+    def build(cls, security_manager, version: int) -> 'PermissionIndex':
+        """Reads the permission-views of all the roles in a single query"""
+        assoc = sqla_models.assoc_permissionview_role
+        permission_view = security_manager.permissionview_model
+        permission = security_manager.permission_model
+        view_menu = security_manager.viewmenu_model
+        rows = (
+            security_manager.get_session.query(assoc.c.role_id, permission.name, view_menu.name)
+            .select_from(assoc)
+            .join(permission_view, permission_view.id == assoc.c.permission_view_id)
+            .join(permission, permission.id == permission_view.permission_id)
+            .join(view_menu, view_menu.id == permission_view.view_menu_id)
+        )
+        view_menus: Dict[int, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        for role_id, permission_name, view_menu_name in rows:
+            view_menus[role_id][permission_name].add(view_menu_name)
+        return cls(version, {
+            role_id: {name: frozenset(names) for name, names in permissions.items()}
+            for role_id, permissions in view_menus.items()
+        })
+
+    def has_perm(self, role_id: int, permission_name: str, view_menu_name: str) -> bool:
+        """Whether the role has the permission on the view-menu"""
+        return view_menu_name in self._permissions.get(role_id, {}).get(permission_name, ())
+
+    def get_permissions_views(self, role_ids: Iterable[int]) -> Set[Tuple[str, str]]:
+        """Returns the (permission name, view-menu name) tuples of the given roles"""
+        return {
+            (permission_name, view_menu_name)
+            for role_id in role_ids
+            for permission_name, view_menu_names in self._permissions.get(role_id, {}).items()
+            for view_menu_name in view_menu_names
+        }
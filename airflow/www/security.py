@@ -17,7 +17,7 @@
 # under the License.
 #
 
-from flask import current_app, g
+from flask import current_app, g, has_request_context
 from flask_appbuilder.security.sqla import models as sqla_models
 from flask_appbuilder.security.sqla.manager import SecurityManager
 from sqlalchemy import and_, or_
@@ -26,6 +26,10 @@ from airflow import models
 from airflow.exceptions import AirflowException
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import provide_session
+from airflow.www.permission_index import (
+    PermissionIndex, PermissionVersion, bump_permission_version, get_permission_version,
+    track_permission_changes,
+)
 from airflow.www.utils import CustomSQLAInterface
 
 EXISTING_ROLES = {
@@ -100,9 +104,13 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
         'can_code',
         'can_log',
         'can_get_logs_with_metadata',
+        'can_get_log_stream',
         'can_tries',
         'can_graph',
+        'can_graph_data',
+        'can_graph_state',
         'can_tree',
+        'can_tree_data',
         'can_task',
         'can_task_instances',
         'can_xcom',
@@ -195,6 +203,33 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
                 continue
             view.datamodel = CustomSQLAInterface(view.datamodel.obj)
         self.perms = None
+        self._permission_index = None
+        track_permission_changes(self.get_session)
+
+    def create_db(self):
+        super().create_db()
+        try:
+            # Deployments created before the permission index do not have its table yet
+            engine = self.get_session.get_bind(mapper=None, clause=None)
+            PermissionVersion.__table__.create(engine, checkfirst=True)
+        except Exception as e:  # pylint: disable=broad-except
+            self.log.error("Failed to create the permission version table: %s", e)
+
+    def get_permission_index(self) -> PermissionIndex:
+        """
+        Returns the permission index of the roles, rebuilt when the roles or
+        permissions changed. The version is checked once per request.
+        """
+        if has_request_context() and getattr(g, '_permission_index_checked', False) and \
+                self._permission_index is not None:
+            return self._permission_index
+
+        version = get_permission_version(self.get_session)
+        if self._permission_index is None or self._permission_index.version != version:
+            self._permission_index = PermissionIndex.build(self, version)
+        if has_request_context():
+            g._permission_index_checked = True  # pylint: disable=protected-access
+        return self._permission_index
 
     def init_role(self, role_name, role_vms, role_perms):
         """
@@ -262,11 +297,8 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
         """
         Returns a set of tuples with the perm name and view menu name
         """
-        perms_views = set()
-        for role in self.get_user_roles():
-            perms_views.update({(perm_view.permission.name, perm_view.view_menu.name)
-                                for perm_view in role.permissions})
-        return perms_views
+        role_ids = [role.id for role in self.get_user_roles() if role]
+        return self.get_permission_index().get_permissions_views(role_ids)
 
     def get_accessible_dag_ids(self, username=None):
         """
@@ -310,6 +342,24 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
             return self.is_item_public(permission, view_name)
         return self._has_view_access(user, permission, view_name)
 
+    def _has_view_access(self, user, permission_name, view_name):
+        """
+        Whether one of the roles of the user has the permission on the view,
+        read from the permission index for the roles stored in the database.
+        """
+        builtin_roles = getattr(self, 'builtin_roles', {})
+        index = None
+        for role in user.roles:
+            if role.name in builtin_roles:
+                if self._has_access_builtin_roles(role, permission_name, view_name):
+                    return True
+                continue
+            if index is None:
+                index = self.get_permission_index()
+            if index.has_perm(role.id, permission_name, view_name):
+                return True
+        return False
+
     def _get_and_cache_perms(self):
         """
         Cache permissions-views
@@ -329,12 +379,11 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
         """
         Whether the user has this perm
         """
-        if hasattr(self, 'perms'):
-            if (permission_name, view_menu_name) in self.perms:
-                return True
-        # rebuild the permissions set
-        self._get_and_cache_perms()
-        return (permission_name, view_menu_name) in self.perms
+        index = self.get_permission_index()
+        return any(
+            index.has_perm(role.id, permission_name, view_menu_name)
+            for role in self.get_user_roles() if role
+        )
 
     def has_all_dags_access(self):
         """
@@ -408,26 +457,12 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
 
         :return: None.
         """
-        self.log.debug('Fetching a set of all permission, view_menu from FAB meta-table')
-
-        def merge_pv(perm, view_menu):
-            """Create permission view menu only if it doesn't exist"""
-            if view_menu and perm and (view_menu, perm) not in all_permission_views:
-                self._merge_perm(perm, view_menu)
-
-        all_permission_views = set()
-        for permission_view in self.get_session.query(self.permissionview_model).all():
-            if permission_view.permission and permission_view.view_menu:
-                all_permission_views.add((permission_view.permission.name, permission_view.view_menu.name))
-
         # Get all the active / paused dags and insert them into a set
         all_dags_models = session.query(models.DagModel)\
             .filter(or_(models.DagModel.is_active, models.DagModel.is_paused)).all()
 
         # create can_dag_edit and can_dag_read permissions for every dag(vm)
-        for dag in all_dags_models:
-            for perm in self.DAG_PERMS:
-                merge_pv(perm, dag.dag_id)
+        self.create_dag_permission_views(dag.dag_id for dag in all_dags_models)
 
         # for all the dag-level role, add the permission of viewer
         # with the dag view to ab_permission_view
@@ -473,6 +508,8 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
                 ab_perm_view_role.insert(),  # pylint: disable=no-value-for-parameter
                 update_perm_views
             )
+            # The rows are inserted without the ORM, which does not see the change
+            bump_permission_version(self.get_session)
         self.get_session.commit()
 
     def update_admin_perm_view(self):
@@ -542,6 +579,67 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
         if access_control:
             self._sync_dag_view_permissions(dag_id, access_control)
 
+    def sync_perms_for_dags(self, access_controls):
+        """
+        Sync permissions for many DAGs at once. The permission view-menus of
+        all the DAGs are created in bulk, and only the DAGs with an access
+        control have their role permissions updated one by one.
+
+        :param access_controls: a dict where each key is a dag id and each
+            value is the access_control of the DAG, or None
+        :type access_controls: dict
+        :return:
+        """
+        self.create_dag_permission_views(access_controls)
+        for dag_id, access_control in access_controls.items():
+            if access_control:
+                self._sync_dag_view_permissions(dag_id, access_control)
+
+    def create_dag_permission_views(self, dag_ids):
+        """
+        Create the missing DAG level permission view-menus of the given DAGs,
+        reading the existing ones with a couple of queries instead of a few
+        per DAG.
+
+        :param dag_ids: the IDs of the DAGs
+        :type dag_ids: iterable of str
+        :return: None.
+        """
+        session = self.get_session
+        dag_ids = set(dag_ids)
+        if not dag_ids:
+            return
+
+        permissions = [self.add_permission(perm_name) for perm_name in sorted(self.DAG_PERMS)]
+        view_menus = {
+            view_menu.name: view_menu
+            for view_menu in session.query(self.viewmenu_model)
+            if view_menu.name in dag_ids
+        }
+        for dag_id in sorted(dag_ids - set(view_menus)):
+            view_menu = self.viewmenu_model()
+            view_menu.name = dag_id
+            session.add(view_menu)
+            view_menus[dag_id] = view_menu
+        session.flush()
+
+        existing = set(
+            session.query(self.permissionview_model.permission_id, self.permissionview_model.view_menu_id)
+            .filter(self.permissionview_model.permission_id.in_([perm.id for perm in permissions]))
+        )
+        created = 0
+        for view_menu in view_menus.values():
+            for permission in permissions:
+                if (permission.id, view_menu.id) not in existing:
+                    permission_view = self.permissionview_model()
+                    permission_view.permission = permission
+                    permission_view.view_menu = view_menu
+                    session.add(permission_view)
+                    created += 1
+        session.commit()
+        if created:
+            self.log.info('Created %s DAG level permission view-menus', created)
+
     def _sync_dag_view_permissions(self, dag_id, access_control):
         """Set the access policy on the given DAG's ViewModel.
 
@@ -16,6 +16,8 @@
 # specific language governing permissions and limitations
 # under the License.
 import json
+import math
+import statistics
 import time
 from urllib.parse import urlencode
 
@@ -184,13 +186,18 @@ def epoch(dttm):
     return int(time.mktime(dttm.timetuple())) * 1000,
 
 
-def json_response(obj):
+def json_response(obj, compact=False):
     """
-    returns a json response from a json serializable python object
+    returns a json response from a json serializable python object,
+    without any whitespace if compact is True
     """
+    if compact:
+        dumps_kwargs = {'separators': (',', ':')}
+    else:
+        dumps_kwargs = {'indent': 4}
     return Response(
         response=json.dumps(
-            obj, indent=4, cls=AirflowJsonEncoder),
+            obj, cls=AirflowJsonEncoder, **dumps_kwargs),
         status=200,
         mimetype="application/json")
 
@@ -350,6 +357,22 @@ def get_chart_height(dag):
     return 600 + len(dag.tasks) * 10
 
 
+def downsample_series(x, y, max_points):
+    """
+    Reduces a chart series to at most ``max_points`` points, replacing each run of
+    consecutive points by its first x value and the median of its y values.
+    The series is returned unchanged if ``max_points`` is not positive.
+    """
+    if max_points <= 0 or len(x) <= max_points:
+        return x, y
+    bucket_size = math.ceil(len(x) / max_points)
+    sampled_x, sampled_y = [], []
+    for start in range(0, len(x), bucket_size):
+        sampled_x.append(x[start])
+        sampled_y.append(statistics.median(y[start:start + bucket_size]))
+    return sampled_x, sampled_y
+
+
 class UtcAwareFilterMixin:  # noqa: D101
     def apply(self, query, value):
         value = timezone.parse(value, timezone=timezone.utc)
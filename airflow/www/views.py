@@ -34,7 +34,7 @@ import nvd3
 import sqlalchemy as sqla
 from flask import (
     Markup, Response, current_app, escape, flash, jsonify, make_response, redirect, render_template, request,
-    session as flask_session, url_for,
+    session as flask_session, stream_with_context, url_for,
 )
 from flask_appbuilder import BaseView, ModelView, expose, has_access, permission_name
 from flask_appbuilder.actions import action
@@ -60,6 +60,7 @@ from airflow.jobs.scheduler_job import SchedulerJob
 from airflow.models import Connection, DagModel, DagTag, Log, SlaMiss, TaskFail, XCom, errors
 from airflow.models.dagcode import DagCode
 from airflow.models.dagrun import DagRun, DagRunType
+from airflow.models.stateversion import state_versions_enabled
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import RUNNING_DEPS, SCHEDULER_QUEUED_DEPS
 from airflow.utils import timezone
@@ -70,15 +71,22 @@ from airflow.utils.platform import get_airflow_git_version
 from airflow.utils.session import create_session, provide_session
 from airflow.utils.state import State
 from airflow.www import utils as wwwutils
-from airflow.www.decorators import action_logging, gzipped, has_dag_access
+from airflow.www.decorators import action_logging, cached_json_response, gzipped, has_dag_access
 from airflow.www.forms import (
     ConnectionForm, DagRunForm, DateTimeForm, DateTimeWithNumRunsForm, DateTimeWithNumRunsWithDagRunsForm,
 )
+from airflow.www.graph_layout import NODE_SEPARATION, RANK_SEPARATION, get_graph_layout
 from airflow.www.widgets import AirflowModelListWidget
 
 PAGE_SIZE = conf.getint('webserver', 'page_size')
 FILTER_TAGS_COOKIE = 'tags_filter'
 FILTER_STATUS_COOKIE = 'dag_status_filter'
+GRAPH_ORIENTATIONS = {
+    'LR': "Left->Right",
+    'RL': "Right->Left",
+    'TB': "Top->Bottom",
+    'BT': "Bottom->Top",
+}
 
 
 def get_date_time_num_runs_dag_runs_form_data(request, session, dag):
@@ -134,6 +142,90 @@ def get_date_time_num_runs_dag_runs_form_data(request, session, dag):
     }
 
 
+def encode_ti(ti: Optional[models.TaskInstance]) -> Optional[List]:
+    """Encodes a task instance of the tree view as a compact list"""
+    if not ti:
+        return None
+
+    # NOTE: order of entry is important here because client JS relies on it for
+    # tree node reconstruction. Remember to change JS code in tree.html
+    # whenever order is altered.
+    data = [
+        ti.state,
+        ti.try_number,
+        None,  # start_ts
+        None,  # duration
+    ]
+
+    if ti.start_date:
+        # round to seconds to reduce payload size
+        data[2] = int(ti.start_date.timestamp())
+        if ti.duration is not None:
+            data[3] = int(ti.duration)
+
+    return data
+
+
+def get_tree_task_order(dag) -> List[models.BaseOperator]:
+    """
+    Returns the tasks of a DAG in the order in which the tree view first
+    displays them: depth first from the roots, each task only once.
+    """
+    ordered_tasks = []
+    visited = set()
+    stack = list(reversed(dag.roots))
+    while stack:
+        task = stack.pop()
+        if task.task_id in visited:
+            continue
+        visited.add(task.task_id)
+        ordered_tasks.append(task)
+        stack.extend(reversed(task.downstream_list))
+    return ordered_tasks
+
+
+def get_chart_task_instances(dag, start_date, end_date, columns, session):
+    """
+    Returns the task id, the execution date and the given columns of the task
+    instances of a DAG between two dates, ordered by execution date.
+    """
+    TI = models.TaskInstance
+    return (
+        session.query(TI.task_id, TI.execution_date, *columns)
+        .filter(
+            TI.dag_id == dag.dag_id,
+            TI.execution_date >= start_date,
+            TI.execution_date <= end_date,
+            TI.task_id.in_(dag.task_ids))
+        .order_by(TI.execution_date)
+        .all()
+    )
+
+
+@provide_session
+def get_dag_state_summary_version(session=None):
+    """
+    Returns a value that changes whenever the DAG state summary or the set of DAGs
+    changes, or None if the summary or the state version is not maintained
+    """
+    if not state_versions_enabled():
+        return None
+    if not conf.getboolean('scheduler', 'maintain_dag_state_summary', fallback=False):
+        return None
+    return models.StateVersion.get_version(session)
+
+
+@provide_session
+def get_dag_runs_version(session=None):
+    """
+    Returns a value that changes whenever a DAG run or a DAG is created or deleted,
+    or None if the state version is not maintained
+    """
+    if not state_versions_enabled():
+        return None
+    return models.StateVersion.get_version(session)
+
+
 ######################################################################################
 #                                    Error handlers
 ######################################################################################
@@ -358,8 +450,9 @@ class Airflow(AirflowBaseView):  # noqa: D101
             status_count_active=status_count_active,
             status_count_paused=status_count_paused)
 
-    @expose('/dag_stats', methods=['POST'])
+    @expose('/dag_stats', methods=['GET', 'POST'])
     @has_access
+    @cached_json_response(state_version=get_dag_state_summary_version)
     @provide_session
     def dag_stats(self, session=None):
         dr = models.DagRun
@@ -373,7 +466,7 @@ class Airflow(AirflowBaseView):  # noqa: D101
 
         # Filter by post parameters
         selected_dag_ids = {
-            unquote(dag_id) for dag_id in request.form.getlist('dag_ids') if dag_id
+            unquote(dag_id) for dag_id in request.values.getlist('dag_ids') if dag_id
         }
 
         if selected_dag_ids:
@@ -385,13 +478,18 @@ class Airflow(AirflowBaseView):  # noqa: D101
             return wwwutils.json_response({})
 
         payload = {}
-        dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))
-        data = {}
+        if conf.getboolean('scheduler', 'maintain_dag_state_summary', fallback=False):
+            data = models.DagStateSummary.get_counts(
+                [models.DagStateSummary.DAG_RUNS], dag_ids=filter_dag_ids, session=session
+            )
+        else:
+            dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))
+            data = {}
 
-        for dag_id, state, count in dag_state_stats:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+            for dag_id, state, count in dag_state_stats:
+                if dag_id not in data:
+                    data[dag_id] = {}
+                data[dag_id][state] = count
 
         for dag_id in filter_dag_ids:
             payload[dag_id] = []
@@ -404,8 +502,9 @@ class Airflow(AirflowBaseView):  # noqa: D101
 
         return wwwutils.json_response(payload)
 
-    @expose('/task_stats', methods=['POST'])
+    @expose('/task_stats', methods=['GET', 'POST'])
     @has_access
+    @cached_json_response(state_version=get_dag_state_summary_version)
     @provide_session
     def task_stats(self, session=None):
         TI = models.TaskInstance
@@ -422,7 +521,7 @@ class Airflow(AirflowBaseView):  # noqa: D101
 
         # Filter by post parameters
         selected_dag_ids = {
-            unquote(dag_id) for dag_id in request.form.getlist('dag_ids') if dag_id
+            unquote(dag_id) for dag_id in request.values.getlist('dag_ids') if dag_id
         }
 
         if selected_dag_ids:
@@ -430,66 +529,77 @@ class Airflow(AirflowBaseView):  # noqa: D101
         else:
             filter_dag_ids = allowed_dag_ids
 
-        RunningDagRun = (
-            session.query(DagRun.dag_id, DagRun.execution_date)
-                   .join(Dag, Dag.dag_id == DagRun.dag_id)
-                   .filter(DagRun.state == State.RUNNING, Dag.is_active)
-        )
-
-        if selected_dag_ids:
-            RunningDagRun = RunningDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
-        RunningDagRun = RunningDagRun.subquery('running_dag_run')
-
-        # Select all task_instances from active dag_runs.
-        RunningTI = (
-            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-                   .join(RunningDagRun,
-                         and_(RunningDagRun.c.dag_id == TI.dag_id,
-                              RunningDagRun.c.execution_date == TI.execution_date))
+        show_recent_stats = conf.getboolean(
+            'webserver', 'SHOW_RECENT_STATS_FOR_COMPLETED_RUNS', fallback=True
         )
-        if selected_dag_ids:
-            RunningTI = RunningTI.filter(TI.dag_id.in_(filter_dag_ids))
-
-        if conf.getboolean('webserver', 'SHOW_RECENT_STATS_FOR_COMPLETED_RUNS', fallback=True):
-            LastDagRun = (
-                session.query(
-                    DagRun.dag_id,
-                    sqla.func.max(DagRun.execution_date).label('execution_date')
-                )
-                .join(Dag, Dag.dag_id == DagRun.dag_id)
-                .filter(DagRun.state != State.RUNNING, Dag.is_active)
-                .group_by(DagRun.dag_id)
+        if conf.getboolean('scheduler', 'maintain_dag_state_summary', fallback=False):
+            categories = [models.DagStateSummary.RUNNING_RUN_TASKS]
+            if show_recent_stats:
+                categories.append(models.DagStateSummary.LAST_RUN_TASKS)
+            data = models.DagStateSummary.get_counts(
+                categories, dag_ids=filter_dag_ids, only_active=True, session=session
+            )
+        else:
+            RunningDagRun = (
+                session.query(DagRun.dag_id, DagRun.execution_date)
+                       .join(Dag, Dag.dag_id == DagRun.dag_id)
+                       .filter(DagRun.state == State.RUNNING, Dag.is_active)
             )
 
             if selected_dag_ids:
-                LastDagRun = LastDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
-            LastDagRun = LastDagRun.subquery('last_dag_run')
+                RunningDagRun = RunningDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
+            RunningDagRun = RunningDagRun.subquery('running_dag_run')
 
             # Select all task_instances from active dag_runs.
-            # If no dag_run is active, return task instances from most recent dag_run.
-            LastTI = (
+            RunningTI = (
                 session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-                       .join(LastDagRun,
-                             and_(LastDagRun.c.dag_id == TI.dag_id,
-                                  LastDagRun.c.execution_date == TI.execution_date))
+                       .join(RunningDagRun,
+                             and_(RunningDagRun.c.dag_id == TI.dag_id,
+                                  RunningDagRun.c.execution_date == TI.execution_date))
             )
             if selected_dag_ids:
-                LastTI = LastTI.filter(TI.dag_id.in_(filter_dag_ids))
+                RunningTI = RunningTI.filter(TI.dag_id.in_(filter_dag_ids))
+
+            if show_recent_stats:
+                LastDagRun = (
+                    session.query(
+                        DagRun.dag_id,
+                        sqla.func.max(DagRun.execution_date).label('execution_date')
+                    )
+                    .join(Dag, Dag.dag_id == DagRun.dag_id)
+                    .filter(DagRun.state != State.RUNNING, Dag.is_active)
+                    .group_by(DagRun.dag_id)
+                )
 
-            FinalTI = union_all(LastTI, RunningTI).alias('final_ti')
-        else:
-            FinalTI = RunningTI.subquery('final_ti')
+                if selected_dag_ids:
+                    LastDagRun = LastDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
+                LastDagRun = LastDagRun.subquery('last_dag_run')
+
+                # Select all task_instances from active dag_runs.
+                # If no dag_run is active, return task instances from most recent dag_run.
+                LastTI = (
+                    session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
+                           .join(LastDagRun,
+                                 and_(LastDagRun.c.dag_id == TI.dag_id,
+                                      LastDagRun.c.execution_date == TI.execution_date))
+                )
+                if selected_dag_ids:
+                    LastTI = LastTI.filter(TI.dag_id.in_(filter_dag_ids))
 
-        qry = (
-            session.query(FinalTI.c.dag_id, FinalTI.c.state, sqla.func.count())
-                   .group_by(FinalTI.c.dag_id, FinalTI.c.state)
-        )
+                FinalTI = union_all(LastTI, RunningTI).alias('final_ti')
+            else:
+                FinalTI = RunningTI.subquery('final_ti')
+
+            qry = (
+                session.query(FinalTI.c.dag_id, FinalTI.c.state, sqla.func.count())
+                       .group_by(FinalTI.c.dag_id, FinalTI.c.state)
+            )
 
-        data = {}
-        for dag_id, state, count in qry:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+            data = {}
+            for dag_id, state, count in qry:
+                if dag_id not in data:
+                    data[dag_id] = {}
+                data[dag_id][state] = count
 
         payload = {}
         for dag_id in filter_dag_ids:
@@ -502,8 +612,9 @@ class Airflow(AirflowBaseView):  # noqa: D101
                 })
         return wwwutils.json_response(payload)
 
-    @expose('/last_dagruns', methods=['POST'])
+    @expose('/last_dagruns', methods=['GET', 'POST'])
     @has_access
+    @cached_json_response(state_version=get_dag_runs_version)
     @provide_session
     def last_dagruns(self, session=None):
         DagRun = models.DagRun
@@ -515,7 +626,7 @@ class Airflow(AirflowBaseView):  # noqa: D101
 
         # Filter by post parameters
         selected_dag_ids = {
-            unquote(dag_id) for dag_id in request.form.getlist('dag_ids') if dag_id
+            unquote(dag_id) for dag_id in request.values.getlist('dag_ids') if dag_id
         }
 
         if selected_dag_ids:
@@ -726,6 +837,94 @@ class Airflow(AirflowBaseView):  # noqa: D101
             metadata['end_of_log'] = True
             return jsonify(message=error_message, error=True, metadata=metadata)
 
+    @expose('/get_log_stream')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @action_logging
+    @provide_session
+    def get_log_stream(self, session=None):
+        """
+        Streams the raw log of a try of a task instance in chunks of bounded size.
+        Supports single ``Range`` requests, and ``tail_bytes`` to only read the
+        end of the log. Windows of lines are read with ``start_line`` or
+        ``tail_lines``, optionally with ``num_lines``, and described by the
+        ``X-Log-Lines`` header as ``<start>-<stop>/<total>``, stop excluded.
+        """
+        dag_id = request.args.get('dag_id')
+        task_id = request.args.get('task_id')
+        execution_date = request.args.get('execution_date')
+        try_number = request.args.get('try_number', type=int)
+        tail_bytes = request.args.get('tail_bytes', type=int)
+        start_line = request.args.get('start_line', type=int)
+        tail_lines = request.args.get('tail_lines', type=int)
+        num_lines = request.args.get('num_lines', type=int)
+
+        try:
+            execution_date = timezone.parse(execution_date)
+        except (TypeError, ValueError):
+            response = jsonify({'error': 'Given execution date, {}, could not be identified '
+                                         'as a date.'.format(execution_date)})
+            response.status_code = 400
+            return response
+
+        task_log_reader = TaskLogReader()
+        if not task_log_reader.supports_stream:
+            response = jsonify({'error': 'Task log handler does not support streaming logs.'})
+            response.status_code = 400
+            return response
+
+        ti = session.query(models.TaskInstance).filter(
+            models.TaskInstance.dag_id == dag_id,
+            models.TaskInstance.task_id == task_id,
+            models.TaskInstance.execution_date == execution_date).first()
+        if ti is None:
+            response = jsonify({'error': 'Task instance did not exist in the DB'})
+            response.status_code = 404
+            return response
+        if try_number is None:
+            # Latest try
+            try_number = max(1, ti.next_try_number - 1)
+
+        line_range = None
+        if tail_lines:
+            line_range = (-tail_lines, None)
+        elif start_line is not None:
+            line_range = (start_line, None if num_lines is None else start_line + num_lines)
+
+        byte_range = None
+        if tail_bytes:
+            byte_range = (-tail_bytes, None)
+        elif request.range and request.range.units == 'bytes' and len(request.range.ranges) == 1:
+            byte_range = request.range.ranges[0]
+
+        try:
+            log_stream = task_log_reader.read_log_range(ti, try_number, byte_range, line_range)
+        except Exception as e:  # pylint: disable=broad-except
+            response = jsonify({'error': 'Failed to read the log: {}'.format(e)})
+            response.status_code = 502
+            return response
+
+        headers = {'Accept-Ranges': 'bytes'}
+        status = 200
+        if log_stream.stop is not None:
+            headers['Content-Length'] = str(log_stream.stop - log_stream.start)
+        if log_stream.lines is not None:
+            headers['X-Log-Lines'] = '{}-{}/{}'.format(*log_stream.lines)
+        elif byte_range is not None and log_stream.size is not None:
+            if log_stream.start >= log_stream.size > 0 and not tail_bytes:
+                return Response(status=416, headers={'Content-Range': 'bytes */{}'.format(log_stream.size)})
+            if log_stream.stop is not None and log_stream.stop > log_stream.start:
+                status = 206
+                headers['Content-Range'] = 'bytes {}-{}/{}'.format(
+                    log_stream.start, log_stream.stop - 1, log_stream.size)
+
+        return Response(
+            stream_with_context(log_stream.chunks),
+            status=status,
+            mimetype='text/plain',
+            headers=headers,
+        )
+
     @expose('/log')
     @has_dag_access(can_dag_read=True)
     @has_access
@@ -1424,28 +1623,6 @@ class Airflow(AirflowBaseView):  # noqa: D101
         node_count = 0
         node_limit = 5000 / max(1, len(dag.leaves))
 
-        def encode_ti(ti: Optional[models.TaskInstance]) -> Optional[List]:
-            if not ti:
-                return None
-
-            # NOTE: order of entry is important here because client JS relies on it for
-            # tree node reconstruction. Remember to change JS code in tree.html
-            # whenever order is altered.
-            data = [
-                ti.state,
-                ti.try_number,
-                None,  # start_ts
-                None,  # duration
-            ]
-
-            if ti.start_date:
-                # round to seconds to reduce payload size
-                data[2] = int(ti.start_date.timestamp())
-                if ti.duration is not None:
-                    data[3] = int(ti.duration)
-
-            return data
-
         def recurse_nodes(task, visited):
             nonlocal node_count
             node_count += 1
@@ -1527,6 +1704,166 @@ class Airflow(AirflowBaseView):  # noqa: D101
             show_external_log_redirect=task_log_reader.supports_external_link,
             external_log_name=external_log_name)
 
+    @expose('/tree_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @gzipped
+    @action_logging
+    @provide_session
+    def tree_data(self, session=None):
+        """
+        Returns the tree view of a DAG as a columnar JSON document, for a window of
+        DAG runs and of tasks so that the page only fetches what it displays.
+
+        Every task is listed once, in tree order, with the ids of its downstream
+        tasks, and the task instances are returned as a matrix of tasks by runs.
+        Older runs are fetched by passing ``previous_base_date`` as ``base_date``,
+        and the other tasks by moving ``task_offset`` or by passing a ``root``.
+        """
+        dag_id = request.args.get('dag_id')
+        dag = current_app.dag_bag.get_dag(dag_id)
+        if not dag:
+            response = jsonify({'error': 'DAG {} not found'.format(dag_id)})
+            response.status_code = 404
+            return response
+
+        root = request.args.get('root')
+        if root:
+            dag = dag.sub_dag(
+                task_regex=root,
+                include_downstream=False,
+                include_upstream=True)
+
+        num_runs = request.args.get('num_runs', type=int)
+        if not num_runs:
+            num_runs = conf.getint('webserver', 'default_dag_run_display_number')
+
+        base_date = request.args.get('base_date')
+        if base_date:
+            base_date = timezone.parse(base_date)
+        else:
+            base_date = dag.get_latest_execution_date(session=session) or timezone.utcnow()
+
+        # Fetch one more run to know where the previous window starts
+        dag_runs = (
+            session.query(DagRun)
+            .filter(
+                DagRun.dag_id == dag.dag_id,
+                DagRun.execution_date <= base_date)
+            .order_by(DagRun.execution_date.desc())
+            .limit(num_runs + 1)
+            .all()
+        )
+        previous_base_date = None
+        if len(dag_runs) > num_runs:
+            previous_base_date = dag_runs.pop().execution_date.isoformat()
+        dag_runs.reverse()
+        dates = [dr.execution_date for dr in dag_runs]
+
+        all_tasks = get_tree_task_order(dag)
+        task_offset = max(0, request.args.get('task_offset', 0, type=int))
+        task_limit = request.args.get('task_limit', type=int)
+        if task_limit:
+            tasks = all_tasks[task_offset:task_offset + task_limit]
+        else:
+            tasks = all_tasks[task_offset:]
+        task_ids = [task.task_id for task in tasks]
+
+        task_instances: Dict[Tuple[str, datetime], models.TaskInstance] = {}
+        if dates and task_ids:
+            TI = models.TaskInstance
+            tis = session.query(TI).filter(TI.dag_id == dag.dag_id, TI.execution_date.in_(dates))
+            if len(tasks) < len(all_tasks):
+                tis = tis.filter(TI.task_id.in_(task_ids))
+            for ti in tis:
+                task_instances[(ti.task_id, ti.execution_date)] = ti
+
+        payload = {
+            'dag_id': dag.dag_id,
+            'total_tasks': len(all_tasks),
+            'task_offset': task_offset,
+            'previous_base_date': previous_base_date,
+            'runs': [alchemy_to_dict(dr) for dr in dag_runs],
+            'tasks': {
+                'task_id': task_ids,
+                'downstream': [sorted(task.downstream_task_ids) for task in tasks],
+                'operator': [task.task_type for task in tasks],
+                'retries': [task.retries for task in tasks],
+                'owner': [task.owner for task in tasks],
+                'ui_color': [task.ui_color for task in tasks],
+                'depends_on_past': [task.depends_on_past for task in tasks],
+                'extra_links': [task.extra_links for task in tasks],
+            },
+            'instances': [
+                [encode_ti(task_instances.get((task_id, d))) for d in dates]
+                for task_id in task_ids
+            ],
+        }
+        return wwwutils.json_response(payload, compact=True)
+
+    @expose('/graph_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @gzipped
+    @action_logging
+    def graph_data(self):
+        """
+        Returns the nodes of a DAG with their coordinates and its edges. The layout
+        is computed once per version of the DAG structure and orientation, the
+        states of the task instances are fetched separately from ``graph_state``.
+        """
+        dag_id = request.args.get('dag_id')
+        dag = current_app.dag_bag.get_dag(dag_id)
+        if not dag:
+            response = jsonify({'error': 'DAG {} not found'.format(dag_id)})
+            response.status_code = 404
+            return response
+
+        root = request.args.get('root')
+        if root:
+            dag = dag.sub_dag(
+                task_regex=root,
+                include_upstream=True,
+                include_downstream=False)
+
+        arrange = request.args.get('arrange', dag.orientation)
+        if arrange not in GRAPH_ORIENTATIONS:
+            response = jsonify({'error': 'Invalid arrange {}'.format(arrange)})
+            response.status_code = 400
+            return response
+
+        layout = get_graph_layout(dag, arrange, current_app.dag_bag.dags_hash.get(dag_id), root)
+        return wwwutils.json_response(layout, compact=True)
+
+    @expose('/graph_state')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @action_logging
+    @provide_session
+    def graph_state(self, session=None):
+        """
+        Returns the state and try number of the task instances of a DAG run,
+        as an overlay of the layout returned by ``graph_data``.
+        """
+        dag_id = request.args.get('dag_id')
+        execution_date = request.args.get('execution_date')
+        if not execution_date:
+            response = jsonify({'error': 'Missing execution_date'})
+            response.status_code = 400
+            return response
+        execution_date = timezone.parse(execution_date)
+
+        TI = models.TaskInstance
+        task_instances = (
+            session.query(TI.task_id, TI.state, TI._try_number)  # pylint: disable=protected-access
+            .filter(TI.dag_id == dag_id, TI.execution_date == execution_date)
+        )
+        payload = {
+            task_id: [state, try_number if state == State.RUNNING else try_number + 1]
+            for task_id, state, try_number in task_instances
+        }
+        return wwwutils.json_response(payload, compact=True)
+
     @expose('/graph')
     @has_dag_access(can_dag_read=True)
     @has_access
@@ -1550,44 +1887,31 @@ class Airflow(AirflowBaseView):  # noqa: D101
 
         arrange = request.args.get('arrange', dag.orientation)
 
-        nodes = []
-        edges = []
-        for task in dag.tasks:
-            nodes.append({
-                'id': task.task_id,
+        layout = get_graph_layout(dag, arrange, current_app.dag_bag.dags_hash.get(dag_id), root)
+        # The page draws the nodes at the coordinates of the layout, without laying them out again
+        nodes = [
+            {
+                'id': node['id'],
+                'x': node['x'],
+                'y': node['y'],
                 'value': {
-                    'label': task.task_id,
-                    'labelStyle': "fill:{0};".format(task.ui_fgcolor),
-                    'style': "fill:{0};".format(task.ui_color),
+                    'label': node['id'],
+                    'labelStyle': "fill:{0};".format(node['fgcolor']),
+                    'style': "fill:{0};".format(node['color']),
                     'rx': 5,
                     'ry': 5,
                 }
-            })
-
-        def get_downstream(task):
-            for t in task.downstream_list:
-                edge = {
-                    'source_id': task.task_id,
-                    'target_id': t.task_id,
-                }
-                if edge not in edges:
-                    edges.append(edge)
-                    get_downstream(t)
-
-        for t in dag.roots:
-            get_downstream(t)
+            }
+            for node in layout['nodes']
+        ]
+        edges = layout['edges']
 
         dt_nr_dr_data = get_date_time_num_runs_dag_runs_form_data(request, session, dag)
         dt_nr_dr_data['arrange'] = arrange
         dttm = dt_nr_dr_data['dttm']
 
         class GraphForm(DateTimeWithNumRunsWithDagRunsForm):
-            arrange = SelectField("Layout", choices=(
-                ('LR', "Left->Right"),
-                ('RL', "Right->Left"),
-                ('TB', "Top->Bottom"),
-                ('BT', "Bottom->Top"),
-            ))
+            arrange = SelectField("Layout", choices=list(GRAPH_ORIENTATIONS.items()))
 
         form = GraphForm(data=dt_nr_dr_data)
         form.execution_date.choices = dt_nr_dr_data['dr_choices']
@@ -1630,6 +1954,8 @@ class Airflow(AirflowBaseView):  # noqa: D101
             tasks=tasks,
             nodes=nodes,
             edges=edges,
+            rank_separation=RANK_SEPARATION,
+            node_separation=NODE_SEPARATION,
             show_external_log_redirect=task_log_reader.supports_external_link,
             external_log_name=external_log_name)
 
@@ -1675,31 +2001,27 @@ class Airflow(AirflowBaseView):  # noqa: D101
         x = defaultdict(list)
         cum_y = defaultdict(list)
 
-        tis = dag.get_task_instances(start_date=min_date, end_date=base_date)
+        tis = get_chart_task_instances(dag, min_date, base_date, [models.TaskInstance.duration], session)
         TF = TaskFail
-        ti_fails = (
-            session.query(TF)
-            .filter(TF.dag_id == dag.dag_id,
-                    TF.execution_date >= min_date,
-                    TF.execution_date <= base_date,
-                    TF.task_id.in_([t.task_id for t in dag.tasks]))
-            .all()
-        )
+        fails_totals = {
+            (task_id, execution_date): fails_total
+            for task_id, execution_date, fails_total in (
+                session.query(TF.task_id, TF.execution_date, sqla.func.sum(TF.duration))
+                .filter(TF.dag_id == dag.dag_id,
+                        TF.execution_date >= min_date,
+                        TF.execution_date <= base_date,
+                        TF.task_id.in_(dag.task_ids))
+                .group_by(TF.task_id, TF.execution_date)
+            )
+        }
 
-        fails_totals = defaultdict(int)
-        for tf in ti_fails:
-            dict_key = (tf.dag_id, tf.task_id, tf.execution_date)
-            if tf.duration:
-                fails_totals[dict_key] += tf.duration
-
-        for ti in tis:
-            if ti.duration:
-                dttm = wwwutils.epoch(ti.execution_date)
-                x[ti.task_id].append(dttm)
-                y[ti.task_id].append(float(ti.duration))
-                fails_dict_key = (ti.dag_id, ti.task_id, ti.execution_date)
-                fails_total = fails_totals[fails_dict_key]
-                cum_y[ti.task_id].append(float(ti.duration + fails_total))
+        for task_id, execution_date, duration in tis:
+            if duration:
+                dttm = wwwutils.epoch(execution_date)
+                x[task_id].append(dttm)
+                y[task_id].append(float(duration))
+                fails_total = fails_totals.get((task_id, execution_date)) or 0
+                cum_y[task_id].append(float(duration + fails_total))
 
         # determine the most relevant time unit for the set of task instance
         # durations for the DAG
@@ -1713,16 +2035,18 @@ class Airflow(AirflowBaseView):  # noqa: D101
                                 label='Duration ({})'.format(cum_y_unit))
         cum_chart.axislist['yAxis']['axisLabelDistance'] = '-15'
 
+        max_points = conf.getint('webserver', 'chart_max_points_per_series', fallback=0)
         for task in dag.tasks:
             if x[task.task_id]:
-                chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                y=scale_time_units(y[task.task_id], y_unit))
-                cum_chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                    y=scale_time_units(cum_y[task.task_id],
-                                                       cum_y_unit))
+                task_x, task_y = wwwutils.downsample_series(x[task.task_id], y[task.task_id], max_points)
+                chart.add_serie(name=task.task_id, x=task_x,
+                                y=scale_time_units(task_y, y_unit))
+                task_x, task_cum_y = wwwutils.downsample_series(
+                    x[task.task_id], cum_y[task.task_id], max_points)
+                cum_chart.add_serie(name=task.task_id, x=task_x,
+                                    y=scale_time_units(task_cum_y, cum_y_unit))
 
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
@@ -1778,20 +2102,25 @@ class Airflow(AirflowBaseView):  # noqa: D101
             name="lineChart", x_is_date=True, y_axis_format='d', height=chart_height,
             width="1200")
 
+        y = defaultdict(list)
+        x = defaultdict(list)
+        # y value should reflect completed tries to have a 0 baseline,
+        # which is the try_number column of the task instance.
+        tis = get_chart_task_instances(
+            dag, min_date, base_date,
+            [models.TaskInstance._try_number],  # pylint: disable=protected-access
+            session)
+        for task_id, execution_date, prev_attempted_tries in tis:
+            x[task_id].append(wwwutils.epoch(execution_date))
+            y[task_id].append(prev_attempted_tries)
+
+        max_points = conf.getint('webserver', 'chart_max_points_per_series', fallback=0)
         for task in dag.tasks:
-            y = []
-            x = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                dttm = wwwutils.epoch(ti.execution_date)
-                x.append(dttm)
-                # y value should reflect completed tries to have a 0 baseline.
-                y.append(ti.prev_attempted_tries)
-            if x:
-                chart.add_serie(name=task.task_id, x=x, y=y)
+            if x[task.task_id]:
+                task_x, task_y = wwwutils.downsample_series(x[task.task_id], y[task.task_id], max_points)
+                chart.add_serie(name=task.task_id, x=task_x, y=task_y)
 
-        tis = dag.get_task_instances(start_date=min_date, end_date=base_date)
-        tries = sorted(list({ti.try_number for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if tries else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
@@ -1841,21 +2170,21 @@ class Airflow(AirflowBaseView):  # noqa: D101
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(
             name="lineChart", x_is_date=True, height=chart_height, width="1200")
-        y = {}
-        x = {}
-        for task in dag.tasks:
-            task_id = task.task_id
-            y[task_id] = []
-            x[task_id] = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                ts = ti.execution_date
+        y = defaultdict(list)
+        x = defaultdict(list)
+        tis = get_chart_task_instances(dag, min_date, base_date, [models.TaskInstance.end_date], session)
+        # The schedule only depends on the execution date, shared by all the tasks of a run
+        landing_bases = {}
+        for task_id, execution_date, end_date in tis:
+            if not end_date:
+                continue
+            if execution_date not in landing_bases:
+                ts = execution_date
                 if dag.schedule_interval and dag.following_schedule(ts):
                     ts = dag.following_schedule(ts)
-                if ti.end_date:
-                    dttm = wwwutils.epoch(ti.execution_date)
-                    secs = (ti.end_date - ts).total_seconds()
-                    x[task_id].append(dttm)
-                    y[task_id].append(secs)
+                landing_bases[execution_date] = ts
+            x[task_id].append(wwwutils.epoch(execution_date))
+            y[task_id].append((end_date - landing_bases[execution_date]).total_seconds())
 
         # determine the most relevant time unit for the set of landing times
         # for the DAG
@@ -1864,14 +2193,14 @@ class Airflow(AirflowBaseView):  # noqa: D101
         chart.create_y_axis('yAxis', format='.02f', custom_format=False,
                             label='Landing Time ({})'.format(y_unit))
         chart.axislist['yAxis']['axisLabelDistance'] = '-15'
+        max_points = conf.getint('webserver', 'chart_max_points_per_series', fallback=0)
         for task in dag.tasks:
             if x[task.task_id]:
-                chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                y=scale_time_units(y[task.task_id], y_unit))
+                task_x, task_y = wwwutils.downsample_series(x[task.task_id], y[task.task_id], max_points)
+                chart.add_serie(name=task.task_id, x=task_x,
+                                y=scale_time_units(task_y, y_unit))
 
-        tis = dag.get_task_instances(start_date=min_date, end_date=base_date)
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        max_date = tis[-1].execution_date if tis else None
 
         session.commit()
 
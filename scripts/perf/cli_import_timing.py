@@ -0,0 +1,66 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures the start-up time of the ``airflow`` command line, and the number of
+modules of Airflow imported by each step, to catch imports making every
+invocation of the CLI slower, e.g. every ``airflow tasks run`` of a task.
+
+    python scripts/perf/cli_import_timing.py
+"""
+import subprocess
+import sys
+
+STEPS = [
+    ("import airflow", "import airflow"),
+    ("import airflow.models", "import airflow.models"),
+    ("build the parser", "from airflow.cli import cli_parser; cli_parser.get_parser()"),
+    ("airflow version", "from airflow.cli import cli_parser; "
+                        "args = cli_parser.get_parser().parse_args(['version']); args.func(args)"),
+]
+
+TIMING_CODE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+duration = time.perf_counter() - start
+print(duration, len([name for name in sys.modules if name.startswith('airflow')]))
+"""
+
+
+def time_step(statement: str, repeat: int = 5):
+    """
+    Runs a statement in new interpreters and returns the best time it took, in
+    seconds, and the number of modules of Airflow it imported.
+    """
+    results = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", TIMING_CODE.format(statement=statement)])
+        duration, modules = output.decode().strip().splitlines()[-1].split()
+        results.append((float(duration), int(modules)))
+    return min(results)
+
+
+def main():
+    print(f"{'Step':<30} {'time':>10} {'modules':>8}")
+    for description, statement in STEPS:
+        duration, modules = time_step(statement)
+        print(f"{description:<30} {duration * 1000:>7.1f} ms {modules:>8}")
+
+
+if __name__ == "__main__":
+    main()
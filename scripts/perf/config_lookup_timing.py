@@ -0,0 +1,64 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures the import time of the configuration and the cost of reading an
+option, with and without the snapshot of the configuration.
+
+    python scripts/perf/config_lookup_timing.py
+"""
+import subprocess
+import sys
+import timeit
+
+NUMBER = 100_000
+
+LOOKUPS = [
+    ("conf.get('core', 'dags_folder')", "option of the config file"),
+    ("conf.getboolean('core', 'enable_xcom_pickling')", "boolean default"),
+    ("conf.getint('scheduler', 'max_tis_per_query')", "integer default"),
+    ("conf.get('logging', 'base_log_folder')", "option with a deprecated name"),
+    ("conf.get('core', 'missing_option', fallback=None)", "missing option with fallback"),
+]
+
+
+def time_import(repeat: int = 5) -> float:
+    """Returns the best time to import the configuration in a new interpreter, in seconds"""
+    code = "import time; start = time.perf_counter(); import airflow.configuration; " \
+           "print(time.perf_counter() - start)"
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code]).decode().strip().splitlines()[-1])
+        for _ in range(repeat)
+    )
+
+
+def main():
+    from airflow.configuration import conf
+
+    print(f"Import of airflow.configuration: {time_import() * 1000:.1f} ms")
+    print(f"{'Lookup':<50} {'resolved':>12} {'snapshot':>12}")
+    for statement, description in LOOKUPS:
+        conf.disable_snapshot()
+        resolved = timeit.timeit(statement, globals={"conf": conf}, number=NUMBER) / NUMBER
+        conf.enable_snapshot()
+        snapshot = timeit.timeit(statement, globals={"conf": conf}, number=NUMBER) / NUMBER
+        print(f"{description:<50} {resolved * 1e6:>9.2f} us {snapshot * 1e6:>9.2f} us")
+    conf.disable_snapshot()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures the time taken by ``DagFileProcessorManager._find_zombies`` on a
+``task_instance`` table filled with millions of historical task instances.
+
+To Run:
+    $ python scripts/perf/zombie_detection_timing.py [num_historical_tis] [num_zombies]
+
+The table is seeded once, run it against a disposable metadata database.
+"""
+import sys
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from airflow.jobs.base_job import BaseJob
+from airflow.models import DagModel, TaskInstance
+from airflow.utils import timezone
+from airflow.utils.dag_processing import DagFileProcessorManager
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+
+DAG_ID = 'perf_zombie_detection'
+TASKS_PER_RUN = 100
+INSERT_CHUNK_SIZE = 10000
+REPEAT_COUNT = 5
+
+
+def seed_task_instances(num_historical_tis, num_zombies):
+    """Inserts finished task instances and running task instances whose job stopped heartbeating"""
+    start_date = timezone.datetime(2000, 1, 1)
+    with create_session() as session:
+        session.query(TaskInstance).filter(TaskInstance.dag_id == DAG_ID).delete()
+        session.query(DagModel).filter(DagModel.dag_id == DAG_ID).delete()
+        session.add(DagModel(dag_id=DAG_ID, fileloc='/dags/perf_zombie_detection.py'))
+
+        rows = []
+        for i in range(num_historical_tis):
+            rows.append({
+                'dag_id': DAG_ID,
+                'task_id': f'task_{i % TASKS_PER_RUN}',
+                'execution_date': start_date + timedelta(minutes=i // TASKS_PER_RUN),
+                'state': State.SUCCESS,
+                'pool': 'default_pool',
+                'job_id': i,
+            })
+            if len(rows) == INSERT_CHUNK_SIZE:
+                session.bulk_insert_mappings(TaskInstance, rows)
+                session.commit()
+                rows = []
+        if rows:
+            session.bulk_insert_mappings(TaskInstance, rows)
+
+        # Jobs are inserted with explicit ids, after the ones referenced by the historical rows
+        stale_heartbeat = timezone.utcnow() - timedelta(days=1)
+        zombie_job_ids = [num_historical_tis + i for i in range(num_zombies)]
+        session.query(BaseJob).filter(BaseJob.id.in_(zombie_job_ids)).delete(synchronize_session=False)
+        session.execute(BaseJob.__table__.insert(), [{
+            'id': job_id,
+            'dag_id': DAG_ID,
+            'job_type': 'LocalTaskJob',
+            'state': State.RUNNING,
+            'latest_heartbeat': stale_heartbeat,
+        } for job_id in zombie_job_ids])
+        session.bulk_insert_mappings(TaskInstance, [{
+            'dag_id': DAG_ID,
+            'task_id': f'zombie_{i}',
+            'execution_date': timezone.utcnow(),
+            'state': State.RUNNING,
+            'pool': 'default_pool',
+            'job_id': job_id,
+        } for i, job_id in enumerate(zombie_job_ids)])
+        session.commit()
+
+
+def time_find_zombies():
+    """Returns the average duration of the zombie detection in seconds"""
+    manager = DagFileProcessorManager(
+        dag_directory='directory',
+        max_runs=1,
+        processor_factory=MagicMock(),
+        processor_timeout=timedelta.max,
+        signal_conn=MagicMock(),
+        dag_ids=[],
+        pickle_dags=False,
+        async_mode=True,
+    )
+    durations = []
+    for _ in range(REPEAT_COUNT):
+        manager._last_zombie_query_time = None  # pylint: disable=protected-access
+        manager._callback_to_execute.clear()  # pylint: disable=protected-access
+        start = timezone.utcnow()
+        manager._find_zombies()  # pylint: disable=protected-access,no-value-for-parameter
+        durations.append((timezone.utcnow() - start).total_seconds())
+    callbacks = manager._callback_to_execute  # pylint: disable=protected-access
+    num_callbacks = sum(len(requests) for requests in callbacks.values())
+    return sum(durations) / len(durations), num_callbacks
+
+
+def main(num_historical_tis=2000000, num_zombies=10):
+    """Seeds the task instance table and times the zombie detection"""
+    print(f"Seeding {num_historical_tis} historical and {num_zombies} zombie task instances")
+    seed_task_instances(num_historical_tis, num_zombies)
+    average, num_callbacks = time_find_zombies()
+    print(f"Found {num_callbacks} zombies in {average * 1000:.3f} ms on average")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 import unittest
 from datetime import timedelta
 
@@ -261,6 +262,93 @@ class TestGetDagRunsPagination(TestDagRunEndpoint):
         ]
 
 
+class TestGetDagRunsCursor(TestDagRunEndpoint):
+    @provide_session
+    def test_should_page_with_cursor(self, session):
+        session.add_all(self._create_dag_runs(5))
+        session.commit()
+
+        response = self.client.get("api/v1/dags/TEST_DAG_ID/dagRuns?limit=2")
+        assert response.status_code == 200
+        self.assertEqual(
+            [dag_run["dag_run_id"] for dag_run in response.json["dag_runs"]],
+            ["TEST_DAG_RUN_ID1", "TEST_DAG_RUN_ID2"],
+        )
+
+        response = self.client.get(
+            "api/v1/dags/TEST_DAG_ID/dagRuns?limit=2&offset=4&cursor=" + response.json["next_cursor"]
+        )
+        assert response.status_code == 200
+        self.assertEqual(
+            [dag_run["dag_run_id"] for dag_run in response.json["dag_runs"]],
+            ["TEST_DAG_RUN_ID3", "TEST_DAG_RUN_ID4"],
+        )
+        self.assertEqual(response.json["total_entries"], 5)
+        self.assertIn("next_cursor", response.json)
+
+    def test_should_response_400_for_invalid_cursor(self):
+        response = self.client.get("api/v1/dags/TEST_DAG_ID/dagRuns?cursor=invalid")
+        assert response.status_code == 400
+
+    def _create_dag_runs(self, count):
+        return [
+            DagRun(
+                dag_id="TEST_DAG_ID",
+                run_id="TEST_DAG_RUN_ID" + str(i),
+                run_type=DagRunType.MANUAL.value,
+                execution_date=timezone.parse(self.default_time) + timedelta(minutes=i),
+                start_date=timezone.parse(self.default_time),
+                external_trigger=True,
+            )
+            for i in range(1, count + 1)
+        ]
+
+
+class TestGetDagRunsBatch(TestDagRunEndpoint):
+    @provide_session
+    def test_should_response_200(self, session):
+        session.add_all(self._create_test_dag_run(extra_dag=True))
+        session.commit()
+
+        response = self.client.post(
+            "api/v1/dags/~/dagRuns/list", json={"dag_ids": ["TEST_DAG_ID", "TEST_DAG_ID_3"]}
+        )
+        assert response.status_code == 200
+        data = json.loads(response.get_data())
+        self.assertEqual(data["total_entries"], 3)
+        self.assertEqual(
+            [dag_run["dag_run_id"] for dag_run in data["dag_runs"]],
+            ["TEST_DAG_RUN_ID_1", "TEST_DAG_RUN_ID_2", "TEST_DAG_RUN_ID_3"],
+        )
+        self.assertNotIn("next_cursor", data)
+
+    @provide_session
+    def test_should_filter_by_date_and_page(self, session):
+        session.add_all(self._create_test_dag_run(extra_dag=True))
+        session.commit()
+
+        data = json.loads(self.client.post(
+            "api/v1/dags/~/dagRuns/list",
+            json={"execution_date_gte": self.default_time_2, "page_limit": 2},
+        ).get_data())
+        self.assertEqual(data["total_entries"], 3)
+        self.assertEqual(
+            [dag_run["dag_run_id"] for dag_run in data["dag_runs"]],
+            ["TEST_DAG_RUN_ID_2", "TEST_DAG_RUN_ID_3"],
+        )
+
+        data = json.loads(self.client.post(
+            "api/v1/dags/~/dagRuns/list",
+            json={"execution_date_gte": self.default_time_2, "page_limit": 2,
+                  "page_cursor": data["next_cursor"]},
+        ).get_data())
+        self.assertEqual([dag_run["dag_run_id"] for dag_run in data["dag_runs"]], ["TEST_DAG_RUN_ID_4"])
+
+    def test_should_response_400_for_invalid_form(self):
+        response = self.client.post("api/v1/dags/~/dagRuns/list", json={"page_offset": -1})
+        assert response.status_code == 400
+
+
 class TestGetDagRunsPaginationFilters(TestDagRunEndpoint):
     @parameterized.expand(
         [
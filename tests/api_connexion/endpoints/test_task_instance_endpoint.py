@@ -14,11 +14,21 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 import unittest
+from datetime import timedelta
 
 import pytest
 
+from airflow import DAG
+from airflow.models import DagRun, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.session import provide_session
+from airflow.utils.state import State
+from airflow.utils.types import DagRunType
 from airflow.www import app
+from tests.test_utils.db import clear_db_runs
 
 
 class TestTaskInstanceEndpoint(unittest.TestCase):
@@ -29,6 +39,30 @@ class TestTaskInstanceEndpoint(unittest.TestCase):
 
     def setUp(self) -> None:
         self.client = self.app.test_client()  # type:ignore
+        self.default_time = timezone.parse('2020-06-11T18:00:00+00:00')
+        clear_db_runs()
+
+    def tearDown(self) -> None:
+        clear_db_runs()
+
+    @provide_session
+    def _create_task_instances(self, dag_id, num_runs, states=None, session=None):
+        dag = DAG(dag_id, start_date=self.default_time)
+        tasks = [DummyOperator(task_id=f'task_{i}', dag=dag) for i in range(2)]
+        for run in range(num_runs):
+            execution_date = self.default_time + timedelta(days=run)
+            session.add(DagRun(
+                dag_id=dag_id,
+                run_id=f'TEST_DAG_RUN_ID_{run}',
+                run_type=DagRunType.MANUAL.value,
+                execution_date=execution_date,
+                external_trigger=True,
+            ))
+            for task in tasks:
+                ti = TaskInstance(task=task, execution_date=execution_date)
+                ti.state = states[run] if states else State.SUCCESS
+                session.add(ti)
+        session.commit()
 
 
 class TestGetTaskInstance(TestTaskInstanceEndpoint):
@@ -41,17 +75,136 @@ class TestGetTaskInstance(TestTaskInstanceEndpoint):
 
 
 class TestGetTaskInstances(TestTaskInstanceEndpoint):
-    @pytest.mark.skip(reason="Not implemented yet")
     def test_should_response_200(self):
-        response = self.client.get("/api/v1/dags/TEST_DAG_ID/taskInstances")
+        self._create_task_instances('TEST_DAG_ID', 2)
+        response = self.client.get("/api/v1/dags/TEST_DAG_ID/dagRuns/TEST_DAG_RUN_ID_1/taskInstances")
+        assert response.status_code == 200
+        self.assertEqual(response.json["total_entries"], 2)
+        self.assertEqual(
+            [(ti["task_id"], ti["execution_date"]) for ti in response.json["task_instances"]],
+            [("task_0", "2020-06-12T18:00:00+00:00"), ("task_1", "2020-06-12T18:00:00+00:00")],
+        )
+        self.assertNotIn("next_cursor", response.json)
+
+    def test_should_return_all_with_tilde(self):
+        self._create_task_instances('TEST_DAG_ID', 2)
+        self._create_task_instances('TEST_DAG_ID_2', 1)
+        response = self.client.get("/api/v1/dags/~/dagRuns/~/taskInstances")
+        assert response.status_code == 200
+        self.assertEqual(response.json["total_entries"], 6)
+
+    def test_should_filter_by_state(self):
+        self._create_task_instances('TEST_DAG_ID', 3, states=[State.SUCCESS, State.FAILED, None])
+        response = self.client.get("/api/v1/dags/TEST_DAG_ID/dagRuns/~/taskInstances?state=failed&state=none")
+        assert response.status_code == 200
+        self.assertEqual(response.json["total_entries"], 4)
+        self.assertEqual(
+            {ti["state"] for ti in response.json["task_instances"]}, {State.FAILED, None}
+        )
+
+    def test_should_page_with_cursor(self):
+        self._create_task_instances('TEST_DAG_ID', 3)
+        url = "/api/v1/dags/TEST_DAG_ID/dagRuns/~/taskInstances?limit=4"
+        response = self.client.get(url)
         assert response.status_code == 200
+        first_page = [(ti["task_id"], ti["execution_date"]) for ti in response.json["task_instances"]]
+        self.assertEqual(len(first_page), 4)
+
+        response = self.client.get(url + "&cursor=" + response.json["next_cursor"])
+        assert response.status_code == 200
+        second_page = [(ti["task_id"], ti["execution_date"]) for ti in response.json["task_instances"]]
+        self.assertEqual(len(second_page), 2)
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertNotIn("next_cursor", response.json)
+
+    def test_should_response_400_for_invalid_cursor(self):
+        response = self.client.get("/api/v1/dags/~/dagRuns/~/taskInstances?cursor=invalid")
+        assert response.status_code == 400
 
 
 class TestGetTaskInstancesBatch(TestTaskInstanceEndpoint):
-    @pytest.mark.skip(reason="Not implemented yet")
     def test_should_response_200(self):
-        response = self.client.post("/api/v1/dags/~/taskInstances/list")
+        self._create_task_instances('TEST_DAG_ID', 2)
+        self._create_task_instances('TEST_DAG_ID_2', 1)
+        self._create_task_instances('TEST_DAG_ID_3', 1)
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list",
+            json={"dag_ids": ["TEST_DAG_ID", "TEST_DAG_ID_2"]},
+        )
+        assert response.status_code == 200
+        data = json.loads(response.get_data())
+        self.assertEqual(data["total_entries"], 6)
+        self.assertEqual(
+            [(ti["dag_id"], ti["task_id"]) for ti in data["task_instances"]],
+            [("TEST_DAG_ID", "task_0"), ("TEST_DAG_ID", "task_1")] * 2 +
+            [("TEST_DAG_ID_2", "task_0"), ("TEST_DAG_ID_2", "task_1")],
+        )
+
+    def test_should_page_with_cursor(self):
+        self._create_task_instances('TEST_DAG_ID', 3)
+        url = "/api/v1/dags/~/dagRuns/~/taskInstances/list"
+        data = json.loads(self.client.post(url, json={"page_limit": 5}).get_data())
+        self.assertEqual(len(data["task_instances"]), 5)
+
+        data = json.loads(
+            self.client.post(url, json={"page_limit": 5, "page_cursor": data["next_cursor"]}).get_data()
+        )
+        self.assertEqual(len(data["task_instances"]), 1)
+        self.assertNotIn("next_cursor", data)
+        self.assertEqual(data["total_entries"], 6)
+
+    def test_should_filter_by_dag_run_ids_and_state(self):
+        self._create_task_instances('TEST_DAG_ID', 3, states=[State.SUCCESS, State.FAILED, State.FAILED])
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list",
+            json={"dag_run_ids": ["TEST_DAG_RUN_ID_0", "TEST_DAG_RUN_ID_1"], "state": ["failed"]},
+        )
+        assert response.status_code == 200
+        data = json.loads(response.get_data())
+        self.assertEqual(data["total_entries"], 2)
+        self.assertEqual(
+            {(ti["execution_date"], ti["state"]) for ti in data["task_instances"]},
+            {("2020-06-12T18:00:00+00:00", "failed")},
+        )
+
+    def test_should_return_selected_fields(self):
+        self._create_task_instances('TEST_DAG_ID', 1)
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list", json={"fields": ["task_id", "try_number"]}
+        )
         assert response.status_code == 200
+        self.assertEqual(
+            json.loads(response.get_data())["task_instances"],
+            [{"task_id": "task_0", "try_number": 0}, {"task_id": "task_1", "try_number": 0}],
+        )
+
+    def test_should_return_compact_rows(self):
+        self._create_task_instances('TEST_DAG_ID', 1)
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list",
+            json={"fields": ["task_id", "state"], "compact": True},
+        )
+        assert response.status_code == 200
+        self.assertEqual(
+            json.loads(response.get_data()),
+            {
+                "task_instances": [["task_0", "success"], ["task_1", "success"]],
+                "total_entries": 2,
+                "fields": ["task_id", "state"],
+            },
+        )
+
+    def test_should_response_400_for_unknown_fields(self):
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list", json={"fields": ["task_id", "password"]}
+        )
+        assert response.status_code == 400
+
+    def test_should_response_400_for_invalid_form(self):
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list", json={"page_limit": 0}
+        )
+        assert response.status_code == 400
 
 
 class TestPostClearTaskInstances(TestTaskInstanceEndpoint):
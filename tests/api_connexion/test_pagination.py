@@ -0,0 +1,40 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from airflow.api_connexion.exceptions import BadRequest
+from airflow.api_connexion.pagination import decode_cursor, encode_cursor
+from airflow.models import DagRun, TaskInstance
+from airflow.utils import timezone
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        execution_date = timezone.parse('2020-06-13T22:44:00+00:00')
+        columns = [TaskInstance.dag_id, TaskInstance.execution_date, TaskInstance.task_id]
+        cursor = encode_cursor(['dag', execution_date, 'task'])
+        self.assertEqual(decode_cursor(cursor, columns), ['dag', execution_date, 'task'])
+
+    def test_should_raise_for_invalid_cursor(self):
+        with self.assertRaises(BadRequest):
+            decode_cursor('not a cursor', [DagRun.id])
+
+    def test_should_raise_for_cursor_of_other_columns(self):
+        cursor = encode_cursor([1, 'other'])
+        with self.assertRaises(BadRequest):
+            decode_cursor(cursor, [DagRun.id])
@@ -51,15 +51,10 @@ class TestCliSyncPerm(unittest.TestCase):
 
         assert appbuilder.sm.sync_roles.call_count == 1
 
-        self.assertEqual(2, len(appbuilder.sm.sync_perm_for_dag.mock_calls))
-        appbuilder.sm.sync_perm_for_dag.assert_any_call(
-            'has_access_control',
-            {'Public': {'can_dag_read'}}
-        )
-        appbuilder.sm.sync_perm_for_dag.assert_any_call(
-            'no_access_control',
-            None,
-        )
+        appbuilder.sm.sync_perms_for_dags.assert_called_once_with({
+            'has_access_control': {'Public': {'can_dag_read'}},
+            'no_access_control': None,
+        })
 
     def expect_dagbag_contains(self, dags, dagbag_mock):
         dagbag = mock.Mock()
@@ -32,12 +32,14 @@ from airflow.cli.commands import task_command
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.models import DagBag, TaskInstance
+from airflow.models.serialized_dag import SerializedDagModel
+from airflow.serialization.serialized_objects import SerializedBaseOperator
 from airflow.settings import Session
 from airflow.utils import timezone
 from airflow.utils.cli import get_dag
 from airflow.utils.state import State
 from tests.test_utils.config import conf_vars
-from tests.test_utils.db import clear_db_pools, clear_db_runs
+from tests.test_utils.db import clear_db_pools, clear_db_runs, clear_db_serialized_dags
 
 DEFAULT_DATE = timezone.make_aware(datetime(2016, 1, 1))
 ROOT_FOLDER = os.path.realpath(
@@ -140,6 +142,67 @@ class TestCliTasks(unittest.TestCase):
             'tasks', 'run', 'example_bash_operator', 'runme_0', '--local',
             DEFAULT_DATE.isoformat()]))
 
+    @mock.patch("airflow.cli.commands.task_command.get_dag")
+    @mock.patch("airflow.cli.commands.task_command.LocalTaskJob")
+    def test_run_local_with_serialized_dag(self, mock_local_job, mock_get_dag):
+        dag = self.dagbag.get_dag('example_bash_operator')
+        SerializedDagModel.write_dag(dag)
+        self.addCleanup(clear_db_serialized_dags)
+        args = self.parser.parse_args([
+            'tasks', 'run', '--local', 'example_bash_operator', 'runme_0', DEFAULT_DATE.isoformat()
+        ])
+
+        # The raw task process is not forked but started as another user, parsing the DAG file
+        with conf_vars({
+            ('core', 'task_supervisor_use_serialized_dag'): 'True',
+            ('core', 'default_impersonation'): 'airflow',
+        }):
+            task_command.task_run(args)
+
+        mock_get_dag.assert_not_called()
+        task = mock_local_job.call_args[1]['task_instance'].task
+        self.assertIsInstance(task, SerializedBaseOperator)
+        self.assertEqual('runme_0', task.task_id)
+
+    @mock.patch("airflow.cli.commands.task_command.get_dag")
+    @mock.patch("airflow.cli.commands.task_command.LocalTaskJob")
+    def test_run_local_parses_dag_file_without_serialized_dag(self, mock_local_job, mock_get_dag):
+        clear_db_serialized_dags()
+        mock_get_dag.return_value = self.dagbag.get_dag('example_bash_operator')
+        args = self.parser.parse_args([
+            'tasks', 'run', '--local', 'example_bash_operator', 'runme_0', DEFAULT_DATE.isoformat()
+        ])
+
+        with conf_vars({('core', 'task_supervisor_use_serialized_dag'): 'True'}):
+            task_command.task_run(args)
+
+        mock_get_dag.assert_called_once_with(args.subdir, 'example_bash_operator')
+        task = mock_local_job.call_args[1]['task_instance'].task
+        self.assertNotIsInstance(task, SerializedBaseOperator)
+
+    @mock.patch("airflow.cli.commands.task_command.get_dag")
+    @mock.patch("airflow.cli.commands.task_command.LocalTaskJob")
+    def test_run_local_parses_dag_file_for_forked_raw_task(self, mock_local_job, mock_get_dag):
+        dag = self.dagbag.get_dag('example_bash_operator')
+        SerializedDagModel.write_dag(dag)
+        self.addCleanup(clear_db_serialized_dags)
+        mock_get_dag.return_value = dag
+        args = self.parser.parse_args([
+            'tasks', 'run', '--local', 'example_bash_operator', 'runme_0', DEFAULT_DATE.isoformat()
+        ])
+
+        # The forked raw task process runs the DAG parsed by the supervising process
+        with conf_vars({
+            ('core', 'task_supervisor_use_serialized_dag'): 'True',
+            ('core', 'task_runner'): 'StandardTaskRunner',
+            ('core', 'default_impersonation'): '',
+        }), mock.patch('airflow.task.task_runner.standard_task_runner.CAN_FORK', True):
+            task_command.task_run(args)
+
+        mock_get_dag.assert_called_once_with(args.subdir, 'example_bash_operator')
+        task = mock_local_job.call_args[1]['task_instance'].task
+        self.assertNotIsInstance(task, SerializedBaseOperator)
+
     @parameterized.expand(
         [
             ("--ignore-all-dependencies", ),
@@ -147,7 +210,6 @@ class TestCliTasks(unittest.TestCase):
             ("--ignore-dependencies",),
             ("--force",),
         ],
-
     )
     def test_cli_run_invalid_raw_option(self, option: str):
         with self.assertRaisesRegex(
@@ -113,6 +113,40 @@ class TestGunicornMonitor(unittest.TestCase):
         self.monitor._reload_gunicorn.assert_called_once_with()  # pylint: disable=no-member
         self.assertAlmostEqual(self.monitor._last_refresh_time, time(), delta=5)
 
+    @mock.patch('airflow.cli.commands.webserver_command.Stats')
+    def test_should_emit_worker_memory_metrics(self, mock_stats):
+        workers = []
+        for pid, rss, uss in ((11, 300, 100), (12, 400, 200)):
+            worker = mock.MagicMock(pid=pid)
+            worker.memory_full_info.return_value = mock.MagicMock(rss=rss, uss=uss)
+            workers.append(worker)
+        dead_worker = mock.MagicMock(pid=13)
+        dead_worker.memory_full_info.side_effect = psutil.NoSuchProcess(13)
+        self.monitor.gunicorn_master_proc = mock.MagicMock()
+        self.monitor.gunicorn_master_proc.children.return_value = workers + [dead_worker]
+        self.monitor.emit_worker_memory_metrics = True
+
+        self.monitor._emit_worker_metrics()
+        mock_stats.gauge.assert_has_calls([
+            mock.call('webserver.workers_rss', 700),
+            mock.call('webserver.workers_uss', 300),
+            mock.call('webserver.workers_max_rss', 400),
+            mock.call('webserver.workers_max_uss', 200),
+        ])
+
+        # Not reported again before the interval has passed
+        mock_stats.gauge.reset_mock()
+        self.monitor._emit_worker_metrics()
+        mock_stats.gauge.assert_not_called()
+
+    @mock.patch('airflow.cli.commands.webserver_command.Stats')
+    def test_should_not_emit_worker_memory_metrics_by_default(self, mock_stats):
+        self.monitor.gunicorn_master_proc = mock.MagicMock()
+
+        self.monitor._emit_worker_metrics()
+        mock_stats.gauge.assert_not_called()
+        self.monitor.gunicorn_master_proc.children.assert_not_called()
+
 
 class TestGunicornMonitorGeneratePluginState(unittest.TestCase):
     @staticmethod
@@ -170,6 +204,20 @@ class TestGunicornMonitorGeneratePluginState(unittest.TestCase):
             self.assertEqual(4, len(state_d))
 
 
+class TestServeWebserverMetrics(unittest.TestCase):
+    @conf_vars({('webserver', 'prometheus_port'): ''})
+    @mock.patch('airflow.cli.commands.webserver_command.serve_metrics')
+    def test_should_not_serve_metrics_without_port(self, mock_serve_metrics):
+        self.assertIsNone(webserver_command.serve_webserver_metrics())
+        mock_serve_metrics.assert_not_called()
+
+    @conf_vars({('webserver', 'prometheus_port'): '9114'})
+    @mock.patch('airflow.cli.commands.webserver_command.serve_metrics')
+    def test_should_serve_metrics_on_port(self, mock_serve_metrics):
+        self.assertEqual(mock_serve_metrics.return_value, webserver_command.serve_webserver_metrics())
+        mock_serve_metrics.assert_called_once_with(9114)
+
+
 class TestCLIGetNumReadyWorkersRunning(unittest.TestCase):
 
     @classmethod
@@ -21,6 +21,8 @@ import argparse
 import contextlib
 import io
 import re
+import subprocess
+import sys
 from collections import Counter
 from unittest import TestCase
 
@@ -181,3 +183,17 @@ class TestCli(TestCase):
         with self.assertRaises(argparse.ArgumentTypeError):
             cli_parser.positive_int('0')
             cli_parser.positive_int('-1')
+
+    def test_should_not_import_models_to_build_parser(self):
+        code = (
+            "import sys; from airflow.cli import cli_parser; "
+            "cli_parser.get_parser().parse_args(['version']); "
+            "print(' '.join(name for name in sys.modules if name.startswith('airflow.')))"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code]).decode()
+        modules = output.strip().splitlines()[-1].split()
+        self.assertIn("airflow.cli.cli_parser", modules)
+        for module in (
+            "airflow.models.dag", "airflow.models.taskinstance", "airflow.executors.base_executor",
+        ):
+            self.assertNotIn(module, modules)
@@ -20,8 +20,11 @@ import unittest
 from datetime import datetime
 from unittest import mock
 
+from airflow.exceptions import AirflowConfigException
 from airflow.executors.base_executor import BaseExecutor
+from airflow.models.taskinstance import SimpleTaskInstance
 from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
 
 
 class TestBaseExecutor(unittest.TestCase):
@@ -52,3 +55,72 @@ class TestBaseExecutor(unittest.TestCase):
                  mock.call('executor.queued_tasks', mock.ANY),
                  mock.call('executor.running_tasks', mock.ANY)]
         mock_stats_gauge.assert_has_calls(calls)
+
+    @conf_vars({('core', 'executor_task_batch_size'): '2'})
+    @mock.patch('airflow.executors.base_executor.BaseExecutor.execute_async')
+    @mock.patch('airflow.executors.base_executor.BaseExecutor.execute_batch_async')
+    def test_trigger_tasks_in_batches(self, mock_execute_batch_async, mock_execute_async):
+        class BatchingExecutor(BaseExecutor):
+            supports_task_batching = True
+
+        executor = BatchingExecutor(parallelism=1)
+        self.assertEqual(executor.task_batch_size, 2)
+
+        date = datetime.utcnow()
+        for task_id, pool in [('t1', 'pool_a'), ('t2', 'pool_a'), ('t3', 'pool_a'), ('t4', 'pool_b')]:
+            simple_ti = mock.MagicMock(spec=SimpleTaskInstance, key=("my_dag", task_id, date, 1),
+                                       pool=pool, executor_config=None)
+            executor.queue_command(simple_ti, ['airflow', 'tasks', 'run', task_id], queue='default')
+
+        executor.trigger_tasks(open_slots=4)
+
+        mock_execute_async.assert_not_called()
+        batches = [call_args[0][0] for call_args in mock_execute_batch_async.call_args_list]
+        self.assertEqual(
+            [[key[1] for key, _, _, _ in batch] for batch in batches],
+            [['t1', 't2'], ['t3'], ['t4']]
+        )
+        self.assertEqual(len(executor.running), 4)
+
+    def test_task_batching_unsupported(self):
+        with conf_vars({('core', 'executor_task_batch_size'): '10'}):
+            executor = BaseExecutor()
+        self.assertEqual(executor.task_batch_size, 1)
+
+    @conf_vars({('core', 'executor_queue_slots'): '{"default": 2, "gpu": 1}'})
+    def test_queue_open_slots(self):
+        executor = BaseExecutor()
+        date = datetime.utcnow()
+        for task_id, queue in [('t1', 'default'), ('t2', 'gpu'), ('t3', 'other')]:
+            simple_ti = mock.MagicMock(spec=SimpleTaskInstance, key=("my_dag", task_id, date, 1))
+            executor.queue_command(simple_ti, ['airflow', 'tasks', 'run', task_id], queue=queue)
+
+        self.assertEqual(executor.queue_open_slots('default'), 1)
+        self.assertEqual(executor.queue_open_slots('gpu'), 0)
+        self.assertIsNone(executor.queue_open_slots('other'))
+        self.assertEqual(executor.queue_backlog()['gpu'], 1)
+
+        del executor.queued_tasks[("my_dag", 't2', date, 1)]
+        executor._prune_task_queues()  # pylint: disable=protected-access
+        self.assertEqual(executor.queue_open_slots('gpu'), 1)
+        self.assertNotIn(("my_dag", 't2', date, 1), executor.task_queues)
+
+    @conf_vars({('core', 'executor_pool_slots'): '{"default_pool": 3}'})
+    def test_pool_open_slots(self):
+        executor = BaseExecutor()
+        date = datetime.utcnow()
+        for task_id, pool in [('t1', 'default_pool'), ('t2', 'default_pool'), ('t3', 'other_pool')]:
+            simple_ti = mock.MagicMock(spec=SimpleTaskInstance, key=("my_dag", task_id, date, 1), pool=pool)
+            executor.queue_command(simple_ti, ['airflow', 'tasks', 'run', task_id])
+        # Picked up by a worker
+        executor.running.add(executor.queued_tasks.popitem(last=False)[0])
+
+        self.assertEqual(executor.pool_usage()['default_pool'], 1)
+        self.assertEqual(executor.pool_backlog()['default_pool'], 1)
+        self.assertEqual(executor.pool_open_slots('default_pool'), 1)
+        self.assertIsNone(executor.pool_open_slots('other_pool'))
+
+    def test_invalid_queue_slots(self):
+        with conf_vars({('core', 'executor_queue_slots'): '[1, 2]'}):
+            with self.assertRaises(AirflowConfigException):
+                BaseExecutor()
@@ -27,7 +27,7 @@ from unittest import mock
 # noinspection PyUnresolvedReferences
 import celery.contrib.testing.tasks  # noqa: F401 pylint: disable=unused-import
 import pytest
-from celery import Celery
+from celery import Celery, states as celery_states
 from celery.backends.base import BaseBackend, BaseKeyValueStoreBackend
 from celery.backends.database import DatabaseBackend
 from celery.contrib.testing.worker import start_worker
@@ -192,6 +192,19 @@ class TestCeleryExecutor(unittest.TestCase):
                  mock.call('executor.running_tasks', mock.ANY)]
         mock_stats_gauge.assert_has_calls(calls)
 
+    def test_queue_backlog_counts_pending_tasks(self):
+        executor = celery_executor.CeleryExecutor()
+        date = datetime.datetime.now()
+        started_key = ('dag', 'started', date, 1)
+        pending_key = ('dag', 'pending', date, 1)
+        executor.task_queues.update({started_key: 'default', pending_key: 'default'})
+        executor.running.update({started_key, pending_key})
+        executor.last_state[started_key] = celery_states.STARTED
+        executor.last_state[pending_key] = celery_states.PENDING
+
+        self.assertEqual(executor.queue_backlog()['default'], 1)
+        self.assertEqual(executor.queue_usage()['default'], 1)
+
     @parameterized.expand((
         [['true'], ValueError],
         [['airflow', 'version'], ValueError],
@@ -31,7 +31,7 @@ try:
     from kubernetes.client.rest import ApiException
 
     from airflow.executors.kubernetes_executor import (
-        AirflowKubernetesScheduler, KubeConfig, KubernetesExecutor,
+        AirflowKubernetesScheduler, KubeConfig, KubernetesExecutor, get_watcher_shard,
     )
     from airflow.kubernetes import pod_generator
     from airflow.kubernetes.pod_generator import PodGenerator
@@ -119,6 +119,15 @@ class TestAirflowKubernetesScheduler(unittest.TestCase):
 
         self.assertEqual(datetime_obj, new_datetime_obj)
 
+    @unittest.skipIf(AirflowKubernetesScheduler is None,
+                     "kubernetes python package is not installed")
+    def test_get_watcher_shard(self):
+        for dag_id, task_id in self._cases():
+            shard = get_watcher_shard(dag_id, task_id, 4)
+            self.assertIn(shard, range(4))
+            self.assertEqual(shard, get_watcher_shard(dag_id, task_id, 4))
+            self.assertEqual(0, get_watcher_shard(dag_id, task_id, 1))
+
 
 class TestKubeConfig(unittest.TestCase):
     def setUp(self):
@@ -303,3 +312,34 @@ class TestKubernetesExecutor(unittest.TestCase):
         executor._change_state(key, State.FAILED, 'pod_id', 'test-namespace')
         self.assertTrue(executor.event_buffer[key][0] == State.FAILED)
         mock_delete_pod.assert_called_once_with('pod_id', 'test-namespace')
+
+    @mock.patch('airflow.executors.kubernetes_executor.KubernetesJobWatcher')
+    @mock.patch('airflow.executors.kubernetes_executor.get_kube_client')
+    def test_clear_not_launched_queued_tasks(self, mock_get_kube_client, mock_kubernetes_job_watcher):
+        executor = KubernetesExecutor()
+        executor.start()
+        execution_date = timezone.datetime(2020, 1, 1)
+        launched_ti = mock.MagicMock(dag_id='dag', task_id='launched', execution_date=execution_date)
+        not_launched_ti = mock.MagicMock(dag_id='dag', task_id='not_launched', execution_date=execution_date)
+        mock_session = mock.MagicMock()
+        mock_session.query.return_value.filter.return_value.all.return_value = [
+            launched_ti, not_launched_ti
+        ]
+        pod = mock.MagicMock()
+        pod.metadata.labels = {
+            'dag_id': 'dag',
+            'task_id': 'launched',
+            'execution_date': AirflowKubernetesScheduler._datetime_to_label_safe_datestring(execution_date),
+        }
+        executor.kube_client.list_namespaced_pod.reset_mock()
+        executor.kube_client.list_namespaced_pod.return_value = mock.MagicMock(items=[pod])
+
+        executor.clear_not_launched_queued_tasks(session=mock_session)
+
+        executor.kube_client.list_namespaced_pod.assert_called_once_with(
+            executor.kube_config.kube_namespace,
+            label_selector='airflow-worker={}'.format(executor.worker_uuid),
+        )
+        mock_session.query.return_value.filter.return_value.update.assert_called_once_with(
+            {mock.ANY: State.NONE}
+        )
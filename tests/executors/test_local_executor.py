@@ -20,7 +20,7 @@ import subprocess
 import unittest
 from unittest import mock
 
-from airflow.executors.local_executor import LocalExecutor
+from airflow.executors.local_executor import LocalExecutor, LocalWorkerBase
 from airflow.utils.state import State
 
 
@@ -88,3 +88,37 @@ class TestLocalExecutor(unittest.TestCase):
                  mock.call('executor.queued_tasks', mock.ANY),
                  mock.call('executor.running_tasks', mock.ANY)]
         mock_stats_gauge.assert_has_calls(calls)
+
+    def _test_execute_batch(self, parallelism):
+        def fake_execute_work_in_fork(args, dag):  # pylint: disable=unused-argument
+            return State.SUCCESS if args.task_id.startswith('success') else State.FAILED
+
+        execution_date = datetime.datetime(2020, 1, 1)
+        keys = [('fake_dag', 'success_{}'.format(i), execution_date, 1) for i in range(3)]
+        keys.append(('fake_dag', 'fail', execution_date, 1))
+
+        with mock.patch.object(LocalWorkerBase, '_get_batch_dag'), mock.patch.object(
+            LocalWorkerBase, '_execute_work_in_fork', side_effect=fake_execute_work_in_fork
+        ):
+            executor = LocalExecutor(parallelism=parallelism)
+            executor.start()
+
+            tasks = []
+            for key in keys:
+                command = ['airflow', 'tasks', 'run', key[0], key[1], execution_date.isoformat(), '--local']
+                executor.running.add(key)
+                tasks.append((key, command, None, None))
+            executor.execute_batch_async(tasks)
+
+            executor.end()
+
+        self.assertEqual(len(executor.running), 0)
+        for key in keys[:-1]:
+            self.assertEqual(executor.event_buffer[key][0], State.SUCCESS)
+        self.assertEqual(executor.event_buffer[keys[-1]][0], State.FAILED)
+
+    def test_execution_batch_unlimited_parallelism(self):
+        self._test_execute_batch(parallelism=0)
+
+    def test_execution_batch_limited_parallelism(self):
+        self._test_execute_batch(parallelism=2)
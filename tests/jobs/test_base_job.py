@@ -21,7 +21,7 @@ import datetime
 
 from mock import ANY, Mock, patch
 from pytest import raises
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, TimeoutError as SQLAlchemyTimeoutError
 
 from airflow.executors.sequential_executor import SequentialExecutor
 from airflow.jobs.base_job import BaseJob
@@ -119,6 +119,19 @@ class TestBaseJob:
 
             assert job.latest_heartbeat == when, "attribute not updated when heartbeat fails"
 
+    @patch('airflow.jobs.base_job.max_slot_wait')
+    @patch('airflow.jobs.base_job.create_session')
+    def test_heartbeat_failed_waiting_for_connection_slot(self, mock_create_session, mock_max_slot_wait):
+        when = timezone.utcnow() - datetime.timedelta(seconds=60)
+        mock_create_session.return_value.__enter__.side_effect = SQLAlchemyTimeoutError("No slot")
+
+        job = MockJob(None, heartrate=10, state=State.RUNNING)
+        job.latest_heartbeat = when
+        job.heartbeat()
+
+        mock_max_slot_wait.assert_called_once_with(5)
+        assert job.latest_heartbeat == when, "attribute not updated when heartbeat fails"
+
     @conf_vars({('scheduler', 'max_tis_per_query'): '100'})
     @patch('airflow.jobs.base_job.ExecutorLoader.get_default_executor')
     @patch('airflow.jobs.base_job.get_hostname')
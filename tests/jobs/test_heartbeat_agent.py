@@ -0,0 +1,135 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import shutil
+import signal
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from airflow.executors.sequential_executor import SequentialExecutor
+from airflow.jobs.base_job import BaseJob
+from airflow.jobs.heartbeat_agent import (
+    HEARTBEAT_AGENT_DIR_ENV, HeartbeatAgent, HeartbeatAgentClient, _run_heartbeat_agent,
+    start_heartbeat_agent,
+)
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_jobs
+
+
+class TestHeartbeatAgent(unittest.TestCase):
+    def setUp(self):
+        clear_db_jobs()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def tearDown(self):
+        clear_db_jobs()
+
+    def _create_job(self, state=State.RUNNING):
+        with create_session() as session:
+            job = BaseJob(executor=SequentialExecutor())
+            job.state = state
+            job.latest_heartbeat = timezone.datetime(2020, 1, 1)
+            session.add(job)
+            session.commit()
+            return job.id
+
+    def test_heartbeat_updates_alive_jobs_and_publishes_status(self):
+        alive_job_id = self._create_job()
+        shutdown_job_id = self._create_job(state=State.SHUTDOWN)
+        unregistered_job_id = self._create_job()
+        alive_client = HeartbeatAgentClient(self.directory, alive_job_id)
+        shutdown_client = HeartbeatAgentClient(self.directory, shutdown_job_id)
+        alive_client.beat()
+        shutdown_client.beat()
+        self.assertIsNone(alive_client.read_status())
+
+        HeartbeatAgent(self.directory).heartbeat()
+
+        with create_session() as session:
+            heartbeats = dict(session.query(BaseJob.id, BaseJob.latest_heartbeat).all())
+        self.assertGreater(heartbeats[alive_job_id], timezone.datetime(2020, 1, 1))
+        self.assertGreater(heartbeats[shutdown_job_id], timezone.datetime(2020, 1, 1))
+        self.assertEqual(heartbeats[unregistered_job_id], timezone.datetime(2020, 1, 1))
+
+        self.assertEqual(alive_client.read_status()['job_state'], State.RUNNING)
+        self.assertEqual(shutdown_client.read_status()['job_state'], State.SHUTDOWN)
+        self.assertIsNone(alive_client.read_status()['ti_state'])
+
+    @conf_vars({('scheduler', 'job_heartbeat_sec'): '5'})
+    def test_heartbeat_ignores_stale_jobs(self):
+        job_id = self._create_job()
+        recent_job_id = self._create_job()
+        client = HeartbeatAgentClient(self.directory, job_id)
+        recent_client = HeartbeatAgentClient(self.directory, recent_job_id)
+        client.beat()
+        recent_client.beat()
+        # Stale after 3 missed heartbeats, long before the zombie threshold of the scheduler
+        stale_time = time.time() - 20
+        os.utime(client.heartbeat_path, (stale_time, stale_time))
+        recent_time = time.time() - 10
+        os.utime(recent_client.heartbeat_path, (recent_time, recent_time))
+
+        HeartbeatAgent(self.directory).heartbeat()
+
+        self.assertFalse(os.path.exists(client.heartbeat_path))
+        self.assertIsNone(client.read_status())
+        self.assertEqual(recent_client.read_status()['job_state'], State.RUNNING)
+
+    def test_heartbeat_skips_foreign_files(self):
+        job_id = self._create_job()
+        client = HeartbeatAgentClient(self.directory, job_id)
+        client.beat()
+        open(os.path.join(self.directory, 'foo.heartbeat'), 'w').close()
+
+        HeartbeatAgent(self.directory).heartbeat()
+
+        self.assertEqual(client.read_status()['job_state'], State.RUNNING)
+
+    @mock.patch('airflow.jobs.heartbeat_agent.signal.signal')
+    @mock.patch('airflow.jobs.heartbeat_agent.HeartbeatAgent.run', side_effect=SystemExit)
+    def test_run_heartbeat_agent_removes_directory(self, mock_run, mock_signal):
+        with self.assertRaises(SystemExit):
+            _run_heartbeat_agent(self.directory)
+
+        mock_run.assert_called_once_with()
+        mock_signal.assert_called_once_with(signal.SIGTERM, mock.ANY)
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_client_unregister(self):
+        client = HeartbeatAgentClient(self.directory, 1)
+        client.beat()
+        self.assertTrue(os.path.exists(client.heartbeat_path))
+        client.unregister()
+        self.assertFalse(os.path.exists(client.heartbeat_path))
+
+    def test_client_from_env(self):
+        with mock.patch.dict(os.environ, {HEARTBEAT_AGENT_DIR_ENV: self.directory}):
+            self.assertIsNotNone(HeartbeatAgentClient.from_env(1))
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(HeartbeatAgentClient.from_env(1))
+
+    @conf_vars({('scheduler', 'shared_task_heartbeat'): 'False'})
+    def test_start_heartbeat_agent_disabled(self):
+        self.assertIsNone(start_heartbeat_agent())
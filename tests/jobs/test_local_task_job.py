@@ -132,6 +132,46 @@ class TestLocalTaskJob(unittest.TestCase):
         mock_pid.return_value = 2
         self.assertRaises(AirflowException, job1.heartbeat_callback)
 
+    @patch('airflow.jobs.local_task_job.sleep')
+    @patch('os.getpid')
+    def test_localtaskjob_heartbeat_through_agent(self, mock_pid, mock_sleep):
+        dag = DAG(
+            'test_localtaskjob_heartbeat_through_agent',
+            start_date=DEFAULT_DATE,
+            default_args={'owner': 'owner1'})
+
+        with dag:
+            op1 = DummyOperator(task_id='op1')
+
+        dag.clear()
+        dr = dag.create_dagrun(run_id="test",
+                               state=State.SUCCESS,
+                               execution_date=DEFAULT_DATE,
+                               start_date=DEFAULT_DATE)
+        ti = dr.get_task_instance(task_id=op1.task_id)
+        job1 = LocalTaskJob(task_instance=ti,
+                            ignore_ti_state=True,
+                            executor=SequentialExecutor())
+        mock_pid.return_value = 1
+        job1.heartbeat_agent_client = mock.MagicMock()
+        job1.heartbeat_agent_client.read_status.return_value = {
+            'latest_heartbeat': '2020-01-01T00:00:00+00:00',
+            'job_state': State.RUNNING,
+            'ti_state': State.RUNNING,
+            'hostname': get_hostname(),
+            'pid': 1,
+        }
+
+        with patch.object(job1, 'heartbeat_callback') as mock_heartbeat_callback:
+            job1.heartbeat()
+            job1.heartbeat_agent_client.beat.assert_called_once_with()
+            mock_heartbeat_callback.assert_not_called()
+            self.assertEqual(job1.latest_heartbeat, timezone.datetime(2020, 1, 1))
+
+            job1.heartbeat_agent_client.read_status.return_value['ti_state'] = State.SUCCESS
+            job1.heartbeat()
+            mock_heartbeat_callback.assert_called_once_with()
+
     @patch('os.getpid')
     def test_heartbeat_failed_fast(self, mock_getpid):
         """
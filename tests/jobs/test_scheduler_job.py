@@ -2145,6 +2145,51 @@ class TestSchedulerJob(unittest.TestCase):
             ti.refresh_from_db()
             self.assertEqual(State.QUEUED, ti.state)
 
+    @parameterized.expand([
+        ('executor_queue_slots', '{"default": 3}'),
+        ('executor_pool_slots', '{"default_pool": 3}'),
+    ])
+    def test_execute_task_instances_executor_slots(self, option, slots):
+        dag_id = f'SchedulerJobTest.test_execute_task_instances_{option}'
+        dag = DAG(dag_id=dag_id, start_date=DEFAULT_DATE, concurrency=16)
+        task1 = DummyOperator(dag=dag, task_id='dummy_task', queue='default')
+        dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag))
+        dagbag = self._make_simple_dag_bag([dag])
+
+        dag_file_processor = DagFileProcessor(dag_ids=[], log=mock.MagicMock())
+        with conf_vars({('core', option): slots}):
+            executor = MockExecutor(do_update=False)
+        scheduler = SchedulerJob(executor=executor)
+        session = settings.Session()
+
+        # One task instance already waiting in the executor
+        dr = dag_file_processor.create_dag_run(dag)
+        waiting_ti = TaskInstance(task1, dr.execution_date)
+        waiting_ti.state = State.QUEUED
+        session.merge(waiting_ti)
+        session.commit()
+        executor.queue_task_instance(waiting_ti)
+
+        tis = []
+        for _ in range(0, 4):
+            dr = dag_file_processor.create_dag_run(dag)
+            ti = TaskInstance(task1, dr.execution_date)
+            ti.state = State.SCHEDULED
+            session.merge(ti)
+            tis.append(ti)
+        session.commit()
+
+        res = scheduler._execute_task_instances(dagbag)
+
+        # The waiting task instance takes one of the 3 slots
+        self.assertEqual(2, res)
+        states = []
+        for ti in tis:
+            ti.refresh_from_db()
+            states.append(ti.state)
+        self.assertEqual([State.QUEUED] * 2 + [State.SCHEDULED] * 2, states)
+        session.close()
+
     @pytest.mark.quarantined
     @pytest.mark.xfail(condition=True, reason="The test is flaky with nondeterministic result")
     def test_change_state_for_tis_without_dagrun(self):
@@ -30,7 +30,7 @@ from airflow.models import DagBag, DagModel
 from airflow.utils.session import create_session
 from tests.models import TEST_DAGS_FOLDER
 from tests.test_utils.config import conf_vars
-from tests.test_utils.db import clear_db_dags
+from tests.test_utils.db import clear_db_dags, clear_db_serialized_dags
 
 
 class TestDagBag(unittest.TestCase):
@@ -632,3 +632,33 @@ class TestDagBag(unittest.TestCase):
         # clean up
         with create_session() as session:
             session.query(DagModel).filter(DagModel.dag_id == 'test_deactivate_unknown_dags').delete()
+
+    def test_refresh_dags_from_db(self):
+        """
+        Test that refresh_dags_from_db reads again the DAGs that changed
+        and drops the DAGs removed from the serialized_dag table
+        """
+        from airflow.models.serialized_dag import SerializedDagModel
+
+        example_dags = DagBag(include_examples=True).dags
+        changed_dag = example_dags["example_bash_operator"]
+        removed_dag = example_dags["example_branch_operator"]
+        unchanged_dag = example_dags["example_python_operator"]
+        clear_db_serialized_dags()
+        for dag in (changed_dag, removed_dag, unchanged_dag):
+            SerializedDagModel.write_dag(dag)
+
+        dagbag = DagBag(dag_folder=self.empty_dir, include_examples=False, store_serialized_dags=True)
+        dagbag.collect_dags_from_db()
+        unchanged_before = dagbag.get_dag("example_python_operator")
+        self.assertEqual(0, dagbag.refresh_dags_from_db())
+
+        changed_dag.description = "A new description"
+        SerializedDagModel.write_dag(changed_dag)
+        SerializedDagModel.remove_dag("example_branch_operator")
+
+        self.assertEqual(2, dagbag.refresh_dags_from_db())
+        self.assertEqual("A new description", dagbag.dags["example_bash_operator"].description)
+        self.assertNotIn("example_branch_operator", dagbag.dags)
+        self.assertIs(unchanged_before, dagbag.dags["example_python_operator"])
+        clear_db_serialized_dags()
@@ -0,0 +1,108 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from airflow.models.dag import DAG
+from airflow.models.dagstatesummary import DagStateSummary
+from airflow.models.stateversion import track_state_changes, untrack_state_changes
+from airflow.models.taskinstance import TaskInstance as TI
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.timezone import datetime
+from airflow.utils.types import DagRunType
+from tests.test_utils.db import clear_db_dag_state_summary, clear_db_runs
+
+DEFAULT_DATE = datetime(2020, 1, 1)
+
+
+class TestDagStateSummary(unittest.TestCase):
+    def setUp(self):
+        clear_db_runs()
+        clear_db_dag_state_summary()
+
+    def tearDown(self):
+        clear_db_runs()
+        clear_db_dag_state_summary()
+
+    def _create_dag_run(self, dag, execution_date, state, ti_states):
+        dag_run = dag.create_dagrun(
+            run_type=DagRunType.SCHEDULED,
+            execution_date=execution_date,
+            state=state,
+        )
+        with create_session() as session:
+            for ti, ti_state in zip(dag_run.get_task_instances(session=session), ti_states):
+                session.query(TI).filter(
+                    TI.dag_id == ti.dag_id, TI.task_id == ti.task_id, TI.execution_date == execution_date
+                ).update({TI.state: ti_state}, synchronize_session=False)
+
+    def test_refresh(self):
+        dag = DAG('test_dag_state_summary', start_date=DEFAULT_DATE)
+        DummyOperator(task_id='task_1', dag=dag)
+        DummyOperator(task_id='task_2', dag=dag)
+        self._create_dag_run(dag, datetime(2020, 1, 1), State.SUCCESS, [State.SUCCESS, State.SUCCESS])
+        self._create_dag_run(dag, datetime(2020, 1, 2), State.FAILED, [State.SUCCESS, State.FAILED])
+        self._create_dag_run(dag, datetime(2020, 1, 3), State.RUNNING, [State.RUNNING, State.NONE])
+
+        with create_session() as session:
+            DagStateSummary.refresh([dag.dag_id], session=session)
+
+        self.assertEqual(
+            DagStateSummary.get_counts([DagStateSummary.DAG_RUNS])[dag.dag_id],
+            {State.SUCCESS: 1, State.FAILED: 1, State.RUNNING: 1}
+        )
+        self.assertEqual(
+            DagStateSummary.get_counts([DagStateSummary.RUNNING_RUN_TASKS])[dag.dag_id],
+            {State.RUNNING: 1, State.NONE: 1}
+        )
+        self.assertEqual(
+            DagStateSummary.get_counts(
+                [DagStateSummary.RUNNING_RUN_TASKS, DagStateSummary.LAST_RUN_TASKS]
+            )[dag.dag_id],
+            {State.RUNNING: 1, State.NONE: 1, State.SUCCESS: 1, State.FAILED: 1}
+        )
+
+    def test_refresh_replaces_previous_summary(self):
+        with create_session() as session:
+            session.add(DagStateSummary('test_dag_state_summary', DagStateSummary.DAG_RUNS, State.RUNNING, 3))
+            session.add(DagStateSummary('other_dag', DagStateSummary.DAG_RUNS, State.RUNNING, 2))
+
+        with create_session() as session:
+            DagStateSummary.refresh(['test_dag_state_summary'], session=session)
+
+        counts = DagStateSummary.get_counts([DagStateSummary.DAG_RUNS])
+        self.assertNotIn('test_dag_state_summary', counts)
+        self.assertEqual(counts['other_dag'], {State.RUNNING: 2})
+
+    def test_refresh_keeps_version_when_unchanged(self):
+        track_state_changes()
+        self.addCleanup(untrack_state_changes)
+        dag = DAG('test_dag_state_summary', start_date=DEFAULT_DATE)
+        DummyOperator(task_id='task_1', dag=dag)
+        self._create_dag_run(dag, datetime(2020, 1, 1), State.RUNNING, [State.RUNNING])
+
+        DagStateSummary.refresh([dag.dag_id])
+        version = DagStateSummary.get_version()
+        DagStateSummary.refresh([dag.dag_id])
+        self.assertEqual(DagStateSummary.get_version(), version)
+
+        self._create_dag_run(dag, datetime(2020, 1, 2), State.RUNNING, [State.QUEUED])
+        DagStateSummary.refresh([dag.dag_id])
+        self.assertNotEqual(DagStateSummary.get_version(), version)
@@ -116,6 +116,27 @@ class SerializedDagModelTest(unittest.TestCase):
         self.assertFalse(SDM.has_dag(stale_dag.dag_id))
         self.assertTrue(SDM.has_dag(fresh_dag.dag_id))
 
+    def test_dag_hash_only_changes_with_dag(self):
+        """The hash of a serialized DAG only changes when the DAG does"""
+        dag = DAG("dag_hash_test", start_date=timezone.datetime(2020, 1, 1))
+        first = SDM(dag)
+        second = SDM(dag)
+        self.assertEqual(first.dag_hash, second.dag_hash)
+
+        dag.description = "changed"
+        self.assertNotEqual(first.dag_hash, SDM(dag).dag_hash)
+
+    def test_read_dags_with_hashes(self):
+        example_dags = self._write_example_dags()
+        dag_ids = [dag_id for dag_id, dag in example_dags.items() if not dag.is_subdag][:2]
+
+        dag_hashes = SDM.get_dag_hashes()
+        dags = SDM.read_dags_with_hashes(dag_ids=dag_ids)
+        self.assertEqual(set(dag_ids), set(dags))
+        for dag_id, (dag, dag_hash) in dags.items():
+            self.assertEqual(dag_id, dag.dag_id)
+            self.assertEqual(dag_hashes[dag_id], dag_hash)
+
     def test_bulk_sync_to_db(self):
         dags = [
             DAG("dag_1"), DAG("dag_2"), DAG("dag_3"),
@@ -0,0 +1,124 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from airflow.models.dag import DAG, DagModel
+from airflow.models.dagrun import DagRun
+from airflow.models.stateversion import (
+    StateVersion, is_tracking_state_changes, state_versions_enabled, track_state_changes,
+    untrack_state_changes,
+)
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.timezone import datetime
+from airflow.utils.types import DagRunType
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_dags, clear_db_runs
+
+DEFAULT_DATE = datetime(2020, 1, 1)
+
+
+def _get_version():
+    with create_session() as session:
+        return StateVersion.get_version(session)
+
+
+class TestStateVersion(unittest.TestCase):
+    def setUp(self):
+        clear_db_runs()
+        clear_db_dags()
+        self.dag = DAG('test_state_version', start_date=DEFAULT_DATE)
+        track_state_changes()
+
+    def tearDown(self):
+        untrack_state_changes()
+        clear_db_runs()
+        clear_db_dags()
+
+    def _create_dag_run(self, execution_date):
+        return self.dag.create_dagrun(
+            run_type=DagRunType.SCHEDULED, execution_date=execution_date, state=State.RUNNING
+        )
+
+    def test_bump_once_per_transaction(self):
+        version = _get_version()
+        with create_session() as session:
+            StateVersion.bump(session)
+            StateVersion.bump(session)
+            self.assertEqual(StateVersion.get_version(session), version + 1)
+        self.assertEqual(_get_version(), version + 1)
+
+        with create_session() as session:
+            StateVersion.bump(session)
+        self.assertEqual(_get_version(), version + 2)
+
+    def test_bump_rolled_back(self):
+        version = _get_version()
+        with create_session() as session:
+            StateVersion.bump(session)
+            session.rollback()
+            StateVersion.bump(session)
+        self.assertEqual(_get_version(), version + 1)
+
+    def test_dag_run_version_never_goes_back(self):
+        self._create_dag_run(DEFAULT_DATE)
+        version = _get_version()
+
+        # The new run may reuse the id of the deleted one, but not the version
+        with create_session() as session:
+            session.query(DagRun).filter(DagRun.dag_id == self.dag.dag_id).delete()
+        self.assertGreater(_get_version(), version)
+        self._create_dag_run(datetime(2020, 1, 2))
+        self.assertGreater(_get_version(), version + 1)
+
+    def test_dag_run_version_ignores_state_changes(self):
+        dag_run = self._create_dag_run(DEFAULT_DATE)
+        version = _get_version()
+
+        with create_session() as session:
+            dag_run = session.merge(dag_run)
+            dag_run.state = State.SUCCESS
+        self.assertEqual(_get_version(), version)
+
+    def test_dag_version(self):
+        DAG.bulk_sync_to_db([self.dag])
+        version = _get_version()
+
+        DAG.bulk_sync_to_db([self.dag])
+        self.assertEqual(_get_version(), version)
+
+        with create_session() as session:
+            session.query(DagModel).filter(DagModel.dag_id == self.dag.dag_id).update(
+                {DagModel.is_active: False}, synchronize_session=False
+            )
+        self.assertEqual(_get_version(), version + 1)
+
+    def test_untracked_writes_keep_version(self):
+        untrack_state_changes()
+        self.assertFalse(is_tracking_state_changes())
+        version = _get_version()
+
+        self._create_dag_run(DEFAULT_DATE)
+        self.assertEqual(_get_version(), version)
+
+    def test_enabled_with_response_cache(self):
+        with conf_vars({('webserver', 'response_cache_ttl'): '0'}):
+            self.assertFalse(state_versions_enabled())
+        with conf_vars({('webserver', 'response_cache_ttl'): '60'}):
+            self.assertTrue(state_versions_enabled())
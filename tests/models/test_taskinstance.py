@@ -33,7 +33,7 @@ from sqlalchemy.orm.session import Session
 from airflow import models, settings
 from airflow.exceptions import AirflowException, AirflowFailException, AirflowSkipException
 from airflow.models import (
-    DAG, DagRun, Pool, RenderedTaskInstanceFields, TaskInstance as TI, TaskReschedule, Variable,
+    DAG, DagRun, Pool, RenderedTaskInstanceFields, TaskInstance as TI, TaskReschedule, Variable, XCom,
 )
 from airflow.operators.bash import BashOperator
 from airflow.operators.dummy_operator import DummyOperator
@@ -51,7 +51,7 @@ from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 from tests.models import DEFAULT_DATE
 from tests.test_utils import db
-from tests.test_utils.asserts import assert_queries_count
+from tests.test_utils.asserts import assert_queries_count, count_queries
 from tests.test_utils.config import conf_vars
 
 
@@ -1716,6 +1716,7 @@ class TestRunRawTaskQueriesCount(unittest.TestCase):
         db.clear_db_dags()
         db.clear_db_sla_miss()
         db.clear_db_errors()
+        db.clear_db_xcom()
 
     def setUp(self) -> None:
         self._clean()
@@ -1739,6 +1740,41 @@ class TestRunRawTaskQueriesCount(unittest.TestCase):
         with assert_queries_count(expected_query_count):
             ti._run_raw_task(mark_success=mark_success)
 
+    def test_execute_queries_count_with_prefetched_xcoms(self):
+        from airflow.models.xcom_arg import XComArg
+
+        upstream_count = 10
+        dag = DAG('test_queries', start_date=DEFAULT_DATE)
+        upstream_tasks = [DummyOperator(task_id=f'upstream_{i}', dag=dag) for i in range(upstream_count)]
+        task = PythonOperator(
+            task_id='fan_in',
+            python_callable=lambda *args: None,
+            op_args=[XComArg(upstream_task) for upstream_task in upstream_tasks],
+            dag=dag,
+        )
+
+        def create_task_instance(execution_date):
+            for upstream_task in upstream_tasks:
+                XCom.set(key='return_value', value=upstream_task.task_id, dag_id=dag.dag_id,
+                         task_id=upstream_task.task_id, execution_date=execution_date)
+            ti = TI(task=task, execution_date=execution_date)
+            ti.state = State.RUNNING
+            with create_session() as session:
+                session.merge(ti)
+            return ti
+
+        ti = create_task_instance(timezone.datetime(2020, 1, 1))
+        with count_queries() as queries:
+            ti._run_raw_task()
+        ti = create_task_instance(timezone.datetime(2020, 1, 2))
+        with conf_vars({('core', 'prefetch_upstream_xcoms'): 'True'}), count_queries() as prefetched_queries:
+            ti._run_raw_task()
+
+        # A single query reads the XComs of all the upstream tasks
+        self.assertEqual(queries.count - upstream_count + 1, prefetched_queries.count)
+        self.assertEqual([f'upstream_{i}' for i in range(upstream_count)], ti.task.op_args)
+        self.assertIsNone(ti._xcom_prefetch)
+
     def test_execute_queries_count_store_serialized(self):
         with create_session() as session:
             dag = DAG('test_queries', start_date=DEFAULT_DATE)
@@ -19,7 +19,7 @@ import unittest
 
 from airflow import settings
 from airflow.configuration import conf
-from airflow.models.xcom import BaseXCom, XCom, resolve_xcom_backend
+from airflow.models.xcom import BaseXCom, XCom, XComPrefetch, resolve_xcom_backend
 from airflow.utils import timezone
 from tests.test_utils import db
 from tests.test_utils.config import conf_vars
@@ -212,3 +212,33 @@ class TestXCom(unittest.TestCase):
 
         for result in results:
             self.assertEqual(result.value, json_obj)
+
+    @conf_vars({("core", "enable_xcom_pickling"): "False"})
+    def test_xcom_prefetch(self):
+        execution_date = timezone.utcnow()
+        for task_id, value in [("task_1", [1]), ("task_2", [2]), ("other_task", [3])]:
+            XCom.set(key="return_value", value=value, dag_id="test_dag", task_id=task_id,
+                     execution_date=execution_date)
+        XCom.set(key="return_value", value=[4], dag_id="test_dag", task_id="task_1",
+                 execution_date=timezone.datetime(2016, 1, 1))
+
+        prefetch = XComPrefetch.fetch("test_dag", execution_date, ["task_1", "task_2", "task_3"])
+
+        self.assertEqual(2, len(prefetch))
+        self.assertTrue(prefetch.has("task_1", "return_value"))
+        self.assertTrue(prefetch.has(["task_1", "task_2"], "return_value"))
+        self.assertFalse(prefetch.has(["task_1", "task_3"], "return_value"))
+        self.assertFalse(prefetch.has("other_task", "return_value"))
+        self.assertFalse(prefetch.has("task_1", "other_key"))
+
+        self.assertEqual([1], prefetch.pull("task_1", "return_value"))
+        # Pulls do not share the deserialized values
+        self.assertIsNot(prefetch.pull("task_1", "return_value"), prefetch.pull("task_1", "return_value"))
+        # Most recent first, like XCom.get_many
+        self.assertEqual([[2], [1]], prefetch.pull(["task_1", "task_2"], "return_value"))
+
+    def test_xcom_prefetch_without_tasks(self):
+        XCom.set(key="return_value", value=1, dag_id="test_dag", task_id="task_1",
+                 execution_date=timezone.utcnow())
+
+        self.assertEqual(0, len(XComPrefetch.fetch("test_dag", timezone.utcnow(), [])))
@@ -15,12 +15,38 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+import tempfile
 import unittest
 from unittest import mock
 
 from airflow.hooks.base_hook import BaseHook
 from airflow.plugins_manager import AirflowPlugin
 from airflow.www import app as application
+from tests.test_utils.config import conf_vars
+from tests.test_utils.mock_plugins import mock_plugin_manager
+
+MACROS_PLUGIN = """
+from airflow.plugins_manager import AirflowPlugin
+
+def manifest_macro():
+    pass
+
+class ManifestMacrosPlugin(AirflowPlugin):
+    name = "manifest_macros_plugin"
+    macros = [manifest_macro]
+"""
+
+EXECUTORS_PLUGIN = """
+from airflow.plugins_manager import AirflowPlugin
+
+class ManifestExecutor:
+    pass
+
+class ManifestExecutorsPlugin(AirflowPlugin):
+    name = "manifest_executors_plugin"
+    executors = [ManifestExecutor]
+"""
 
 
 class TestPluginsRBAC(unittest.TestCase):
@@ -156,3 +182,54 @@ class TestPluginsManager(unittest.TestCase):
             'compatible with the current Airflow version. Please contact the author of '
             'the plugin.'
         ])
+
+
+class TestPluginsManifest(unittest.TestCase):
+    def setUp(self):
+        self.plugins_folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.plugins_folder.cleanup)
+        for file_name, code in (("manifest_macros.py", MACROS_PLUGIN),
+                                ("manifest_executors.py", EXECUTORS_PLUGIN)):
+            with open(os.path.join(self.plugins_folder.name, file_name), "w") as plugin_file:
+                plugin_file.write(code)
+        self.manifest_path = os.path.join(self.plugins_folder.name, "plugins_manifest.json")
+
+        for patcher in (
+            mock.patch("airflow.settings.PLUGINS_FOLDER", self.plugins_folder.name),
+            mock.patch("airflow.plugins_manager.PLUGINS_MANIFEST_PATH", self.manifest_path),
+            mock.patch("airflow.plugins_manager.pkg_resources.iter_entry_points", return_value=[]),
+            conf_vars({("core", "cache_plugins_manifest"): "True"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _loaded_plugin_names(self, category):
+        from airflow import plugins_manager
+
+        with mock_plugin_manager():
+            plugins_manager.ensure_plugins_loaded(category)
+            return sorted(plugin.name for plugin in plugins_manager.plugins)
+
+    def test_should_load_only_plugins_of_category_with_manifest(self):
+        # Without manifest all the plugins are loaded, and the manifest is written
+        self.assertEqual(
+            ["manifest_executors_plugin", "manifest_macros_plugin"], self._loaded_plugin_names("executors")
+        )
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+        self.assertEqual(["manifest_executors_plugin"], self._loaded_plugin_names("executors"))
+        self.assertEqual(["manifest_macros_plugin"], self._loaded_plugin_names("dag"))
+        self.assertEqual([], self._loaded_plugin_names("web_ui"))
+        self.assertEqual(
+            ["manifest_executors_plugin", "manifest_macros_plugin"], self._loaded_plugin_names(None)
+        )
+
+    def test_should_rebuild_stale_manifest(self):
+        self._loaded_plugin_names("dag")
+        plugin_path = os.path.join(self.plugins_folder.name, "manifest_macros.py")
+        stat = os.stat(plugin_path)
+        os.utime(plugin_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertEqual(
+            ["manifest_executors_plugin", "manifest_macros_plugin"], self._loaded_plugin_names("dag")
+        )
@@ -16,6 +16,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import gzip
 import os
 import unittest
 from unittest import mock
@@ -204,3 +205,33 @@ class TestS3TaskHandler(unittest.TestCase):
         with self.assertRaises(self.conn.exceptions.NoSuchKey):
             boto3.resource('s3').Object(  # pylint: disable=no-member
                 'bucket', self.remote_log_key).get()
+
+    @conf_vars({('logging', 'remote_log_compression'): 'gzip'})
+    def test_close_compressed(self):
+        self.s3_task_handler.set_context(self.ti)
+        with open(self.s3_task_handler.handler.baseFilename, 'w') as log_file:
+            log_file.write('Log line\n')
+
+        self.s3_task_handler.close()
+
+        keys = self.s3_task_handler.hook.list_keys('bucket', prefix=self.remote_log_key)
+        self.assertEqual(1, len(keys))
+        self.assertTrue(keys[0].endswith('.gz'))
+        body = boto3.resource('s3').Object(  # pylint: disable=no-member
+            'bucket', keys[0]).get()['Body'].read()
+        self.assertEqual(b'Log line\n', gzip.decompress(body))
+
+    def test_read_compressed_parts(self):
+        self.conn.put_object(Bucket='bucket', Key=self.remote_log_key, Body=b'Uncompressed\n')
+        self.conn.put_object(Bucket='bucket', Key=self.remote_log_key + '.20200102T000000000000.gz',
+                             Body=gzip.compress(b'Second\n'))
+        self.conn.put_object(Bucket='bucket', Key=self.remote_log_key + '.20200101T000000000000.gz',
+                             Body=gzip.compress(b'First\n'))
+
+        self.assertEqual(
+            self.s3_task_handler.read(self.ti),
+            (['*** Reading remote log from s3://bucket/remote/log/location/1.log.\n'
+              'Uncompressed\nFirst\nSecond\n\n'], [{'end_of_log': True}])
+        )
+        log_stream = self.s3_task_handler.stream(self.ti, 1)
+        self.assertEqual(b'Uncompressed\nFirst\nSecond\n', b''.join(log_stream.chunks))
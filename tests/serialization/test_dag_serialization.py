@@ -362,6 +362,8 @@ class TestStringifiedDAGs(unittest.TestCase):
             assert getattr(serialized_task, field) == getattr(task, field), \
                 f'{task.dag.dag_id}.{task.task_id}.{field} does not match'
 
+        assert serialized_task.deps == task.deps
+
         if serialized_task.resources is None:
             assert task.resources is None or task.resources == []
         else:
@@ -719,6 +721,50 @@ class TestStringifiedDAGs(unittest.TestCase):
 
         assert serialized_op.do_xcom_push is False
 
+    def test_operator_deps(self):
+        from airflow.sensors.base_sensor_operator import BaseSensorOperator
+        from airflow.ti_deps.deps.base_ti_dep import BaseTIDep
+        from airflow.ti_deps.deps.ready_to_reschedule import ReadyToRescheduleDep
+        from airflow.ti_deps.deps.valid_state_dep import ValidStateDep
+        from airflow.utils.state import State
+
+        class CustomDep(BaseTIDep):
+            pass
+
+        class CustomDepOperator(BaseOperator):
+            @property
+            def deps(self):
+                return BaseOperator.deps.fget(self) | {CustomDep()}
+
+        blob = SerializedBaseOperator.serialize_operator(BaseOperator(task_id='default'))
+        assert 'deps' not in blob
+        assert SerializedBaseOperator.deserialize_operator(blob).deps == BaseOperator.deps.fget(None)
+
+        sensor = BaseSensorOperator(task_id='sensor', mode='reschedule')
+        blob = SerializedBaseOperator.serialize_operator(sensor)
+        assert 'airflow.ti_deps.deps.ready_to_reschedule.ReadyToRescheduleDep' in blob['deps']
+        serialized_sensor = SerializedBaseOperator.deserialize_operator(blob)
+        assert ReadyToRescheduleDep() in serialized_sensor.deps
+        assert serialized_sensor.deps == sensor.deps
+
+        # Only the dependencies of Airflow are loaded, the others are kept as import paths
+        blob = SerializedBaseOperator.serialize_operator(CustomDepOperator(task_id='custom'))
+        serialized_op = SerializedBaseOperator.deserialize_operator(blob)
+        assert serialized_op.deps == BaseOperator.deps.fget(None)
+        assert serialized_op.unloaded_deps == [f'{CustomDep.__module__}.{CustomDep.__name__}']
+        assert SerializedBaseOperator.serialize_operator(serialized_op)['deps'] == blob['deps']
+
+        # Dependencies with constructor arguments are not loaded either
+        class ValidStateDepOperator(BaseOperator):
+            @property
+            def deps(self):
+                return BaseOperator.deps.fget(self) | {ValidStateDep({State.SUCCESS})}
+
+        blob = SerializedBaseOperator.serialize_operator(ValidStateDepOperator(task_id='valid_state'))
+        serialized_op = SerializedBaseOperator.deserialize_operator(blob)
+        assert serialized_op.deps == BaseOperator.deps.fget(None)
+        assert serialized_op.unloaded_deps == ['airflow.ti_deps.deps.valid_state_dep.ValidStateDep']
+
     def test_no_new_fields_added_to_base_operator(self):
         """
         This test verifies that there are no new fields added to BaseOperator. And reminds that
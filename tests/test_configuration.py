@@ -240,6 +240,60 @@ key8 = true #123
         self.assertEqual(False, test_conf.getboolean('false', 'key7'))
         self.assertEqual(True, test_conf.getboolean('inline-comment', 'key8'))
 
+    def test_snapshot_memoizes_options(self):
+        """Test that options are only resolved once in snapshot mode"""
+        test_conf = AirflowConfigParser(default_config="""
+[snapshot]
+key1 = value1
+key2 = 5
+""")
+        test_conf.enable_snapshot()
+        self.assertTrue(test_conf.snapshot_enabled)
+        with mock.patch.object(test_conf, '_get_option', wraps=test_conf._get_option) as mock_get_option:
+            for _ in range(3):
+                self.assertEqual('value1', test_conf.get('snapshot', 'key1'))
+                self.assertEqual(5, test_conf.getint('snapshot', 'key2'))
+                self.assertEqual('default', test_conf.get('snapshot', 'missing', fallback='default'))
+                self.assertFalse(test_conf.has_option('snapshot', 'missing'))
+            self.assertEqual(3, mock_get_option.call_count)
+
+        with self.assertRaisesRegex(AirflowConfigException, re.escape('section/key [snapshot/missing]')):
+            test_conf.get('snapshot', 'missing')
+        # The fallback of a call is not memoized as the value of the option
+        self.assertEqual(1, test_conf.getint('snapshot', 'missing', fallback=1))
+        self.assertEqual(2, test_conf.getint('snapshot', 'missing', fallback=2))
+
+    def test_snapshot_is_invalidated(self):
+        """Test that the snapshot is invalidated by changes of the config and explicitly"""
+        test_conf = AirflowConfigParser(default_config="""
+[snapshot]
+key1 = value1
+""")
+        test_conf.enable_snapshot()
+        self.assertEqual('value1', test_conf.get('snapshot', 'key1'))
+
+        test_conf.add_section('snapshot')
+        test_conf.set('snapshot', 'key1', 'value2')
+        self.assertEqual('value2', test_conf.get('snapshot', 'key1'))
+
+        test_conf.remove_option('snapshot', 'key1', remove_default=False)
+        self.assertEqual('value1', test_conf.get('snapshot', 'key1'))
+
+        test_conf.read_string("""
+[snapshot]
+key1 = value3
+""")
+        self.assertEqual('value3', test_conf.get('snapshot', 'key1'))
+
+        with mock.patch.dict('os.environ', {'AIRFLOW__SNAPSHOT__KEY1': 'value4'}):
+            self.assertEqual('value3', test_conf.get('snapshot', 'key1'))
+            test_conf.invalidate_snapshot()
+            self.assertEqual('value4', test_conf.get('snapshot', 'key1'))
+
+        test_conf.disable_snapshot()
+        self.assertFalse(test_conf.snapshot_enabled)
+        self.assertEqual('value3', test_conf.get('snapshot', 'key1'))
+
     def test_getint(self):
         """Test AirflowConfigParser.getint"""
         test_config = """
@@ -0,0 +1,145 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import unittest
+import urllib.request
+from datetime import timedelta
+
+from parameterized import parameterized
+
+from airflow.metrics_registry import MetricsRegistry, parse_stat, start_metrics_server, timing_to_seconds
+
+
+class TestParseStat(unittest.TestCase):
+
+    @parameterized.expand([
+        ('scheduler_heartbeat', 'scheduler_heartbeat', {}),
+        ('ti.finish.my_dag.my_task.success', 'ti.finish',
+         {'dag_id': 'my_dag', 'task_id': 'my_task', 'state': 'success'}),
+        ('dagrun.duration.failed.my.dotted.dag', 'dagrun.duration',
+         {'state': 'failed', 'dag_id': 'my.dotted.dag'}),
+        ('pool.open_slots.default_pool', 'pool.open_slots', {'pool': 'default_pool'}),
+        ('operator_failures_BashOperator', 'operator_failures', {'operator': 'BashOperator'}),
+        ('dag_processing.last_run.seconds_ago.my_file', 'dag_processing.last_run.seconds_ago',
+         {'file': 'my_file'}),
+    ])
+    def test_parse_stat(self, stat, expected_name, expected_labels):
+        self.assertEqual((expected_name, expected_labels), parse_stat(stat))
+
+    def test_parse_stat_with_tags(self):
+        self.assertEqual(
+            ('scheduler_heartbeat', {'host': 'worker-1', 'team': 'data'}),
+            parse_stat('scheduler_heartbeat', ['host:worker-1', 'team:data'])
+        )
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        registry.inc('ti.start', labels={'dag_id': 'dag_1'})
+        registry.inc('ti.start', 2, labels={'dag_id': 'dag_1'})
+        registry.inc('ti.start', labels={'dag_id': 'dag_2'})
+        registry.set('executor.open_slots', 10)
+        registry.set('executor.open_slots', -2, delta=True)
+
+        self.assertEqual(
+            '# TYPE airflow_executor_open_slots gauge\n'
+            'airflow_executor_open_slots 8\n'
+            '# TYPE airflow_ti_start_total counter\n'
+            'airflow_ti_start_total{dag_id="dag_1"} 3\n'
+            'airflow_ti_start_total{dag_id="dag_2"} 1\n',
+            registry.generate_latest()
+        )
+
+    def test_histogram(self):
+        registry = MetricsRegistry(buckets=(1, 10))
+        registry.observe('dagrun.duration', 0.5, labels={'dag_id': 'dag_1'})
+        registry.observe('dagrun.duration', 5, labels={'dag_id': 'dag_1'})
+        registry.observe('dagrun.duration', 50, labels={'dag_id': 'dag_1'})
+
+        self.assertEqual(
+            '# TYPE airflow_dagrun_duration_seconds histogram\n'
+            'airflow_dagrun_duration_seconds_bucket{dag_id="dag_1",le="1"} 1\n'
+            'airflow_dagrun_duration_seconds_bucket{dag_id="dag_1",le="10"} 2\n'
+            'airflow_dagrun_duration_seconds_bucket{dag_id="dag_1",le="+Inf"} 3\n'
+            'airflow_dagrun_duration_seconds_sum{dag_id="dag_1"} 55.5\n'
+            'airflow_dagrun_duration_seconds_count{dag_id="dag_1"} 3\n',
+            registry.generate_latest()
+        )
+
+    def test_counter_is_not_decremented(self):
+        registry = MetricsRegistry()
+        registry.inc('ti_failures', 2)
+        registry.inc('ti_failures', -1)
+        self.assertIn('airflow_ti_failures_total 2\n', registry.generate_latest())
+
+    def test_metric_keeps_its_type(self):
+        registry = MetricsRegistry()
+        registry.inc('dagbag_size')
+        registry.set('dagbag_size', 10)
+        self.assertIn('airflow_dagbag_size_total 1\n', registry.generate_latest())
+
+    def test_dropped_labels_are_aggregated(self):
+        registry = MetricsRegistry(dropped_labels=['task_id'])
+        registry.inc('ti.start', labels={'dag_id': 'dag_1', 'task_id': 'task_1'})
+        registry.inc('ti.start', labels={'dag_id': 'dag_1', 'task_id': 'task_2'})
+        self.assertIn('airflow_ti_start_total{dag_id="dag_1"} 2\n', registry.generate_latest())
+
+    def test_label_values_are_capped(self):
+        registry = MetricsRegistry(max_label_values=2)
+        for pool in ('pool_1', 'pool_2', 'pool_3', 'pool_4'):
+            registry.set('pool.open_slots', 1, labels={'pool': pool})
+        registry.set('pool.open_slots', 5, labels={'pool': 'pool_1'})
+
+        output = registry.generate_latest()
+        self.assertIn('airflow_pool_open_slots{pool="pool_1"} 5\n', output)
+        self.assertIn('airflow_pool_open_slots{pool="pool_2"} 1\n', output)
+        self.assertIn('airflow_pool_open_slots{pool="__other__"} 1\n', output)
+        self.assertNotIn('pool_3', output)
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.inc('ti.start', labels={'dag_id': 'my "dag"\\'})
+        self.assertIn('airflow_ti_start_total{dag_id="my \\"dag\\"\\\\"} 1\n', registry.generate_latest())
+
+    def test_clear(self):
+        registry = MetricsRegistry()
+        registry.inc('scheduler_heartbeat')
+        registry.clear()
+        self.assertEqual('', registry.generate_latest())
+
+    def test_timing_to_seconds(self):
+        self.assertEqual(1.5, timing_to_seconds(timedelta(milliseconds=1500)))
+        self.assertEqual(1.5, timing_to_seconds(1500))
+
+
+class TestMetricsServer(unittest.TestCase):
+
+    def test_serves_metrics(self):
+        registry = MetricsRegistry()
+        registry.inc('scheduler_heartbeat')
+        server = start_metrics_server(registry, 0, 'localhost')
+        try:
+            url = 'http://localhost:{}/metrics'.format(server.server_address[1])
+            with urllib.request.urlopen(url) as response:
+                self.assertEqual(200, response.status)
+                self.assertIn('text/plain', response.headers['Content-Type'])
+                self.assertIn(b'airflow_scheduler_heartbeat_total 1\n', response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
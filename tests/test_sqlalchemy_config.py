@@ -16,6 +16,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import sys
 import unittest
 
 from mock import patch
@@ -66,6 +67,23 @@ class TestSqlAlchemySettings(unittest.TestCase):
             pool_size=5
         )
 
+    @unittest.skipIf(sys.version_info < (3, 7), "Needs module __getattr__")
+    @patch('airflow.settings.setup_event_handlers')
+    @patch('airflow.settings.scoped_session')
+    @patch('airflow.settings.sessionmaker')
+    @patch('airflow.settings.create_engine')
+    def test_configure_orm_on_first_access(self,
+                                           mock_create_engine,
+                                           mock_sessionmaker,
+                                           mock_scoped_session,
+                                           mock_setup_event_handlers):
+        del settings.engine
+        del settings.Session
+
+        self.assertEqual(mock_scoped_session.return_value, settings.Session)
+        self.assertEqual(mock_create_engine.return_value, settings.engine)
+        mock_create_engine.assert_called_once()
+
     @patch('airflow.settings.setup_event_handlers')
     @patch('airflow.settings.scoped_session')
     @patch('airflow.settings.sessionmaker')
@@ -17,7 +17,10 @@
 # under the License.
 import importlib
 import re
+import threading
+import time
 import unittest
+from datetime import timedelta
 from unittest import mock
 from unittest.mock import Mock
 
@@ -25,7 +28,11 @@ import statsd
 
 import airflow
 from airflow.exceptions import AirflowConfigException, InvalidStatsNameException
-from airflow.stats import AllowListValidator, SafeDogStatsdLogger, SafeStatsdLogger
+from airflow.metrics_registry import MetricsRegistry
+from airflow.stats import (
+    AllowListValidator, BufferedDogStatsdLogger, BufferedStatsdLogger, DummyStatsLogger,
+    PrometheusStatsLogger, SafeDogStatsdLogger, SafeStatsdLogger, StatsBuffer,
+)
 from tests.test_utils.config import conf_vars
 
 
@@ -212,6 +219,239 @@ class TestDogStats(unittest.TestCase):
         importlib.reload(airflow.stats)
 
 
+class TestStatsTimer(unittest.TestCase):
+
+    def test_timer_sends_duration(self):
+        statsd_client = Mock()
+        stats = SafeStatsdLogger(statsd_client)
+        with stats.timer('test_timer') as timer:
+            pass
+        self.assertIsNotNone(timer.duration)
+        statsd_client.timing.assert_called_once_with('test_timer', timer.duration)
+
+    def test_timer_does_not_send_when_stopped_without_sending(self):
+        statsd_client = Mock()
+        timer = SafeStatsdLogger(statsd_client).timer('test_timer').start()
+        timer.stop(send=False)
+        self.assertIsNotNone(timer.duration)
+        statsd_client.timing.assert_not_called()
+
+    def test_timer_sends_tags_with_dogstatsd(self):
+        dogstatsd_client = Mock()
+        stats = SafeDogStatsdLogger(dogstatsd_client)
+        with stats.timer('test_timer', tags=['key:value']) as timer:
+            pass
+        dogstatsd_client.timing.assert_called_once_with(
+            metric='test_timer', value=timer.duration, tags=['key:value']
+        )
+
+    def test_dummy_timer_does_not_measure(self):
+        with DummyStatsLogger.timer('test_timer') as timer:
+            pass
+        self.assertIsNone(timer.duration)
+        self.assertIs(timer, DummyStatsLogger.timer('other_timer'))
+
+    @conf_vars({
+        ('scheduler', 'stat_name_handler'): 'tests.test_stats.counting_handler'
+    })
+    def test_stat_name_validation_is_memoized(self):
+        importlib.reload(airflow.stats)
+        statsd_client = Mock()
+        stats = airflow.stats.SafeStatsdLogger(statsd_client)
+        counting_handler.calls = 0
+        for _ in range(3):
+            stats.incr('test_memoized_stat')
+        self.assertEqual(1, counting_handler.calls)
+        self.assertEqual(3, statsd_client.incr.call_count)
+
+    def tearDown(self) -> None:
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
+class TestBufferedStats(unittest.TestCase):
+
+    def setUp(self):
+        self.statsd_client = Mock()
+        self.pipeline = self.statsd_client.pipeline.return_value
+        self.stats = BufferedStatsdLogger(self.statsd_client, flush_interval=60, max_size=100)
+
+    def test_aggregates_until_flush(self):
+        self.stats.incr('test_counter')
+        self.stats.incr('test_counter', 2)
+        self.stats.decr('test_counter')
+        self.stats.gauge('test_gauge', 5)
+        self.stats.gauge('test_gauge', 7)
+        self.stats.gauge('test_delta_gauge', 1, delta=True)
+        self.stats.gauge('test_delta_gauge', 2, delta=True)
+        self.stats.timing('test_timing', 10)
+        self.stats.timing('test_timing', 20)
+        self.statsd_client.pipeline.assert_not_called()
+
+        self.stats.flush()
+        self.pipeline.incr.assert_called_once_with('test_counter', 2)
+        self.pipeline.gauge.assert_has_calls([
+            mock.call('test_gauge', 7, delta=False),
+            mock.call('test_delta_gauge', 3, delta=True),
+        ])
+        self.pipeline.timing.assert_has_calls([
+            mock.call('test_timing', 10),
+            mock.call('test_timing', 20),
+        ])
+        self.pipeline.send.assert_called_once_with()
+
+    def test_flushes_when_full(self):
+        stats = BufferedStatsdLogger(self.statsd_client, flush_interval=60, max_size=2)
+        stats.incr('test_counter_one')
+        self.statsd_client.pipeline.assert_not_called()
+        stats.incr('test_counter_two')
+        self.pipeline.send.assert_called_once_with()
+
+    @mock.patch('airflow.stats.time.monotonic')
+    def test_flushes_after_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 1000
+        stats = BufferedStatsdLogger(self.statsd_client, flush_interval=1, max_size=100)
+        stats.incr('test_counter')
+        self.statsd_client.pipeline.assert_not_called()
+        mock_monotonic.return_value = 1001
+        stats.incr('test_counter')
+        self.pipeline.incr.assert_called_once_with('test_counter', 2)
+
+    def test_flushes_idle_buffer_periodically(self):
+        stats = BufferedStatsdLogger(self.statsd_client, flush_interval=0.01, max_size=100)
+        self.addCleanup(stats.buffer.stop)
+        stats.incr('test_counter')
+
+        # No other metric is recorded, the thread of the buffer flushes it
+        deadline = time.monotonic() + 5
+        while not self.pipeline.send.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.pipeline.incr.assert_called_once_with('test_counter', 1)
+
+    def test_flushes_send_one_at_a_time(self):
+        sending, release = threading.Event(), threading.Event()
+        sent = []
+
+        def send(counters, gauges, timings):  # pylint: disable=unused-argument
+            sent.append(counters)
+            sending.set()
+            release.wait(5)
+
+        buffer = StatsBuffer(send, flush_interval=60, max_size=100)
+        self.addCleanup(buffer.stop)
+        buffer.incr('first_counter', 1, 1)
+        first_flush = threading.Thread(target=buffer.flush)
+        first_flush.start()
+        self.assertTrue(sending.wait(5))
+
+        # As from the thread of the buffer, while the first flush is still sending
+        buffer.incr('second_counter', 1, 1)
+        second_flush = threading.Thread(target=buffer.flush)
+        second_flush.start()
+        second_flush.join(0.1)
+        self.assertTrue(second_flush.is_alive())
+        self.assertEqual(len(sent), 1)
+
+        release.set()
+        first_flush.join(5)
+        second_flush.join(5)
+        self.assertEqual(sent, [{('first_counter', ()): 1}, {('second_counter', ()): 1}])
+
+    def test_does_not_send_empty_buffer(self):
+        self.stats.flush()
+        self.statsd_client.pipeline.assert_not_called()
+
+    def test_does_not_buffer_invalid_or_not_allowed_stats(self):
+        stats = BufferedStatsdLogger(
+            self.statsd_client, AllowListValidator("stats_one"), flush_interval=60, max_size=100
+        )
+        stats.incr('test/$tats')
+        stats.incr('stats_two')
+        self.assertEqual(0, len(stats.buffer))
+
+    def test_aggregates_per_tags_with_dogstatsd(self):
+        dogstatsd_client = Mock()
+        stats = BufferedDogStatsdLogger(dogstatsd_client, flush_interval=60, max_size=100)
+        stats.incr('test_counter', tags=['key:one'])
+        stats.incr('test_counter', tags=['key:one'])
+        stats.incr('test_counter', tags=['key:two'])
+        stats.flush()
+        dogstatsd_client.open_buffer.assert_called_once_with()
+        dogstatsd_client.increment.assert_has_calls([
+            mock.call(metric='test_counter', value=2, tags=['key:one']),
+            mock.call(metric='test_counter', value=1, tags=['key:two']),
+        ])
+        dogstatsd_client.close_buffer.assert_called_once_with()
+
+    def test_sampled_counter_is_scaled_up(self):
+        buffer = StatsBuffer(Mock(), flush_interval=60, max_size=100)
+        with mock.patch('airflow.stats.random.random', return_value=0.1):
+            buffer.incr('test_counter', 1, 0.5)
+        with mock.patch('airflow.stats.random.random', return_value=0.9):
+            buffer.incr('test_counter', 1, 0.5)
+        self.assertEqual({('test_counter', ()): 2}, buffer._counters)
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_flush_interval'): '1',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_does_use_buffered_logger_when_flush_interval_is_set(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        self.assertIsInstance(airflow.stats.Stats.instance, airflow.stats.BufferedStatsdLogger)
+
+    def tearDown(self) -> None:
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
+class TestPrometheusStats(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.stats = PrometheusStatsLogger(self.registry)
+
+    def test_records_labeled_metrics(self):
+        self.stats.incr('ti.finish.my_dag.my_task.success')
+        self.stats.gauge('pool.open_slots.default_pool', 128)
+        self.stats.timing('dagrun.duration.success.my_dag', timedelta(seconds=2))
+
+        output = self.registry.generate_latest()
+        self.assertIn(
+            'airflow_ti_finish_total{dag_id="my_dag",state="success",task_id="my_task"} 1\n', output
+        )
+        self.assertIn('airflow_pool_open_slots{pool="default_pool"} 128\n', output)
+        self.assertIn('airflow_dagrun_duration_seconds_sum{dag_id="my_dag",state="success"} 2\n', output)
+
+    def test_up_down_counter_is_a_gauge(self):
+        self.stats.incr('dag_processing.processes')
+        self.stats.incr('dag_processing.processes')
+        self.stats.decr('dag_processing.processes')
+        self.assertIn('airflow_dag_processing_processes 1\n', self.registry.generate_latest())
+
+    def test_does_not_record_not_allowed_stats(self):
+        stats = PrometheusStatsLogger(self.registry, AllowListValidator('scheduler'))
+        stats.incr('ti_failures')
+        self.assertEqual('', self.registry.generate_latest())
+
+    @conf_vars({
+        ('scheduler', 'prometheus_on'): 'True',
+        ('scheduler', 'prometheus_dropped_labels'): 'task_id',
+    })
+    def test_does_use_prometheus_logger_when_prometheus_on(self):
+        importlib.reload(airflow.stats)
+        self.assertIsInstance(airflow.stats.Stats.instance, airflow.stats.PrometheusStatsLogger)
+        self.assertEqual(frozenset(['task_id']), airflow.stats.Stats.instance.registry.dropped_labels)
+
+    def test_serve_metrics_does_nothing_without_prometheus(self):
+        importlib.reload(airflow.stats)
+        self.assertIsNone(airflow.stats.serve_metrics(0))
+
+    def tearDown(self) -> None:
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
 class TestStatsWithAllowList(unittest.TestCase):
 
     def setUp(self):
@@ -262,6 +502,14 @@ def always_valid(stat_name):
     return stat_name
 
 
+def counting_handler(stat_name):
+    counting_handler.calls += 1
+    return stat_name
+
+
+counting_handler.calls = 0
+
+
 class TestCustomStatsName(unittest.TestCase):
     @conf_vars({
         ('scheduler', 'statsd_on'): 'True',
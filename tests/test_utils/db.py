@@ -17,8 +17,8 @@
 # under the License.
 from airflow.jobs.base_job import BaseJob
 from airflow.models import (
-    Connection, DagModel, DagRun, DagTag, Log, Pool, RenderedTaskInstanceFields, SlaMiss, TaskFail,
-    TaskInstance, TaskReschedule, Variable, XCom, errors,
+    Connection, DagModel, DagRun, DagStateSummary, DagTag, Log, Pool, RenderedTaskInstanceFields, SlaMiss,
+    TaskFail, TaskInstance, TaskReschedule, Variable, XCom, errors,
 )
 from airflow.models.dagcode import DagCode
 from airflow.models.serialized_dag import SerializedDagModel
@@ -38,6 +38,11 @@ def clear_db_dags():
         session.query(DagModel).delete()
 
 
+def clear_db_dag_state_summary():
+    with create_session() as session:
+        session.query(DagStateSummary).delete()
+
+
 def clear_db_serialized_dags():
     with create_session() as session:
         session.query(SerializedDagModel).delete()
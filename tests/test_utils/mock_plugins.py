@@ -33,6 +33,7 @@ PLUGINS_MANAGER_NULLABLE_ATTRIBUTES = [
     "global_operator_extra_links",
     "operator_extra_links",
     "registered_operator_link_classes",
+    "_pending_plugin_sources",
 ]
 
 
@@ -0,0 +1,124 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from airflow.models import DAG, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils.log.gcs_task_handler import GCSTaskHandler
+from airflow.utils.state import State
+from airflow.utils.timezone import datetime
+from tests.test_utils.config import conf_vars
+
+
+class FakeBlob:
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+        self.ranges = []
+
+    def download_as_string(self, start=None, end=None):
+        self.ranges.append((start, end))
+        return self.data[start:end + 1]
+
+
+class FakeGCSHook:
+    """Holds the blobs of a single bucket in memory"""
+
+    def __init__(self):
+        self.blobs = {}
+
+    def list(self, bucket_name, prefix=None):
+        return [name for name in self.blobs if name.startswith(prefix or '')]
+
+    def exists(self, bucket_name, object_name):
+        return object_name in self.blobs
+
+    def upload(self, bucket_name, object_name, filename):
+        with open(filename, 'rb') as file:
+            self.blobs[object_name] = FakeBlob(file.read())
+
+    def get_conn(self):
+        client = mock.MagicMock()
+        client.bucket.return_value.get_blob.side_effect = self.blobs.get
+        return client
+
+
+class TestGCSTaskHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.local_log_location = tempfile.mkdtemp()
+        self.remote_log_base = 'gs://bucket/remote/log/location'
+        self.remote_log_location = 'gs://bucket/remote/log/location/1.log'
+        self.remote_log_blob = 'remote/log/location/1.log'
+        self.gcs_task_handler = GCSTaskHandler(
+            self.local_log_location,
+            self.remote_log_base,
+            '{try_number}.log'
+        )
+        self.hook = FakeGCSHook()
+        self.gcs_task_handler.hook = self.hook
+
+        date = datetime(2016, 1, 1)
+        self.dag = DAG('dag_for_testing_file_task_handler', start_date=date)
+        task = DummyOperator(task_id='task_for_testing_file_log_handler', dag=self.dag)
+        self.ti = TaskInstance(task=task, execution_date=date)
+        self.ti.try_number = 1
+        self.ti.state = State.RUNNING
+
+    def tearDown(self):
+        shutil.rmtree(self.local_log_location, ignore_errors=True)
+
+    @conf_vars({('logging', 'remote_log_compression'): 'gzip'})
+    def test_close_compressed(self):
+        self.gcs_task_handler.set_context(self.ti)
+        with open(self.gcs_task_handler.handler.baseFilename, 'w') as log_file:
+            log_file.write('Log line\n')
+
+        self.gcs_task_handler.close()
+
+        blobs = self.hook.list('bucket', prefix=self.remote_log_blob)
+        self.assertEqual(1, len(blobs))
+        self.assertTrue(blobs[0].endswith('.gz'))
+        self.assertEqual(b'Log line\n', gzip.decompress(self.hook.blobs[blobs[0]].data))
+        # The compressed file is removed once uploaded
+        self.assertEqual(['1.log'], os.listdir(self.local_log_location))
+
+    @mock.patch('airflow.utils.log.log_compression.DOWNLOAD_CHUNK_SIZE', 4)
+    def test_read_compressed_parts(self):
+        self.hook.blobs[self.remote_log_blob] = FakeBlob(b'Uncompressed\n')
+        self.hook.blobs[self.remote_log_blob + '.20200102T000000000000.gz'] = \
+            FakeBlob(gzip.compress(b'Second\n'))
+        self.hook.blobs[self.remote_log_blob + '.20200101T000000000000.gz'] = \
+            FakeBlob(gzip.compress(b'First\n'))
+
+        self.assertEqual(
+            self.gcs_task_handler.read(self.ti),
+            (['*** Reading remote log from gs://bucket/remote/log/location/1.log.\n'
+              'Uncompressed\nFirst\nSecond\n\n'], [{'end_of_log': True}])
+        )
+        log_stream = self.gcs_task_handler.stream(self.ti, 1)
+        self.assertEqual(b'Uncompressed\nFirst\nSecond\n', b''.join(log_stream.chunks))
+        # The blobs are downloaded in ranges, not as a whole
+        self.assertEqual(
+            [(0, 3), (4, 7), (8, 11), (12, 12)] * 2, self.hook.blobs[self.remote_log_blob].ranges
+        )
@@ -0,0 +1,86 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gzip
+import os
+import tempfile
+import unittest
+
+from airflow.configuration import AirflowConfigException
+from airflow.utils.log.log_compression import (
+    compress_file, decompress_chunks, filter_log_parts, get_download_ranges, get_log_part_location,
+    get_remote_log_compression, read_log_parts,
+)
+from tests.test_utils.config import conf_vars
+
+
+class TestLogCompression(unittest.TestCase):
+    @conf_vars({('logging', 'remote_log_compression'): ''})
+    def test_no_compression(self):
+        self.assertIsNone(get_remote_log_compression())
+
+    @conf_vars({('logging', 'remote_log_compression'): 'GZIP'})
+    def test_gzip_compression(self):
+        self.assertEqual('gzip', get_remote_log_compression())
+
+    @conf_vars({('logging', 'remote_log_compression'): 'lzma'})
+    def test_unsupported_compression(self):
+        with self.assertRaises(AirflowConfigException):
+            get_remote_log_compression()
+
+    def test_compress_file(self):
+        with tempfile.NamedTemporaryFile('w') as log_file:
+            log_file.write('Log line\n' * 100)
+            log_file.flush()
+            compressed_path = compress_file(log_file.name, 'gzip')
+        try:
+            with open(compressed_path, 'rb') as compressed_file:
+                self.assertEqual(b'Log line\n' * 100, gzip.decompress(compressed_file.read()))
+        finally:
+            os.remove(compressed_path)
+
+    def test_decompress_chunks(self):
+        data = gzip.compress(b'Log line\n' * 100)
+        chunks = [data[offset:offset + 7] for offset in range(0, len(data), 7)]
+
+        self.assertEqual(b'Log line\n' * 100, b''.join(decompress_chunks(chunks, 'gzip')))
+        self.assertEqual(data, b''.join(decompress_chunks(chunks, None)))
+
+    def test_filter_log_parts(self):
+        first = get_log_part_location('dag/task/1.log', 'gzip')
+        second = get_log_part_location('dag/task/1.log', 'gzip')
+
+        self.assertEqual(
+            [first, second],
+            filter_log_parts('dag/task/1.log', [second, 'dag/task/1.log', 'dag/task/1.log.idx', first]),
+        )
+
+    def test_read_log_parts(self):
+        objects = {
+            '1.log': [b'Uncompressed\n'],
+            '1.log.20200101T000000000000.gz': [gzip.compress(b'Compressed\n')],
+        }
+
+        self.assertEqual(
+            b'Uncompressed\nCompressed\n',
+            b''.join(read_log_parts(['1.log', '1.log.20200101T000000000000.gz'], objects.__getitem__)),
+        )
+
+    def test_get_download_ranges(self):
+        self.assertEqual([(0, 3), (4, 7), (8, 9)], list(get_download_ranges(10, 4)))
+        self.assertEqual([(0, 7)], list(get_download_ranges(8, 8)))
+        self.assertEqual([], list(get_download_ranges(0, 4)))
@@ -0,0 +1,97 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from airflow.utils.log.log_index import INDEX_SUFFIX, LogIndex, index_log_file
+
+
+def _line(number):
+    return "[2020-07-20 10:{:02d}:00,000] line {}\n".format(number % 60, number)
+
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, '1.log')
+        self.lines = [_line(number) for number in range(25)]
+        with open(self.log_path, 'w') as log_file:
+            log_file.write(''.join(self.lines))
+
+    def _read(self, start, stop):
+        with open(self.log_path) as log_file:
+            log_file.seek(start)
+            return log_file.read(stop - start)
+
+    def test_index_every_interval_lines(self):
+        log_index = index_log_file(self.log_path, interval=10)
+
+        self.assertTrue(os.path.exists(self.log_path + INDEX_SUFFIX))
+        self.assertEqual(25, log_index.num_lines)
+        self.assertEqual(3, log_index.num_entries)
+
+    def test_resolve_line_range(self):
+        log_index = index_log_file(self.log_path, interval=10)
+
+        start_line, stop_line, start, stop = log_index.resolve_line_range((12, 15))
+        self.assertEqual((12, 15), (start_line, stop_line))
+        self.assertEqual(''.join(self.lines[12:15]), self._read(start, stop))
+
+    def test_resolve_last_lines(self):
+        log_index = index_log_file(self.log_path, interval=10)
+
+        start_line, stop_line, start, stop = log_index.resolve_line_range((-3, None))
+        self.assertEqual((22, 25), (start_line, stop_line))
+        self.assertEqual(''.join(self.lines[-3:]), self._read(start, stop))
+
+    def test_update_extends_index(self):
+        index_log_file(self.log_path, interval=10)
+        with open(self.log_path, 'a') as log_file:
+            log_file.write(_line(25) + "partial")
+
+        log_index = index_log_file(self.log_path, interval=10)
+
+        self.assertEqual(27, log_index.num_lines)
+        start_line, _, start, stop = log_index.resolve_line_range((-2, None))
+        self.assertEqual(25, start_line)
+        self.assertEqual(_line(25) + "partial", self._read(start, stop))
+
+    def test_update_rebuilds_index_of_truncated_log(self):
+        index_log_file(self.log_path, interval=10)
+        with open(self.log_path, 'w') as log_file:
+            log_file.write(_line(0))
+
+        log_index = index_log_file(self.log_path, interval=10)
+
+        self.assertEqual(1, log_index.num_lines)
+        self.assertEqual(1, log_index.num_entries)
+
+    def test_find_line(self):
+        log_index = index_log_file(self.log_path, interval=10)
+
+        self.assertEqual(10, log_index.find_line(datetime(2020, 7, 20, 10, 15).timestamp()))
+        self.assertEqual(0, log_index.find_line(datetime(2020, 7, 20, 9, 0).timestamp()))
+
+    def test_lines_past_the_end(self):
+        log_index = LogIndex(self.log_path, interval=10)
+        log_index.update()
+
+        _, _, start, stop = log_index.resolve_line_range((100, None))
+        self.assertEqual((os.path.getsize(self.log_path),) * 2, (start, stop))
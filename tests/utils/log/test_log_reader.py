@@ -209,3 +209,38 @@ class TestLogView(unittest.TestCase):
             ],
             any_order=False,
         )
+
+    def test_read_log_range_should_read_whole_file(self):
+        task_log_reader = TaskLogReader()
+        log_stream = task_log_reader.read_log_range(self.ti, 1)
+
+        self.assertEqual(b"try_number=1.\n", b"".join(log_stream.chunks))
+        self.assertEqual((0, 14, 14), (log_stream.start, log_stream.stop, log_stream.size))
+
+    def test_read_log_range_should_read_range(self):
+        task_log_reader = TaskLogReader()
+        log_stream = task_log_reader.read_log_range(self.ti, 2, (4, 10))
+
+        self.assertEqual(b"number", b"".join(log_stream.chunks))
+        self.assertEqual((4, 10, 14), (log_stream.start, log_stream.stop, log_stream.size))
+
+    def test_read_log_range_should_read_tail(self):
+        task_log_reader = TaskLogReader()
+        log_stream = task_log_reader.read_log_range(self.ti, 3, (-3, None))
+
+        self.assertEqual(b"3.\n", b"".join(log_stream.chunks))
+        self.assertEqual(11, log_stream.start)
+
+    @mock.patch("airflow.utils.log.file_task_handler.LOG_STREAM_CHUNK_SIZE", 4)
+    def test_read_log_range_should_read_in_chunks(self):
+        task_log_reader = TaskLogReader()
+        log_stream = task_log_reader.read_log_range(self.ti, 1)
+
+        self.assertEqual([b"try_", b"numb", b"er=1", b".\n"], list(log_stream.chunks))
+
+    def test_read_log_range_should_read_lines(self):
+        task_log_reader = TaskLogReader()
+        log_stream = task_log_reader.read_log_range(self.ti, 1, line_range=(-1, None))
+
+        self.assertEqual(b"try_number=1.\n", b"".join(log_stream.chunks))
+        self.assertEqual((0, 1, 1), log_stream.lines)
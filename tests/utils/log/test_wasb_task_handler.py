@@ -0,0 +1,126 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from airflow.models import DAG, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils.log.wasb_task_handler import WasbTaskHandler
+from airflow.utils.state import State
+from airflow.utils.timezone import datetime
+from tests.test_utils.config import conf_vars
+
+
+class FakeBlockBlobService:
+    """Holds the blobs of a single container in memory"""
+
+    def __init__(self):
+        self.blobs = {}
+        self.ranges = []
+
+    def list_blobs(self, container_name, prefix=None):
+        return [SimpleNamespace(name=name) for name in self.blobs if name.startswith(prefix)]
+
+    def get_blob_properties(self, container_name, blob_name):
+        return SimpleNamespace(properties=SimpleNamespace(content_length=len(self.blobs[blob_name])))
+
+    def get_blob_to_bytes(self, container_name, blob_name, start_range=None, end_range=None):
+        self.ranges.append((blob_name, start_range, end_range))
+        return SimpleNamespace(content=self.blobs[blob_name][start_range:end_range + 1])
+
+
+class FakeWasbHook:
+    def __init__(self):
+        self.connection = FakeBlockBlobService()
+
+    def check_for_blob(self, container_name, blob_name):
+        return blob_name in self.connection.blobs
+
+    def load_file(self, file_path, container_name, blob_name):
+        with open(file_path, 'rb') as file:
+            self.connection.blobs[blob_name] = file.read()
+
+
+class TestWasbTaskHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.local_log_location = tempfile.mkdtemp()
+        self.remote_log_base = 'remote/log/location'
+        self.remote_log_location = 'remote/log/location/1.log'
+        self.wasb_task_handler = WasbTaskHandler(
+            self.local_log_location,
+            self.remote_log_base,
+            'wasb-container',
+            '{try_number}.log',
+            False,
+        )
+        self.hook = FakeWasbHook()
+        self.wasb_task_handler.hook = self.hook
+
+        date = datetime(2016, 1, 1)
+        self.dag = DAG('dag_for_testing_file_task_handler', start_date=date)
+        task = DummyOperator(task_id='task_for_testing_file_log_handler', dag=self.dag)
+        self.ti = TaskInstance(task=task, execution_date=date)
+        self.ti.try_number = 1
+        self.ti.state = State.RUNNING
+
+    def tearDown(self):
+        shutil.rmtree(self.local_log_location, ignore_errors=True)
+
+    @conf_vars({('logging', 'remote_log_compression'): 'gzip'})
+    def test_close_compressed(self):
+        self.wasb_task_handler.set_context(self.ti)
+        with open(self.wasb_task_handler.handler.baseFilename, 'w') as log_file:
+            log_file.write('Log line\n')
+
+        self.wasb_task_handler.close()
+
+        blobs = self.hook.connection.blobs
+        self.assertEqual(1, len(blobs))
+        blob_name, data = blobs.popitem()
+        self.assertTrue(blob_name.startswith(self.remote_log_location))
+        self.assertTrue(blob_name.endswith('.gz'))
+        self.assertEqual(b'Log line\n', gzip.decompress(data))
+        # The compressed file is removed once uploaded
+        self.assertEqual(['1.log'], os.listdir(self.local_log_location))
+
+    @mock.patch('airflow.utils.log.log_compression.DOWNLOAD_CHUNK_SIZE', 4)
+    def test_read_compressed_parts(self):
+        blobs = self.hook.connection.blobs
+        blobs[self.remote_log_location] = b'Uncompressed\n'
+        blobs[self.remote_log_location + '.20200102T000000000000.gz'] = gzip.compress(b'Second\n')
+        blobs[self.remote_log_location + '.20200101T000000000000.gz'] = gzip.compress(b'First\n')
+
+        self.assertEqual(
+            self.wasb_task_handler.read(self.ti),
+            (['*** Reading remote log from remote/log/location/1.log.\n'
+              'Uncompressed\nFirst\nSecond\n\n'], [{'end_of_log': True}])
+        )
+        log_stream = self.wasb_task_handler.stream(self.ti, 1)
+        self.assertEqual(b'Uncompressed\nFirst\nSecond\n', b''.join(log_stream.chunks))
+        # The blobs are downloaded in ranges, not as a whole
+        self.assertEqual(
+            [(0, 3), (4, 7), (8, 11), (12, 12)] * 2,
+            [(start, end) for name, start, end in self.hook.connection.ranges
+             if name == self.remote_log_location],
+        )
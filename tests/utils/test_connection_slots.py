@@ -0,0 +1,111 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import fcntl
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import NullPool
+
+from airflow.utils.connection_slots import (
+    HostConnectionSlots, get_host_connection_slots, limit_connections, max_slot_wait,
+)
+from tests.test_utils.config import conf_vars
+
+
+class TestHostConnectionSlots(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_connections_of_process_share_slot(self):
+        slots = HostConnectionSlots(self.directory.name, slots=1, timeout=0)
+
+        slots.acquire()
+        slots.acquire()
+        self.assertTrue(slots.held)
+        slots.release()
+        self.assertTrue(slots.held)
+        slots.release()
+        self.assertFalse(slots.held)
+
+    def test_should_wait_for_free_slot(self):
+        # Every instance locks the files with its own descriptors, like another process would
+        holder = HostConnectionSlots(self.directory.name, slots=2, timeout=0)
+        other_holder = HostConnectionSlots(self.directory.name, slots=2, timeout=0)
+        waiter = HostConnectionSlots(self.directory.name, slots=2, timeout=0.1)
+        holder.acquire()
+        other_holder.acquire()
+
+        with self.assertRaises(exc.TimeoutError):
+            waiter.acquire()
+        self.assertFalse(waiter.held)
+
+        holder.release()
+        waiter.acquire()
+        self.assertTrue(waiter.held)
+
+    def test_max_slot_wait(self):
+        holder = HostConnectionSlots(self.directory.name, slots=1, timeout=0)
+        waiter = HostConnectionSlots(self.directory.name, slots=1, timeout=300)
+        holder.acquire()
+
+        with max_slot_wait(0.1), self.assertRaisesRegex(exc.TimeoutError, "after 0.1 seconds"):
+            waiter.acquire()
+
+    def test_slot_not_inherited(self):
+        slots = HostConnectionSlots(self.directory.name, slots=1, timeout=0)
+        slots.acquire()
+        # Not inherited by the programs executed
+        self.assertTrue(fcntl.fcntl(slots._fd, fcntl.F_GETFD) & fcntl.FD_CLOEXEC)
+
+        # Closed by the forked processes
+        pid = os.fork()
+        if not pid:
+            os._exit(0 if slots._fd is None else 1)  # pylint: disable=protected-access
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, os.WEXITSTATUS(status))
+
+    def test_engine_connections_take_slot(self):
+        slots = HostConnectionSlots(self.directory.name, slots=1, timeout=0)
+        engine = create_engine(
+            "sqlite:///{}".format(os.path.join(self.directory.name, "test.db")), poolclass=NullPool
+        )
+        limit_connections(engine, slots)
+
+        with engine.connect() as connection:
+            self.assertTrue(slots.held)
+            with engine.connect() as other_connection:
+                self.assertEqual(1, other_connection.scalar("select 1"))
+            self.assertTrue(slots.held)
+            self.assertEqual(1, connection.scalar("select 1"))
+        self.assertFalse(slots.held)
+
+    def test_get_host_connection_slots(self):
+        with conf_vars({("core", "task_connection_slots"): "0"}):
+            self.assertIsNone(get_host_connection_slots("sqlite://"))
+
+        with conf_vars({
+            ("core", "task_connection_slots"): "4",
+            ("core", "task_connection_slots_folder"): self.directory.name,
+        }):
+            slots = get_host_connection_slots("sqlite://")
+        self.assertEqual(4, slots.slots)
+        self.assertEqual(self.directory.name, slots.directory)
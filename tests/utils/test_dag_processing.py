@@ -25,6 +25,9 @@ from tempfile import TemporaryDirectory
 from unittest import mock
 from unittest.mock import MagicMock, PropertyMock
 
+from sqlalchemy import event
+
+from airflow import settings
 from airflow.configuration import conf
 from airflow.jobs.local_task_job import LocalTaskJob as LJ
 from airflow.jobs.scheduler_job import DagFileProcessorProcess
@@ -222,6 +225,62 @@ class TestDagFileProcessorManager(unittest.TestCase):
             session.query(TI).delete()
             session.query(LJ).delete()
 
+    def test_find_zombies_uses_running_ti_index(self):
+        if settings.engine.dialect.name != 'sqlite':
+            self.skipTest("The query plan is checked with SQLite")
+        manager = DagFileProcessorManager(
+            dag_directory='directory',
+            max_runs=1,
+            processor_factory=MagicMock().return_value,
+            processor_timeout=timedelta.max,
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True)
+
+        zombie_queries = []
+
+        def capture_zombie_query(
+            conn, cursor, statement, parameters, context, executemany
+        ):  # pylint: disable=unused-argument
+            if 'FROM task_instance JOIN job' in statement:
+                zombie_queries.append((statement, parameters))
+
+        event.listen(settings.engine, 'before_cursor_execute', capture_zombie_query)
+        try:
+            manager._find_zombies()  # pylint: disable=no-value-for-parameter
+        finally:
+            event.remove(settings.engine, 'before_cursor_execute', capture_zombie_query)
+
+        self.assertEqual(len(zombie_queries), 1)
+        statement, parameters = zombie_queries[0]
+        connection = settings.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+            plan = [row[-1] for row in cursor.fetchall()]
+        finally:
+            connection.close()
+        self.assertIn('SEARCH task_instance USING INDEX ti_state_job_id (state=?)', plan)
+
+    def test_add_callbacks_to_queue(self):
+        manager = DagFileProcessorManager(
+            dag_directory='directory',
+            max_runs=1,
+            processor_factory=MagicMock().return_value,
+            processor_timeout=timedelta.max,
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True)
+        manager._file_path_queue = ['file_1.py', 'file_2.py']
+        requests = [MagicMock(full_filepath='file_2.py'), MagicMock(full_filepath='file_2.py')]
+
+        manager._add_callbacks_to_queue('file_2.py', requests)
+
+        self.assertEqual(manager._file_path_queue, ['file_2.py', 'file_1.py'])
+        self.assertEqual(manager._callback_to_execute['file_2.py'], requests)
+
     def test_handle_failure_callback_with_zombies_are_correctly_passed_to_dag_file_processor(self):
         """
         Check that the same set of failure callback with zombies are passed to the dag
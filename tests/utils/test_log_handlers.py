@@ -26,10 +26,12 @@ from airflow.models import DAG, DagRun, TaskInstance
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.operators.python import PythonOperator
 from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.log_index import INDEX_SUFFIX
 from airflow.utils.log.logging_mixin import set_context
 from airflow.utils.session import create_session
 from airflow.utils.state import State
 from airflow.utils.timezone import datetime
+from tests.test_utils.config import conf_vars
 
 DEFAULT_DATE = datetime(2016, 1, 1)
 TASK_LOGGER = 'airflow.task'
@@ -113,6 +115,27 @@ class TestFileTaskLogHandler(unittest.TestCase):
         # Remove the generated tmp log file.
         os.remove(log_filename)
 
+    @conf_vars({('logging', 'index_task_logs'): 'True'})
+    def test_file_task_handler_writes_index_on_close(self):
+        dag = DAG('dag_for_testing_file_task_handler', start_date=DEFAULT_DATE)
+        task = DummyOperator(task_id='task_for_testing_file_log_handler', dag=dag)
+        ti = TaskInstance(task=task, execution_date=DEFAULT_DATE)
+
+        file_handler = next(handler for handler in ti.log.handlers if handler.name == FILE_TASK_HANDLER)
+        set_context(ti.log, ti)
+        log_filename = file_handler.handler.baseFilename
+        ti.log.disabled = False
+        ti.log.info("test")
+        file_handler.close()
+
+        self.assertTrue(os.path.isfile(log_filename + INDEX_SUFFIX))
+        log_stream = file_handler.stream(ti, 1, line_range=(-1, None))
+        self.assertIn(b'INFO - test', b''.join(log_stream.chunks))
+        self.assertEqual(1, log_stream.lines[2])
+
+        os.remove(log_filename)
+        os.remove(log_filename + INDEX_SUFFIX)
+
     def test_file_task_handler_running(self):
         def task_callable(ti, **kwargs):
             ti.log.info("test")
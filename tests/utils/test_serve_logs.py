@@ -24,7 +24,9 @@ from time import sleep
 import requests
 
 from airflow.configuration import conf
-from airflow.utils.serve_logs import serve_logs
+from airflow.utils.log.log_index import INDEX_SUFFIX
+from airflow.utils.serve_logs import create_app, serve_logs
+from tests.test_utils.config import conf_vars
 
 LOG_DATA = "Airflow log data" * 20
 
@@ -42,3 +44,30 @@ class TestServeLogs(unittest.TestCase):
             log_url = f"http://localhost:{log_port}/log/{basename(f.name)}"
             self.assertEqual(LOG_DATA, requests.get(log_url).content.decode())
             sub_proc.terminate()
+
+    def test_should_serve_range(self):
+        log_dir = os.path.expanduser(conf.get('logging', 'BASE_LOG_FOLDER'))
+        with NamedTemporaryFile(dir=log_dir) as f:
+            f.write(LOG_DATA.encode())
+            f.flush()
+            response = create_app().test_client().get(
+                f"/log/{basename(f.name)}", headers={'Range': 'bytes=0-6'})
+            self.assertEqual(206, response.status_code)
+            self.assertEqual(b"Airflow", response.data)
+
+    @conf_vars({('logging', 'log_index_interval'): '2'})
+    def test_should_serve_line_windows(self):
+        log_dir = os.path.expanduser(conf.get('logging', 'BASE_LOG_FOLDER'))
+        with NamedTemporaryFile(dir=log_dir) as f:
+            f.write("".join(f"line {number}\n" for number in range(5)).encode())
+            f.flush()
+            client = create_app().test_client()
+
+            response = client.get(f"/log/{basename(f.name)}?start_line=1&num_lines=2")
+            self.assertEqual(b"line 1\nline 2\n", response.data)
+            self.assertEqual("1-3/5", response.headers['X-Log-Lines'])
+            self.assertEqual("7-21/35", response.headers['X-Log-Bytes'])
+
+            response = client.get(f"/log/{basename(f.name)}?tail_lines=1")
+            self.assertEqual(b"line 4\n", response.data)
+            os.remove(f.name + INDEX_SUFFIX)
@@ -0,0 +1,122 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from airflow.models.dag import DAG
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils.timezone import datetime
+from airflow.www import graph_layout
+from airflow.www.graph_layout import NODE_SEPARATION, RANK_SEPARATION, get_dag_structure, get_graph_layout
+from tests.test_utils.config import conf_vars
+
+
+def _create_dag(dag_id='test_graph_layout'):
+    dag = DAG(dag_id, start_date=datetime(2020, 1, 1))
+    start = DummyOperator(task_id='start', dag=dag)
+    left = DummyOperator(task_id='left', dag=dag)
+    right = DummyOperator(task_id='right', dag=dag)
+    end = DummyOperator(task_id='end', dag=dag)
+    start >> [left, right] >> end
+    return dag
+
+
+class TestGraphLayout(unittest.TestCase):
+    def setUp(self):
+        self.cache_folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_folder.cleanup)
+        conf_patcher = conf_vars({('webserver', 'graph_layout_cache_folder'): self.cache_folder.name})
+        conf_patcher.__enter__()
+        self.addCleanup(conf_patcher.__exit__, None, None, None)
+
+    def test_layout_left_to_right(self):
+        layout = get_graph_layout(_create_dag(), 'LR')
+        nodes = {node['id']: node for node in layout['nodes']}
+
+        self.assertEqual({task_id: node['rank'] for task_id, node in nodes.items()},
+                         {'start': 0, 'left': 1, 'right': 1, 'end': 2})
+        self.assertEqual(nodes['end']['x'], 2 * RANK_SEPARATION)
+        self.assertEqual(nodes['left']['x'], nodes['right']['x'])
+        self.assertEqual(abs(nodes['left']['y'] - nodes['right']['y']), NODE_SEPARATION)
+        self.assertCountEqual(
+            [(edge['source_id'], edge['target_id']) for edge in layout['edges']],
+            [('start', 'left'), ('start', 'right'), ('left', 'end'), ('right', 'end')]
+        )
+
+    def test_layout_bottom_to_top(self):
+        layout = get_graph_layout(_create_dag(), 'BT')
+        nodes = {node['id']: node for node in layout['nodes']}
+
+        self.assertEqual(nodes['start']['y'], 2 * RANK_SEPARATION)
+        self.assertEqual(nodes['end']['y'], 0)
+        self.assertEqual(layout['height'], 2 * RANK_SEPARATION)
+
+    def test_layout_is_cached_per_structure(self):
+        with mock.patch.object(
+            graph_layout, '_compute_graph_layout', wraps=graph_layout._compute_graph_layout
+        ) as compute:
+            layout = get_graph_layout(_create_dag(), 'LR')
+            # Another DAG object with the same structure, as after a reload of the DAG file
+            self.assertEqual(get_graph_layout(_create_dag(), 'LR'), layout)
+            self.assertEqual(compute.call_count, 1)
+
+            dag = _create_dag()
+            DummyOperator(task_id='other', dag=dag)
+            self.assertNotEqual(get_graph_layout(dag, 'LR')['version'], layout['version'])
+            self.assertEqual(compute.call_count, 2)
+
+    def test_layout_is_cached_per_dag_hash(self):
+        with mock.patch.object(
+            graph_layout, '_compute_graph_layout', wraps=graph_layout._compute_graph_layout
+        ) as compute:
+            layout = get_graph_layout(_create_dag(), 'LR', dag_hash='hash1')
+            self.assertEqual(layout['version'], 'hash1')
+            dag_folder = os.path.join(self.cache_folder.name, 'test_graph_layout')
+            self.assertEqual(os.listdir(dag_folder), ['hash1.LR.json'])
+
+            # The cached layout is read without looking at the structure of the DAG
+            with mock.patch.object(graph_layout, 'get_dag_structure') as get_structure:
+                self.assertEqual(get_graph_layout(_create_dag(), 'LR', dag_hash='hash1'), layout)
+            get_structure.assert_not_called()
+            self.assertEqual(compute.call_count, 1)
+
+            get_graph_layout(_create_dag(), 'LR', dag_hash='hash1', root='left')
+            self.assertEqual(compute.call_count, 2)
+
+            # A new version of the DAG replaces the layouts of the previous one
+            self.assertEqual(get_graph_layout(_create_dag(), 'LR', dag_hash='hash2')['version'], 'hash2')
+            self.assertEqual(os.listdir(dag_folder), ['hash2.LR.json'])
+            self.assertEqual(compute.call_count, 3)
+
+    @conf_vars({('webserver', 'graph_layout_cache_folder'): ''})
+    def test_layout_is_not_cached_without_folder(self):
+        with mock.patch.object(
+            graph_layout, '_compute_graph_layout', wraps=graph_layout._compute_graph_layout
+        ) as compute:
+            get_graph_layout(_create_dag(), 'LR', dag_hash='hash1')
+            get_graph_layout(_create_dag(), 'LR', dag_hash='hash1')
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(os.listdir(self.cache_folder.name), [])
+
+    def test_get_dag_structure(self):
+        structure = get_dag_structure(_create_dag())
+        self.assertEqual([task_id for task_id, _, _, _ in structure], ['end', 'left', 'right', 'start'])
+        self.assertEqual(structure[3][3], ('left', 'right'))
@@ -298,3 +298,32 @@ class TestSecurity(unittest.TestCase):
         test_security_manager = MockSecurityManager(appbuilder=self.appbuilder)
         self.assertEqual(len(test_security_manager.VIEWER_VMS), 1)
         self.assertEqual(test_security_manager.VIEWER_VMS, {'Airflow'})
+
+    def test_permission_index_is_rebuilt_when_permissions_change(self):
+        self.expect_user_is_in_role(self.user, rolename='team-a')
+        index = self.security_manager.get_permission_index()
+        self.assertIs(index, self.security_manager.get_permission_index())
+        self.assert_user_does_not_have_dag_perms(perms=['can_dag_read'], dag_id='index_test')
+
+        self.security_manager.sync_perm_for_dag('index_test', access_control={'team-a': READ_ONLY})
+        self.assertGreater(self.security_manager.get_permission_index().version, index.version)
+        self.assert_user_has_dag_perms(perms=['can_dag_read'], dag_id='index_test')
+        self.assert_user_does_not_have_dag_perms(perms=['can_dag_edit'], dag_id='index_test')
+
+    def test_sync_perms_for_dags(self):
+        self.expect_user_is_in_role(self.user, rolename='team-a')
+        self.security_manager.sync_perms_for_dags({
+            'dag_with_access_control': {'team-a': READ_WRITE},
+            'dag_without_access_control': None,
+        })
+        for dag_id in ('dag_with_access_control', 'dag_without_access_control'):
+            for dag_perm in self.security_manager.DAG_PERMS:
+                self.assertIsNotNone(self.security_manager.find_permission_view_menu(dag_perm, dag_id))
+        self.assert_user_has_dag_perms(perms=READ_WRITE, dag_id='dag_with_access_control')
+        self.assert_user_does_not_have_dag_perms(perms=READ_WRITE, dag_id='dag_without_access_control')
+
+    def test_create_dag_permission_views_is_idempotent(self):
+        self.security_manager.create_dag_permission_views(['dag_a', 'dag_b'])
+        num_pv_before = self.db.session().query(sqla_models.PermissionView).count()
+        self.security_manager.create_dag_permission_views(['dag_a', 'dag_b'])
+        self.assertEqual(num_pv_before, self.db.session().query(sqla_models.PermissionView).count())
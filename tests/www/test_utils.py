@@ -204,6 +204,15 @@ class TestUtils(unittest.TestCase):
         self.assertNotIn('<a&1>', html)
         self.assertNotIn('<b2>', html)
 
+    def test_downsample_series(self):
+        x, y = utils.downsample_series([1, 2, 3, 4, 5], [10, 30, 20, 5, 7], 3)
+        self.assertEqual(x, [1, 3, 5])
+        self.assertEqual(y, [20, 12.5, 7])
+
+    def test_downsample_series_disabled(self):
+        self.assertEqual(utils.downsample_series([1, 2, 3], [4, 5, 6], 0), ([1, 2, 3], [4, 5, 6]))
+        self.assertEqual(utils.downsample_series([1, 2, 3], [4, 5, 6], 3), ([1, 2, 3], [4, 5, 6]))
+
 
 class TestAttrRenderer(unittest.TestCase):
 
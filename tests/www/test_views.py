@@ -50,6 +50,7 @@ from airflow.models import DAG, Connection, DagRun, TaskInstance
 from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
 from airflow.models.renderedtifields import RenderedTaskInstanceFields as RTIF
 from airflow.models.serialized_dag import SerializedDagModel
+from airflow.models.stateversion import track_state_changes, untrack_state_changes
 from airflow.operators.bash import BashOperator
 from airflow.operators.dummy_operator import DummyOperator
 from airflow.settings import Session
@@ -62,6 +63,8 @@ from airflow.utils.state import State
 from airflow.utils.timezone import datetime
 from airflow.utils.types import DagRunType
 from airflow.www import app as application
+from airflow.www.extensions.init_response_cache import response_cache
+from airflow.www.permission_index import bump_permission_version
 from tests.test_utils.asserts import assert_queries_count
 from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_runs
@@ -688,6 +691,68 @@ class TestAirflowBaseViews(TestBase):
         resp = self.client.post('last_dagruns', follow_redirects=True)
         self.check_content_in_response('example_bash_operator', resp)
 
+    def test_last_dagruns_conditional_get(self):
+        resp = self.client.get('last_dagruns?dag_ids=example_bash_operator', follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp.headers['ETag']
+
+        resp = self.client.get('last_dagruns?dag_ids=example_bash_operator',
+                               headers={'If-None-Match': etag}, follow_redirects=True)
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get('last_dagruns?dag_ids=example_subdag_operator',
+                               headers={'If-None-Match': etag}, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+
+    @conf_vars({('webserver', 'response_cache_ttl'): '60'})
+    def test_last_dagruns_conditional_get_after_recreated_run(self):
+        response_cache.clear()
+        track_state_changes()
+        self.addCleanup(untrack_state_changes)
+        self.addCleanup(response_cache.clear)
+        url = 'last_dagruns?dag_ids=example_xcom'
+        etag = self.client.get(url, follow_redirects=True).headers['ETag']
+
+        # The recreated run may reuse the id of the deleted one
+        with create_session() as session:
+            session.query(DagRun).filter(DagRun.dag_id == 'example_xcom').delete()
+        self.xcom_dag.create_dagrun(
+            run_type=DagRunType.SCHEDULED,
+            execution_date=self.EXAMPLE_DAG_DEFAULT_DATE + timedelta(days=1),
+            start_date=timezone.utcnow(),
+            state=State.RUNNING)
+
+        resp = self.client.get(url, headers={'If-None-Match': etag}, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers['ETag'], etag)
+
+    @conf_vars({('webserver', 'response_cache_ttl'): '60'})
+    def test_last_dagruns_conditional_get_after_permission_change(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        url = 'last_dagruns?dag_ids=example_bash_operator'
+        etag = self.client.get(url, follow_redirects=True).headers['ETag']
+
+        with create_session() as session:
+            bump_permission_version(session)
+
+        resp = self.client.get(url, headers={'If-None-Match': etag}, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers['ETag'], etag)
+
+    @conf_vars({('webserver', 'response_cache_ttl'): '60'})
+    def test_task_stats_cached(self):
+        response_cache.clear()
+        resp = self.client.post('task_stats', follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        with mock.patch(
+            'airflow.www.security.AirflowSecurityManager.get_accessible_dag_ids'
+        ) as mock_get_accessible_dag_ids:
+            resp_cached = self.client.post('task_stats', follow_redirects=True)
+        mock_get_accessible_dag_ids.assert_not_called()
+        self.assertEqual(resp.data, resp_cached.data)
+        response_cache.clear()
+
     def test_last_dagruns_success_when_selecting_dags(self):
         resp = self.client.post('last_dagruns',
                                 data={'dag_ids': ['example_subdag_operator']},
@@ -717,6 +782,62 @@ class TestAirflowBaseViews(TestBase):
         resp = self.client.get(url, follow_redirects=True)
         self.check_content_in_response('section-1-task-1', resp)
 
+    def test_tree_data(self):
+        url = 'tree_data?dag_id=example_bash_operator'
+        resp = self.client.get(url, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.data.decode('utf-8'))
+        task_ids = data['tasks']['task_id']
+        self.assertCountEqual(task_ids, self.bash_dag.task_ids)
+        self.assertEqual(data['total_tasks'], len(self.bash_dag.tasks))
+        self.assertEqual(len(data['runs']), 1)
+        self.assertIsNone(data['previous_base_date'])
+        self.assertEqual(len(data['instances']), len(task_ids))
+        self.assertTrue(all(len(instances) == 1 for instances in data['instances']))
+
+    def test_tree_data_window(self):
+        url = 'tree_data?dag_id=example_bash_operator&task_offset=1&task_limit=2'
+        resp = self.client.get(url, follow_redirects=True)
+        data = json.loads(resp.data.decode('utf-8'))
+        self.assertEqual(data['task_offset'], 1)
+        self.assertEqual(len(data['tasks']['task_id']), 2)
+        self.assertEqual(len(data['instances']), 2)
+
+    def test_tree_data_missing_dag(self):
+        resp = self.client.get('tree_data?dag_id=missing_dag', follow_redirects=True)
+        self.assertEqual(resp.status_code, 404)
+
+    def test_graph_data(self):
+        url = 'graph_data?dag_id=example_bash_operator&arrange=TB'
+        resp = self.client.get(url, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.data.decode('utf-8'))
+        self.assertEqual(data['arrange'], 'TB')
+        self.assertCountEqual([node['id'] for node in data['nodes']], self.bash_dag.task_ids)
+
+    def test_graph_uses_server_layout(self):
+        with self.capture_templates() as templates:
+            self.client.get('graph?dag_id=example_bash_operator&arrange=TB', follow_redirects=True)
+        data = json.loads(self.client.get(
+            'graph_data?dag_id=example_bash_operator&arrange=TB', follow_redirects=True
+        ).data.decode('utf-8'))
+        positions = {node['id']: (node['x'], node['y']) for node in data['nodes']}
+        nodes = templates[0].local_context['nodes']
+        self.assertEqual({node['id']: (node['x'], node['y']) for node in nodes}, positions)
+
+    def test_graph_data_invalid_arrange(self):
+        resp = self.client.get('graph_data?dag_id=example_bash_operator&arrange=XX', follow_redirects=True)
+        self.assertEqual(resp.status_code, 400)
+
+    def test_graph_state(self):
+        url = 'graph_state?dag_id=example_bash_operator&execution_date={}'.format(
+            self.percent_encode(self.EXAMPLE_DAG_DEFAULT_DATE.isoformat()))
+        resp = self.client.get(url, follow_redirects=True)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.data.decode('utf-8'))
+        self.assertCountEqual(data.keys(), self.bash_dag.task_ids)
+        self.assertEqual(data['runme_0'], [None, 1])
+
     def test_duration(self):
         url = 'duration?days=30&dag_id=example_bash_operator'
         resp = self.client.get(url, follow_redirects=True)
@@ -1220,6 +1341,43 @@ class TestLogView(TestBase):
         self.assertIn('Log for testing.', response.data.decode('utf-8'))
         self.assertEqual(200, response.status_code)
 
+    def test_get_log_stream(self):
+        url = "get_log_stream?dag_id={}&task_id={}&execution_date={}&try_number=1".format(
+            self.DAG_ID, self.TASK_ID, quote_plus(self.DEFAULT_DATE.isoformat()))
+        response = self.client.get(url, follow_redirects=True)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('bytes', response.headers['Accept-Ranges'])
+        self.assertIn('Log for testing.', response.data.decode('utf-8'))
+
+    def test_get_log_stream_range(self):
+        url = "get_log_stream?dag_id={}&task_id={}&execution_date={}&try_number=1".format(
+            self.DAG_ID, self.TASK_ID, quote_plus(self.DEFAULT_DATE.isoformat()))
+        full_log = self.client.get(url, follow_redirects=True).data
+
+        response = self.client.get(url, headers={'Range': 'bytes=2-5'}, follow_redirects=True)
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(full_log[2:6], response.data)
+        self.assertEqual('bytes 2-5/{}'.format(len(full_log)), response.headers['Content-Range'])
+
+        response = self.client.get(url + '&tail_bytes=4', follow_redirects=True)
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(full_log[-4:], response.data)
+
+    def test_get_log_stream_lines(self):
+        url = "get_log_stream?dag_id={}&task_id={}&execution_date={}&try_number=1".format(
+            self.DAG_ID, self.TASK_ID, quote_plus(self.DEFAULT_DATE.isoformat()))
+        full_log = self.client.get(url, follow_redirects=True).data
+        lines = full_log.splitlines(keepends=True)
+
+        response = self.client.get(url + '&tail_lines=1', follow_redirects=True)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(lines[-1], response.data)
+        self.assertEqual('{0}-{1}/{1}'.format(len(lines) - 1, len(lines)), response.headers['X-Log-Lines'])
+
+        response = self.client.get(url + '&start_line=0&num_lines=1', follow_redirects=True)
+        self.assertEqual(lines[0], response.data)
+
     def test_get_logs_with_null_metadata(self):
         url_template = "get_logs_with_metadata?dag_id={}&" \
                        "task_id={}&execution_date={}&" \